@@ -0,0 +1,89 @@
+# Copyright (c) 2012-2018 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+# A script to compare the memory use and timing of photon shooting with float64 and float32
+# PhotonArrays.
+#
+# The float32 arrays use half the memory per photon, so for a given memory budget, maxN can be
+# twice as large.  The operations on the photons (convolve, addTo, the surface ops and
+# SiliconSensor.accumulate) are mostly limited by memory bandwidth for large numbers of photons,
+# so they should also be somewhat faster with float32.
+
+from __future__ import print_function
+import galsim
+import time
+import os
+import sys
+import numpy as np
+
+nphotons = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**7
+nsilicon = nphotons // 10   # The silicon sensor is much slower, so use fewer photons for it.
+image_size = 256
+
+sedpath = os.path.join(galsim.meta_data.share_dir, 'SEDs')
+bppath = os.path.join(galsim.meta_data.share_dir, 'bandpasses')
+
+def nbytes(photons):
+    n = photons.x.nbytes + photons.y.nbytes + photons.flux.nbytes
+    if photons.hasAllocatedAngles():
+        n += photons.dxdz.nbytes + photons.dydz.nbytes
+    if photons.hasAllocatedWavelengths():
+        n += photons.wavelength.nbytes
+    return n
+
+def time_dtype(dtype):
+    obj = galsim.Convolve(galsim.Exponential(half_light_radius=1.3, flux=nphotons),
+                          galsim.Kolmogorov(fwhm=0.7))
+    sed = galsim.SED(os.path.join(sedpath, 'CWW_E_ext.sed'), 'nm', 'flambda').thin()
+    bandpass = galsim.Bandpass(os.path.join(bppath, 'LSST_r.dat'), 'nm').thin()
+    rng = galsim.BaseDeviate(8675309)
+    ops = [ galsim.WavelengthSampler(sed, bandpass, rng), galsim.FRatioAngles(1.2, 0.6, rng) ]
+    image = galsim.ImageF(image_size, image_size, xmin=-image_size//2, ymin=-image_size//2)
+
+    t0 = time.time()
+    photons = obj.shoot(nphotons, rng, dtype=dtype)
+    t1 = time.time()
+    for op in ops:
+        op.applyTo(photons)
+    t2 = time.time()
+    photons.addTo(image)
+    t3 = time.time()
+
+    sensor = galsim.SiliconSensor(rng=rng)
+    few = galsim.PhotonArray(nsilicon, x=photons.x[:nsilicon], y=photons.y[:nsilicon],
+                             flux=photons.flux[:nsilicon], dxdz=photons.dxdz[:nsilicon],
+                             dydz=photons.dydz[:nsilicon],
+                             wavelength=photons.wavelength[:nsilicon], dtype=dtype)
+    image.setZero()
+    t4 = time.time()
+    sensor.accumulate(few, image)
+    t5 = time.time()
+
+    return nbytes(photons), t1-t0, t2-t1, t3-t2, t5-t4
+
+def main():
+    print('nphotons = ',nphotons)
+    print('%10s %12s %10s %14s %10s %16s'%('dtype','memory (MB)','shoot (s)','surface ops (s)',
+                                            'addTo (s)','accumulate (s)'))
+    for dtype in [np.float64, np.float32]:
+        mem, t_shoot, t_ops, t_add, t_acc = time_dtype(dtype)
+        print('%10s %12.1f %10.3f %14.3f %10.3f %16.3f'%(dtype.__name__, mem/2.**20, t_shoot,
+                                                         t_ops, t_add, t_acc))
+
+if __name__ == "__main__":
+    main()
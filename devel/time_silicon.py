@@ -0,0 +1,95 @@
+# Copyright (c) 2012-2018 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+# A script to time the SiliconSensor accumulation as a function of the image size and the
+# number of stamps that actually receive photons.
+#
+# The pixel boundary updates are only done near the pixels that received charge since the
+# last update, so for a fixed number of photons, the time spent per recalculation should
+# scale with the number of active pixels, not with the full image size.  The only part that
+# scales with the image size is the initial setup of the pixel boundaries at the start of
+# each call to accumulate (with resume=False).
+
+from __future__ import print_function
+import galsim
+import time
+import sys
+import numpy as np
+
+# Some global variables that we might want to adjust
+image_sizes = [256, 512, 1024, 2048]
+nstamps_list = [1, 4, 16]
+nphotons = 10**6
+nrecalc = 10000
+sigma = 1.5     # The size of each spot in pixels.
+nthreads = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+def make_photons(rng, image_size, nstamps):
+    """Make nphotons photons spread among nstamps Gaussian spots on the image."""
+    ud = galsim.UniformDeviate(rng)
+    gd = galsim.GaussianDeviate(rng, sigma=sigma)
+    cx = np.empty(nstamps)
+    cy = np.empty(nstamps)
+    ud.generate(cx)
+    ud.generate(cy)
+    cx = cx * (image_size - 20) + 10
+    cy = cy * (image_size - 20) + 10
+    which = np.arange(nphotons) % nstamps
+
+    photons = galsim.PhotonArray(nphotons)
+    gd.generate(photons.x)
+    gd.generate(photons.y)
+    photons.x += cx[which]
+    photons.y += cy[which]
+    photons.flux = 1.
+    return photons
+
+def time_accumulate(image_size, nstamps):
+    rng = galsim.BaseDeviate(8675309)
+    photons = make_photons(rng, image_size, nstamps)
+    sensor = galsim.SiliconSensor(rng=rng, nrecalc=nrecalc)
+    image = galsim.ImageF(image_size, image_size)
+
+    # The first call does the full setup of the pixel boundaries, which necessarily
+    # scales with the image size.  Time that separately from the rest, which is dominated
+    # by the photon placement and the incremental boundary updates.
+    n1 = nphotons // 10
+    first = galsim.PhotonArray(n1, x=photons.x[:n1], y=photons.y[:n1], flux=photons.flux[:n1])
+    rest = galsim.PhotonArray(nphotons-n1, x=photons.x[n1:], y=photons.y[n1:],
+                              flux=photons.flux[n1:])
+    t0 = time.time()
+    sensor.accumulate(first, image)
+    t1 = time.time()
+    sensor.accumulate(rest, image, resume=True)
+    t2 = time.time()
+    return t1-t0, t2-t1
+
+def main():
+    galsim.utilities.set_num_threads(nthreads)
+    print('nthreads = ',nthreads)
+    print('%10s %10s %12s %12s %16s'%('size','nstamps','setup (s)','rest (s)',
+                                      'per recalc (ms)'))
+    nrecalcs = (nphotons - nphotons//10) / nrecalc
+    for image_size in image_sizes:
+        for nstamps in nstamps_list:
+            t_setup, t_rest = time_accumulate(image_size, nstamps)
+            print('%10d %10d %12.3f %12.3f %16.3f'%(image_size, nstamps, t_setup, t_rest,
+                                                    t_rest / nrecalcs * 1.e3))
+
+if __name__ == "__main__":
+    main()
@@ -124,7 +124,7 @@ from .noise import DeviateNoise, VariableGaussianNoise
 from .correlatednoise import CorrelatedNoise, getCOSMOSNoise, UncorrelatedNoise, CovarianceSpectrum
 
 # GSObject
-from .gsobject import GSObject
+from .gsobject import GSObject, drawImages
 from .gsparams import GSParams
 from .gaussian import Gaussian
 from .moffat import Moffat
@@ -192,5 +192,6 @@ from . import meta_data
 from . import cdmodel
 from . import utilities
 from . import fft
+from . import disk_cache
 from . import download_cosmos
 from . import zernike
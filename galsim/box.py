@@ -132,6 +132,10 @@ class Box(GSObject):
     def _drawReal(self, image):
         self._sbp.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._sbp
+
     @doc_inherit
     def _shoot(self, photons, rng):
         self._sbp.shoot(photons._pa, rng._rng)
@@ -289,6 +293,10 @@ class TopHat(GSObject):
     def _drawReal(self, image):
         self._sbp.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._sbp
+
     @doc_inherit
     def _shoot(self, photons, rng):
         self._sbp.shoot(photons._pa, rng._rng)
@@ -38,25 +38,58 @@ class Catalog(object):
     @param file_name    Filename of the input catalog. (Required)
     @param dir          Optionally a directory name can be provided if `file_name` does not
                         already include it.
-    @param file_type    Either 'ASCII' or 'FITS'.  If None, infer from `file_name` ending.
-                        [default: None]
+    @param file_type    One of 'ASCII', 'FITS', 'NPY' or 'PARQUET'.  If None, infer from
+                        `file_name` ending ('.fit*' for FITS, '.npy' for NPY, '.parquet' or '.pq'
+                        for PARQUET, and anything else is ASCII).  [default: None]
     @param comments     The character used to indicate the start of a comment in an
                         ASCII catalog.  [default: '#']
     @param hdu          Which hdu to use for FITS files.  [default: 1]
+    @param columnar     Whether to store the catalog as a typed array for each column.
+                        [default: False]
+    @param first_row    The first row of the file to use.  Row numbers passed to get() are
+                        relative to this row.  For ASCII catalogs, comment and blank lines are
+                        not counted as rows.  [default: 0]
+    @param nrows        The maximum number of rows to use, starting at `first_row`.  If None,
+                        use all of the rows to the end of the file.  [default: None]
+
+    Columnar catalogs
+    -----------------
+
+    Normally, an ASCII catalog is read into an array of str, and each value is converted to the
+    requested type when it is accessed.  This is simple, but for very large catalogs it is both
+    slow and uses a lot of memory.  With `columnar=True`, the file is instead parsed in chunks,
+    and each column is converted to the first of int, float or str that can represent all of its
+    values.  Then get() returns the value in this type, and getColumn() returns the whole column
+    as a typed NumPy array.
+
+    For FITS catalogs, `columnar=True` means that the table is memory mapped rather than read
+    into memory.  NPY files (a NumPy structured array saved with numpy.save) are always memory
+    mapped, and PARQUET files (which require the pyarrow package) are always read into typed
+    columns.  For all of these, columns are accessed by name.
+
+    Using only some rows
+    --------------------
+
+    If `first_row` or `nrows` is given, only those rows are kept in memory.  For ASCII files,
+    the rows before `first_row` are skipped without being parsed, and reading stops after
+    `nrows` rows.  For FITS (with `columnar=True`) and NPY files, only the requested rows of the
+    memory map are ever read.  The config `catalog` input type uses this when `stream=True`
+    to read just the rows needed for each output file.
 
     Attributes
     ----------
 
     After construction, the following attributes are available:
 
-        nobjects   The number of objects in the catalog.
+        nobjects   The number of objects in the catalog.  (i.e. the number of rows used)
         ncols      The number of columns in the catalog.
         isfits     Whether the catalog is a fits catalog.
-        names      For a fits catalog, the valid column names.
+        names      For a catalog with named columns (i.e. any but ASCII), the valid column names.
 
     """
     _req_params = { 'file_name' : str }
-    _opt_params = { 'dir' : str , 'file_type' : str , 'comments' : str , 'hdu' : int }
+    _opt_params = { 'dir' : str , 'file_type' : str , 'comments' : str , 'hdu' : int ,
+                    'columnar' : bool , 'first_row' : int , 'nrows' : int }
     _single_params = []
     _takes_rng = False
 
@@ -64,7 +97,7 @@ class Catalog(object):
     # the config structure.  It indicates that all we care about is the nobjects parameter.
     # So skip any other calculations that might normally be necessary on construction.
     def __init__(self, file_name, dir=None, file_type=None, comments='#', hdu=1,
-                 _nobjects_only=False):
+                 columnar=False, first_row=0, nrows=None, _nobjects_only=False):
 
         # First build full file_name
         self.file_name = file_name.strip()
@@ -77,28 +110,56 @@ class Catalog(object):
             name, ext = os.path.splitext(file_name)
             if ext.lower().startswith('.fit'):
                 file_type = 'FITS'
+            elif ext.lower() == '.npy':
+                file_type = 'NPY'
+            elif ext.lower() in ('.parquet', '.pq'):
+                file_type = 'PARQUET'
             else:
                 file_type = 'ASCII'
         file_type = file_type.upper()
-        if file_type not in ('FITS', 'ASCII'):
-            raise GalSimValueError("file_type must be either FITS or ASCII if specified.",
-                                   file_type, ('FITS', 'ASCII'))
+        if file_type not in self._valid_file_types:
+            raise GalSimValueError("Invalid file_type", file_type, self._valid_file_types)
         self.file_type = file_type
         if comments == '': comments = None  # loadtxt actually wants None, not ''
         self.comments = comments
         self.hdu = hdu
+        self.columnar = columnar or file_type in ('NPY', 'PARQUET')
+        if first_row < 0:
+            raise GalSimValueError("first_row must be >= 0", first_row)
+        if nrows is not None and nrows < 0:
+            raise GalSimValueError("nrows must be >= 0", nrows)
+        self.first_row = first_row
+        self.nrows = nrows
+        self._columns = None
 
         if file_type == 'FITS':
             self.readFits(hdu, _nobjects_only)
+        elif file_type == 'NPY':
+            self.readNpy(_nobjects_only)
+        elif file_type == 'PARQUET':
+            self.readParquet(_nobjects_only)
         else:  # file_type == 'ASCII':
             self.readAscii(comments, _nobjects_only)
 
+    _valid_file_types = ('ASCII', 'FITS', 'NPY', 'PARQUET')
+
     # When we make a proxy of this class (cf. galsim/config/stamp.py), the attributes
     # don't get proxied.  Only callable methods are.  So make method versions of these.
     def getNObjects(self) : return self.nobjects
     def isFits(self) : return self.isfits
+    def hasNames(self) : return self.file_type != 'ASCII'
     def __len__(self) : return self.nobjects
 
+    def _rowSlice(self, n):
+        """Return the slice of the n rows in the file that are used for this catalog.
+        """
+        start = min(self.first_row, n)
+        stop = n if self.nrows is None else min(n, start + self.nrows)
+        return slice(start, stop)
+
+    def _useAllRows(self):
+        return self.first_row == 0 and self.nrows is None
+
     def readAscii(self, comments, _nobjects_only=False):
         """Read in an input catalog from an ASCII file.
         """
@@ -113,62 +174,148 @@ class Catalog(object):
             with open(self.file_name) as f:
                 if comments is not None:
                     c = comments[0]
-                    self.nobjects = sum(1 for line in f if line[0] != c)
+                    nlines = sum(1 for line in f if line[0] != c)
                 else:  # comments == None.  No comments.
-                    self.nobjects = sum(1 for line in f)
+                    nlines = sum(1 for line in f)
+            rows = self._rowSlice(nlines)
+            self.nobjects = rows.stop - rows.start
+            return
+
+        self.isfits = False
+        if self.columnar:
+            self._columns = _read_ascii_columns(self.file_name, comments, self.first_row,
+                                                self.nrows)
+            self.ncols = len(self._columns)
+            self.nobjects = len(self._columns[0]) if self.ncols > 0 else 0
             return
 
         # Read in the data using the numpy convenience function
         # Note: we leave the data as str, rather than convert to float, so that if
         # we have any str fields, they don't give an error here.  They'll only give an
         # error if one tries to convert them to float at some point.
-        self.data = np.loadtxt(self.file_name, comments=comments, dtype=bytes, ndmin=2)
+        if self._useAllRows():
+            self.data = np.loadtxt(self.file_name, comments=comments, dtype=bytes, ndmin=2)
+        else:
+            with open(self.file_name) as f:
+                lines = list(_ascii_data_lines(f, comments, self.first_row, self.nrows))
+            if len(lines) > 0:
+                self.data = np.loadtxt(lines, comments=comments, dtype=bytes, ndmin=2)
+            else:
+                self.data = np.empty((0,0), dtype=bytes)
         # Convert the bytes to str.  For Py2, this is a no op.
         self.data = self.data.astype(str)
 
         self.nobjects = self.data.shape[0]
         self.ncols = self.data.shape[1]
-        self.isfits = False
 
     def readFits(self, hdu, _nobjects_only=False):
         """Read in an input catalog from a FITS file.
         """
         from ._pyfits import pyfits
-        with pyfits.open(self.file_name) as fits:
-            self.data = fits[hdu].data.copy()
+        if self.columnar:
+            # The data stay memory mapped after the file is closed, so columns are only read
+            # from disk as they are used.
+            with pyfits.open(self.file_name, memmap=True) as fits:
+                self.data = fits[hdu].data
+                if not self._useAllRows():
+                    self.data = self.data[self._rowSlice(len(self.data))]
+        else:
+            with pyfits.open(self.file_name) as fits:
+                self.data = fits[hdu].data
+                if not self._useAllRows():
+                    self.data = self.data[self._rowSlice(len(self.data))]
+                self.data = self.data.copy()
         self.names = self.data.columns.names
         self.nobjects = len(self.data)
         if (_nobjects_only): return
         self.ncols = len(self.names)
         self.isfits = True
 
-    def get(self, index, col):
-        """Return the data for the given `index` and `col` in its native type.
-
-        For ASCII catalogs, `col` is the column number.
-        For FITS catalogs, `col` is a string giving the name of the column in the FITS table.
+    def readNpy(self, _nobjects_only=False):
+        """Read in an input catalog from a NumPy structured array saved in a .npy file.
+        """
+        self.data = np.load(self.file_name, mmap_mode='r')
+        if self.data.dtype.names is None:
+            raise GalSimValueError("NPY catalog must be a structured array", self.file_name)
+        if not self._useAllRows():
+            self.data = self.data[self._rowSlice(len(self.data))]
+        self.names = list(self.data.dtype.names)
+        self.nobjects = len(self.data)
+        if (_nobjects_only): return
+        self.ncols = len(self.names)
+        self._columns = dict((name, self.data[name]) for name in self.names)
+        # Convert any bytes columns to str, as for ASCII catalogs.
+        for name in self.names:
+            if self._columns[name].dtype.kind == 'S':
+                self._columns[name] = self._columns[name].astype(str)
+        self.isfits = False
 
-        Also, for ASCII catalogs, the "native type" is always str.  For FITS catalogs, it is
-        whatever type is specified for each field in the binary table.
+    def readParquet(self, _nobjects_only=False):
+        """Read in an input catalog from a Parquet file.  This requires the pyarrow package.
         """
-        if self.isfits:
+        import pyarrow.parquet as pq
+        if _nobjects_only:
+            rows = self._rowSlice(pq.ParquetFile(self.file_name).metadata.num_rows)
+            self.nobjects = rows.stop - rows.start
+            return
+        table = pq.read_table(self.file_name)
+        if not self._useAllRows():
+            rows = self._rowSlice(table.num_rows)
+            table = table.slice(rows.start, rows.stop - rows.start)
+        self.names = list(table.column_names)
+        self.nobjects = table.num_rows
+        self.ncols = len(self.names)
+        self._columns = dict((name, table.column(name).to_numpy()) for name in self.names)
+        self.isfits = False
+
+    def _checkCol(self, col):
+        if self.hasNames():
             if col not in self.names:
                 raise GalSimKeyError("Column is invalid for catalog %s"%self.file_name, col)
-            if not isinstance(index, int):
-                raise GalSimIndexError("Index must be an int for catalog %s"%self.file_name, index)
-            if index < 0 or index >= self.nobjects:
-                raise GalSimIndexError("Index is invalid for catalog %s"%self.file_name, index)
-            return self.data[col][index]
         else:
             if not isinstance(col, int):
                 raise GalSimIndexError("Column must an int for ASCII catalog %s"%self.file_name,
                                        col)
             if col < 0 or col >= self.ncols:
                 raise GalSimIndexError("Column is invalid for catalog %s"%self.file_name, col)
-            if not isinstance(index, int):
-                raise GalSimIndexError("Index must be an int for catalog %s"%self.file_name, index)
-            if index < 0 or index >= self.nobjects:
-                raise GalSimIndexError("Index is invalid for catalog %s"%self.file_name, col)
+
+    def getColumn(self, col):
+        """Return all the data in the given `col` as a NumPy array.
+
+        For ASCII catalogs, `col` is the column number.  For other catalogs, `col` is a string
+        giving the name of the column.
+
+        For columnar catalogs, the array has the type of the column.  Otherwise, for ASCII
+        catalogs, it is an array of str.
+        """
+        self._checkCol(col)
+        if self._columns is not None:
+            return self._columns[col]
+        elif self.isfits:
+            return self.data[col]
+        else:
+            return self.data[:,col]
+
+    def get(self, index, col):
+        """Return the data for the given `index` and `col` in its native type.
+
+        For ASCII catalogs, `col` is the column number.
+        For FITS catalogs, `col` is a string giving the name of the column in the FITS table.
+
+        Also, for ASCII catalogs, the "native type" is always str, unless the catalog is
+        columnar, in which case it is the type inferred for that column.  For other catalogs, it
+        is whatever type is specified for each field in the file.
+        """
+        self._checkCol(col)
+        if not isinstance(index, int):
+            raise GalSimIndexError("Index must be an int for catalog %s"%self.file_name, index)
+        if index < 0 or index >= self.nobjects:
+            raise GalSimIndexError("Index is invalid for catalog %s"%self.file_name, index)
+        if self._columns is not None:
+            return self._columns[col][index]
+        elif self.isfits:
+            return self.data[col][index]
+        else:
             return self.data[index, col]
 
     def getFloat(self, index, col):
@@ -185,6 +332,9 @@ class Catalog(object):
         s = "galsim.Catalog(file_name=%r, file_type=%r"%(self.file_name, self.file_type)
         if self.comments != '#': s += ', comments=%r'%self.comments
         if self.hdu != 1: s += ', hdu=%r'%self.hdu
+        if self.columnar and self.file_type in ('ASCII', 'FITS'): s += ', columnar=True'
+        if self.first_row != 0: s += ', first_row=%r'%self.first_row
+        if self.nrows is not None: s += ', nrows=%r'%self.nrows
         s += ')'
         return s
 
@@ -195,6 +345,77 @@ class Catalog(object):
     def __hash__(self): return hash(repr(self))
 
 
+# The types to try for the columns of a columnar ASCII catalog, in order.
+_ascii_column_types = (np.int64, np.float64, str)
+
+def _ascii_data_lines(f, comments, first_row=0, nrows=None):
+    """Iterate over the lines of an ASCII catalog that have data, skipping blank and comment
+    lines, starting at row `first_row` and stopping after `nrows` rows.
+    """
+    import itertools
+    lines = ( line for line in f if line.strip() and
+              (comments is None or not line.lstrip().startswith(comments)) )
+    stop = None if nrows is None else first_row + nrows
+    return itertools.islice(lines, first_row, stop)
+
+def _read_ascii_columns(file_name, comments, first_row=0, nrows=None, chunk_size=100000):
+    """Read an ASCII catalog into a list of typed arrays, one for each column.
+
+    The file is parsed `chunk_size` lines at a time, so only one chunk is ever held as strings.
+    Each column starts out as an int, and is promoted to float or str if some value in it cannot
+    be converted.  Promoting earlier chunks from int to float is straightforward, but the original
+    text cannot be recovered from numbers, so if a column needs to become str partway through the
+    file, we start again, knowing that column is a str from the start.
+    """
+    dtypes = []
+    args = (file_name, comments, first_row, nrows, chunk_size, dtypes)
+    columns = _parse_ascii_chunks(*args)
+    while columns is None:
+        columns = _parse_ascii_chunks(*args)
+    return columns
+
+def _parse_ascii_chunks(file_name, comments, first_row, nrows, chunk_size, dtypes):
+    """Helper function for _read_ascii_columns.  This does a single pass through the file.
+
+    `dtypes` is a list of the index into _ascii_column_types for each column, which is updated
+    as needed.  (An empty list on input means start every column as an int.)
+
+    @returns the list of column arrays, or None if we need to start over.
+    """
+    import itertools
+    columns = None
+    with open(file_name) as f:
+        data_lines = _ascii_data_lines(f, comments, first_row, nrows)
+        while True:
+            lines = list(itertools.islice(data_lines, chunk_size))
+            if not lines: break
+            data = np.loadtxt(lines, comments=comments, dtype=bytes, ndmin=2)
+            if columns is None:
+                ncols = data.shape[1]
+                columns = [ [] for j in range(ncols) ]
+                if not dtypes: dtypes.extend([0] * ncols)
+            elif data.shape[1] != ncols:
+                raise GalSimValueError("Inconsistent number of columns in catalog %s"%file_name,
+                                       data.shape[1])
+            for j in range(ncols):
+                t = dtypes[j]
+                while True:
+                    try:
+                        col = data[:,j].astype(_ascii_column_types[t])
+                        break
+                    except (ValueError, OverflowError):
+                        t += 1
+                if t != dtypes[j]:
+                    dtypes[j] = t
+                    if _ascii_column_types[t] is str and len(columns[j]) > 0:
+                        return None
+                    columns[j] = [ c.astype(_ascii_column_types[t]) for c in columns[j] ]
+                columns[j].append(col)
+    if columns is None:
+        return []
+    return [ np.concatenate(c) for c in columns ]
+
+
 class Dict(object):
     """A class that reads a python dict from a file.
 
@@ -38,6 +38,46 @@ from . import utilities
 from . import integ
 from .errors import GalSimError, GalSimRangeError, GalSimSEDError, GalSimValueError
 from .errors import GalSimIncompatibleValuesError, GalSimNotImplementedError, galsim_warn
+from .disk_cache import DiskCache
+
+# If set, the DiskCache to use for saving the effective profiles of ChromaticConvolutions.
+_disk_cache = None
+_disk_cache_stats = { 'hits' : 0, 'misses' : 0 }
+
+def set_disk_cache(directory=None, max_size=2**30):
+    """Set a directory in which to save the effective profiles used when drawing
+    ChromaticConvolutions.
+
+    Drawing a ChromaticConvolution with an inseparable component (e.g. a galaxy with an SED
+    convolved with a PSF that changes with wavelength) requires integrating the inseparable
+    part over the bandpass.  The result is cached in memory (see
+    ChromaticConvolution.resize_effective_prof_cache), but that cache is not shared between
+    processes.  When a disk cache is set, the images of these effective profiles are also saved
+    to disk, so other processes that need the same one (the same SED, PSF, bandpass, integrator
+    and gsparams) can load it rather than doing the integral again.
+
+    The effective profiles are identified by the repr of the inseparable object, the bandpass
+    and the integrator.  If any of these is not fully specified by its repr (e.g. an SED that
+    uses a python function), the disk cache is not used for it.
+
+    The directory may be shared by multiple processes.  See galsim.disk_cache.DiskCache for
+    details.
+
+    @param directory    The directory to use, or None to turn off the disk cache.
+                        [default: None]
+    @param max_size     The maximum total size of the cache in bytes.  [default: 2**30, i.e. 1 GB]
+    """
+    global _disk_cache
+    if directory is None:
+        _disk_cache = None
+    else:
+        _disk_cache = DiskCache(directory, max_size)
+
+def get_disk_cache():
+    """Get the DiskCache used for ChromaticConvolution effective profiles, or None if there is
+    not one.  See set_disk_cache for details.
+    """
+    return _disk_cache
 
 class ChromaticObject(object):
     """Base class for defining wavelength-dependent objects.
@@ -389,6 +429,10 @@ class ChromaticObject(object):
             >>> integrator = galsim.ContinuousIntegrator(rule=galsim.integ.midptRule, N=100)
             >>> image = chromatic_obj.drawImage(bandpass, integrator=integrator)
 
+        There is also `galsim.integ.AdaptiveIntegrator`, which chooses the wavelengths at which
+        to evaluate the integrand according to how quickly the image changes with wavelength.
+        After drawing, `integrator.last_n_eval` gives the number of wavelengths that were used.
+
         Finally, this method uses a cache to avoid recomputing the integral over the product of
         the bandpass and object SED when possible (i.e., for separable profiles).  Because the
         cache size is finite, users may find that it is more efficient when drawing many images
@@ -2093,6 +2137,23 @@ class ChromaticConvolution(ChromaticObject):
     @staticmethod
     def _get_effective_prof(insep_obj, bandpass, iimult, integrator, gsparams):
         from .interpolatedimage import InterpolatedImage
+        from .image import Image
+        disk_key = None
+        if _disk_cache is not None:
+            disk_key = ChromaticConvolution._disk_cache_key(insep_obj, bandpass, iimult,
+                                                            integrator, gsparams)
+        if disk_key is not None:
+            arrays = _disk_cache.load(disk_key)
+            if arrays is not None:
+                _disk_cache_stats['hits'] += 1
+                xmin, ymin = arrays['origin']
+                effective_prof_image = Image(arrays['image'], xmin=int(xmin), ymin=int(ymin),
+                                             scale=float(arrays['scale']))
+                return InterpolatedImage(effective_prof_image, gsparams=gsparams,
+                                         _force_stepk=float(arrays['stepk']),
+                                         _force_maxk=float(arrays['maxk']))
+            _disk_cache_stats['misses'] += 1
+
         # Find scale at which to draw effective profile
         _, prof0 = insep_obj._fiducial_profile(bandpass)
         iiscale = prof0.nyquist_scale
@@ -2110,17 +2171,77 @@ class ChromaticConvolution(ChromaticObject):
                     bandpass, scale=iiscale, integrator=integrator,
                     method='no_pixel')
 
-        return InterpolatedImage(effective_prof_image, gsparams=gsparams)
+        effective_prof = InterpolatedImage(effective_prof_image, gsparams=gsparams)
+        if disk_key is not None:
+            b = effective_prof_image.bounds
+            _disk_cache.save(disk_key, image=effective_prof_image.array,
+                             origin=np.array([b.xmin, b.ymin]), scale=iiscale,
+                             stepk=effective_prof._stepk, maxk=effective_prof._maxk)
+        return effective_prof
 
     @staticmethod
-    def resize_effective_prof_cache(maxsize):
+    def _disk_cache_key(insep_obj, bandpass, iimult, integrator, gsparams):
+        """The key to use for an effective profile in the disk cache, or None if the inputs
+        are not fully specified by their reprs.
+        """
+        from ._version import __version__
+        items = [repr(insep_obj), repr(bandpass), repr(integrator)]
+        # Default reprs, functions, lambdas and long numpy arrays (which are summarized with ...)
+        # don't uniquely identify an object across processes, so don't risk using the wrong
+        # profile.
+        for item in items:
+            if ' at 0x' in item or '<lambda>' in item or '<locals>' in item or '...' in item:
+                return None
+        return DiskCache.key('galsim.ChromaticConvolution', __version__, iimult,
+                             GSParams.check(gsparams), *items)
+
+    @staticmethod
+    def _effective_prof_nbytes(prof):
+        # The padded real-space image, the Fourier-space image of about the same size that is
+        # made when it is drawn, and the original image.
+        return 2 * prof._xim.array.nbytes + prof._image.array.nbytes
+
+    @staticmethod
+    def resize_effective_prof_cache(maxsize, max_bytes=None):
         """ Resize the cache containing effective profiles, (i.e., wavelength-integrated products
         of separable profile SEDs, inseparable profiles, and Bandpasses), which are used by
         ChromaticConvolution.drawImage().
 
-        @param maxsize  The new number of effective profiles to cache.
+        The cache may be limited by the number of effective profiles, and also by the memory
+        they use.  The memory use of each profile is estimated from the size of its padded
+        image, so profiles drawn with a large `iimult` count for more than small ones.
+
+        @param maxsize      The new number of effective profiles to cache.
+        @param max_bytes    The maximum total memory in bytes to use for the cached profiles,
+                            or None for no limit besides `maxsize`.  [default: None]
         """
         ChromaticConvolution._effective_prof_cache.resize(maxsize)
+        ChromaticConvolution._effective_prof_cache.set_max_bytes(max_bytes)
+
+    @staticmethod
+    def clear_effective_prof_cache():
+        """ Clear the cache of effective profiles and reset its statistics.
+        See resize_effective_prof_cache for details.
+        """
+        ChromaticConvolution._effective_prof_cache.clear()
+        _disk_cache_stats['hits'] = 0
+        _disk_cache_stats['misses'] = 0
+
+    @staticmethod
+    def get_effective_prof_cache_stats():
+        """ Get statistics about the use of the cache of effective profiles.
+        See resize_effective_prof_cache for details.
+
+        @returns a dict with the number of `hits`, `misses` and `evictions`, the `hit_rate`,
+                 the current number of cached profiles (`size`), their estimated memory use in
+                 bytes (`nbytes`), the limits `maxsize` and `max_bytes`, and the numbers of
+                 misses that were found in the disk cache (`disk_hits`) or not (`disk_misses`).
+                 See set_disk_cache for details about the latter.
+        """
+        stats = ChromaticConvolution._effective_prof_cache.stats()
+        stats['disk_hits'] = _disk_cache_stats['hits']
+        stats['disk_misses'] = _disk_cache_stats['misses']
+        return stats
 
     def __eq__(self, other):
         return (isinstance(other, ChromaticConvolution) and
@@ -2323,7 +2444,8 @@ class ChromaticConvolution(ChromaticObject):
 
 
 ChromaticConvolution._effective_prof_cache = utilities.LRU_Cache(
-    ChromaticConvolution._get_effective_prof, maxsize=10)
+    ChromaticConvolution._get_effective_prof, maxsize=10,
+    sizeof=ChromaticConvolution._effective_prof_nbytes)
 
 
 class ChromaticDeconvolution(ChromaticObject):
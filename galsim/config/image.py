@@ -202,7 +202,8 @@ def SetupConfigImageSize(config, xsize, ysize, logger=None):
 # Ignore these when parsing the parameters for specific Image types:
 from .stamp import stamp_image_keys
 image_ignore = [ 'random_seed', 'noise', 'pixel_scale', 'wcs', 'sky_level', 'sky_level_pixel',
-                 'world_center', 'index_convention', 'nproc'] + stamp_image_keys
+                 'world_center', 'index_convention', 'nproc', 'shared_stamps'
+               ] + stamp_image_keys
 
 def BuildImage(config, image_num=0, obj_num=0, logger=None):
     """
@@ -300,7 +301,8 @@ def FlattenNoiseVariance(config, full_image, stamps, current_vars, logger):
 
     @param config           The configuration dict.
     @param full_image       The full image onto which the noise should be added.
-    @param stamps           A list of the individual postage stamps.
+    @param stamps           A list of the individual postage stamps.  These may also be just
+                            the bounds of each stamp, since that is all that is needed.
     @param current_vars     A list of the current variance in each postage stamps.
     @param logger           If given, a logger object to log progress.
 
@@ -319,7 +321,8 @@ def FlattenNoiseVariance(config, full_image, stamps, current_vars, logger):
         noise_image = galsim.ImageF(full_image.bounds)
         for k in range(nobjects):
             if stamps[k] is None: continue
-            b = stamps[k].bounds & full_image.bounds
+            b = stamps[k] if isinstance(stamps[k], galsim.BoundsI) else stamps[k].bounds
+            b = b & full_image.bounds
             if b.isDefined(): noise_image[b] += current_vars[k]
         # Update this, since overlapping postage stamps may have led to a larger
         # value in some pixels.
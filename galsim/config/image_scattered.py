@@ -48,7 +48,7 @@ class ScatteredImageBuilder(ImageBuilder):
 
         # These are allowed for Scattered, but we don't use them here.
         extra_ignore = [ 'image_pos', 'world_pos', 'stamp_size', 'stamp_xsize', 'stamp_ysize',
-                         'nobjects' ]
+                         'nobjects', 'region_size' ]
         opt = { 'size' : int , 'xsize' : int , 'ysize' : int }
         params = galsim.config.GetAllParams(config, base, opt=opt, ignore=ignore+extra_ignore)[0]
 
@@ -107,6 +107,15 @@ class ScatteredImageBuilder(ImageBuilder):
                 'y' : { 'type' : 'Random' , 'min' : ymin , 'max' : ymax }
             }
 
+        if 'region_size' in config:
+            region_size = galsim.config.ParseValue(config, 'region_size', base, int)[0]
+            regions = self.makeRegions(config, base, obj_num, region_size, logger)
+        else:
+            regions = None
+
+        if regions is not None:
+            return self.buildRegions(config, base, image_num, obj_num, regions, logger)
+
         stamps, current_vars = galsim.config.BuildStamps(
                 self.nobjects, base, logger=logger, obj_num=obj_num, do_noise=False)
 
@@ -135,6 +144,133 @@ class ScatteredImageBuilder(ImageBuilder):
 
         return full_image, current_var
 
+    def makeRegions(self, config, base, obj_num, region_size, logger):
+        """Assign the objects to square regions of the full image according to their positions.
+
+        This is used when image.region_size is given to build the image in parallel with each
+        process building all the objects in a region of the image.  The positions of the objects
+        are calculated here using a copy of the config dict, so the original is not modified.
+
+        @param config       The configuration dict for the image field.
+        @param base         The base configuration dict.
+        @param obj_num      The first object number in the image.
+        @param region_size  The size (in pixels) of the regions in each direction.
+        @param logger       If given, a logger object to log progress.
+
+        @returns a list of lists of the obj_nums in each non-empty region, or None if the
+                 regions are not going to be used.
+        """
+        if region_size <= 0:
+            raise galsim.GalSimConfigValueError("image.region_size must be > 0", region_size)
+        if 'nproc' in config:
+            nproc = galsim.config.ParseValue(config, 'nproc', base, int)[0]
+            nproc = galsim.config.UpdateNProc(nproc, self.nobjects, base, logger)
+        else:
+            nproc = 1
+        if nproc <= 1:
+            return None
+
+        full_bounds = base['current_image'].bounds
+        nx = (full_bounds.xmax - full_bounds.xmin) // region_size + 1
+        ny = (full_bounds.ymax - full_bounds.ymin) // region_size + 1
+        logger.debug('image %d: Assigning %d objects to %d x %d regions',
+                     base.get('image_num',0), self.nobjects, nx, ny)
+
+        pos_config = galsim.config.CopyConfig(base)
+        regions = {}
+        for k in range(self.nobjects):
+            galsim.config.SetupConfigObjNum(pos_config, obj_num+k, logger)
+            galsim.config.SetupConfigRNG(pos_config, seed_offset=1, logger=logger)
+            stamp = pos_config['stamp']
+            builder = galsim.config.valid_stamp_types[stamp['type']]
+            image_pos, world_pos = builder.setup(stamp, pos_config, 0, 0,
+                                                 galsim.config.stamp_ignore, logger)[2:]
+            if image_pos is None and world_pos is not None:
+                image_pos = pos_config['wcs'].toImage(world_pos)
+            if image_pos is None:
+                logger.info('image %d: Unable to determine the object positions, so not '
+                            'using regions.', base.get('image_num',0))
+                return None
+            # Objects off the edge go in the nearest region.  They will only contribute to the
+            # image if their stamps overlap it.
+            ix = min(max(int((image_pos.x - full_bounds.xmin) // region_size), 0), nx-1)
+            iy = min(max(int((image_pos.y - full_bounds.ymin) // region_size), 0), ny-1)
+            regions.setdefault( (iy,ix), [] ).append(obj_num+k)
+        return [ regions[key] for key in sorted(regions) ]
+
+    def buildRegions(self, config, base, image_num, obj_num, regions, logger):
+        """Build the image using a separate process for each region of the image.
+
+        Each process builds the stamps for all the objects in a region and adds them to its own
+        sub-image, which covers all of those stamps, including any parts that extend beyond the
+        region itself.  The main process then just adds these sub-images to the full image.
+
+        @param config       The configuration dict for the image field.
+        @param base         The base configuration dict.
+        @param image_num    The current image number.
+        @param obj_num      The first object number in the image.
+        @param regions      A list of lists of the obj_nums in each region.
+        @param logger       If given, a logger object to log progress.
+
+        @returns the final image and the current noise variance in the image as a tuple
+        """
+        full_image = base['current_image']
+        nproc = galsim.config.ParseValue(config, 'nproc', base, int)[0]
+        nproc = galsim.config.UpdateNProc(nproc, len(regions), base, logger)
+        if 'shared_stamps' in config:
+            shared = galsim.config.ParseValue(config, 'shared_stamps', base, bool)[0]
+        else:
+            shared = False
+
+        jobs = [ { 'obj_nums' : obj_nums } for obj_nums in regions ]
+        tasks = [ [ (job, k) ] for k, job in enumerate(jobs) ]
+
+        # Use the stamp costs if available to balance the regions among the processes.
+        stamp_jobs = [ { 'obj_num' : n, 'xsize' : 0, 'ysize' : 0 }
+                       for obj_nums in regions for n in obj_nums ]
+        stamp_costs = galsim.config.GetStampCosts(base, stamp_jobs, logger)
+        if stamp_costs is None:
+            costs = [ len(obj_nums) for obj_nums in regions ]
+        else:
+            stamp_costs = dict(zip([ job['obj_num'] for job in stamp_jobs ], stamp_costs))
+            costs = [ sum(stamp_costs[n] for n in obj_nums) for obj_nums in regions ]
+
+        def done_func(logger, proc, k, result, t):
+            if proc is None: s0 = ''
+            else: s0 = '%s: '%proc
+            logger.info(s0 + 'Region %d: %d objects, time = %f sec', k, len(regions[k]), t)
+
+        def except_func(logger, proc, k, e, tr):
+            if proc is None: s0 = ''
+            else: s0 = '%s: '%proc
+            logger.error(s0 + 'Exception caught when building region %d', k)
+            logger.debug('%s',tr)
+            logger.error('Aborting the rest of this image')
+
+        results = galsim.config.MultiProcess(nproc, base, BuildScatteredRegion, tasks, 'region',
+                                             logger, done_func = done_func,
+                                             except_func = except_func,
+                                             costs = costs,
+                                             shared_images = shared)
+
+        base['index_key'] = 'image_num'
+
+        # Put the stamp information back in obj_num order.
+        stamp_bounds = [ None ] * self.nobjects
+        current_vars = [ 0. ] * self.nobjects
+        for region_image, stamp_info in results:
+            if region_image is not None:
+                full_image[region_image.bounds] += region_image
+            for n, bounds, var in stamp_info:
+                stamp_bounds[n-obj_num] = bounds
+                current_vars[n-obj_num] = var
+
+        # Bring the image so far up to a flat noise variance
+        current_var = galsim.config.FlattenNoiseVariance(
+                base, full_image, stamp_bounds, current_vars, logger)
+
+        return full_image, current_var
+
     def makeTasks(self, config, base, jobs, logger):
         """Turn a list of jobs into a list of tasks.
 
@@ -190,6 +326,43 @@ class ScatteredImageBuilder(ImageBuilder):
         base['index_key'] = orig_index_key
         return nobj
 
+def BuildScatteredRegion(config, obj_nums, logger=None):
+    """Build the stamps for the objects in one region of a Scattered image and add them up.
+
+    @param config           A configuration dict.
+    @param obj_nums         A list of the obj_nums of the objects to build.
+    @param logger           If given, a logger object to log progress. [default: None]
+
+    @returns the tuple (image, stamp_info), where image covers all the stamps that overlap the
+             full image (or is None if there are none), and stamp_info is a list of tuples
+             (obj_num, bounds, current_var) for each object.  The bounds are None for objects
+             that were skipped.
+    """
+    logger = galsim.config.LoggerWrapper(logger)
+    full_bounds = config['current_image'].bounds
+    stamps = []
+    bounds = galsim.BoundsI()
+    for obj_num in obj_nums:
+        stamp, current_var = galsim.config.BuildStamp(config, obj_num, do_noise=False,
+                                                      logger=logger)
+        stamps.append( (obj_num, stamp, current_var) )
+        if stamp is not None:
+            bounds += stamp.bounds & full_bounds
+
+    if bounds.isDefined():
+        image = galsim.ImageF(bounds, wcs=config['current_image'].wcs)
+        for obj_num, stamp, current_var in stamps:
+            if stamp is None: continue
+            b = stamp.bounds & full_bounds
+            if b.isDefined():
+                image[b] += stamp[b]
+    else:
+        image = None
+
+    stamp_info = [ (obj_num, None if stamp is None else stamp.bounds, current_var)
+                   for obj_num, stamp, current_var in stamps ]
+    return image, stamp_info
+
 # Register this as a valid image type
 from .image import RegisterImageType
 RegisterImageType('Scattered', ScatteredImageBuilder())
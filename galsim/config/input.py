@@ -119,6 +119,7 @@ def ProcessInput(config, logger=None, file_scope_only=False, safe_only=False):
                 nfields = len(fields) if isinstance(fields, list) else 1
                 config['_input_objs'][key] = [ None for i in range(nfields) ]
                 config['_input_objs'][key+'_safe'] = [ None for i in range(nfields) ]
+                config['_input_objs'][key+'_version'] = [ 0 for i in range(nfields) ]
 
         # Read all input fields provided and create the corresponding object
         # with the parameters given in the config file.
@@ -170,7 +171,7 @@ def ProcessInput(config, logger=None, file_scope_only=False, safe_only=False):
                         continue
 
                     logger.debug('file %d: %s kwargs = %s',file_num,key,kwargs)
-                    if use_manager:
+                    if use_manager and loader.useProxy(field, config):
                         tag = key + str(i)
                         input_obj = getattr(config['_input_manager'],tag)(**kwargs)
                     else:
@@ -279,6 +280,30 @@ def SetupInputsForImage(config, logger=None):
                     field = fields[i]
                     input_obj = input_objs[i]
                     loader.setupImage(input_obj, field, config, logger)
+                    # Any loader with its own setupImage may have changed the object, so make
+                    # sure the processes in a WorkerPool get the new version.
+                    if type(loader).setupImage is not InputLoader.setupImage:
+                        SetInputChanged(config, input_obj)
+
+
+def SetInputChanged(base, input_obj):
+    """Mark an input object as having changed since it was built.
+
+    Input objects are only sent to the processes in a WorkerPool when they are new or have been
+    marked as changed.  This is done automatically after calling the setupImage function of any
+    InputLoader that defines one, but anything else that modifies an input object after it has
+    been built needs to call this function afterwards.
+
+    @param base         The base configuration dict.
+    @param input_obj    The input object that has changed.
+    """
+    input_objs = base.get('_input_objs', {})
+    for key in input_objs:
+        if key.endswith('_safe') or key.endswith('_version'): continue
+        for i, obj in enumerate(input_objs[key]):
+            if obj is input_obj:
+                versions = input_objs.setdefault(key+'_version', [0] * len(input_objs[key]))
+                versions[i] += 1
 
 
 # A helper function for getting the input object needed for generating a value or building
@@ -378,6 +403,22 @@ class InputLoader(object):
             safe = False
         return kwargs, safe
 
+    def useProxy(self, config, base):
+        """Whether to use a proxy object when the input object is used by multiple processes.
+
+        Normally, input objects are built once by an InputManager in the main process, and
+        other processes access it through a proxy.  However, if the input object is small
+        and is rebuilt for each file anyway, it can be more efficient to just copy it to each
+        process along with the rest of the config dict.  In this case, a subclass should
+        override this to return False.
+
+        @param config       The config dict for this input item
+        @param base         The base config dict
+
+        @returns whether to use a proxy (True in the base class)
+        """
+        return True
+
     def setupImage(self, input_obj, config, base, logger):
         """Do any necessary setup at the start of each image.
 
@@ -416,6 +457,55 @@ def RegisterInputConnectedType(input_type, type_name):
 # We define in this file two simple input types: catalog and dict, which read in a Catalog
 # or Dict from a file and then can use that to generate values.
 
+class CatalogLoader(InputLoader):
+    """A loader for the catalog input type.
+
+    In addition to the usual Catalog parameters, this allows an optional parameter, `stream`.
+    If `stream` is True, then each output file only reads the rows of the catalog for its own
+    objects.  i.e. Rows start_obj_num through start_obj_num + nobjects - 1, where nobjects is
+    the total number of objects in the file.  With the default index (the object number within
+    the file), this means object number obj_num uses row obj_num of the catalog, so a very large
+    catalog can be split among many output files without ever having all of it in memory.
+
+    The rows are read anew for each file, and since they are only what that file needs, they
+    are just copied to any processes that build the file's objects, rather than being accessed
+    through a proxy.  If you want to split the catalog among files this way, you should
+    set nobjects (or the equivalent for your image type) explicitly.  Otherwise each file
+    will use all the remaining rows in the catalog.
+    """
+    def getKwargs(self, config, base, logger):
+        """Parse the config dict and return the kwargs needed to build the Catalog object.
+
+        @param config       The configuration dict for 'catalog'
+        @param base         The base configuration dict
+        @param logger       If given, a logger object to log progress.
+
+        @returns kwargs, safe
+        """
+        req = galsim.Catalog._req_params
+        opt = galsim.Catalog._opt_params
+        single = galsim.Catalog._single_params
+        kwargs, safe = galsim.config.GetAllParams(config, base, req=req, opt=opt, single=single,
+                                                  ignore=['stream'])
+        if self.isStream(config, base):
+            # The rows for the current file.  Note: 'nobj' is only set once the number of
+            # objects in the file is known.  If this is called to figure that out (via
+            # ProcessInputNObjects), then we use all the rows from start_obj_num onward.
+            kwargs['first_row'] = kwargs.get('first_row',0) + base.get('start_obj_num',0)
+            if 'nobj' in base:
+                kwargs['nrows'] = sum(base['nobj'])
+            safe = False
+        return kwargs, safe
+
+    def isStream(self, config, base):
+        """Whether the catalog should only read the rows for the current file.
+        """
+        return 'stream' in config and galsim.config.ParseValue(config, 'stream', base, bool)[0]
+
+    def useProxy(self, config, base):
+        return not self.isStream(config, base)
+
+
 # Now define the value generators connected to the catalog and dict input types.
 def _GenerateFromCatalog(config, base, value_type):
     """@brief Return a value read from an input catalog
@@ -428,10 +518,10 @@ def _GenerateFromCatalog(config, base, value_type):
     galsim.config.SetDefaultIndex(config, input_cat.getNObjects())
 
     # Coding note: the and/or bit is equivalent to a C ternary operator:
-    #     input_cat.isFits() ? str : int
+    #     input_cat.hasNames() ? str : int
     # which of course doesn't exist in python.  This does the same thing (so long as the
     # middle item evaluates to true).
-    req = { 'col' : input_cat.isFits() and str or int , 'index' : int }
+    req = { 'col' : input_cat.hasNames() and str or int , 'index' : int }
     opt = { 'num' : int }
     kwargs, safe = galsim.config.GetAllParams(config, base, req=req, opt=opt)
     col = kwargs['col']
@@ -467,7 +557,7 @@ def _GenerateFromDict(config, base, value_type):
 # Register these as valid value types
 from .value import RegisterValueType
 RegisterValueType('Catalog', _GenerateFromCatalog, [ float, int, bool, str ], input_type='catalog')
-RegisterInputType('catalog', InputLoader(galsim.Catalog, has_nobj=True))
+RegisterInputType('catalog', CatalogLoader(galsim.Catalog, has_nobj=True))
 RegisterInputType('dict', InputLoader(galsim.Dict, file_scope=True))
 RegisterValueType('Dict', _GenerateFromDict, [ float, int, bool, str ], input_type='dict')
 # Note: Doing the above in different orders for catalog and dict is intentional.  It makes sure
@@ -142,10 +142,14 @@ def BuildFiles(nfiles, config, file_num=0, logger=None, except_abort=False):
     # Each task is a list of (job, k) tuples.  In this case, we only have one job per task.
     tasks = [ [ (job, k) ] for (k, job) in enumerate(jobs) ]
 
-    results = galsim.config.MultiProcess(nproc, orig_config, BuildFile, tasks, 'file',
-                                         logger, done_func = done_func,
-                                         except_func = except_func,
-                                         except_abort = except_abort)
+    try:
+        results = galsim.config.MultiProcess(nproc, orig_config, BuildFile, tasks, 'file',
+                                             logger, done_func = done_func,
+                                             except_func = except_func,
+                                             except_abort = except_abort)
+    finally:
+        # Any worker pool used for the files, images or stamps is no longer needed.
+        galsim.config.CloseWorkerPool(orig_config)
     t2 = time.time()
 
     if not results:  # pragma: no cover
@@ -315,6 +319,7 @@ def SetupConfigFileNum(config, file_num, image_num, obj_num, logger=None):
     - Set config['index_key'] = 'file_num'
     - Set config['start_image_num'] = image_num
     - Set config['start_obj_num'] = obj_num
+    - Remove config['nobj'] if it is present from the previous file
     - Make sure config['output'] exists
     - Set default config['output']['type'] to 'Fits' if not specified
     - Check that the specified output type is valid.
@@ -333,6 +338,7 @@ def SetupConfigFileNum(config, file_num, image_num, obj_num, logger=None):
     config['image_num'] = image_num
     config['obj_num'] = obj_num
     config['index_key'] = 'file_num'
+    config.pop('nobj', None)
 
     if 'output' not in config:
         config['output'] = {}
@@ -257,8 +257,9 @@ def CopyConfig(config):
     import copy
     config1 = copy.copy(config)
 
-    # Make sure the input_manager isn't in the copy
+    # Make sure the input_manager and worker pool aren't in the copy
     config1.pop('_input_manager',None)
+    config1.pop('_worker_pool',None)
 
     # Now deepcopy all the regular config fields to make sure things like current don't
     # get clobbered by two processes writing to the same dict.  Also the rngs.
@@ -268,13 +269,16 @@ def CopyConfig(config):
 
     return config1
 
-def GetLoggerProxy(logger):
-    """Make a proxy for the given logger that can be passed into multiprocessing Processes
-    and used safely.
+def _StartLoggerManager(logger):
+    """Start a manager process for the given logger and make a proxy for it.
+
+    The manager process stops when the manager is garbage collected (or shut down), after which
+    the proxy can no longer be used.  So the caller needs to keep a reference to one of them for
+    as long as any processes might use the proxy.
 
     @param logger       The logger to make a copy of
 
-    @returns a proxy for the given logger
+    @returns the tuple (logger_manager, logger_proxy), which are both None if logger is None.
     """
     from multiprocessing.managers import BaseManager
     if logger:
@@ -285,8 +289,22 @@ def GetLoggerProxy(logger):
         logger_manager.start()
         logger_proxy = logger_manager.logger()
     else:
+        logger_manager = None
         logger_proxy = None
-    return logger_proxy
+    return logger_manager, logger_proxy
+
+def GetLoggerProxy(logger):
+    """Make a proxy for the given logger that can be passed into multiprocessing Processes
+    and used safely.
+
+    Note: The proxy keeps the manager process that serves it alive, so you need to keep a
+    reference to the returned proxy for as long as other processes might use it.
+
+    @param logger       The logger to make a copy of
+
+    @returns a proxy for the given logger
+    """
+    return _StartLoggerManager(logger)[1]
 
 class LoggerWrapper(object):
     """A wrap around a Logger object that checks whether a debug or info or warn call will
@@ -770,8 +788,657 @@ def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=F
                              except_abort=except_abort)
 
 
+# These config keys hold objects that only make sense in the root process (or are not picklable),
+# so they are never sent to the processes in a WorkerPool.
+pool_ignore_keys = [ '_input_manager', 'output_manager', '_worker_pool' ]
+
+def _StripCaches(config):
+    # Remove the values that config processing caches in the fields of the config dict, so the
+    # rest can be sent to the workers.  Leading-underscore items (e.g. the compiled _fn of an
+    # Eval or the _gen_fn of a user-defined type) are often not picklable, and the per-object
+    # current values are no use to any other object.  The current values for the image and file
+    # are kept, since the workers can't always regenerate them (e.g. from an rng).
+    if isinstance(config, dict):
+        return dict( (k, _StripCaches(v)) for k,v in config.items()
+                     if not str(k).startswith('_') and
+                        not (k == 'current' and isinstance(v, tuple) and len(v) == 5 and
+                             v[4] in ('obj_num', 'obj_num_in_file')) )
+    elif isinstance(config, list):
+        return [ _StripCaches(item) for item in config ]
+    else:
+        return config
+
+def _WorkerConfig(config):
+    """Make the version of the config dict to send to the processes in a WorkerPool.
+
+    This leaves out anything in pool_ignore_keys and the values cached in the fields of the
+    config dict (see _StripCaches).  The current image is replaced by one with the same bounds
+    and wcs, but no pixels, since the workers only ever need its bounds and wcs.
+
+    @param config       The configuration dict.
+
+    @returns a new dict to pickle for the workers.
+    """
+    import numpy as np
+    c = {}
+    for key, value in config.items():
+        if key in pool_ignore_keys:
+            continue
+        elif key[0] == '_':
+            # The leading-underscore items at the top level are data, not caches.
+            c[key] = value
+        else:
+            c[key] = _StripCaches(value)
+    image = config.get('current_image', None)
+    if isinstance(image, galsim.Image):
+        blank = galsim._Image(np.empty((0,0), dtype=image.dtype), image.bounds, image.wcs)
+        c['current_image'] = blank
+        if config.get('current_noise_image', None) is image:
+            c['current_noise_image'] = blank
+    return c
+
+class _ConfigCache(object):
+    """Keep track of the version of the config dict that the processes in a WorkerPool have.
+
+    The root process calls makeUpdate(config) each time the pool is about to start a new batch
+    of tasks.  Each worker process calls applyUpdate(update) with the result to get its own copy
+    of the config dict.
+
+    The input objects in config['_input_objs'] (e.g. a RealGalaxyCatalog or a PowerSpectrum) are
+    pickled separately from the rest of the config dict and only sent to the workers when they
+    are new or have changed.  The rest of the dict refers to them by a token, so the workers keep
+    using the copies they already have, along with anything those objects have loaded or cached
+    since.  The rest of the config dict (without the values cached in it, see _WorkerConfig) is
+    only sent if it differs from what the workers already have.
+
+    Input objects are tracked by identity along with their version number in
+    config['_input_objs'][key+'_version'], which is incremented (by SetInputChanged) whenever an
+    object may have been modified after it was built, including after every call to the
+    setupImage function of its InputLoader, if it has one.  So only new or changed input
+    objects need to be pickled.
+    """
+    def __init__(self):
+        self.objs = {}      # token -> input object (in the workers)
+        self.sent = {}      # id(obj) -> (obj, version, token) of the objects sent (in the root)
+        self.ntokens = 0    # The number of tokens made so far (in the root process)
+        self.digest = None  # The digest of the last config pickle sent (in the root process)
+        self.config = None  # The last config pickle received (in the workers)
+
+    def _tokenize(self, config):
+        import pickle
+        tokens = {}
+        new_objs = {}
+        sent = {}
+        input_objs = config.get('_input_objs', {})
+        for key in input_objs:
+            if key.endswith('_safe') or key.endswith('_version'): continue
+            versions = input_objs.get(key+'_version', [0] * len(input_objs[key]))
+            for i, obj in enumerate(input_objs[key]):
+                if obj is None or id(obj) in tokens: continue
+                version = versions[i]
+                entry = self.sent.get(id(obj), None)
+                if entry is not None and entry[0] is obj and entry[1] == version:
+                    token = entry[2]
+                else:
+                    token = '%s%d:%d'%(key, i, self.ntokens)
+                    self.ntokens += 1
+                    new_objs[token] = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+                tokens[id(obj)] = token
+                sent[id(obj)] = (obj, version, token)
+        self.sent = sent
+        return tokens, new_objs
+
+    def makeUpdate(self, config):
+        """Make the update to send to the worker processes for the given config dict.
+
+        @param config       The configuration dict to be used by the workers.
+
+        @returns the update object to pass to applyUpdate in each worker.
+        """
+        import pickle, hashlib, io
+        tokens, new_objs = self._tokenize(config)
+
+        class TokenPickler(pickle.Pickler):
+            def persistent_id(self, obj):
+                return tokens.get(id(obj), None)
+
+        f = io.BytesIO()
+        TokenPickler(f, pickle.HIGHEST_PROTOCOL).dump(_WorkerConfig(config))
+        s = f.getvalue()
+        digest = hashlib.sha1(s).digest()
+        if digest == self.digest:
+            # Then the workers already have this.  They just need to reload their copy.
+            s = None
+        self.digest = digest
+        live = list(tokens.values())
+        return new_objs, live, s
+
+    def applyUpdate(self, update):
+        """Apply an update made by makeUpdate and return a fresh copy of the config dict.
+
+        @param update       The return value from makeUpdate in the root process.
+
+        @returns the config dict to use for the next tasks.
+        """
+        import pickle, io
+        new_objs, live, s = update
+        for token in new_objs:
+            self.objs[token] = pickle.loads(new_objs[token])
+        for token in list(self.objs.keys()):
+            if token not in live:
+                del self.objs[token]
+        if s is not None:
+            self.config = s
+        objs = self.objs
+
+        class TokenUnpickler(pickle.Unpickler):
+            def persistent_load(self, token):
+                return objs[token]
+
+        # Always make a new copy, so any changes made while running the previous tasks don't
+        # leak into the next ones.
+        return TokenUnpickler(io.BytesIO(self.config)).load()
+
+
+class SharedImageRef(object):
+    """A reference to an image that a worker process has written into its _StampArena.
+
+    This is what gets sent back to the main process in place of the image itself.  Call
+    load(open_func) to get an Image that views the shared memory without copying it.
+    """
+    def __init__(self, file_name, offset, shape, dtype, bounds, wcs):
+        self.file_name = file_name
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+        self.bounds = bounds
+        self.wcs = wcs
+
+    def load(self, open_func):
+        """Return an Image that views the shared memory.
+
+        @param open_func    A function that returns the memory map for a given file name.
+        """
+        import numpy as np
+        buf = open_func(self.file_name)
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=buf, offset=self.offset)
+        return galsim._Image(array, self.bounds, self.wcs)
+
+
+class _StampArena(object):
+    """Shared memory where a worker process in a WorkerPool can write the images it builds.
+
+    The memory is a set of memory-mapped files in a directory owned by the WorkerPool.  Each
+    worker appends images to its own files, and the space is reused for each new batch of tasks,
+    so the main process must be done with the images from one batch before starting the next.
+    """
+    segment_size = 64 * 1024**2
+
+    def __init__(self, dir_name, proc):
+        self.dir_name = dir_name
+        self.proc = proc
+        self.segments = []
+        self.reset()
+
+    def reset(self):
+        """Start writing again at the beginning of the arena.
+        """
+        self.iseg = 0
+        self.offset = 0
+
+    def _alloc(self, nbytes):
+        import numpy as np
+        nbytes = (nbytes + 15) // 16 * 16  # Keep each array 16-byte aligned.
+        while True:
+            if self.iseg < len(self.segments):
+                file_name, buf = self.segments[self.iseg]
+                if self.offset + nbytes <= len(buf):
+                    offset = self.offset
+                    self.offset += nbytes
+                    return file_name, buf, offset
+                self.iseg += 1
+                self.offset = 0
+            else:
+                file_name = os.path.join(self.dir_name, '%s_%d'%(self.proc, len(self.segments)))
+                size = max(self.segment_size, nbytes)
+                buf = np.memmap(file_name, dtype=np.uint8, mode='w+', shape=(size,))
+                self.segments.append( (file_name, buf) )
+
+    def share(self, result):
+        """Copy any images in a result into the arena and replace them with SharedImageRefs.
+
+        @param result       The result of a job.  Either an Image or a tuple that may include
+                            some Images.
+
+        @returns the equivalent result to send back to the main process.
+        """
+        import numpy as np
+        if isinstance(result, galsim.Image):
+            array = result.array
+            file_name, buf, offset = self._alloc(array.nbytes)
+            dest = np.ndarray(array.shape, dtype=array.dtype, buffer=buf, offset=offset)
+            dest[:,:] = array
+            return SharedImageRef(file_name, offset, array.shape, array.dtype,
+                                  result.bounds, result.wcs)
+        elif isinstance(result, tuple):
+            return tuple(self.share(r) for r in result)
+        else:
+            return result
+
+
+def _GetChunk(j, task_queues, poll_time=0.1):
+    """Get the next chunk of tasks for worker j.
+
+    If there is nothing left in this worker's own queue, try to steal a chunk from one of the
+    other workers' queues.  If there is nothing to steal either, wait a little while for
+    something to show up in our own queue, and then try again.
+
+    @returns the tuple (chunk, stolen)
+    """
+    try:
+        from queue import Empty
+    except ImportError:
+        from Queue import Empty
+    n = len(task_queues)
+    while True:
+        try:
+            return task_queues[j].get_nowait(), False
+        except Empty:
+            pass
+        for i in range(1,n):
+            q = task_queues[(j+i)%n]
+            try:
+                chunk = q.get_nowait()
+            except Empty:
+                continue
+            if chunk == 'STOP':
+                # This STOP was meant for that worker, so put it back.
+                q.put(chunk)
+                continue
+            return chunk, True
+        try:
+            return task_queues[j].get(timeout=poll_time), False
+        except Empty:
+            pass
+
+
+def _PoolWorker(j, task_queues, update_queue, results_queue, arena_dir, logger, profile):
+    """The function that runs in each process of a WorkerPool.
+
+    It pulls chunks of tasks off its task queue (or steals them from the other workers' queues
+    if its own is empty), runs them, and puts the results onto the results_queue to send them
+    back to the main process.  Each chunk is tagged with the generation of the config dict it
+    needs, and new generations are read from this process's update_queue as needed.  If the
+    chunk is marked as shared, any images in the results are written to this process's
+    _StampArena in arena_dir, rather than being sent through the results_queue.  See
+    WorkerPool for more details.
+    """
+    import time
+    import traceback
+    from multiprocessing import current_process
+    proc = current_process().name
+
+    # The logger object passed in here is a proxy object.  This means that all the arguments
+    # to any logging commands are passed through the pipe to the real Logger object on the
+    # other end of the pipe.  This tends to produce a lot of unnecessary communication, since
+    # most of those commands don't actually produce any output (e.g. logger.debug(..) commands
+    # when the logging level is not DEBUG).  So it is helpful to wrap this object in a
+    # LoggerWrapper that checks whether it is worth sending the arguments back to the original
+    # Logger before calling the functions.
+    logger = LoggerWrapper(logger)
+
+    if profile:
+        import cProfile, pstats, io
+        pr = cProfile.Profile()
+        pr.enable()
+    else:
+        pr = None
+
+    cache = _ConfigCache()
+    arena = _StampArena(arena_dir, proc)
+    gen = 0
+    config = None
+
+    while True:
+        chunk, stolen = _GetChunk(j, task_queues)
+        if chunk == 'STOP': break
+        job_func, item, task, task_gen, shared = chunk
+        try:
+            while gen < task_gen:
+                gen, update = update_queue.get()
+                config = None
+                config = cache.applyUpdate(update)
+                arena.reset()
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            # Then none of the jobs can be run.  Report the failure for each one, so the main
+            # process isn't left waiting for them.
+            tr = traceback.format_exc()
+            for kwargs, k in task:
+                results_queue.put( (e, k, tr, proc) )
+            logger.debug('%s: Caught exception: %s\n%s',proc,str(e),tr)
+            continue
+        logger.debug('%s: Received %sjob to do %d %ss, starting with %s',
+                     proc,'stolen ' if stolen else '',len(task),item,task[0][1])
+        # Each job gets its own result, even if it fails, since the main process is waiting for
+        # one result per job.
+        for kwargs, k in task:
+            try:
+                t1 = time.time()
+                kwargs['config'] = config
+                kwargs['logger'] = logger
+                result = job_func(**kwargs)
+                if shared:
+                    result = arena.share(result)
+                t2 = time.time()
+                results_queue.put( (result, k, t2-t1, proc) )
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                tr = traceback.format_exc()
+                # Send the result first, so the main process hears about it even if the logging
+                # fails too.
+                results_queue.put( (e, k, tr, proc) )
+                logger.debug('%s: Caught exception: %s\n%s',proc,str(e),tr)
+    logger.debug('%s: Received STOP', proc)
+    if pr is not None:
+        pr.disable()
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+        s = StringIO()
+        sortby = 'time'  # Note: This is now called tottime, but time seems to be a valid
+                         # alias for this that is backwards compatible to older versions
+                         # of pstats.
+        ps = pstats.Stats(pr, stream=s).sort_stats(sortby).reverse_order()
+        ps.print_stats()
+        logger.error("*** Start profile for %s ***\n%s\n*** End profile for %s ***",
+                     proc,s.getvalue(),proc)
+
+
+def _MakeChunks(tasks, costs, nproc):
+    """Group a list of tasks into chunks to be sent to the workers in a WorkerPool.
+
+    The tasks are ordered by decreasing cost, so the most expensive ones are started first and
+    the cheap ones are available to fill in at the end.  The chunk size is chosen so that each
+    chunk costs about 1/(4 nproc) of the remaining work (but is at least one task).  So the
+    expensive tasks at the start end up in small chunks, and the cheap ones at the end are
+    grouped into larger chunks to save on the communication overhead.
+
+    @param tasks        A list of tasks, each of which is a list of jobs (kwargs, k).
+    @param costs        A list of the estimated cost of each job, indexed by k, or None.
+    @param nproc        The number of processes.
+
+    @returns a list of tuples (chunk, cost), where each chunk is the list of all the jobs
+             in the tasks that make up that chunk.
+    """
+    if costs is None:
+        task_costs = [ float(len(task)) for task in tasks ]
+    else:
+        task_costs = [ float(sum(costs[k] for kwargs, k in task)) for task in tasks ]
+    # Note: sorted is stable, so equal cost tasks stay in their original order.
+    order = sorted(range(len(tasks)), key=lambda i: -task_costs[i])
+
+    remaining = sum(task_costs)
+    chunks = []
+    chunk = []
+    chunk_cost = 0.
+    target = remaining / (4*nproc)
+    for i in order:
+        chunk += tasks[i]
+        chunk_cost += task_costs[i]
+        if chunk_cost >= target:
+            chunks.append( (chunk, chunk_cost) )
+            remaining -= chunk_cost
+            target = remaining / (4*nproc)
+            chunk = []
+            chunk_cost = 0.
+    if chunk:
+        chunks.append( (chunk, chunk_cost) )
+    return chunks
+
+
+class WorkerPool(object):
+    """A set of worker processes that persists across multiple calls to MultiProcess.
+
+    Starting new processes for every call to MultiProcess means paying the cost of starting
+    the processes, sending them the config dict, and having them connect to (or load) the input
+    objects again each time BuildImages or BuildStamps is called.  For a typical run with
+    image.nproc > 1, that is once per image.  Instead, MultiProcess uses a WorkerPool that is
+    stored in config['_worker_pool'] and reused for all subsequent calls using the same config
+    dict.  It is shut down at the end of BuildFiles, or when the config dict is deleted.
+
+    Before each batch of tasks, the root process sends each worker an update of the config dict.
+    The input objects are only sent when they change, and the rest of the dict is only sent when
+    it differs from the previous batch.  See _ConfigCache for details.
+
+    The tasks are sent to the workers in chunks, ordered by their estimated cost.  Each worker
+    has its own queue of chunks, and once that is empty, it steals chunks from the other workers'
+    queues.  See addTasks for details.
+
+    If the tasks are added with shared_images=True, the workers write any images they build into
+    memory-mapped files in a temporary directory owned by the pool (see _StampArena), and only
+    send back references to them, which getResult turns into Images that view the same memory.
+    These images are only valid until the next batch of tasks starts.
+
+    @param nproc            How many processes to start.
+    @param logger           If given, a logger object to log progress. [default: None]
+    @param profile          Whether to profile each worker process and output the results
+                            when the pool is closed. [default: False]
+    """
+    # How often (in seconds) getResult checks whether the workers are still alive.
+    poll_time = 1.
+
+    def __init__(self, nproc, logger=None, profile=False):
+        from multiprocessing import Process, Queue
+        import tempfile
+        self.nproc = nproc
+        self.logger = LoggerWrapper(logger).logger
+        self.pid = os.getpid()
+        self.gen = 0
+        self._cache = _ConfigCache()
+        self._arena_maps = {}
+
+        # Use a RAM-backed file system for the shared images if possible.
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        self.arena_dir = tempfile.mkdtemp(prefix='galsim_arena_', dir=shm_dir)
+
+        # The logger is not picklable, so we need to make a proxy for it so all the
+        # processes can emit logging information safely.  Keep the manager and our proxy for
+        # the life of the pool, since the workers can't log anything once either one is gone.
+        self.logger_manager, self.logger_proxy = _StartLoggerManager(self.logger)
+
+        self.task_queues = [ Queue() for j in range(nproc) ]
+        self.results_queue = Queue()
+        self.update_queues = [ Queue() for j in range(nproc) ]
+        self.processes = []
+        for j in range(nproc):
+            # We name the processes explicitly, so the logging output is always Process-1 ...
+            # Process-nproc, rather than continuing to increment the numbers each time a new
+            # pool is started.
+            p = Process(target=_PoolWorker,
+                        args=(j, self.task_queues, self.update_queues[j], self.results_queue,
+                              self.arena_dir, self.logger_proxy, profile),
+                        name='Process-%d'%(j+1))
+            # The pool may still be around when the main process finishes, so make sure the
+            # workers don't keep the program running.
+            p.daemon = True
+            p.start()
+            self.processes.append(p)
+
+    def setConfig(self, config):
+        """Send the current config dict to the workers.  Tasks added after this will use it.
+        """
+        self.gen += 1
+        self.load = [ 0. for j in range(self.nproc) ]
+        update = self._cache.makeUpdate(config)
+        for q in self.update_queues:
+            q.put( (self.gen, update) )
+
+    def addTasks(self, job_func, item, tasks, costs=None, shared_images=False):
+        """Add a list of tasks to be run by the workers.
+
+        The tasks are sorted by their estimated cost, most expensive first, and grouped into
+        chunks, whose size decreases as the remaining work gets smaller.  Each chunk is assigned
+        to the worker with the least total cost assigned so far.  Workers that run out of work
+        steal chunks from the other workers' queues.
+
+        @param job_func     The function to run for each job in the tasks.
+        @param item         A string indicating what is being worked on.
+        @param tasks        A list of tasks, each of which is a list of jobs (kwargs, k).
+        @param costs        If given, a list of the estimated cost of each job, indexed by k.
+                            [default: None, which means all jobs are assumed to cost the same.]
+        @param shared_images  Whether to return the images in the results via shared memory.
+                            [default: False]
+        """
+        for chunk, cost in _MakeChunks(tasks, costs, self.nproc):
+            j = self.load.index(min(self.load))
+            self.load[j] += cost
+            self.task_queues[j].put( (job_func, item, chunk, self.gen, shared_images) )
+
+    def getResult(self):
+        """Get the next result from the workers as a tuple (result, k, t, proc).
+
+        If any of the worker processes has died (rather than raising an exception, which is
+        returned as the result), then no more results may be coming, so this raises a
+        GalSimError rather than waiting forever.
+        """
+        try:
+            from queue import Empty
+        except ImportError:
+            from Queue import Empty
+        while True:
+            try:
+                res, k, t, proc = self.results_queue.get(timeout=self.poll_time)
+            except Empty:
+                dead = [ p for p in self.processes if not p.is_alive() ]
+                if dead:
+                    raise galsim.GalSimError(
+                        "WorkerPool process %s died unexpectedly with exit code %s"%(
+                        dead[0].name, dead[0].exitcode))
+            else:
+                return self._loadShared(res), k, t, proc
+
+    def _openArena(self, file_name):
+        import numpy as np
+        if file_name not in self._arena_maps:
+            self._arena_maps[file_name] = np.memmap(file_name, dtype=np.uint8, mode='r+')
+        return self._arena_maps[file_name]
+
+    def _loadShared(self, res):
+        if isinstance(res, SharedImageRef):
+            return res.load(self._openArena)
+        elif isinstance(res, tuple):
+            return tuple(self._loadShared(r) for r in res)
+        else:
+            return res
+
+    def _removeArena(self):
+        import shutil
+        self._arena_maps = {}
+        shutil.rmtree(self.arena_dir, ignore_errors=True)
+
+    def close(self):
+        """Stop the worker processes once they have finished all queued tasks.
+        """
+        # Once you are done with the processes, putting nproc 'STOP's will stop them all.
+        for q in self.task_queues:
+            q.put('STOP')
+        for p in self.processes:
+            p.join()
+        for q in self.task_queues:
+            q.close()
+        self.processes = []
+        self._removeArena()
+        self._stopLogger()
+
+    def terminate(self):
+        """Stop the worker processes immediately, discarding any unfinished tasks.
+        """
+        for p in self.processes:
+            p.terminate()
+        for p in self.processes:
+            p.join()
+        self.processes = []
+        self._removeArena()
+        self._stopLogger()
+
+    def _stopLogger(self):
+        if self.logger_manager is not None:
+            self.logger_proxy = None
+            self.logger_manager.shutdown()
+            self.logger_manager = None
+
+    def __del__(self):
+        # Only the process that started the workers can stop them.
+        if getattr(self, 'pid', None) == os.getpid() and self.processes:
+            self.terminate()
+
+
+def GetWorkerPool(nproc, config, logger=None):
+    """Get a WorkerPool with at least nproc processes to use for the given config dict.
+
+    If config already has a suitable pool, it is reused.  Otherwise a new one is started and
+    stored in config['_worker_pool'].
+
+    @param nproc            How many processes are needed.
+    @param config           The configuration dict.
+    @param logger           If given, a logger object to log progress. [default: None]
+
+    @returns the WorkerPool
+    """
+    logger = LoggerWrapper(logger)
+    pool = config.get('_worker_pool', None)
+    if pool is not None and (pool.nproc < nproc or pool.logger is not logger.logger):
+        logger.debug("Existing pool of %d processes is not suitable.  Starting a new one.",
+                     pool.nproc)
+        CloseWorkerPool(config)
+        pool = None
+    if pool is None:
+        profile = config.get('profile', False)
+        if profile:
+            logger.info("Starting separate profiling for each of the %d processes.",nproc)
+        pool = WorkerPool(nproc, logger, profile)
+        config['_worker_pool'] = pool
+    return pool
+
+
+def CloseWorkerPool(config, terminate=False):
+    """Shut down the WorkerPool stored in the config dict, if any.
+
+    @param config           The configuration dict.
+    @param terminate        Whether to stop the processes immediately, rather than letting them
+                            finish any queued tasks. [default: False]
+    """
+    pool = config.pop('_worker_pool', None)
+    if pool is not None:
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+
+
+def ReportUtilization(busy, t, item, logger):
+    """Report how busy each process was while running a batch of tasks in MultiProcess.
+
+    @param busy             A dict mapping each process name to a tuple (n, t_busy) with the
+                            number of jobs it finished and the total time spent on them.
+    @param t                The total elapsed time.
+    @param item             A string indicating what is being worked on.
+    @param logger           A logger object to log the results.
+    """
+    if not logger.isEnabledFor(logging.INFO) or t <= 0.: return
+    for proc in sorted(busy):
+        n, t_busy = busy[proc]
+        logger.info('%s: %d %ss, busy for %f sec (%.1f%%)', proc, n, item, t_busy,
+                    100. * t_busy / t)
+
+
 def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
-                 done_func=None, except_func=None, except_abort=True):
+                 done_func=None, except_func=None, except_abort=True, costs=None,
+                 shared_images=False):
     """A helper function for performing a task using multiprocessing.
 
     A note about the nomenclature here.  We use the term "job" to mean the job of building a single
@@ -785,6 +1452,11 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
     Each job is a tuple consisting of (kwargs, k), where kwargs is the dict of kwargs to pass to
     the job_func and k is the index of this job in the full list of jobs.
 
+    When nproc > 1, the jobs are run by a WorkerPool, which is kept in the config dict and
+    reused for any later calls to MultiProcess with the same config dict.  The tasks are
+    scheduled according to the (optional) estimated cost of each job, and the fraction of the
+    time each process spent working is reported at the end.
+
     @param nproc            How many processes to use.
     @param config           The configuration dict.
     @param job_func         The function to run for each job.  It will be called as
@@ -805,120 +1477,46 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
     @param except_abort     Whether an exception should abort the rest of the processing.
                             If False, then the returned results list will not include anything
                             for the jobs that failed.  [default: True]
+    @param costs            If given, a list of the estimated relative cost of each job, indexed
+                            by k, which is used to help balance the load among the processes.
+                            [default: None, which means to treat all jobs as equally costly.]
+    @param shared_images    Whether the worker processes should return any images in their
+                            results via shared memory rather than pickling them.  If True, these
+                            images are only valid until the next call to MultiProcess with the
+                            same config dict, so the caller needs to be done with them by then.
+                            This is only relevant when nproc > 1. [default: False]
 
     @returns a list of the outputs from job_func for each job
     """
     import time
     import traceback
 
-    # The worker function will be run once in each process.
-    # It pulls tasks off the task_queue, runs them, and puts the results onto the results_queue
-    # to send them back to the main process.
-    # The *tasks* can be made up of more than one *job*.  Each job involves calling job_func
-    # with the kwargs from the list of jobs.
-    # Each job also carries with it its index in the original list of all jobs.
-    def worker(task_queue, results_queue, config, logger):
-        proc = current_process().name
-
-        # The logger object passed in here is a proxy object.  This means that all the arguments
-        # to any logging commands are passed through the pipe to the real Logger object on the
-        # other end of the pipe.  This tends to produce a lot of unnecessary communication, since
-        # most of those commands don't actually produce any output (e.g. logger.debug(..) commands
-        # when the logging level is not DEBUG).  So it is helpful to wrap this object in a
-        # LoggerWrapper that checks whether it is worth sending the arguments back to the original
-        # Logger before calling the functions.
-        logger = LoggerWrapper(logger)
-
-        if 'profile' in config and config['profile']:
-            import cProfile, pstats, io
-            pr = cProfile.Profile()
-            pr.enable()
-        else:
-            pr = None
-
-        for task in iter(task_queue.get, 'STOP'):
-            try :
-                logger.debug('%s: Received job to do %d %ss, starting with %s',
-                             proc,len(task),item,task[0][1])
-                for kwargs, k in task:
-                    t1 = time.time()
-                    kwargs['config'] = config
-                    kwargs['logger'] = logger
-                    result = job_func(**kwargs)
-                    t2 = time.time()
-                    results_queue.put( (result, k, t2-t1, proc) )
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                tr = traceback.format_exc()
-                logger.debug('%s: Caught exception: %s\n%s',proc,str(e),tr)
-                results_queue.put( (e, k, tr, proc) )
-        logger.debug('%s: Received STOP', proc)
-        if pr is not None:
-            pr.disable()
-            try:
-                from StringIO import StringIO
-            except ImportError:
-                from io import StringIO
-            s = StringIO()
-            sortby = 'time'  # Note: This is now called tottime, but time seems to be a valid
-                             # alias for this that is backwards compatible to older versions
-                             # of pstats.
-            ps = pstats.Stats(pr, stream=s).sort_stats(sortby).reverse_order()
-            ps.print_stats()
-            logger.error("*** Start profile for %s ***\n%s\n*** End profile for %s ***",
-                         proc,s.getvalue(),proc)
-
     njobs = sum([len(task) for task in tasks])
 
     if nproc > 1:
         logger.warning("Using %d processes for %s processing",nproc,item)
 
-        from multiprocessing import Process, Queue, current_process
-        from multiprocessing.managers import BaseManager
-
-        # Send the tasks to the task_queue.
-        task_queue = Queue()
-        for task in tasks:
-            task_queue.put(task)
-
         # Temporarily mark that we are multiprocessing, so we know not to start another
         # round of multiprocessing later.
         config['current_nproc'] = nproc
 
-        if 'profile' in config and config['profile']:
-            logger.info("Starting separate profiling for each of the %d processes.",nproc)
-
-        # The logger is not picklable, so we need to make a proxy for it so all the
-        # processes can emit logging information safely.
-        logger_proxy = GetLoggerProxy(logger)
-
-        # Run the tasks.
-        # Each Process command starts up a parallel process that will keep checking the queue
-        # for a new task. If there is one there, it grabs it and does it. If not, it waits
-        # until there is one to grab. When it finds a 'STOP', it shuts down.
-        results_queue = Queue()
-        p_list = []
-        for j in range(nproc):
-            # The process name is actually the default name that Process would generate on its
-            # own for the first time we do this. But after that, if we start another round of
-            # multiprocessing, then it just keeps incrementing the numbers, rather than starting
-            # over at Process-1.  As far as I can tell, it's not actually spawning more
-            # processes, so for the sake of the logging output, we name the processes explicitly.
-            p = Process(target=worker, args=(task_queue, results_queue, config, logger_proxy),
-                        name='Process-%d'%(j+1))
-            p.start()
-            p_list.append(p)
-
         raise_error = None
 
         try:
+            # Each worker process keeps checking the queue for a new task. If there is one there,
+            # it grabs it and does it. If not, it waits until there is one to grab.
+            t1 = time.time()
+            pool = GetWorkerPool(nproc, config, logger)
+            pool.setConfig(config)
+            pool.addTasks(job_func, item, tasks, costs, shared_images)
+            busy = {}
+
             # In the meanwhile, the main process keeps going.  We pull each set of images off of the
             # results_queue and put them in the appropriate place in the lists.
             # This loop is happening while the other processes are still working on their tasks.
             results = [ None for k in range(njobs) ]
             for kk in range(njobs):
-                res, k, t, proc = results_queue.get()
+                res, k, t, proc = pool.getResult()
                 if isinstance(res, Exception):
                     # res is really the exception, e
                     # t is really the traceback
@@ -926,8 +1524,9 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
                     if except_func is not None:  # pragma: no branch
                         except_func(logger, proc, k, res, t)
                     if except_abort or isinstance(res, KeyboardInterrupt):
-                        for j in range(nproc):
-                            p_list[j].terminate()
+                        # The other workers may still be working on this batch of tasks, so
+                        # this pool cannot be reused.
+                        CloseWorkerPool(config, terminate=True)
                         raise_error = res
                         break
                 else:
@@ -935,30 +1534,20 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
                     if done_func is not None:  # pragma: no branch
                         done_func(logger, proc, k, res, t)
                     results[k] = res
+                    n, tt = busy.get(proc, (0, 0.))
+                    busy[proc] = (n+1, tt+t)
+
+            if raise_error is None:
+                ReportUtilization(busy, time.time()-t1, item, logger)
 
         except Exception as e:  # pragma: no cover
             logger.error("Caught a fatal exception during multiprocessing:\n%r",e)
             logger.error("%s",traceback.format_exc())
-            # Clear any unclaimed jobs that are still in the queue
-            while not task_queue.empty():
-                task_queue.get()
-            # And terminate any jobs that might still be running.
-            for j in range(nproc):
-                p_list[j].terminate()
+            # Terminate any jobs that might still be running.
+            CloseWorkerPool(config, terminate=True)
             raise_error = e
 
         finally:
-            # Stop the processes
-            # Once you are done with the processes, putting nproc 'STOP's will stop them all.
-            # This is important, because the program will keep running as long as there are running
-            # processes, even if the main process gets to the end.  So you do want to make sure to
-            # add those 'STOP's at some point!
-            for j in range(nproc):
-                task_queue.put('STOP')
-            for j in range(nproc):
-                p_list[j].join()
-            task_queue.close()
-
             del config['current_nproc']
 
         if raise_error is not None:
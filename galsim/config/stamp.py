@@ -55,6 +55,11 @@ def BuildStamps(nobjects, config, obj_num=0,
                             [default: True]
     @param logger           If given, a logger object to log progress. [default: None]
 
+    If image.nproc > 1 and image.shared_stamps is True, the worker processes write the stamps
+    into shared memory rather than sending them back through a pipe.  This is much faster when
+    there are many stamps, but the returned images are then only valid until the next call to
+    BuildStamps, so they need to be used (e.g. added to the full image) right away.
+
     @returns the tuple (images, current_vars).  Both are lists.
     """
     logger = galsim.config.LoggerWrapper(logger)
@@ -101,9 +106,22 @@ def BuildStamps(nobjects, config, obj_num=0,
     # Each task is a list of (job, k) tuples.
     tasks = MakeStampTasks(config, jobs, logger)
 
+    # If there are multiple processes, estimate how long each stamp will take to help
+    # balance the load.
+    costs = GetStampCosts(config, jobs, logger) if nproc > 1 else None
+
+    # The stamps can optionally be returned from the worker processes via shared memory.
+    # In this case, they are only valid until the next call to BuildStamps.
+    if nproc > 1 and 'shared_stamps' in config['image']:
+        shared = galsim.config.ParseValue(config['image'], 'shared_stamps', config, bool)[0]
+    else:
+        shared = False
+
     results = galsim.config.MultiProcess(nproc, config, BuildStamp, tasks, 'stamp', logger,
                                          done_func = done_func,
-                                         except_func = except_func)
+                                         except_func = except_func,
+                                         costs = costs,
+                                         shared_images = shared)
 
     images, current_vars = zip(*results)
 
@@ -117,7 +135,7 @@ def BuildStamps(nobjects, config, obj_num=0,
 # and backwards-compatibility reasons.  Any of these present will be copied over to
 # config['stamp'] if they exist in config['image'].
 stamp_image_keys = ['offset', 'retry_failures', 'gsparams', 'draw_method',
-                    'n_photons', 'max_extra_noise', 'poisson_flux']
+                    'n_photons', 'max_extra_noise', 'poisson_flux', 'maxN']
 
 def SetupConfigObjNum(config, obj_num, logger=None):
     """Do the basic setup of the config dict at the stamp (or object) processing level.
@@ -261,8 +279,8 @@ def SetupConfigStampSize(config, xsize, ysize, image_pos, world_pos, logger=None
 # Ignore these when parsing the parameters for specific stamp types:
 stamp_ignore = ['xsize', 'ysize', 'size', 'image_pos', 'world_pos',
                 'offset', 'retry_failures', 'gsparams', 'draw_method',
-                'n_photons', 'max_extra_noise', 'poisson_flux',
-                'skip', 'reject', 'min_flux_frac', 'min_snr', 'max_snr']
+                'n_photons', 'max_extra_noise', 'poisson_flux', 'maxN',
+                'skip', 'reject', 'min_flux_frac', 'min_snr', 'max_snr', 'cost']
 
 valid_draw_methods = ('auto', 'fft', 'phot', 'real_space', 'no_pixel', 'sb')
 
@@ -473,6 +491,44 @@ def MakeStampTasks(config, jobs, logger):
     return valid_stamp_types[stamp_type].makeTasks(stamp, config, jobs, logger)
 
 
+def GetStampCosts(config, jobs, logger=None):
+    """Estimate the relative cost of building each stamp in a list of jobs.
+
+    The estimates come from the getCost method of the stamp builder, which is evaluated using a
+    copy of the config dict, so the original is not modified.  If the builder cannot give
+    estimates, or if they fail for some reason, then this returns None, which means to treat
+    all the stamps as equally costly.
+
+    @param config           The configuration dict
+    @param jobs             A list of jobs.  Each job in the list is a dict of parameters that
+                            includes 'obj_num', 'xsize', and 'ysize'.
+    @param logger           If given, a logger object to log progress. [default: None]
+
+    @returns a list of the estimated costs for each job, or None
+    """
+    logger = galsim.config.LoggerWrapper(logger)
+    stamp = config.get('stamp', {})
+    builder = valid_stamp_types[stamp.get('type', 'Basic')]
+    if not builder.hasCost(stamp, config):
+        return None
+
+    logger.debug('image %d: Estimating the costs of %d stamps',config.get('image_num',0),len(jobs))
+    cost_config = galsim.config.CopyConfig(config)
+    costs = []
+    try:
+        for job in jobs:
+            SetupConfigObjNum(cost_config, job['obj_num'], logger)
+            galsim.config.SetupConfigRNG(cost_config, seed_offset=1, logger=logger)
+            cost = builder.getCost(cost_config['stamp'], cost_config, job['xsize'], job['ysize'],
+                                   logger)
+            costs.append(cost)
+    except Exception as e:
+        logger.debug('Caught exception estimating stamp costs: %s',e)
+        logger.info('Unable to estimate the stamp costs.  Treating them all equally.')
+        return None
+    return costs
+
+
 def DrawBasic(prof, image, method, offset, config, base, logger, **kwargs):
     """The basic implementation of the draw command
 
@@ -526,6 +582,11 @@ def DrawBasic(prof, image, method, offset, config, base, logger, **kwargs):
             raise galsim.GalSimConfigError('poisson_flux is invalid with method != phot')
         kwargs['poisson_flux'] = galsim.config.ParseValue(config, 'poisson_flux', base, bool)[0]
 
+    if 'maxN' in config and 'maxN' not in kwargs:
+        if method != 'phot':
+            raise galsim.GalSimConfigError('maxN is invalid with method != phot')
+        kwargs['maxN'] = galsim.config.ParseValue(config, 'maxN', base, int)[0]
+
     if max_extra_noise is not None and 'max_extra_noise' not in kwargs:
         if max_extra_noise < 0.:
             raise galsim.GalSimConfigError("image.max_extra_noise cannot be negative")
@@ -977,6 +1038,61 @@ class StampBuilder(object):
         current_var = galsim.config.AddNoise(base,image,current_var,logger)
         return image, current_var
 
+    def hasCost(self, config, base):
+        """Check whether getCost can give useful estimates of the cost of each stamp.
+
+        In the base class, this is True if either stamp.cost or stamp.n_photons is given.
+
+        @param config       The configuration dict for the stamp field.
+        @param base         The base configuration dict.
+
+        @returns whether to call getCost for each stamp.
+        """
+        return 'cost' in config or 'n_photons' in config or 'n_photons' in base.get('image',{})
+
+    def getCost(self, config, base, xsize, ysize, logger):
+        """Estimate the relative cost of building the current stamp.
+
+        This is only used to balance the load among processes when building stamps with
+        image.nproc > 1, so only the relative values matter.  It is called with base set up
+        for the current object, but before anything else about the stamp has been built.
+
+        In the base class, the cost is given by stamp.cost if it is present.  This can be any
+        float value, such as an Eval using catalog values for the size and flux of the object.
+        Otherwise, it is the area of the stamp (if known) times stamp.n_photons or
+        image.n_photons (if given).
+
+        @param config       The configuration dict for the stamp field.
+        @param base         The base configuration dict.
+        @param xsize        The xsize of the stamp (if known).
+        @param ysize        The ysize of the stamp (if known).
+        @param logger       If given, a logger object to log progress.
+
+        @returns the estimated cost
+        """
+        if 'cost' in config:
+            return galsim.config.ParseValue(config, 'cost', base, float)[0]
+        cost = 1.
+        if not xsize:
+            if 'xsize' in config:
+                xsize = galsim.config.ParseValue(config,'xsize',base,int)[0]
+            elif 'size' in config:
+                xsize = galsim.config.ParseValue(config,'size',base,int)[0]
+        if not ysize:
+            if 'ysize' in config:
+                ysize = galsim.config.ParseValue(config,'ysize',base,int)[0]
+            elif 'size' in config:
+                ysize = galsim.config.ParseValue(config,'size',base,int)[0]
+        if xsize and ysize:
+            cost *= xsize * ysize
+        if 'n_photons' in config:
+            cost *= galsim.config.ParseValue(config, 'n_photons', base, float)[0]
+        elif 'n_photons' in base.get('image',{}):
+            # This would normally be copied into the stamp field, but that may not have
+            # happened yet.
+            cost *= galsim.config.ParseValue(base['image'], 'n_photons', base, float)[0]
+        return cost
+
     def makeTasks(self, config, base, jobs, logger):
         """Turn a list of jobs into a list of tasks.
 
@@ -399,6 +399,15 @@ class Convolution(GSObject):
         else:
             raise GalSimError("Cannot use real_space convolution for >2 profiles")
 
+    @doc_inherit
+    def _realSBP(self):
+        if len(self.obj_list) == 1:
+            return self.obj_list[0]._realSBP()
+        elif len(self.obj_list) == 2:
+            return self._sbp
+        else:
+            return None
+
     @doc_inherit
     def _shoot(self, photons, ud):
         from .photon_array import PhotonArray
@@ -409,7 +418,7 @@ class Convolution(GSObject):
         # both have their negative ones at the end.
         # However, this decision is now made by the convolve method.
         for obj in self.obj_list[1:]:
-            p1 = PhotonArray(len(photons))
+            p1 = PhotonArray(len(photons), dtype=photons.dtype)
             obj._shoot(p1, ud)
             photons.convolve(p1, ud)
 
@@ -777,7 +786,7 @@ class AutoConvolution(Convolution):
     def _shoot(self, photons, ud):
         from .photon_array import PhotonArray
         self.orig_obj._shoot(photons, ud)
-        photons2 = PhotonArray(len(photons))
+        photons2 = PhotonArray(len(photons), dtype=photons.dtype)
         self.orig_obj._shoot(photons2, ud)
         photons.convolve(photons2, ud)
 
@@ -938,7 +947,7 @@ class AutoCorrelation(Convolution):
     def _shoot(self, photons, ud):
         from .photon_array import PhotonArray
         self.orig_obj._shoot(photons, ud)
-        photons2 = PhotonArray(len(photons))
+        photons2 = PhotonArray(len(photons), dtype=photons.dtype)
         self.orig_obj._shoot(photons2, ud)
 
         # Flip sign of (x, y) in one of the results
@@ -0,0 +1,190 @@
+# Copyright (c) 2012-2018 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file disk_cache.py
+A simple content-addressed cache of NumPy arrays on disk.
+
+This is used to save the results of expensive calculations (e.g. PhaseScreenPSF images) so that
+they can be reused by later processes that need the same thing.
+"""
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+from .errors import GalSimValueError
+
+
+class DiskCache(object):
+    """A content-addressed cache of NumPy arrays stored in a directory on disk.
+
+    Each entry is a set of named arrays, saved as a single .npz file whose name is a hash of the
+    key.  Entries are written to a temporary file and then atomically renamed into place, so
+    several processes may safely share the same cache directory.  Readers will either see a
+    complete entry or no entry at all.
+
+    When the total size of the files in the directory exceeds `max_size`, the least recently
+    used entries are removed until it is below `max_size` again.  An entry is marked as used
+    whenever it is saved or loaded.
+
+        >>> cache = galsim.disk_cache.DiskCache('~/.galsim_cache', max_size=2**30)
+        >>> key = cache.key('my_calculation', 1.2, (3,4))
+        >>> arrays = cache.load(key)
+        >>> if arrays is None:
+        ...     arrays = dict(a=do_calculation())
+        ...     cache.save(key, **arrays)
+
+    @param directory    The directory in which to store the cache.  It is created if necessary.
+    @param max_size     The maximum total size of the cache in bytes. [default: 2**30, i.e. 1 GB]
+    """
+    _suffix = '.npz'
+
+    def __init__(self, directory, max_size=2**30):
+        if max_size <= 0:
+            raise GalSimValueError("max_size must be positive", max_size)
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = int(max_size)
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:  # pragma: no cover
+                # Another process may have made it at the same time.
+                if not os.path.isdir(self.directory): raise
+
+    def __repr__(self):
+        return 'galsim.disk_cache.DiskCache(%r, max_size=%r)'%(self.directory, self.max_size)
+
+    def __eq__(self, other):
+        return (isinstance(other, DiskCache) and self.directory == other.directory and
+                self.max_size == other.max_size)
+    def __ne__(self, other): return not self.__eq__(other)
+
+    def __hash__(self): return hash(repr(self))
+
+    @staticmethod
+    def key(*items):
+        """Make a key from a number of items.
+
+        Strings, bytes and NumPy arrays are used directly.  Anything else is converted to a
+        string with repr, so it should have a repr that fully specifies its value.
+
+        @returns the key as a hex string.
+        """
+        h = hashlib.sha256()
+        for item in items:
+            if isinstance(item, np.ndarray):
+                h.update(repr((item.dtype.str, item.shape)).encode())
+                h.update(np.ascontiguousarray(item).tobytes())
+            elif isinstance(item, bytes):
+                h.update(item)
+            else:
+                h.update(repr(item).encode())
+            # Separator, so e.g. ('ab','c') and ('a','bc') don't give the same key.
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def _file_name(self, key):
+        return os.path.join(self.directory, key + self._suffix)
+
+    def load(self, key):
+        """Load the arrays for the given key.
+
+        @param key      The key, as returned by the key() method.
+
+        @returns a dict of the arrays saved with this key, or None if there is no such entry.
+        """
+        file_name = self._file_name(key)
+        try:
+            with np.load(file_name, allow_pickle=False) as data:
+                arrays = dict((k, data[k]) for k in data.files)
+            os.utime(file_name, None)
+        except (IOError, OSError, ValueError):
+            # Either not there, or removed by another process while we were reading it.
+            # Either way, count it as a miss.
+            return None
+        return arrays
+
+    def save(self, key, **arrays):
+        """Save some arrays with the given key.
+
+        If there is already an entry with this key, it is replaced.
+
+        @param key      The key, as returned by the key() method.
+        @param **arrays The arrays to save, given as keyword arguments.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            # os.replace is atomic, even if the file already exists.  (Python 2 only has rename,
+            # which is also fine, except on Windows.)
+            getattr(os, 'replace', os.rename)(tmp_name, self._file_name(key))
+        except Exception:
+            try:
+                os.remove(tmp_name)
+            except OSError:  # pragma: no cover
+                pass
+            raise
+        self._evict()
+
+    def _entries(self):
+        """Return a list of (mtime, size, file_name) for the entries currently in the cache.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self._suffix): continue
+            file_name = os.path.join(self.directory, name)
+            try:
+                st = os.stat(file_name)
+            except OSError:  # pragma: no cover  (Removed by another process.)
+                continue
+            entries.append((st.st_mtime, st.st_size, file_name))
+        return entries
+
+    def _evict(self):
+        """Remove the least recently used entries until the total size is below max_size.
+        """
+        entries = self._entries()
+        total = sum(e[1] for e in entries)
+        if total <= self.max_size: return
+        entries.sort()
+        for mtime, size, file_name in entries:
+            try:
+                os.remove(file_name)
+            except OSError:  # pragma: no cover  (Another process got there first.)
+                pass
+            total -= size
+            if total <= self.max_size: break
+
+    @property
+    def size(self):
+        """The total size in bytes of the entries in the cache.
+        """
+        return sum(e[1] for e in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def clear(self):
+        """Remove all entries from the cache.
+        """
+        for _, _, file_name in self._entries():
+            try:
+                os.remove(file_name)
+            except OSError:  # pragma: no cover
+                pass
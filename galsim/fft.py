@@ -32,6 +32,9 @@ Note that the GalSim versions often only implement the normal use case without m
 advanced options available with the numpy functions.  This is mostly laziness on our part --
 we only implemented the functions that we needed.  If your usage requires some option available
 in the numpy version, feel free to post a feature request on our GitHub page.
+
+The implementation used for these functions (and for the FFTs done by GSObject.drawFFT and
+Image.calculate_fft and calculate_inverse_fft) may be changed with set_backend.
 """
 
 import numpy as np
@@ -91,8 +94,7 @@ def fft2(a, shift_in=False, shift_out=False):
         a = a.astype(np.complex128, copy=False)
         xim = ImageCD(a, xmin = -No2, ymin = -Mo2)
         kim = ImageCD(BoundsI(-No2,No2-1,-Mo2,Mo2-1))
-        with convert_cpp_errors():
-            _galsim.cfft(xim._image, kim._image, False, shift_in, shift_out)
+        _cfft_image(xim, kim, False, shift_in, shift_out)
         kar = kim.array
     else:
         a = a.astype(np.float64, copy=False)
@@ -105,8 +107,7 @@ def fft2(a, shift_in=False, shift_out=False):
 
         # Faster to start with rfft2 version
         rkim = ImageCD(BoundsI(0,No2,-Mo2,Mo2-1))
-        with convert_cpp_errors():
-            _galsim.rfft(xim._image, rkim._image, shift_in, shift_out)
+        _rfft_image(xim, rkim, shift_in, shift_out)
         # This only returns kx >= 0.  Fill out the full image.
         kar = np.empty( (M,N), dtype=np.complex128)
         rkar = rkim.array
@@ -181,8 +182,7 @@ def ifft2(a, shift_in=False, shift_out=False):
         a = a.astype(np.float64, copy=False)
         kim = ImageD(a, xmin = -No2, ymin = -Mo2)
     xim = ImageCD(BoundsI(-No2,No2-1,-Mo2,Mo2-1))
-    with convert_cpp_errors():
-        _galsim.cfft(kim._image, xim._image, True, shift_in, shift_out)
+    _cfft_image(kim, xim, True, shift_in, shift_out)
     return xim.array
 
 
@@ -234,8 +234,7 @@ def rfft2(a, shift_in=False, shift_out=False):
     a = a.astype(np.float64, copy=False)
     xim = ImageD(a, xmin = -No2, ymin = -Mo2)
     kim = ImageCD(BoundsI(0,No2,-Mo2,Mo2-1))
-    with convert_cpp_errors():
-        _galsim.rfft(xim._image, kim._image, shift_in, shift_out)
+    _rfft_image(xim, kim, shift_in, shift_out)
     return kim.array
 
 
@@ -287,9 +286,118 @@ def irfft2(a, shift_in=False, shift_out=False):
     a = a.astype(np.complex128, copy=False)
     kim = ImageCD(a, xmin = 0, ymin = -Mo2)
     xim = ImageD(BoundsI(-No2,No2+1,-Mo2,Mo2-1))
-    with convert_cpp_errors():
-        _galsim.irfft(kim._image, xim._image, shift_in, shift_out)
+    _irfft_image(kim, xim, shift_in, shift_out)
     xim = xim.subImage(BoundsI(-No2,No2-1,-Mo2,Mo2-1))
     return xim.array
 
 
+_backend = 'fftw'
+_valid_backends = ('fftw', 'numpy', 'scipy')
+
+def set_backend(backend='fftw', nthreads=None):
+    """Set which FFT implementation to use.
+
+    This affects the functions in this module as well as the FFTs done by GSObject.drawFFT,
+    Image.calculate_fft and Image.calculate_inverse_fft.  The options are:
+
+        'fftw'      Use FFTW via the GalSim C++ layer.  This is the default.  The FFTW plans are
+                    cached for each size of transform, so repeated transforms of the same size
+                    don't need to be planned again.  When more than one thread is used, large
+                    transforms are split into 1-d transforms of the rows and then the columns,
+                    which are done in parallel.
+        'numpy'     Use numpy.fft.  This is always single-threaded.
+        'scipy'     Use scipy.fft, using its workers parameter to run in parallel.  This requires
+                    scipy version 1.4 or later.
+
+    The different backends agree to within floating point rounding, as do the FFTW transforms
+    with one or more threads.
+
+    @param backend      The name of the backend to use. [default: 'fftw']
+    @param nthreads     The number of threads to use for the 'fftw' and 'scipy' backends.  If
+                        this is <= 0, then use the number of cores on the machine.
+                        [default: None, which means to use the number of threads set by
+                        galsim.utilities.set_num_threads]
+    """
+    global _backend
+    if backend not in _valid_backends:
+        raise GalSimValueError("Invalid FFT backend", backend, _valid_backends)
+    if backend == 'scipy':
+        import scipy.fft  # Raise an ImportError now if this isn't available.
+    if nthreads is not None:
+        nthreads = int(nthreads)
+        if nthreads <= 0:
+            import multiprocessing
+            nthreads = multiprocessing.cpu_count()
+    _backend = backend
+    _galsim.SetFFTNumThreads(0 if nthreads is None else nthreads)
+
+def get_backend():
+    """Get the name of the current FFT backend.  See set_backend for details.
+    """
+    return _backend
+
+def get_num_threads():
+    """Get the number of threads being used for the FFTs.  See set_backend for details.
+    """
+    if _backend == 'numpy':
+        return 1
+    else:
+        return _galsim.GetFFTNumThreads()
+
+def clear_plan_cache():
+    """Clear the cache of FFTW plans used by the 'fftw' backend.
+
+    The plans are small, so there is normally no need to do this, but if you have done many
+    transforms of different sizes, this will release the memory used by their plans.
+    """
+    _galsim.ClearFFTPlans()
+
+def _fft_module():
+    # Return the numpy-like module to use for the FFTs and any extra kwargs to pass to it.
+    if _backend == 'scipy':
+        import scipy.fft
+        return scipy.fft, { 'workers' : get_num_threads() }
+    else:
+        return np.fft, {}
+
+def _shift(a, shift, axes=None):
+    return np.fft.fftshift(a, axes=axes) if shift else a
+
+# The following do the FFTs from one Image into another using the current backend.  The bounds
+# of the images must be as required by the corresponding C++ functions.  Like the C++ functions,
+# the numpy and scipy backends always compute in double precision.  (Since NumPy 2, they would
+# otherwise do the transforms of single precision arrays in single precision.)
+
+def _rfft_image(xim, kim, shift_in, shift_out):
+    if _backend == 'fftw':
+        with convert_cpp_errors():
+            _galsim.rfft(xim._image, kim._image, shift_in, shift_out)
+    else:
+        mod, kwargs = _fft_module()
+        xar = xim.array.astype(np.float64, copy=False)
+        kar = mod.rfft2(_shift(xar, shift_in), **kwargs)
+        kim.array[:,:] = _shift(kar, shift_out, axes=(0,))
+
+def _irfft_image(kim, xim, shift_in, shift_out):
+    # Note: xim has two extra columns, which are used as scratch space by FFTW.
+    if _backend == 'fftw':
+        with convert_cpp_errors():
+            _galsim.irfft(kim._image, xim._image, shift_in, shift_out)
+    else:
+        mod, kwargs = _fft_module()
+        M, N = xim.array.shape
+        N -= 2
+        kar = kim.array.astype(np.complex128, copy=False)
+        xar = mod.irfft2(_shift(kar, shift_in, axes=(0,)), s=(M,N), **kwargs)
+        xim.array[:,:N] = _shift(xar, shift_out)
+
+def _cfft_image(xim, kim, inverse, shift_in, shift_out):
+    if _backend == 'fftw':
+        with convert_cpp_errors():
+            _galsim.cfft(xim._image, kim._image, inverse, shift_in, shift_out)
+    else:
+        mod, kwargs = _fft_module()
+        f = mod.ifft2 if inverse else mod.fft2
+        xar = xim.array.astype(np.complex128, copy=False)
+        kar = f(_shift(xar, shift_in), **kwargs)
+        kim.array[:,:] = _shift(kar, shift_out)
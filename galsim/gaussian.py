@@ -178,6 +178,10 @@ class Gaussian(GSObject):
     def _drawReal(self, image):
         self._sbp.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._sbp
+
     @doc_inherit
     def _shoot(self, photons, rng):
         self._sbp.shoot(photons._pa, rng._rng)
@@ -695,10 +695,20 @@ class GSObject(object):
         profiles can do so by drawing the convolved profile into an image, using the image to
         initialize a new InterpolatedImage, and then using the xValue() method for that new object.
 
+        The x and y values may also be given as NumPy arrays (again either as two arguments or
+        as kwargs x and y), in which case the surface brightness is calculated at all of the
+        positions in a single C++ call, and a NumPy array with the broadcast shape of x and y
+        is returned.  This is much faster than calling xValue() for each position separately.
+
+            >>> vals = obj.xValue(x_array, y_array)
+
         @param position  The position at which you want the surface brightness of the object.
 
         @returns the surface brightness at that position.
         """
+        xy = _parse_value_arrays(args, kwargs, 'x', 'y')
+        if xy is not None:
+            return self._xValueArray(*xy)
         pos = parse_pos_args(args,kwargs,'x','y')
         return self._xValue(pos)
 
@@ -711,6 +721,20 @@ class GSObject(object):
         """
         raise NotImplementedError("%s does not implement xValue"%self.__class__.__name__)
 
+    def _xValueArray(self, x, y):
+        """Equivalent to xValue(x, y) for NumPy arrays x and y, but they must be contiguous
+        float64 arrays with the same shape.
+
+        @param x        The x values of the positions.
+        @param y        The y values of the positions.
+
+        @returns a NumPy array of the surface brightness at those positions.
+        """
+        val = np.empty_like(x)
+        with convert_cpp_errors():
+            self._sbp.xValueMany(x.ctypes.data, y.ctypes.data, val.ctypes.data, x.size)
+        return val
+
     def kValue(self, *args, **kwargs):
         """Returns the value of the object at a chosen 2D position in k space.
 
@@ -723,10 +747,16 @@ class GSObject(object):
         == True`, but this is the case for all GSObjects currently, so that should never be an
         issue (unlike for xValue()).
 
+        As for xValue(), kx and ky may also be given as NumPy arrays, in which case a complex
+        NumPy array of the fourier amplitudes at all of those positions is returned.
+
         @param position  The position in k space at which you want the fourier amplitude.
 
         @returns the amplitude of the fourier transform at that position.
         """
+        kxy = _parse_value_arrays(args, kwargs, 'kx', 'ky')
+        if kxy is not None:
+            return self._kValueArray(*kxy)
         kpos = parse_pos_args(args,kwargs,'kx','ky')
         return self._kValue(kpos)
 
@@ -735,6 +765,20 @@ class GSObject(object):
         """
         raise NotImplementedError("%s does not implement kValue"%self.__class__.__name__)
 
+    def _kValueArray(self, kx, ky):
+        """Equivalent to kValue(kx, ky) for NumPy arrays kx and ky, but they must be contiguous
+        float64 arrays with the same shape.
+
+        @param kx       The kx values of the positions.
+        @param ky       The ky values of the positions.
+
+        @returns a complex NumPy array of the fourier amplitudes at those positions.
+        """
+        val = np.empty(kx.shape, dtype=np.complex128)
+        with convert_cpp_errors():
+            self._sbp.kValueMany(kx.ctypes.data, ky.ctypes.data, val.ctypes.data, kx.size)
+        return val
+
     def withGSParams(self, gsparams):
         """Create a version of the current object with the given gsparams
 
@@ -1175,11 +1219,74 @@ class GSObject(object):
         # Do any work that was postponed until drawImage.
         pass
 
+    def _prepareImage(self, image, nx, ny, bounds, scale, wcs, dtype, method, area, exptime,
+                      gain, add_to_image, use_true_center, offset, sensor):
+        # The part of drawImage that is common to all drawing methods.  Returns the set up image
+        # along with the profile in image coordinates that should be drawn onto it.
+        from .convolve import Convolve
+        from .box import Pixel
+
+        # Do any delayed computation needed by fft or real_space drawing.
+        if method != 'phot':
+            self._prepareDraw()
+
+        # Figure out what wcs we are going to use.
+        wcs = self._determine_wcs(scale, wcs, image)
+
+        # Make sure offset is a PositionD
+        offset = self._parse_offset(offset)
+
+        # Determine the bounds of the new image for use below (if it can be known yet)
+        new_bounds = self._get_new_bounds(image, nx, ny, bounds)
+
+        # Get the local WCS, accounting for the offset correctly.
+        local_wcs = self._local_wcs(wcs, image, offset, use_true_center, new_bounds)
+
+        # Convert the profile in world coordinates to the profile in image coordinates:
+        prof = local_wcs.toImage(self)
+
+        # Apply the offset, and possibly fix the centering for even-sized images
+        offset = self._adjust_offset(new_bounds, offset, use_true_center)
+        if offset != PositionD(0,0):
+            prof = prof._shift(offset)
+            local_wcs = local_wcs.withOrigin(offset)
+
+        # Account for area and exptime.
+        flux_scale = area * exptime
+        # For surface brightness normalization, also scale by the pixel area.
+        if method == 'sb':
+            flux_scale /= local_wcs.pixelArea()
+        # Only do the gain here if not photon shooting, since need the number of photons to
+        # reflect that actual photons, not ADU.
+        if gain != 1 and method != 'phot' and sensor is None:
+            flux_scale /= gain
+
+        prof *= flux_scale
+
+        # If necessary, convolve by the pixel
+        prof_no_pixel = real_space = None
+        if method in ('auto', 'fft', 'real_space'):
+            if method == 'auto':
+                real_space = None
+            elif method == 'fft':
+                real_space = False
+            else:
+                real_space = True
+            prof_no_pixel = prof
+            prof = Convolve(prof, Pixel(scale=1.0, gsparams=self.gsparams),
+                            real_space=real_space, gsparams=self.gsparams)
+
+        # Make sure image is setup correctly
+        image = prof._setup_image(image, nx, ny, bounds, add_to_image, dtype)
+        image.wcs = wcs
+
+        return image, prof, prof_no_pixel, real_space, local_wcs, flux_scale
+
     def drawImage(self, image=None, nx=None, ny=None, bounds=None, scale=None, wcs=None, dtype=None,
                   method='auto', area=1., exptime=1., gain=1., add_to_image=False,
                   use_true_center=True, offset=None, n_photons=0., rng=None, max_extra_noise=0.,
                   poisson_flux=None, sensor=None, surface_ops=(), n_subsample=3, maxN=None,
-                  save_photons=False, setup_only=False):
+                  save_photons=False, photon_dtype=np.float64, setup_only=False):
         """Draws an Image of the object.
 
         The drawImage() method is used to draw an Image of the current object using one of several
@@ -1507,6 +1614,11 @@ class GSObject(object):
                             [default: None, which means no limit]
         @param save_photons If True, save the PhotonArray as `image.photons`. Only valid if method
                             is 'phot' or sensor is not None.  [default: False]
+        @param photon_dtype The numpy data type to use for the PhotonArray when photon shooting
+                            (or when using a sensor), either numpy.float64 or numpy.float32.
+                            Using numpy.float32 halves the memory required for each photon, so
+                            you can use a larger maxN for the same memory.
+                            [default: numpy.float64]
         @param setup_only   Don't actually draw anything on the image.  Just make sure the image
                             is set up correctly.  This is used internally by GalSim, but there
                             may be cases where the user will want the same functionality.
@@ -1581,58 +1693,11 @@ class GSObject(object):
                 raise GalSimIncompatibleValuesError(
                     "Setting maxN is incompatible with save_photons=True")
 
-        # Do any delayed computation needed by fft or real_space drawing.
-        if method != 'phot':
-            self._prepareDraw()
-
-        # Figure out what wcs we are going to use.
-        wcs = self._determine_wcs(scale, wcs, image)
-
-        # Make sure offset is a PositionD
-        offset = self._parse_offset(offset)
-
-        # Determine the bounds of the new image for use below (if it can be known yet)
-        new_bounds = self._get_new_bounds(image, nx, ny, bounds)
-
-        # Get the local WCS, accounting for the offset correctly.
-        local_wcs = self._local_wcs(wcs, image, offset, use_true_center, new_bounds)
-
-        # Convert the profile in world coordinates to the profile in image coordinates:
-        prof = local_wcs.toImage(self)
-
-        # Apply the offset, and possibly fix the centering for even-sized images
-        offset = self._adjust_offset(new_bounds, offset, use_true_center)
-        if offset != PositionD(0,0):
-            prof = prof._shift(offset)
-            local_wcs = local_wcs.withOrigin(offset)
-
-        # Account for area and exptime.
-        flux_scale = area * exptime
-        # For surface brightness normalization, also scale by the pixel area.
-        if method == 'sb':
-            flux_scale /= local_wcs.pixelArea()
-        # Only do the gain here if not photon shooting, since need the number of photons to
-        # reflect that actual photons, not ADU.
-        if gain != 1 and method != 'phot' and sensor is None:
-            flux_scale /= gain
-
-        prof *= flux_scale
-
-        # If necessary, convolve by the pixel
-        if method in ('auto', 'fft', 'real_space'):
-            if method == 'auto':
-                real_space = None
-            elif method == 'fft':
-                real_space = False
-            else:
-                real_space = True
-            prof_no_pixel = prof
-            prof = Convolve(prof, Pixel(scale=1.0, gsparams=self.gsparams),
-                            real_space=real_space, gsparams=self.gsparams)
-
-        # Make sure image is setup correctly
-        image = prof._setup_image(image, nx, ny, bounds, add_to_image, dtype)
-        image.wcs = wcs
+        # Convert the profile to image coordinates, including the offset, flux scaling and
+        # pixel convolution, and make sure the image is set up correctly.
+        image, prof, prof_no_pixel, real_space, local_wcs, flux_scale = self._prepareImage(
+                image, nx, ny, bounds, scale, wcs, dtype, method, area, exptime, gain,
+                add_to_image, use_true_center, offset, sensor)
 
         if setup_only:
             image.added_flux = 0.
@@ -1647,7 +1712,7 @@ class GSObject(object):
             added_photons, photons = prof.drawPhot(imview, gain, add_to_image,
                                                    n_photons, rng, max_extra_noise, poisson_flux,
                                                    sensor, surface_ops, maxN,
-                                                   orig_center, local_wcs)
+                                                   orig_center, local_wcs, photon_dtype)
         else:
             # If not using phot, but doing sensor, then make a copy.
             if sensor is not None:
@@ -1684,7 +1749,7 @@ class GSObject(object):
 
             if sensor is not None:
                 ud = UniformDeviate(rng)
-                photons = PhotonArray.makeFromImage(draw_image, rng=ud)
+                photons = PhotonArray.makeFromImage(draw_image, rng=ud, dtype=photon_dtype)
                 for op in surface_ops:
                     op.applyTo(photons, local_wcs)
                 if imview.dtype in (np.float32, np.float64):
@@ -1752,6 +1817,15 @@ class GSObject(object):
         """
         raise NotImplementedError("%s does not implement drawReal"%self.__class__.__name__)
 
+    def _realSBP(self):
+        """Return the C++ SBProfile that _drawReal draws, or None if _drawReal does anything
+        beyond a single SBProfile draw call.
+
+        This is used by drawImages to draw many profiles in a single call into C++.  Classes
+        whose _drawReal is just a draw of some SBProfile should return that SBProfile here.
+        """
+        return None
+
     def getGoodImageSize(self, pixel_scale):
         """Return a good size to use for drawing this profile.
 
@@ -1791,7 +1865,7 @@ class GSObject(object):
                                       the result should be wrapped before doing the inverse fft.
         """
         from .bounds import _BoundsI
-        from .image import ImageCD, ImageCF
+        from .image import ImageCD
         # Start with what this profile thinks a good size would be given the image's pixel scale.
         N = self.getGoodImageSize(image.scale)
 
@@ -1818,11 +1892,12 @@ class GSObject(object):
         if Nk > self.gsparams.maximum_fft_size:
             raise GalSimFFTSizeError("drawFFT requires an FFT that is too large.", Nk)
 
+        # Always use double precision for the k-space image, even when drawing onto a float32
+        # image.  The serial and multi-threaded drawK fill the image along different code paths,
+        # so accumulating in single precision would make their results differ by more than the
+        # final rounding to the output dtype.
         bounds = _BoundsI(0,Nk//2,-Nk//2,Nk//2)
-        if image.dtype in (np.complex128, np.float64, np.int32, np.uint32):
-            kimage = ImageCD(bounds=bounds, scale=dk)
-        else:
-            kimage = ImageCF(bounds=bounds, scale=dk)
+        kimage = ImageCD(bounds=bounds, scale=dk)
         return kimage, N
 
     def drawFFT_finish(self, image, kimage, wrap_size, add_to_image):
@@ -1843,6 +1918,7 @@ class GSObject(object):
         """
         from .bounds import _BoundsI
         from .image import Image
+        from . import fft
         # Wrap the full image to the size we want for the FT.
         # Even if N == Nk, this is useful to make this portion properly Hermitian in the
         # N/2 column and N/2 row.
@@ -1852,8 +1928,7 @@ class GSObject(object):
         # Perform the fourier transform.
         breal = _BoundsI(-wrap_size//2, wrap_size//2+1, -wrap_size//2, wrap_size//2-1)
         real_image = Image(breal, dtype=float)
-        with convert_cpp_errors():
-            _galsim.irfft(kimage_wrap._image, real_image._image, True, True)
+        fft._irfft_image(kimage_wrap, real_image, True, True)
 
         # Add (a portion of) this to the original image.
         temp = real_image.subImage(image.bounds)
@@ -2016,7 +2091,7 @@ class GSObject(object):
     def drawPhot(self, image, gain=1., add_to_image=False,
                  n_photons=0, rng=None, max_extra_noise=0., poisson_flux=None,
                  sensor=None, surface_ops=(), maxN=None, orig_center=PositionI(0,0),
-                 local_wcs=None):
+                 local_wcs=None, photon_dtype=np.float64):
         """
         Draw this profile into an Image by shooting photons.
 
@@ -2073,14 +2148,22 @@ class GSObject(object):
                             [default: ()]
         @param maxN         Sets the maximum number of photons that will be added to the image
                             at a time.  (Memory requirements are proportional to this number.)
-                            [default: None, which means no limit]
+                            Each batch is shot, passed through the surface_ops and accumulated
+                            onto the image before the next one is made, and the sensor resumes
+                            from where the previous batch left off.  For a given rng and maxN,
+                            the result is reproducible, but it is not identical to using a
+                            different maxN, since the random numbers are used in a different
+                            order.  [default: None, which means no limit]
         @param orig_center  The position of the image center in the original image coordinates.
                             [default: (0,0)]
         @param local_wcs    The local wcs in the original image. [default: None]
+        @param photon_dtype The numpy data type to use for the PhotonArray, either numpy.float64
+                            or numpy.float32. [default: numpy.float64]
 
         @returns (nphotons, photons) where
             nphotons is the total flux of photons that landed inside the image bounds, and
-            photons is the PhotonArray that was applied to the image.
+            photons is the PhotonArray that was applied to the image.  (If maxN is less than
+            the total number of photons, this is just the last batch.)
         """
         from .random import UniformDeviate
         from .sensor import Sensor
@@ -2123,6 +2206,13 @@ class GSObject(object):
 
         if not add_to_image: image.setZero()
 
+        # The sensor needs a float image to accumulate onto.  For integer images, use a single
+        # temporary for all the batches, so the sensor can resume from one batch to the next.
+        if image.dtype in (np.float32, np.float64):
+            sensor_image = image
+        else:
+            sensor_image = ImageD(bounds=image.bounds)
+
         # Nleft is the number of photons remaining to shoot.
         Nleft = Ntot
         photons = None  # Just in case Nleft is already 0.
@@ -2131,8 +2221,11 @@ class GSObject(object):
             # Shoot at most maxN at a time
             thisN = min(maxN, Nleft)
 
+            # Release the previous batch before making the next one, so at most one batch
+            # is in memory at a time.
+            photons = None
             try:
-                photons = self.shoot(thisN, ud)
+                photons = self.shoot(thisN, ud, dtype=photon_dtype)
             except (GalSimError, NotImplementedError) as e:
                 raise GalSimNotImplementedError(
                         "Unable to draw this GSObject with photon shooting.  Perhaps it "
@@ -2148,21 +2241,19 @@ class GSObject(object):
             for op in surface_ops:
                 op.applyTo(photons, local_wcs)
 
-            if image.dtype in (np.float32, np.float64):
-                added_flux += sensor.accumulate(photons, image, orig_center, resume=resume)
-                resume = True  # Resume from this point if there are any further iterations.
-            else:
-                # Need a temporary
-                im1 = ImageD(bounds=image.bounds)
-                added_flux += sensor.accumulate(photons, im1, orig_center)
-                image.array[:,:] += im1.array.astype(image.dtype, copy=False)
+            added_flux += sensor.accumulate(photons, sensor_image, orig_center, resume=resume)
+            resume = True  # Resume from this point if there are any further iterations.
 
             Nleft -= thisN
 
+        if sensor_image is not image:
+            # Round to the nearest integer rather than truncating.
+            image.array[:,:] += np.rint(sensor_image.array).astype(image.dtype, copy=False)
+
         return added_flux, photons
 
 
-    def shoot(self, n_photons, rng=None):
+    def shoot(self, n_photons, rng=None, dtype=np.float64):
         """Shoot photons into a PhotonArray.
 
         @param n_photons    The number of photons to use for photon shooting.
@@ -2170,13 +2261,15 @@ class GSObject(object):
                             which may be any kind of BaseDeviate object.  If `rng` is None, one
                             will be automatically created, using the time as a seed.
                             [default: None]
+        @param dtype        The numpy data type to use for the PhotonArray, either numpy.float64
+                            or numpy.float32. [default: numpy.float64]
 
         @returns PhotonArray.
         """
         from .random import UniformDeviate
         from .photon_array import PhotonArray
 
-        photons = PhotonArray(n_photons)
+        photons = PhotonArray(n_photons, dtype=dtype)
         if n_photons == 0:
             # It's ok to shoot 0, but downstream can have problems with it, so just stop now.
             return photons
@@ -2320,3 +2413,121 @@ class GSObject(object):
 
     # Derived classes should define the __eq__ function
     def __ne__(self, other): return not self.__eq__(other)
+
+
+def _parse_value_arrays(args, kwargs, name1, name2):
+    """Check whether the arguments of xValue or kValue are arrays of positions.
+
+    If they are, return them as a tuple of contiguous float64 arrays with a common shape.
+    Otherwise, return None, and the arguments should be parsed as a single position.
+    """
+    if len(args) == 2 and not kwargs:
+        x, y = args
+    elif len(args) == 0 and len(kwargs) == 2 and name1 in kwargs and name2 in kwargs:
+        x = kwargs[name1]
+        y = kwargs[name2]
+    else:
+        return None
+    if np.ndim(x) == 0 and np.ndim(y) == 0:
+        return None
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return np.ascontiguousarray(x), np.ascontiguousarray(y)
+
+
+def drawImages(profiles, images=None, nx=None, ny=None, bounds=None, scale=None, wcs=None,
+               dtype=None, method='auto', area=1., exptime=1., gain=1., add_to_image=False,
+               use_true_center=True, offset=None):
+    """Draw many profiles at once, each onto its own Image.
+
+    This is equivalent to
+
+        >>> images = [prof.drawImage(image, ...) for prof, image in zip(profiles, images)]
+
+    and the resulting images are identical to what that loop produces.  However, all the
+    profiles that can be drawn in real space (e.g. with method='no_pixel' or 'real_space', or any
+    method for profiles that are analytic in real space) are drawn with a single call into the
+    C++ layer, which does not hold the Python GIL while it is drawing.  This removes most of the
+    per-object overhead when drawing many small stamps, and lets other Python threads do useful
+    work in the meantime.  Profiles that need to be drawn with an FFT are drawn one at a time
+    in the normal way.
+
+    Photon shooting and sensors are not supported here, since they need a random number
+    generator to be shared between the profiles.  Use drawImage for those.
+
+    All of the keyword parameters have the same meaning as for GSObject.drawImage, and apply
+    to every profile.  The images should all be distinct Image instances.
+
+    @param profiles     A list of GSObjects to draw.
+    @param images       A list of Images onto which to draw the profiles, one per profile.
+                        Entries may be None, in which case a new image is made using the
+                        `nx`, `ny`, `bounds` and `dtype` parameters (or an automatically
+                        determined size) just like drawImage.  [default: None, which means
+                        make new images for all of them]
+
+    @returns the list of drawn Images.
+    """
+    from .image import Image
+    from .wcs import PixelScale
+
+    profiles = list(profiles)
+    if images is None:
+        images = [None] * len(profiles)
+    else:
+        images = list(images)
+        if len(images) != len(profiles):
+            raise GalSimIncompatibleValuesError(
+                "images must have the same length as profiles", images=images, profiles=profiles)
+    for image in images:
+        if image is not None and not isinstance(image, Image):
+            raise TypeError("image is not an Image instance", image)
+    if gain <= 0.:
+        raise GalSimRangeError("Invalid gain <= 0.", gain, 0., None)
+    if area <= 0.:
+        raise GalSimRangeError("Invalid area <= 0.", area, 0., None)
+    if exptime <= 0.:
+        raise GalSimRangeError("Invalid exptime <= 0.", exptime, 0., None)
+    if method not in ('auto', 'fft', 'real_space', 'no_pixel', 'sb'):
+        raise GalSimValueError("Invalid method name for drawImages", method,
+                               ('auto', 'fft', 'real_space', 'no_pixel', 'sb'))
+
+    # Set up all the images and find the image-coordinate profiles to draw.  Those whose
+    # drawReal call would reduce to a single SBProfile draw are batched by dtype.
+    batches = { np.float32 : ([], [], []), np.float64 : ([], [], []) }
+    views = []
+    for k, obj in enumerate(profiles):
+        image, prof, _, _, _, flux_scale = obj._prepareImage(
+                images[k], nx, ny, bounds, scale, wcs, dtype, method, area, exptime, gain,
+                add_to_image, use_true_center, offset, None)
+        images[k] = image
+
+        # This matches what drawImage does for non-photon-shooting methods.
+        imview = image._view()
+        imview.setCenter(0,0)
+        imview.wcs = PixelScale(1.0)
+        sbp = None
+        if (prof.is_analytic_x and imview.dtype in batches and not add_to_image
+                and imview.iscontiguous):
+            sbp = prof._realSBP()
+        if sbp is not None:
+            sbps, ims, scales = batches[imview.dtype]
+            sbps.append(sbp)
+            ims.append(imview._image)
+            scales.append(imview.scale)
+        views.append((imview, prof, sbp, flux_scale))
+
+    with convert_cpp_errors():
+        for dt, (sbps, ims, scales) in batches.items():
+            if len(sbps) > 0:
+                draw_many = _galsim.drawManyF if dt == np.float32 else _galsim.drawManyD
+                draw_many(sbps, ims, scales)
+
+    for image, (imview, prof, sbp, flux_scale) in zip(images, views):
+        if sbp is not None:
+            added_photons = imview.array.sum(dtype=float)
+        elif prof.is_analytic_x:
+            added_photons = prof.drawReal(imview, add_to_image)
+        else:
+            added_photons = prof.drawFFT(imview, add_to_image)
+        image.added_flux = added_photons / flux_scale
+
+    return images
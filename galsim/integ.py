@@ -141,6 +141,14 @@ def trapzRule(f, xs):
     return result
 
 
+def _rule_repr(rule):
+    # Functions like midptRule don't have a useful repr, but module.name is fine for them.
+    if hasattr(rule, '__module__') and hasattr(rule, '__name__'):
+        return '%s.%s'%(rule.__module__, rule.__name__)
+    else:
+        return repr(rule)
+
+
 class ImageIntegrator(object):
     def __init__(self):
         raise NotImplementedError("Must instantiate subclass of ImageIntegrator")
@@ -150,6 +158,22 @@ class ImageIntegrator(object):
     # 2) an function attribute `.rule` which takes an integrand function as its first
     #    argument, and a list of evaluation wavelengths as its second argument, and returns
     #    an approximation to the integral.  (E.g., the function midptRule above)
+    # 3) an attribute `.batch`, which says whether to draw all the wavelengths at once.
+
+    def calculateWeights(self, waves):
+        """Calculate the weight that the integration rule gives to each wavelength.
+
+        This requires the rule to be linear in the values of the integrand, as midptRule and
+        trapzRule are.
+
+        @param waves    The wavelengths at which the integrand is evaluated.
+
+        @returns a numpy array with the weight for each wavelength.
+        """
+        waves = np.asarray(waves, dtype=float)
+        # Integrating a function that is 1 at one wavelength and 0 at the others gives the
+        # weight for that wavelength.  Do them all at once by using arrays for the values.
+        return np.asarray(self.rule(lambda w: (waves == w).astype(float), waves))
 
     def __call__(self, evaluateAtWavelength, bandpass, image, drawImageKwargs, doK=False):
         """
@@ -167,6 +191,13 @@ class ImageIntegrator(object):
         self.last_n_eval = len(waves)
         drawImageKwargs.pop('add_to_image', None) # Make sure add_to_image isn't in kwargs
 
+        # Photon shooting and sensors are not linear in the profile in the same way, so those
+        # always draw each wavelength separately.
+        if (getattr(self, 'batch', False) and drawImageKwargs.get('method', 'auto') != 'phot' and
+                drawImageKwargs.get('sensor', None) is None):
+            return self._drawBatch(evaluateAtWavelength, bandpass, waves, image,
+                                   drawImageKwargs, doK)
+
         def integrand(w):
             prof = evaluateAtWavelength(w) * bandpass(w)
             if not doK:
@@ -175,6 +206,22 @@ class ImageIntegrator(object):
                 return prof.drawKImage(image=image.copy(), **drawImageKwargs)
         return self.rule(integrand, waves)
 
+    def _drawBatch(self, evaluateAtWavelength, bandpass, waves, image, drawImageKwargs, doK):
+        # Drawing is linear in the profile, so the weighted sum of the images at each wavelength
+        # is the image of the weighted sum of the profiles.  Drawing the sum does everything in
+        # a single call to the C++ layer, and in particular for FFT drawing, it only needs one
+        # FFT rather than one for each wavelength.
+        from .sum import Add
+        weights = self.calculateWeights(waves) * bandpass(np.asarray(waves, dtype=float))
+        profs = [evaluateAtWavelength(w) * wt for w, wt in zip(waves, weights) if wt != 0.]
+        if len(profs) == 0:
+            profs = [evaluateAtWavelength(waves[0]) * 0.]
+        prof = Add(profs)
+        if not doK:
+            return prof.drawImage(image=image.copy(), **drawImageKwargs)
+        else:
+            return prof.drawKImage(image=image.copy(), **drawImageKwargs)
+
 
 class SampleIntegrator(ImageIntegrator):
     """Create a chromatic surface brightness profile integrator, which will integrate over
@@ -188,9 +235,20 @@ class SampleIntegrator(ImageIntegrator):
                         brightness samples.  Options include:
                             galsim.integ.midptRule  --  Use the midpoint integration rule
                             galsim.integ.trapzRule  --  Use the trapezoidal integration rule
+    @param batch        Whether to draw all of the wavelengths at once, as a single weighted sum
+                        of the monochromatic profiles, rather than drawing each one separately
+                        and adding up the images.  This is much faster, especially for FFT
+                        drawing, which then only needs a single FFT.  The results are equal up
+                        to the accuracy of the drawing (the FFT size is set by the sum rather than
+                        by each profile separately).  Photon shooting always draws each wavelength
+                        separately.  [default: False]
     """
-    def __init__(self, rule):
+    def __init__(self, rule, batch=False):
         self.rule = rule
+        self.batch = batch
+
+    def __repr__(self):
+        return 'galsim.integ.SampleIntegrator(%s, batch=%r)'%(_rule_repr(self.rule), self.batch)
 
     def calculateWaves(self, bandpass):
         return bandpass.wave_list
@@ -218,11 +276,18 @@ class ContinuousIntegrator(ImageIntegrator):
                         generally sampled, (only the midpoint between each integration limit and
                         its nearest interior point is sampled), thus `use_endpoints` should be
                         set to False in this case.  [default: True]
+    @param batch        Whether to draw all of the wavelengths at once.  See SampleIntegrator
+                        for details.  [default: False]
     """
-    def __init__(self, rule, N=250, use_endpoints=True):
+    def __init__(self, rule, N=250, use_endpoints=True, batch=False):
         self.rule = rule
         self.N = N
         self.use_endpoints = use_endpoints
+        self.batch = batch
+
+    def __repr__(self):
+        return 'galsim.integ.ContinuousIntegrator(%s, N=%r, use_endpoints=%r, batch=%r)'%(
+                _rule_repr(self.rule), self.N, self.use_endpoints, self.batch)
 
     def calculateWaves(self, bandpass):
         h = (bandpass.red_limit*1.0 - bandpass.blue_limit)/self.N
@@ -230,3 +295,183 @@ class ContinuousIntegrator(ImageIntegrator):
             return [bandpass.blue_limit + h * i for i in range(self.N+1)]
         else:
             return [bandpass.blue_limit + h * (i+0.5) for i in range(self.N)]
+
+
+class AdaptiveIntegrator(ImageIntegrator):
+    """Create a chromatic surface brightness profile integrator, which will integrate over
+    wavelength using a Bandpass as a weight function, choosing the wavelengths at which to
+    evaluate the integrand adaptively.
+
+    The integrand is first evaluated at `N+1` equally spaced wavelengths from
+    `bandpass.blue_limit` to `bandpass.red_limit`.  Then each interval between successive
+    wavelengths is split in half if the monochromatic image at its midpoint differs from the
+    linear interpolation between the images at its ends by more than the allowed error.  This
+    continues until all intervals are accurate enough, or `max_n` images have been drawn.  So
+    objects whose images change slowly with wavelength need few evaluations, and the
+    evaluations for the others are concentrated where they are needed.
+
+    The images are treated as varying linearly between the final wavelengths, and this is
+    integrated exactly against the bandpass throughput.  So sharp features in the throughput do
+    not themselves need more evaluations of the integrand.  Each image is added to the result as
+    soon as the intervals on both sides of it are final, so only the images at the ends of the
+    intervals still being refined are kept in memory, not all of the images drawn.
+
+    The number of images drawn is available afterwards as `last_n_eval`.
+
+    Photon shooting is not recommended with this integrator, since the shot noise in each image
+    would make every interval look inaccurate.
+
+    @param rel_err      The maximum error to allow in each interval, relative to the peak value of
+                        the integrated image.  (It is actually relative to an upper bound on the
+                        peak value, so it is somewhat conservative.)  [default: 1.e-4]
+    @param N            The number of intervals to start with. [default: 8]
+    @param max_n        The maximum number of images to draw. [default: 250]
+    """
+    def __init__(self, rel_err=1.e-4, N=8, max_n=250):
+        if rel_err <= 0.:
+            raise GalSimRangeError("rel_err must be positive", rel_err, 0.)
+        if N < 1:
+            raise GalSimRangeError("N must be at least 1", N, 1)
+        if max_n < N+1:
+            raise GalSimRangeError("max_n must be at least N+1", max_n, N+1)
+        self.rel_err = float(rel_err)
+        self.N = int(N)
+        self.max_n = int(max_n)
+
+    def __repr__(self):
+        return 'galsim.integ.AdaptiveIntegrator(rel_err=%r, N=%r, max_n=%r)'%(
+                self.rel_err, self.N, self.max_n)
+
+    def calculateWaves(self, bandpass):
+        """Return the initial wavelengths at which to evaluate the integrand.
+        """
+        return list(np.linspace(bandpass.blue_limit, bandpass.red_limit, self.N+1))
+
+    @staticmethod
+    def _bandpassGrid(bandpass):
+        # A grid on which to integrate the throughput.  Include the bandpass's own wavelengths,
+        # so its features are integrated accurately.
+        grid = np.linspace(bandpass.blue_limit, bandpass.red_limit, 1001)
+        if len(bandpass.wave_list) > 0:
+            bp_waves = np.asarray(bandpass.wave_list, dtype=float)
+            bp_waves = bp_waves[(bp_waves >= grid[0]) & (bp_waves <= grid[-1])]
+            grid = np.union1d(grid, bp_waves)
+        return grid
+
+    @staticmethod
+    def _hatWeight(grid, bandpass, lo, w, hi):
+        # The integral of the throughput times a piecewise linear function that is 1 at w and 0
+        # at lo and hi (and outside of them).  lo or hi may be None if w is the first or last
+        # wavelength, in which case the function is 1 to that end of the grid.
+        xp = [ x for x in (lo, w, hi) if x is not None ]
+        fp = [ 1. if x == w else 0. for x in xp ]
+        a = grid[0] if lo is None else lo
+        b = grid[-1] if hi is None else hi
+        sub = np.union1d(grid[(grid > a) & (grid < b)], [a, w, b])
+        # The trapezoid rule weights for the sub-grid points.
+        dsub = np.diff(sub)
+        sub_weights = np.zeros(len(sub))
+        sub_weights[:-1] += 0.5 * dsub
+        sub_weights[1:] += 0.5 * dsub
+        sub_weights *= bandpass(sub)
+        return np.dot(np.interp(sub, xp, fp), sub_weights)
+
+    def calculateBandpassWeights(self, waves, bandpass):
+        """Calculate the weight for each wavelength of a piecewise linear function that is 1 at
+        that wavelength and 0 at the others, integrated against the bandpass throughput.
+
+        @param waves    The (sorted) wavelengths at which the integrand was evaluated.
+        @param bandpass The Bandpass to use as the weight function.
+
+        @returns a numpy array with the weight for each wavelength.
+        """
+        waves = np.asarray(waves, dtype=float)
+        grid = self._bandpassGrid(bandpass)
+        n = len(waves)
+        weights = np.empty(n)
+        for i in range(n):
+            lo = waves[i-1] if i > 0 else None
+            hi = waves[i+1] if i < n-1 else None
+            weights[i] = self._hatWeight(grid, bandpass, lo, waves[i], hi)
+        return weights
+
+    def __call__(self, evaluateAtWavelength, bandpass, image, drawImageKwargs, doK=False):
+        """
+        @param evaluateAtWavelength Function that returns a monochromatic surface brightness
+                                    profile as a function of wavelength.
+        @param bandpass             Bandpass object representing the filter being imaged through.
+        @param image                Image used to set size and scale of output
+        @param drawImageKwargs      dict with other kwargs to send to drawImage function.
+        @param doK                  Integrate up results of drawKImage instead of results of
+                                    drawImage.  [default: False]
+
+        @returns the result of integral as an Image
+        """
+        from collections import deque
+        drawImageKwargs.pop('add_to_image', None) # Make sure add_to_image isn't in kwargs
+
+        def draw(w):
+            prof = evaluateAtWavelength(w)
+            if not doK:
+                return prof.drawImage(image=image.copy(), **drawImageKwargs)
+            else:
+                return prof.drawKImage(image=image.copy(), **drawImageKwargs)
+
+        waves = self.calculateWaves(bandpass)
+        images = dict((w, draw(w)) for w in waves)
+        n_eval = len(waves)
+
+        # The weight of each interval is the integral of the throughput over it.
+        grid = self._bandpassGrid(bandpass)
+        throughput = bandpass(grid)
+        cumulative = np.concatenate(([0.], np.cumsum(0.5 * (throughput[1:] + throughput[:-1])
+                                                     * np.diff(grid))))
+        def interval_weight(a, b):
+            return np.interp(b, grid, cumulative) - np.interp(a, grid, cumulative)
+
+        # An upper bound on the peak value of the integral.
+        peak = max(np.max(np.abs(im.array)) for im in images.values()) * cumulative[-1]
+        tol = self.rel_err * peak
+
+        # Once both intervals next to a wavelength are final, its weight is known, so add its
+        # image to the result and let it go.  This way we only keep the images at the ends of
+        # the intervals still waiting to be tested, rather than all max_n of them.
+        left = { waves[0] : None }
+        right = { waves[-1] : None }
+        result = [ None ]
+        def finalize(a, b):
+            right[a] = b
+            left[b] = a
+            for w in (a, b):
+                if w in left and w in right:
+                    wt = self._hatWeight(grid, bandpass, left[w], w, right[w])
+                    im = images.pop(w)
+                    if result[0] is None:
+                        im *= wt
+                        result[0] = im
+                    else:
+                        result[0].array[:,:] += wt * im.array
+
+        # Split intervals breadth first, so if we hit max_n, the refinement is still fairly even.
+        intervals = deque(zip(waves[:-1], waves[1:]))
+        while intervals and n_eval < self.max_n:
+            a, b = intervals.popleft()
+            m = 0.5 * (a + b)
+            if m == a or m == b:  # pragma: no cover  (Only possible from rounding.)
+                finalize(a, b)
+                continue
+            images[m] = draw(m)
+            n_eval += 1
+            diff = np.max(np.abs(images[m].array - 0.5 * (images[a].array + images[b].array)))
+            if diff * interval_weight(a, b) > tol:
+                intervals.append((a, m))
+                intervals.append((m, b))
+            else:
+                finalize(a, m)
+                finalize(m, b)
+        # If we hit max_n, the remaining intervals are final as they are.
+        for a, b in intervals:
+            finalize(a, b)
+
+        self.last_n_eval = n_eval
+        return result[0]
@@ -690,6 +690,10 @@ class InterpolatedImage(GSObject):
     def _drawReal(self, image):
         self._sbp.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._sbp
+
     @doc_inherit
     def _drawKImage(self, image):
         self._sbp.drawK(image._image, image.scale)
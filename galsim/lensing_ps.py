@@ -228,6 +228,15 @@ class PowerSpectrum(object):
 
     def __hash__(self): return hash(repr(self))
 
+    def __getstate__(self):
+        # The cached interpolators are not picklable, so remake them as needed after unpickling.
+        d = self.__dict__.copy()
+        d['_interp_cache'] = {}
+        return d
+
+    def __setstate__(self, d):
+        self.__dict__ = d
+
     def _get_scale_fac(self, units):
         if isinstance(units, str):
             # if the string is invalid, this raises a reasonable error message.
@@ -551,6 +560,9 @@ class PowerSpectrum(object):
         self.im_g1 = ImageD(self.grid_g1, scale=self.grid_spacing)
         self.im_g2 = ImageD(self.grid_g2, scale=self.grid_spacing)
         self.im_kappa = ImageD(self.grid_kappa, scale=self.grid_spacing)
+        # The interpolators for these images (and for the reduced shear and magnification) are
+        # made as needed by getShear, etc. and then cached until the next call to buildGrid.
+        self._interp_cache = {}
 
         if get_convergence:
             return self.grid_g1, self.grid_g2, self.grid_kappa
@@ -927,63 +939,14 @@ class PowerSpectrum(object):
 
         @returns the (possibly reduced) shears as a tuple (g1,g2) (either scalars or numpy arrays)
         """
-        kinterp = Quintic()  # Irrelevant, but required.
-
-        im_g1 = self.im_g1
-        im_g2 = self.im_g2
-        kinterp = Quintic()
-
         if reduced:
-            # get reduced shear (just discard magnification)
-            g1, g2, _ = theoryToObserved(im_g1.array, im_g2.array, self.im_kappa.array)
-            im_g1 = ImageD(g1, scale=self.grid_spacing)
-            im_g2 = ImageD(g2, scale=self.grid_spacing)
-
-        if periodic:
-            # Make an expanded image.  We expand by 7 (default) to be safe, though most
-            # interpolants don't need that much.  Note that we do NOT overwrite the stored data
-            # in the PowerSpectrum instance with anything that is done here, so what's being
-            # done here must be redone in subsequent calls to getShear with periodic
-            # interpolation.
-            im_g1 = self._wrap_image(im_g1)
-            im_g2 = self._wrap_image(im_g2)
-
-        # Make an InterpolatedImage, which will do the heavy lifting for the interpolation.
-        # However, if we are doing wrapped interpolation then we will want to manually stick the
-        # wrapped grid bits around the edges, because otherwise the interpolant will treat
-        # everything off the edges as zero.
-        ii_g1 = _InterpolatedImage(im_g1, self.interpolant, kinterp) * self.grid_spacing**2
-        ii_g2 = _InterpolatedImage(im_g2, self.interpolant, kinterp) * self.grid_spacing**2
-
-        # interpolate if necessary
-        try:
-            g1g2 = [ self._getSingleShear(x, y, ii_g1, ii_g2, periodic)
-                     for x,y in zip(pos_x, pos_y) ]
-            g1, g2 = zip(*g1g2)
-            return np.array(g1), np.array(g2)
-        except TypeError:
-            return self._getSingleShear(pos_x, pos_y, ii_g1, ii_g2, periodic)
-
-    def _getSingleShear(self, x, y, ii_g1, ii_g2, periodic):
-        """Helper function for _getShear"""
-        # Check that the position is in the bounds of the interpolated image
-        pos = PositionD(x,y)
-        if not self.bounds.includes(pos):
-            if not periodic:
-                # We're not treating this as a periodic box, so issue a warning and set the
-                # shear to zero for positions that are outside the original grid.
-                galsim_warn(
-                    "Warning: position (%f,%f) not within the bounds (%s) of the gridded shear "
-                    "values.  Returning a shear of (0,0) for this point."%(x,y,self.bounds))
-                return 0., 0.
-            else:
-                # Treat this as a periodic box.
-                dx = self.bounds.xmax-self.bounds.xmin
-                dy = self.bounds.ymax-self.bounds.ymin
-                pos = PositionD((x-self.bounds.xmin) % dx + self.bounds.xmin,
-                                (y-self.bounds.ymin) % dy + self.bounds.ymin)
-        g1 = ii_g1._xValue(pos-self.center)
-        g2 = ii_g2._xValue(pos-self.center)
+            names = ('g1_r', 'g2_r')
+        else:
+            names = ('g1', 'g2')
+        g1, g2 = self._interpolate(
+            pos_x, pos_y, names, periodic,
+            "Warning: %s not within the bounds (%s) of the gridded shear values.  "
+            "Returning a shear of (0,0) for %s.")
         return g1, g2
 
     def getConvergence(self, pos, units=arcsec, periodic=False):
@@ -1038,48 +1001,11 @@ class PowerSpectrum(object):
 
         @returns the convergence, kappa (either a scalar or a numpy array)
         """
-        kinterp = Quintic()  # Irrelevant, but required.
-
-        im_kappa = self.im_kappa
-        kinterp = Quintic()
-
-        if periodic:
-            # Make an expanded bounds.  We expand by 7 (default) to be safe, though most
-            # interpolants don't need that much.
-            im_kappa = self._wrap_image(im_kappa)
-
-        # Make an InterpolatedImage, which will do the heavy lifting for the interpolation.
-        # However, if we are doing wrapped interpolation then we will want to manually stick the
-        # wrapped grid bits around the edges, because otherwise the interpolant will treat
-        # everything off the edges as zero.
-        ii_kappa = _InterpolatedImage(im_kappa, self.interpolant, kinterp) * self.grid_spacing**2
-
-        # interpolate if necessary
-        try:
-            k = [ self._getSingleConvergence(x, y, ii_kappa, periodic)
-                  for x,y in zip(pos_x, pos_y) ]
-            return np.array(k)
-        except TypeError:
-            return self._getSingleConvergence(pos_x, pos_y, ii_kappa, periodic)
-
-    def _getSingleConvergence(self, x, y, ii_kappa, periodic):
-        """Helper function for _getConvergence"""
-        pos = PositionD(x,y)
-        # Check that the position is in the bounds of the interpolated image
-        if not self.bounds.includes(pos):
-            if not periodic:
-                galsim_warn(
-                    "Warning: position (%f,%f) not within the bounds (%s) of the gridded "
-                    "convergence values. Returning a convergence of 0 for this point."%(
-                    x,y,self.bounds))
-                return 0.
-            else:
-                # Treat this as a periodic box.
-                dx = self.bounds.xmax-self.bounds.xmin
-                dy = self.bounds.ymax-self.bounds.ymin
-                pos = PositionD((x-self.bounds.xmin) % dx + self.bounds.xmin,
-                                (y-self.bounds.ymin) % dy + self.bounds.ymin)
-        return ii_kappa._xValue(pos-self.center)
+        kappa, = self._interpolate(
+            pos_x, pos_y, ('kappa',), periodic,
+            "Warning: %s not within the bounds (%s) of the gridded convergence values. "
+            "Returning a convergence of 0 for %s.")
+        return kappa
 
     def getMagnification(self, pos, units=arcsec, periodic=False):
         """
@@ -1134,50 +1060,12 @@ class PowerSpectrum(object):
 
         @returns the magnification, mu (either a scalar or a numpy array)
         """
-        kinterp = Quintic()  # Irrelevant, but required.
-
-        # Calculate the magnification based on the convergence and shear
-        _, _, mu = theoryToObserved(self.im_g1.array, self.im_g2.array, self.im_kappa.array)
-        # Interpolate mu-1, so the zero values off the edge are appropriate.
-        im_mu = ImageD(mu-1, scale=self.grid_spacing)
-
-        if periodic:
-            # Make an expanded bounds.  We expand by 7 (default) to be safe, though most
-            # interpolants don't need that much.
-            im_mu = self._wrap_image(im_mu)
-
-        # Make an InterpolatedImage, which will do the heavy lifting for the interpolation.
-        # However, if we are doing wrapped interpolation then we will want to manually stick the
-        # wrapped grid bits around the edges, because otherwise the interpolant will treat
-        # everything off the edges as zero.
-        ii_mu = _InterpolatedImage(im_mu, self.interpolant, kinterp) * self.grid_spacing**2
-
-        # interpolate if necessary
-        try:
-            mu = [ self._getSingleMagnification(x, y, ii_mu, periodic)
-                   for x,y in zip(pos_x, pos_y) ]
-            return np.array(mu)
-        except TypeError:
-            return self._getSingleMagnification(pos_x, pos_y, ii_mu, periodic)
-
-    def _getSingleMagnification(self, x, y, ii_mu, periodic):
-        """Helper function for _getMagnification"""
-        pos = PositionD(x,y)
-        # Check that the position is in the bounds of the interpolated image
-        if not self.bounds.includes(pos):
-            if not periodic:
-                galsim_warn(
-                    "Warning: position (%f,%f) not within the bounds (%s) of the gridded "
-                    "convergence values. Returning a magnification of 1 for this point."%(
-                    x,y,self.bounds))
-                return 1.
-            else:
-                # Treat this as a periodic box.
-                dx = self.bounds.xmax-self.bounds.xmin
-                dy = self.bounds.ymax-self.bounds.ymin
-                pos = PositionD((x-self.bounds.xmin) % dx + self.bounds.xmin,
-                                (y-self.bounds.ymin) % dy + self.bounds.ymin)
-        return ii_mu._xValue(pos-self.center) + 1.
+        # We interpolate mu-1, so the zero values off the edge are appropriate.
+        mu, = self._interpolate(
+            pos_x, pos_y, ('mu',), periodic,
+            "Warning: %s not within the bounds (%s) of the gridded convergence values. "
+            "Returning a magnification of 1 for %s.")
+        return mu + 1.
 
     def getLensing(self, pos, units=arcsec, periodic=False):
         """
@@ -1235,59 +1123,105 @@ class PowerSpectrum(object):
         @returns the reduced shear and magnification as a tuple (g1,g2,mu) (either scalars or
                  numpy arrays)
         """
-        kinterp = Quintic()  # Irrelevant, but required.
+        g1, g2, mu = self._interpolate(
+            pos_x, pos_y, ('g1_r', 'g2_r', 'mu'), periodic,
+            "Warning: %s not within the bounds (%s) of the gridded values. "
+            "Returning 0 for lensing observables at %s.")
+        return g1, g2, mu + 1.
+
+    def _get_interpolator(self, name, periodic):
+        """Get the InterpolatedImage that interpolates one of the gridded quantities.
+
+        The valid names are 'g1', 'g2', 'kappa' for the quantities calculated by buildGrid,
+        and 'g1_r', 'g2_r', 'mu' for the reduced shear and the magnification minus 1.
+        These are cached, so they only need to be made once for each realization.
+
+        Note: The whole Python object is cached, not just its _sbp, since the C++ object only
+        holds references to the interpolants, which need to be kept alive.
+        """
+        key = (name, periodic)
+        if key in self._interp_cache:
+            return self._interp_cache[key]
 
-        # Calculate the magnification based on the convergence and shear
-        g1, g2, mu = theoryToObserved(self.im_g1.array, self.im_g2.array, self.im_kappa.array)
-        im_g1 = ImageD(g1, scale=self.grid_spacing)
-        im_g2 = ImageD(g2, scale=self.grid_spacing)
-        im_mu = ImageD(mu-1, scale=self.grid_spacing)
+        if name in ('g1', 'g2', 'kappa'):
+            im = getattr(self, 'im_' + name)
+        else:
+            if 'observed' not in self._interp_cache:
+                g1, g2, mu = theoryToObserved(self.im_g1.array, self.im_g2.array,
+                                              self.im_kappa.array)
+                # Interpolate mu-1, so the zero values off the edge are appropriate.
+                self._interp_cache['observed'] = {
+                    'g1_r' : ImageD(g1, scale=self.grid_spacing),
+                    'g2_r' : ImageD(g2, scale=self.grid_spacing),
+                    'mu' : ImageD(mu-1, scale=self.grid_spacing) }
+            im = self._interp_cache['observed'][name]
 
         if periodic:
-            # Make an expanded bounds.  We expand by 7 (default) to be safe, though most
-            # interpolants don't need that much.
-            im_mu = self._wrap_image(im_mu)
-            im_g1 = self._wrap_image(im_g1)
-            im_g2 = self._wrap_image(im_g2)
+            # Make an expanded image.  We expand by 7 (default) to be safe, though most
+            # interpolants don't need that much.  Otherwise the interpolant would treat everything
+            # off the edges as zero.
+            im = self._wrap_image(im)
 
         # Make an InterpolatedImage, which will do the heavy lifting for the interpolation.
-        # However, if we are doing wrapped interpolation then we will want to manually stick the
-        # wrapped grid bits around the edges, because otherwise the interpolant will treat
-        # everything off the edges as zero.
-        ii_g1 = _InterpolatedImage(im_g1, self.interpolant, kinterp) * self.grid_spacing**2
-        ii_g2 = _InterpolatedImage(im_g2, self.interpolant, kinterp) * self.grid_spacing**2
-        ii_mu = _InterpolatedImage(im_mu, self.interpolant, kinterp) * self.grid_spacing**2
-
-        # interpolate if necessary
-        try:
-            g1g2mu = [ self._getSingleLensing(x, y, ii_g1, ii_g2, ii_mu, periodic)
-                       for x,y in zip(pos_x, pos_y) ]
-            g1, g2, mu = zip(*g1g2mu)
-            return np.array(g1), np.array(g2), np.array(mu)
-        except TypeError:
-            return self._getSingleLensing(pos_x, pos_y, ii_g1, ii_g2, ii_mu, periodic)
-
-    def _getSingleLensing(self, x, y, ii_g1, ii_g2, ii_mu, periodic):
-        """Helper function for _getLensing"""
-        pos = PositionD(x,y)
-        # Check that the position is in the bounds of the interpolated image
-        if not self.bounds.includes(pos):
-            if not periodic:
-                galsim_warn(
-                    "Warning: position (%f,%f) not within the bounds (%s) of the gridded "
-                    "values. Returning 0 for lensing observables at this point."%(x,y,self.bounds))
-                return 0., 0., 1.
+        kinterp = Quintic()  # Irrelevant, but required.
+        ii = _InterpolatedImage(im, self.interpolant, kinterp) * self.grid_spacing**2
+        self._interp_cache[key] = ii
+        return ii
+
+    def _interpolate(self, pos_x, pos_y, names, periodic, warning):
+        """Interpolate the named gridded quantities at the given positions.
+
+        All positions are evaluated together in a single C++ call for each quantity.
+        Positions outside the grid are either wrapped around (if `periodic` is True) or
+        given a value of 0, in which case a warning is emitted using the `warning` string.
+
+        @returns a list with the value of each quantity, either as scalars or numpy arrays,
+                 according to the input pos_x, pos_y.
+        """
+        shape = np.shape(pos_x)
+        x = np.array(pos_x, dtype=float).ravel()
+        y = np.array(pos_y, dtype=float).ravel()
+        b = self.bounds
+        inside = (x >= b.xmin) & (x <= b.xmax) & (y >= b.ymin) & (y <= b.ymax)
+        if np.all(inside):
+            u = x - self.center.x
+            v = y - self.center.y
+        elif periodic:
+            # Treat this as a periodic box.
+            dx = b.xmax - b.xmin
+            dy = b.ymax - b.ymin
+            x = np.where(inside, x, (x-b.xmin) % dx + b.xmin)
+            y = np.where(inside, y, (y-b.ymin) % dy + b.ymin)
+            u = x - self.center.x
+            v = y - self.center.y
+            inside[:] = True
+        else:
+            # We're not treating this as a periodic box, so issue a warning and set the
+            # values to zero for positions that are outside the original grid.
+            outside = np.where(~inside)[0]
+            if len(outside) == 1:
+                where = "position (%f,%f)"%(x[outside[0]], y[outside[0]])
+                which = "this point"
+            else:
+                where = "%d positions"%len(outside)
+                which = "these points"
+            galsim_warn(warning%(where, self.bounds, which))
+            u = x[inside] - self.center.x
+            v = y[inside] - self.center.y
+
+        values = []
+        for name in names:
+            ii = self._get_interpolator(name, periodic)
+            val = ii._xValueArray(u, v)
+            if len(u) != len(x):
+                full = np.zeros_like(x)
+                full[inside] = val
+                val = full
+            if shape == ():
+                values.append(float(val[0]))
             else:
-                # Treat this as a periodic box.
-                dx = self.bounds.xmax-self.bounds.xmin
-                dy = self.bounds.ymax-self.bounds.ymin
-                pos = PositionD((x-self.bounds.xmin) % dx + self.bounds.xmin,
-                                (y-self.bounds.ymin) % dy + self.bounds.ymin)
-
-        g1 = ii_g1._xValue(pos-self.center)
-        g2 = ii_g2._xValue(pos-self.center)
-        mu = ii_mu._xValue(pos-self.center) + 1.
-        return g1, g2, mu
+                values.append(val.reshape(shape))
+        return values
 
 class PowerSpectrumRealizer(object):
     """Class for generating realizations of power spectra with any area and pixel size.
@@ -68,7 +68,7 @@ Atmosphere
 from past.builtins import basestring
 from itertools import chain
 from builtins import range
-from heapq import heappush, heappop
+from heapq import heappush, heappop, heapify
 import numpy as np
 
 from .gsobject import GSObject
@@ -81,6 +81,39 @@ from .interpolatedimage import InterpolatedImage
 from .utilities import doc_inherit, OrderedWeakRef, rotate_xy, lazy_property
 from .errors import GalSimError, GalSimValueError, GalSimRangeError, GalSimIncompatibleValuesError
 from .errors import GalSimFFTSizeError, galsim_warn
+from .disk_cache import DiskCache
+
+_disk_cache = None
+
+def set_disk_cache(directory=None, max_size=2**30):
+    """Set a directory in which to save the images of PhaseScreenPSFs and OpticalPSFs.
+
+    Calculating these PSFs can be slow, so if the same PSFs are needed by many different jobs,
+    it can be worth saving them to disk.  When a directory is set, each PSF is looked for in the
+    cache before it is calculated, and is saved there afterwards.  The PSFs are identified by a
+    hash of everything that goes into the calculation (the aperture, the phase screens, lam,
+    theta, the time sampling, the gsparams, etc.), so a cached PSF is only used if it would
+    have been identical to calculating it again.
+
+    Several processes may use the same directory at once.  When the total size of the cached
+    files exceeds `max_size`, the least recently used ones are removed.
+
+    @param directory    The directory to use for the cache, or None to turn off the caching.
+                        [default: None]
+    @param max_size     The maximum total size of the cache in bytes. [default: 2**30, i.e. 1 GB]
+    """
+    global _disk_cache
+    if directory is None:
+        _disk_cache = None
+    else:
+        _disk_cache = DiskCache(directory, max_size)
+
+def get_disk_cache():
+    """Get the DiskCache used for PhaseScreenPSFs, or None if there is not one.
+    See set_disk_cache for details.
+    """
+    return _disk_cache
+
 
 class Aperture(object):
     """ Class representing a telescope aperture embedded in a larger pupil plane array -- for use
@@ -830,13 +863,21 @@ class PhaseScreenList(object):
         """Calculate previously delayed PSFs."""
         if not self._pending:
             return
+        if _disk_cache is not None:
+            # Any PSFs that are in the disk cache don't need to be calculated.
+            self._pending = [(t, psfref) for t, psfref in self._pending
+                             if psfref() is not None and not psfref()._load_from_disk_cache()]
+            heapify(self._pending)
+            if not self._pending:
+                self._update_time_heap = []
+                return
         # See if we have any dynamic screens.  If not, then we can immediately compute each PSF
         # in a simple loop.
         if not self.dynamic:
-            for _, psfref in self._pending:
-                psf = psfref()
+            psfs = [psfref() for _, psfref in self._pending]
+            PhaseScreenPSF._step_batch([psf for psf in psfs if psf is not None])
+            for psf in psfs:
                 if psf is not None:
-                    psf._step()
                     psf._finalize()
             self._pending = []
             self._update_time_heap = []
@@ -846,19 +887,24 @@ class PhaseScreenList(object):
         # careful to always stop at multiples of each PSF's time_step attribute to update that PSF.
         # Use a heap (in _pending list) to track the next time to stop at.
         while(self._pending):
-            # Get and seek to next time that has a PSF update.
+            # Get and seek to next time that has a PSF update.  All the PSFs that need an update
+            # at this time are done together, so the screens only need to seek there once.
             t, psfref = heappop(self._pending)
-            # Check if this PSF weakref is still alive
-            psf = psfref()
-            if psf is not None:
-                # If it's alive, update this PSF
+            psfrefs = [psfref]
+            while self._pending and self._pending[0][0] == t:
+                psfrefs.append(heappop(self._pending)[1])
+            # Check which of these PSF weakrefs are still alive
+            psfs = [psf for psf in (ref() for ref in psfrefs) if psf is not None]
+            if psfs:
+                # Update the ones that are alive.
                 self._seek(t)
-                psf._step()
+                PhaseScreenPSF._step_batch(psfs)
+            for psf in psfs:
                 # If that PSF's next possible update time doesn't extend past its exptime, then
                 # push it back on the heap.
-                t += psf.time_step
-                if t < psf.t0 + psf.exptime:
-                    heappush(self._pending, (t, OrderedWeakRef(psf)))
+                tnext = t + psf.time_step
+                if tnext < psf.t0 + psf.exptime:
+                    heappush(self._pending, (tnext, OrderedWeakRef(psf)))
                 else:
                     psf._finalize()
         self._pending = []
@@ -916,6 +962,20 @@ class PhaseScreenList(object):
         else:
             return self._layers[0]._wavefront(u, v, t, theta)
 
+    def _wavefront_batch(self, u, v, t, thetas):
+        # Same as _wavefront, but for a list of thetas at once.  Returns an array with shape
+        # (len(thetas),) + u.shape.
+        wfs = []
+        for layer in self:
+            if hasattr(layer, '_wavefront_batch'):
+                wfs.append(layer._wavefront_batch(u, v, t, thetas))
+            else:
+                wfs.append(np.array([layer._wavefront(u, v, t, theta) for theta in thetas]))
+        if len(wfs) > 1:
+            return np.sum(wfs, axis=0)
+        else:
+            return wfs[0]
+
     def _wavefront_gradient(self, u, v, t, theta):
         gradx, grady = self._layers[0]._wavefront_gradient(u, v, t, theta)
         for layer in self._layers[1:]:
@@ -1238,9 +1298,12 @@ class PhaseScreenPSF(GSObject):
 
     @lazy_property
     def _real_ii(self):
+        # If the image came from the disk cache, then so did stepk and maxk.
+        force_stepk = getattr(self, '_cached_stepk', self._force_stepk)
+        force_maxk = getattr(self, '_cached_maxk', self._force_maxk)
         ii = InterpolatedImage(
                 self.img, x_interpolant=self.interpolant,
-                _force_stepk=self._force_stepk, _force_maxk=self._force_maxk,
+                _force_stepk=force_stepk, _force_maxk=force_maxk,
                 pad_factor=self._ii_pad_factor,
                 use_true_center=False, gsparams=self._gsparams)
 
@@ -1328,6 +1391,9 @@ class PhaseScreenPSF(GSObject):
         ret = copy(self)
         ret._gsparams = GSParams.check(gsparams)
         ret.aper = self.aper.withGSParams(gsparams)
+        # The disk cache key and any stepk, maxk loaded from the cache depend on the gsparams.
+        for attr in ('_disk_key', '_cached_stepk', '_cached_maxk'):
+            ret.__dict__.pop(attr, None)
         return ret
 
     def __str__(self):
@@ -1368,19 +1434,48 @@ class PhaseScreenPSF(GSObject):
 
     def _step(self):
         """Compute the current instantaneous PSF and add it to the developing integrated PSF."""
+        PhaseScreenPSF._step_batch([self])
+
+    @staticmethod
+    def _step_batch(psfs):
+        """Do the equivalent of _step for each of a list of PSFs, which are all at the same time.
+
+        PSFs with the same wavelength and aperture are done together.  The wavefronts for all of
+        their thetas are evaluated in a single vectorized call and exponentiated as a single
+        stacked array, which is then Fourier transformed one slice at a time.
+        """
         from . import fft
-        u = self.aper.u[self.aper.illuminated]
-        v = self.aper.v[self.aper.illuminated]
-        # This is where I need to make sure the screens are instantiated for FFT.
-        self._screen_list.instantiate(check='FFT')
-        wf = self._screen_list._wavefront(u, v, None, self.theta)
-        expwf = np.exp((2j*np.pi/self.lam) * wf)
-        expwf_grid = np.zeros_like(self.aper.illuminated, dtype=np.complex128)
-        expwf_grid[self.aper.illuminated] = expwf
-        ftexpwf = fft.fft2(expwf_grid, shift_in=True, shift_out=True)
-        self.img += np.abs(ftexpwf)**2
-        if self._bar:  # pragma: no cover
-            self._bar.update()
+        # Group the PSFs by (lam, aper).  Use == for the apertures, since PSFs made with the
+        # same aperture keywords will each have their own (equal) Aperture instance.
+        groups = []
+        for psf in psfs:
+            for lam, aper, group in groups:
+                if psf.lam == lam and psf.aper == aper:
+                    group.append(psf)
+                    break
+            else:
+                groups.append((psf.lam, psf.aper, [psf]))
+
+        for lam, aper, group in groups:
+            screen_list = group[0]._screen_list
+            illuminated = aper.illuminated
+            u = aper.u[illuminated]
+            v = aper.v[illuminated]
+            screen_list.instantiate(check='FFT')
+            # Limit the size of the stacked arrays to about 128 MB at a time.
+            nbatch = max(1, 2**23 // illuminated.size)
+            for k in range(0, len(group), nbatch):
+                batch = group[k:k+nbatch]
+                thetas = [psf.theta for psf in batch]
+                wf = screen_list._wavefront_batch(u, v, None, thetas)
+                expwf = np.exp((2j*np.pi/lam) * wf)
+                expwf_grid = np.zeros((len(batch),) + illuminated.shape, dtype=np.complex128)
+                expwf_grid[:, illuminated] = expwf
+                for psf, grid in zip(batch, expwf_grid):
+                    ftexpwf = fft.fft2(grid, shift_in=True, shift_out=True)
+                    psf.img += np.abs(ftexpwf)**2
+                    if psf._bar:  # pragma: no cover
+                        psf._bar.update()
 
     def _finalize(self):
         """Take accumulated integrated PSF image and turn it into a proper GSObject."""
@@ -1390,6 +1485,50 @@ class PhaseScreenPSF(GSObject):
 
         self.finalized = True
 
+        if _disk_cache is not None:
+            ii = self._real_ii
+            _disk_cache.save(self._disk_cache_key(), img=self.img.array,
+                             stepk=ii.stepk, maxk=ii.maxk)
+
+    def _disk_cache_key(self):
+        """The key to use for this PSF in the disk cache.
+
+        This includes everything that affects the finalized image or its stepk and maxk.
+        """
+        from ._version import __version__
+        if not hasattr(self, '_disk_key'):
+            screens = []
+            for layer in self._screen_list:
+                # Screens that haven't been instantiated yet will be instantiated for FFT drawing.
+                kmin = getattr(layer, 'kmin', None)
+                kmax = getattr(layer, 'kmax', None)
+                if kmax is None:
+                    kmin, kmax = 0., np.inf
+                screens.append((repr(layer), kmin, kmax))
+            self._disk_key = DiskCache.key(
+                    'galsim.PhaseScreenPSF', __version__, screens,
+                    self.aper.illuminated, self.aper.pupil_plane_size, self.lam,
+                    self.theta[0].rad, self.theta[1].rad, self.scale,
+                    self.t0, self.exptime, self.time_step, self._flux,
+                    self.interpolant, self._ii_pad_factor, self._force_stepk, self._force_maxk,
+                    self.gsparams)
+        return self._disk_key
+
+    def _load_from_disk_cache(self):
+        """Try to load the finalized image from the disk cache.
+
+        @returns whether it was found.
+        """
+        arrays = _disk_cache.load(self._disk_cache_key())
+        if arrays is None:
+            return False
+        b = _BoundsI(1,self.aper.npix,1,self.aper.npix)
+        self.img = _Image(arrays['img'], b, PixelScale(self.scale))
+        self._cached_stepk = float(arrays['stepk'])
+        self._cached_maxk = float(arrays['maxk'])
+        self.finalized = True
+        return True
+
     @property
     def _sbp(self):
         return self._ii._sbp
@@ -1447,6 +1586,10 @@ class PhaseScreenPSF(GSObject):
     def _drawReal(self, image):
         self._ii._drawReal(image)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._ii._realSBP()
+
     @doc_inherit
     def _shoot(self, photons, ud):
         from .photon_array import PhotonArray
@@ -1479,7 +1622,7 @@ class PhaseScreenPSF(GSObject):
         photons.flux = self._flux / n_photons
 
         if self.second_kick:
-            p2 = PhotonArray(len(photons))
+            p2 = PhotonArray(len(photons), dtype=photons.dtype)
             self.second_kick._shoot(p2, ud)
             photons.convolve(p2, ud)
 
@@ -1904,6 +2047,10 @@ class OpticalPSF(GSObject):
     def _drawReal(self, image):
         self._psf._drawReal(image)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._psf._realSBP()
+
     @doc_inherit
     def _shoot(self, photons, ud):
         self._psf._shoot(photons, ud)
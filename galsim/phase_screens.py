@@ -377,6 +377,18 @@ class AtmosphericScreen(object):
         v = v - t*self.vy + 1000*self.altitude*theta[1].tan()
         return self._tab2d(u, v)
 
+    def _wavefront_batch(self, u, v, t, thetas):
+        # Same as _wavefront, but for a list of thetas at once.  Returns an array with shape
+        # (len(thetas),) + u.shape.
+        if t is None:
+            t = self._time
+        alt = 1000*self.altitude
+        dx = np.array([alt*th[0].tan() for th in thetas])
+        dy = np.array([alt*th[1].tan() for th in thetas])
+        u = (u - t*self.vx)[np.newaxis,...] + dx.reshape((-1,)+(1,)*u.ndim)
+        v = (v - t*self.vy)[np.newaxis,...] + dy.reshape((-1,)+(1,)*v.ndim)
+        return self._tab2d(u.ravel(), v.ravel()).reshape(u.shape)
+
     def wavefront_gradient(self, u, v, t=None, theta=(0.0*radians, 0.0*radians)):
         """ Compute gradient of wavefront due to atmospheric phase screen.
 
@@ -755,6 +767,12 @@ class OpticalScreen(object):
         # Note, this phase screen is actually independent of time and theta.
         return self._zernike.evalCartesian(u, v) * self.lam_0
 
+    def _wavefront_batch(self, u, v, t, thetas):
+        # Same as _wavefront, but for a list of thetas at once.
+        # Since this screen doesn't depend on theta, just repeat the single result.
+        wf = self._wavefront(u, v, t, None)
+        return np.broadcast_to(wf, (len(thetas),) + wf.shape)
+
     def wavefront_gradient(self, u, v, t=None, theta=None):
         """ Compute gradient of wavefront due to optical phase screen.
 
@@ -87,13 +87,24 @@ class PhotonArray(object):
     @param dxdz         Optionally, the initial dxdz values. [default: None]
     @param dydz         Optionally, the initial dydz values. [default: None]
     @param wavelength   Optionally, the initial wavelength values. [default: None]
+    @param dtype        The numpy data type to use for all of the arrays.  This may be either
+                        numpy.float64 or numpy.float32.  The latter uses half the memory, which
+                        lets you shoot twice as many photons at a time for the same memory, at
+                        the cost of precision in the values (about 1.e-7 relative).
+                        [default: numpy.float64]
     """
-    def __init__(self, N, x=None, y=None, flux=None, dxdz=None, dydz=None, wavelength=None):
+    _valid_dtypes = (np.float64, np.float32)
+
+    def __init__(self, N, x=None, y=None, flux=None, dxdz=None, dydz=None, wavelength=None,
+                 dtype=np.float64):
+        dtype = np.dtype(dtype).type
+        if dtype not in self._valid_dtypes:
+            raise GalSimValueError("Invalid dtype for PhotonArray", dtype, self._valid_dtypes)
         # Only x, y, flux are built by default, since these are always required.
         # The others we leave as None unless/until they are needed.
-        self._x = np.zeros(N, dtype=float)
-        self._y = np.zeros(N, dtype=float)
-        self._flux = np.zeros(N, dtype=float)
+        self._x = np.zeros(N, dtype=dtype)
+        self._y = np.zeros(N, dtype=dtype)
+        self._flux = np.zeros(N, dtype=dtype)
         self._dxdz = None
         self._dydz = None
         self._wave = None
@@ -110,6 +121,12 @@ class PhotonArray(object):
     def size(self):
         return len(self._x)
 
+    @property
+    def dtype(self):
+        """The numpy data type of the arrays (either numpy.float64 or numpy.float32).
+        """
+        return self._x.dtype.type
+
     def __len__(self):
         return len(self._x)
 
@@ -224,6 +241,8 @@ class PhotonArray(object):
             s += ", dxdz=array(%r), dydz=array(%r)"%(self.dxdz.tolist(), self.dydz.tolist())
         if self.hasAllocatedWavelengths():
             s += ", wavelength=array(%r)"%(self.wavelength.tolist())
+        if self.dtype != np.float64:
+            s += ", dtype=%s"%(self.dtype.__name__)
         s += ")"
         return s
 
@@ -267,7 +286,7 @@ class PhotonArray(object):
             _wave = self._wave.ctypes.data
         with convert_cpp_errors():
             return _galsim.PhotonArray(int(self.size()), _x, _y, _flux, _dxdz, _dydz, _wave,
-                                       self._is_corr)
+                                       self._is_corr, self.dtype == np.float32)
 
     def addTo(self, image):
         """Add flux of photons to an image by binning into pixels.
@@ -287,7 +306,7 @@ class PhotonArray(object):
         return self._pa.addTo(image._image)
 
     @classmethod
-    def makeFromImage(cls, image, max_flux=1., rng=None):
+    def makeFromImage(cls, image, max_flux=1., rng=None, dtype=np.float64):
         """Turn an existing image into a PhotonArray that would accumulate into this image.
 
         The flux in each non-zero pixel will be turned into 1 or more photons with random positions
@@ -301,6 +320,7 @@ class PhotonArray(object):
         @param image        The image to turn into a PhotonArray
         @param max_flux     The maximum flux value to use for any output photon [default: 1]
         @param rng          A BaseDeviate to use for the random number generation [default: None]
+        @param dtype        The numpy data type to use for the arrays [default: numpy.float64]
 
         @returns a PhotonArray
         """
@@ -313,7 +333,7 @@ class PhotonArray(object):
         # This goes a bit over what we actually need, but not by much.  Worth it to not have to
         # worry about array reallocations.
         N = int(np.prod(image.array.shape) + total_flux / max_flux)
-        photons = cls(N)
+        photons = cls(N, dtype=dtype)
 
         N = photons._pa.setFrom(image._image, max_flux, ud._rng)
         photons._x = photons.x[:N]
@@ -330,7 +350,8 @@ class PhotonArray(object):
         The output file will be a FITS binary table with a row for each photon in the PhotonArray.
         Columns will include 'id' (sequential from 1 to nphotons), 'x', 'y', and 'flux'.
         Additionally, the columns 'dxdz', 'dydz', and 'wavelength' will be included if they are
-        set for this PhotonArray object.
+        set for this PhotonArray object.  The columns are single precision if the PhotonArray
+        uses float32 arrays.
 
         The file can be read back in with the classmethod `PhotonArray.read`.
 
@@ -342,18 +363,20 @@ class PhotonArray(object):
         from ._pyfits import pyfits
         from . import fits
 
+        # Use single precision columns for float32 arrays.
+        fmt = 'E' if self.dtype == np.float32 else 'D'
         cols = []
         cols.append(pyfits.Column(name='id', format='J', array=range(self.size())))
-        cols.append(pyfits.Column(name='x', format='D', array=self.x))
-        cols.append(pyfits.Column(name='y', format='D', array=self.y))
-        cols.append(pyfits.Column(name='flux', format='D', array=self.flux))
+        cols.append(pyfits.Column(name='x', format=fmt, array=self.x))
+        cols.append(pyfits.Column(name='y', format=fmt, array=self.y))
+        cols.append(pyfits.Column(name='flux', format=fmt, array=self.flux))
 
         if self.hasAllocatedAngles():
-            cols.append(pyfits.Column(name='dxdz', format='D', array=self.dxdz))
-            cols.append(pyfits.Column(name='dydz', format='D', array=self.dydz))
+            cols.append(pyfits.Column(name='dxdz', format=fmt, array=self.dxdz))
+            cols.append(pyfits.Column(name='dydz', format=fmt, array=self.dydz))
 
         if self.hasAllocatedWavelengths():
-            cols.append(pyfits.Column(name='wavelength', format='D', array=self.wavelength))
+            cols.append(pyfits.Column(name='wavelength', format=fmt, array=self.wavelength))
 
         cols = pyfits.ColDefs(cols)
         try:
@@ -380,7 +403,7 @@ class PhotonArray(object):
         N = len(data)
         names = data.columns.names
 
-        photons = cls(N, x=data['x'], y=data['y'], flux=data['flux'])
+        photons = cls(N, x=data['x'], y=data['y'], flux=data['flux'], dtype=data['x'].dtype)
         if 'dxdz' in names:
             photons.dxdz = data['dxdz']
             photons.dydz = data['dydz']
@@ -33,13 +33,14 @@ page on the GalSim Wiki: https://github.com/GalSim-developers/GalSim/wiki/RealGa
 
 
 import os
+import weakref
 import numpy as np
 
 from .gsobject import GSObject
 from .gsparams import GSParams
 from .chromatic import ChromaticSum
 from .position import PositionD
-from .utilities import lazy_property, doc_inherit, convert_interpolant
+from .utilities import lazy_property, doc_inherit, convert_interpolant, LRU_Cache
 from .interpolant import Quintic
 from .interpolatedimage import InterpolatedImage, _InterpolatedKImage
 from .convolve import Convolve, Deconvolve
@@ -72,6 +73,82 @@ real_galaxy_bandpasses = {
         'F160W': ('WFC3_ir_F160W.dat', 25.9463)
 }
 
+def _make_real_galaxy_profiles(gal_image, psf_image, x_interpolant, k_interpolant, pad_factor,
+                               noise_pad_size, noise_pad, rng, gsparams):
+    """Make the InterpolatedImages of the PSF and the galaxy for a RealGalaxy.
+
+    @returns original_psf, original_gal
+    """
+    original_psf = InterpolatedImage(
+        psf_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
+        flux=1.0, gsparams=gsparams)
+
+    # Use the stepk value of the PSF as a maximum value for stepk of the galaxy.
+    # (Otherwise, low surface brightness galaxies can get a spuriously high stepk, which
+    # leads to problems.)
+    original_gal = InterpolatedImage(
+            gal_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
+            pad_factor=pad_factor, noise_pad_size=noise_pad_size,
+            calculate_stepk=original_psf.stepk, calculate_maxk=original_psf.maxk,
+            noise_pad=noise_pad, rng=rng, gsparams=gsparams)
+    return original_psf, original_gal
+
+def _make_deconvolved_cache_entry(catalog_ref, index, x_interpolant, k_interpolant,
+                                  pad_factor, gsparams):
+    """Read the images for a catalog entry and make the profiles that RealGalaxy objects made
+    from it can share.
+
+    @returns gal_image, psf_image, original_psf, original_gal
+    """
+    real_galaxy_catalog = catalog_ref()
+    gal_image = real_galaxy_catalog.getGalImage(index)
+    psf_image = real_galaxy_catalog.getPSFImage(index)
+    original_psf, original_gal = _make_real_galaxy_profiles(
+            gal_image, psf_image, x_interpolant, k_interpolant, pad_factor, 0, 0., None, gsparams)
+    return gal_image, psf_image, original_psf, original_gal
+
+# A cache of the profiles needed to draw a RealGalaxy, keyed by the catalog, index, and the other
+# parameters that affect the InterpolatedImages.  This lets repeated RealGalaxy objects made from
+# the same catalog entry share the (fairly expensive) k-space tables of the InterpolatedImages,
+# rather than rebuilding them each time.  The deconvolution by the PSF is cheap to make from the
+# shared PSF profile, so it is not cached.  The key holds a weak reference to the catalog, so the
+# cache doesn't keep catalogs alive.  (A weakref compares equal to another one if their live
+# referents are equal, and never matches once its catalog is gone.)
+_deconvolved_cache = LRU_Cache(_make_deconvolved_cache_entry, maxsize=10)
+
+def set_deconvolved_cache_size(maxsize):
+    """Set the maximum number of entries in the cache of deconvolved RealGalaxy profiles.
+
+    When RealGalaxy objects are made from a RealGalaxyCatalog, the images and InterpolatedImages
+    of the galaxy and the PSF are saved in a least recently used cache.  Subsequent RealGalaxy
+    objects using the same catalog entry (and the same interpolants, pad_factor and gsparams)
+    share these profiles rather than remaking them, so the k-space tables of the
+    InterpolatedImages only need to be computed once.
+
+    Galaxies made with noise_pad_size > 0 are never cached, since each one has a different
+    realization of the noise padding.
+
+    @param maxsize      The maximum number of entries to keep.  [default for the cache: 10]
+    """
+    _deconvolved_cache.resize(maxsize)
+
+def clear_deconvolved_cache():
+    """Clear the cache of deconvolved RealGalaxy profiles and reset its statistics.
+    See set_deconvolved_cache_size for details.
+    """
+    _deconvolved_cache.clear()
+
+def get_deconvolved_cache_stats():
+    """Get statistics about the use of the cache of deconvolved RealGalaxy profiles.
+    See set_deconvolved_cache_size for details.
+
+    @returns a dict with the number of `hits`, `misses` and `evictions`, the `hit_rate`, the
+             current `size` and the `maxsize` of the cache.  See utilities.LRU_Cache.stats for
+             details.
+    """
+    return _deconvolved_cache.stats()
+
+
 class RealGalaxy(GSObject):
     """A class describing real galaxies from some training dataset.  Its underlying implementation
     uses a Convolution instance of an InterpolatedImage (for the observed galaxy) with a
@@ -221,6 +298,10 @@ class RealGalaxy(GSObject):
 
         logger = LoggerWrapper(logger)  # So don't need to check `if logger:` all the time.
 
+        # If we can use the cache, this will be set to (gal_image, psf_image, original_psf,
+        # original_gal).  Otherwise, we'll read and build them here.
+        cached = None
+
         if isinstance(real_galaxy_catalog, tuple):
             # Special (undocumented) way to build a RealGalaxy without needing the rgc directly
             # by providing the things we need from it.  Used by COSMOSGalaxy.
@@ -257,13 +338,21 @@ class RealGalaxy(GSObject):
                     "No method specified for selecting a galaxy.",
                     index=index, id=id, random=random)
             logger.debug('RealGalaxy %d: Start RealGalaxy constructor.',use_index)
+            self.catalog_file = real_galaxy_catalog.getFileName()
 
-            # Read in the galaxy, PSF images; for now, rely on pyfits to make I/O errors.
-            self.gal_image = real_galaxy_catalog.getGalImage(use_index)
-            logger.debug('RealGalaxy %d: Got gal_image',use_index)
+            if not noise_pad_size:
+                cached = _deconvolved_cache(weakref.ref(real_galaxy_catalog), use_index,
+                                            x_interpolant, k_interpolant, pad_factor,
+                                            GSParams.check(gsparams))
+                self.gal_image, self.psf_image = cached[:2]
+                logger.debug('RealGalaxy %d: Got profiles from cache',use_index)
+            else:
+                # Read in the galaxy, PSF images; for now, rely on pyfits to make I/O errors.
+                self.gal_image = real_galaxy_catalog.getGalImage(use_index)
+                logger.debug('RealGalaxy %d: Got gal_image',use_index)
 
-            self.psf_image = real_galaxy_catalog.getPSFImage(use_index)
-            logger.debug('RealGalaxy %d: Got psf_image',use_index)
+                self.psf_image = real_galaxy_catalog.getPSFImage(use_index)
+                logger.debug('RealGalaxy %d: Got psf_image',use_index)
 
             #self._gal_noise = real_galaxy_catalog.getNoise(use_index, self.rng, gsparams)
             # We need to duplication some of the RealGalaxyCatalog.getNoise() function, since we
@@ -271,7 +360,6 @@ class RealGalaxy(GSObject):
             # BaseCorrelatedNoise object is not picklable.  So we just build it here instead.
             noise_image, pixel_scale, var = real_galaxy_catalog.getNoiseProperties(use_index)
             logger.debug('RealGalaxy %d: Got noise_image',use_index)
-            self.catalog_file = real_galaxy_catalog.getFileName()
             self.catalog = real_galaxy_catalog
 
         self._gsparams = GSParams.check(gsparams)
@@ -304,23 +392,15 @@ class RealGalaxy(GSObject):
         else:
             noise_pad = 0.
 
-        # Build the InterpolatedImage of the PSF.
-        self.original_psf = InterpolatedImage(
-            self.psf_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
-            flux=1.0, gsparams=self._gsparams)
-        logger.debug('RealGalaxy %d: Made original_psf',use_index)
-
-        # Build the InterpolatedImage of the galaxy.
-        # Use the stepk value of the PSF as a maximum value for stepk of the galaxy.
-        # (Otherwise, low surface brightness galaxies can get a spuriously high stepk, which
-        # leads to problems.)
-        self.original_gal = InterpolatedImage(
-                self.gal_image, x_interpolant=x_interpolant, k_interpolant=k_interpolant,
-                pad_factor=pad_factor, noise_pad_size=noise_pad_size,
-                calculate_stepk=self.original_psf.stepk,
-                calculate_maxk=self.original_psf.maxk,
-                noise_pad=noise_pad, rng=self.rng, gsparams=self._gsparams)
-        logger.debug('RealGalaxy %d: Made original_gal',use_index)
+        if cached is not None:
+            # Anything that uses these profiles will share the same k-space tables, so they
+            # only need to be calculated the first time.
+            self.original_psf, self.original_gal = cached[2:]
+        else:
+            self.original_psf, self.original_gal = _make_real_galaxy_profiles(
+                    self.gal_image, self.psf_image, x_interpolant, k_interpolant, pad_factor,
+                    noise_pad_size, noise_pad, self.rng, self._gsparams)
+            logger.debug('RealGalaxy %d: Made original_psf and original_gal',use_index)
 
         # Only alter normalization if a change is requested
         if flux is not None or flux_rescale is not None or area_norm != 1:
@@ -340,6 +420,8 @@ class RealGalaxy(GSObject):
         from copy import copy
         ret = copy(self)
         ret._gsparams = GSParams.check(gsparams)
+        ret.__dict__.pop('_psf_inv',None)
+        ret.__dict__.pop('_conv',None)
         ret.original_gal = self.original_gal.withGSParams(ret._gsparams)
         ret.original_psf = self.original_psf.withGSParams(ret._gsparams)
         ret._gal_noise = self._gal_noise.withGSParams(ret._gsparams)
@@ -540,11 +622,18 @@ class RealGalaxyCatalog(object):
                       approximately the same total I/O time (assuming you eventually use most of
                       the image files referenced in the catalog), but it is spread over the
                       various calls to getGalImage() and getPSFImage().  [default: False]
+    @param stamp_dir  If given, the galaxy and PSF images are copied (the first time the catalog
+                      is used with this directory) into a compact store in this directory:
+                      one contiguous array per image file along with an index of where each
+                      catalog entry's stamps are.  These arrays are then memory mapped, so
+                      getGalImage() and getPSFImage() don't need to open or parse any FITS
+                      files, and several processes using the same catalog share the same pages
+                      of memory.  [default: None]
     @param logger     An optional logger object to log progress. [default: None]
     """
     _req_params = {}
     _opt_params = { 'file_name' : str, 'sample' : str, 'dir' : str,
-                    'preload' : bool }
+                    'preload' : bool, 'stamp_dir' : str }
     _single_params = []
     _takes_rng = False
 
@@ -552,7 +641,7 @@ class RealGalaxyCatalog(object):
     # the config structure.  It indicates that all we care about is the nobjects parameter.
     # So skip any other calculations that might normally be necessary on construction.
     def __init__(self, file_name=None, sample=None, dir=None, preload=False,
-                 logger=None, _nobjects_only=False):
+                 stamp_dir=None, logger=None, _nobjects_only=False):
         from ._pyfits import pyfits
         from .config import LoggerWrapper
 
@@ -623,6 +712,11 @@ class RealGalaxyCatalog(object):
         self.loaded_lock = Lock()  # Use this when opening new files from disk
         self.noise_lock = Lock()  # Use this for building the noise image(s) (usually just one)
 
+        self.stamp_dir = stamp_dir
+        self._stamp_arrays = {}
+        if stamp_dir is not None:
+            self._loadStampIndex()
+
         # Preload all files if desired
         if preload: self.preload()
         self._preload = preload
@@ -643,6 +737,7 @@ class RealGalaxyCatalog(object):
             for f in self.loaded_files.values():
                 f.close()
         self.loaded_files = {}
+        self._stamp_arrays = {}
 
     def getNObjects(self) : return self.nobjects
     def __len__(self): return self.nobjects
@@ -668,6 +763,11 @@ class RealGalaxyCatalog(object):
         """
         from ._pyfits import pyfits
         self.logger.debug('RealGalaxyCatalog: start preload')
+        if self.stamp_dir is not None:
+            # Just open the memory maps.  The OS will take care of reading the data.
+            for k in range(len(self._stamp_files)):
+                self._getStampArray(k)
+            return
         for file_name in np.concatenate((self.gal_file_name , self.psf_file_name)):
             # numpy sometimes add a space at the end of the string that is not present in
             # the original file.  Stupid.  But this next line removes it.
@@ -704,6 +804,98 @@ class RealGalaxyCatalog(object):
             self.loaded_lock.release()
         return f
 
+    def _loadStampIndex(self):
+        """Load the index of the memory-mapped stamp store, building the store if necessary.
+        """
+        from .disk_cache import DiskCache
+        if not os.path.isdir(self.stamp_dir):
+            try:
+                os.makedirs(self.stamp_dir)
+            except OSError:  # pragma: no cover
+                # Another process may have made it at the same time.
+                if not os.path.isdir(self.stamp_dir): raise
+        st = os.stat(self.file_name)
+        key = DiskCache.key('galsim.RealGalaxyCatalog', os.path.abspath(self.file_name),
+                            os.path.abspath(self.image_dir), st.st_size, st.st_mtime)
+        prefix = os.path.join(self.stamp_dir, 'rgc_' + key[:16])
+        index_file = prefix + '_index.npz'
+        if not os.path.isfile(index_file):
+            self._buildStampStore(prefix, index_file)
+        else:
+            self.logger.debug('RealGalaxyCatalog: using stamp index %s',index_file)
+        with np.load(index_file, allow_pickle=False) as index:
+            self._stamp_files = [ os.path.join(self.stamp_dir, f) for f in index['files'] ]
+            self._gal_stamp = index['gal']
+            self._psf_stamp = index['psf']
+
+    def _buildStampStore(self, prefix, index_file):
+        """Copy all the galaxy and PSF images into one array per file, and write the index.
+
+        The index has, for each catalog entry, the number of the stamp file and the offset and
+        shape of the galaxy and PSF images within it.  Everything is written to temporary files
+        and renamed into place, and the index is written last.  So if several processes do this
+        at the same time, they will just each write the same files, and no process will ever
+        use an incomplete store.
+        """
+        import tempfile
+        from ._pyfits import pyfits
+        self.logger.info('RealGalaxyCatalog: building stamp store in %s',self.stamp_dir)
+        rename = getattr(os, 'replace', os.rename)
+        file_names = sorted(set(self.gal_file_name) | set(self.psf_file_name))
+        file_num = dict((f,k) for k,f in enumerate(file_names))
+        locations = {}   # (file_name, hdu) -> (offset, ny, nx)
+        store_files = []
+        for k, file_name in enumerate(file_names):
+            hdus = set()
+            for names, hdu_nums in ((self.gal_file_name, self.gal_hdu),
+                                    (self.psf_file_name, self.psf_hdu)):
+                hdus.update(int(h) for f, h in zip(names, hdu_nums) if f == file_name)
+            hdus = sorted(hdus)
+            self.logger.debug('RealGalaxyCatalog: copying %d stamps from %s',len(hdus),file_name)
+            with pyfits.open(file_name, memmap=False) as f:
+                arrays = [ f[hdu].data for hdu in hdus ]
+            dtype = np.result_type(*arrays)
+            store_name = '%s_%d.npy'%(prefix, k)
+            fd, tmp_name = tempfile.mkstemp(dir=self.stamp_dir, suffix='.tmp')
+            os.close(fd)
+            store = np.lib.format.open_memmap(tmp_name, mode='w+', dtype=dtype,
+                                              shape=(sum(a.size for a in arrays),))
+            offset = 0
+            for hdu, array in zip(hdus, arrays):
+                store[offset:offset+array.size] = array.ravel()
+                locations[file_name, hdu] = (offset,) + array.shape
+                offset += array.size
+            store.flush()
+            del store
+            rename(tmp_name, store_name)
+            store_files.append(os.path.basename(store_name))
+
+        # For each entry: file number, offset, ny, nx
+        gal = np.array([ (file_num[f],) + locations[f, int(h)]
+                         for f, h in zip(self.gal_file_name, self.gal_hdu) ], dtype=np.int64)
+        psf = np.array([ (file_num[f],) + locations[f, int(h)]
+                         for f, h in zip(self.psf_file_name, self.psf_hdu) ], dtype=np.int64)
+        fd, tmp_name = tempfile.mkstemp(dir=self.stamp_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fout:
+            np.savez(fout, files=np.array(store_files), gal=gal, psf=psf)
+        rename(tmp_name, index_file)
+
+    def _getStampArray(self, k):
+        """Get the memory-mapped array for stamp file number k.
+        """
+        array = self._stamp_arrays.get(k)
+        if array is None:
+            array = np.load(self._stamp_files[k], mmap_mode='r')
+            self._stamp_arrays[k] = array
+        return array
+
+    def _getStamp(self, loc):
+        """Get the image for a row of the stamp index as a float64 numpy array.
+        """
+        k, offset, ny, nx = loc
+        array = self._getStampArray(k)[offset:offset+ny*nx].reshape(ny,nx)
+        return np.ascontiguousarray(array.astype(np.float64))
+
     def getBandpass(self):
         """Returns a Bandpass object for the catalog.
         """
@@ -723,6 +915,8 @@ class RealGalaxyCatalog(object):
         self.logger.debug('RealGalaxyCatalog %d: Start getGalImage',i)
         if i >= len(self.gal_file_name):
             raise GalSimIndexError('index out of range (0..%d)'%(len(self.gal_file_name)-1),i)
+        if self.stamp_dir is not None:
+            return Image(self._getStamp(self._gal_stamp[i]), scale=self.pixel_scale[i])
         f = self._getFile(self.gal_file_name[i])
         # For some reason the more elegant `with gal_lock:` syntax isn't working for me.
         # It gives an EOFError.  But doing an explicit acquire and release seems to work fine.
@@ -739,6 +933,8 @@ class RealGalaxyCatalog(object):
         self.logger.debug('RealGalaxyCatalog %d: Start getPSFImage',i)
         if i >= len(self.psf_file_name):
             raise GalSimIndexError('index out of range (0..%d)'%(len(self.psf_file_name)-1),i)
+        if self.stamp_dir is not None:
+            return Image(self._getStamp(self._psf_stamp[i]), scale=self.pixel_scale[i])
         f = self._getFile(self.psf_file_name[i])
         self.psf_lock.acquire()
         array = f[self.psf_hdu[i]].data
@@ -820,6 +1016,8 @@ class RealGalaxyCatalog(object):
         d = self.__dict__.copy()
         d['loaded_files'] = {}
         d['saved_noise_im'] = {}
+        # The memory maps are cheap to reopen, so don't pickle them.
+        d['_stamp_arrays'] = {}
         del d['gal_lock']
         del d['psf_lock']
         del d['loaded_lock']
@@ -907,6 +907,24 @@ class SED(object):
     def _cache_deviate(self):
         return dict()
 
+    def _make_deviate(self, bandpass, npoints):
+        """Make a DistDeviate for the rest-frame wavelengths of photons from this SED, possibly
+        as observed through a bandpass.
+        """
+        from .random import DistDeviate
+        if bandpass is None:
+            sed = self
+        else:
+            sed = self._mul_bandpass(bandpass)
+
+        if isinstance(sed._fast_spec, LookupTable):
+            return DistDeviate(function=sed._fast_spec, npoints=npoints)
+        else:
+            xmin = sed.blue_limit / (1.+self.redshift)
+            xmax = sed.red_limit / (1.+self.redshift)
+            return DistDeviate(function=sed._fast_spec, x_min=xmin, x_max=xmax,
+                               npoints=npoints)
+
     def sampleWavelength(self, nphotons, bandpass, rng=None, npoints=None):
         """ Sample a number of random wavelength values from the SED, possibly as observed through
         a bandpass.
@@ -920,25 +938,13 @@ class SED(object):
         @param npoints   Number of points DistDeviate should use for its internal interpolation
                          tables. [default: None, which uses the DistDeviate default]
         """
-        from .random import DistDeviate
         nphotons=int(nphotons)
 
         key = (bandpass,npoints)
         if key in self._cache_deviate:
             dev = self._cache_deviate[key]
         else:
-            if bandpass is None:
-                sed = self
-            else:
-                sed = self._mul_bandpass(bandpass)
-
-            if isinstance(sed._fast_spec, LookupTable):
-                dev = DistDeviate(function=sed._fast_spec, npoints=npoints)
-            else:
-                xmin = sed.blue_limit / (1.+self.redshift)
-                xmax = sed.red_limit / (1.+self.redshift)
-                dev = DistDeviate(function=sed._fast_spec, x_min=xmin, x_max=xmax,
-                                  npoints=npoints)
+            dev = self._make_deviate(bandpass, npoints)
             self._cache_deviate[key] = dev
 
         # Reset the deviate explicitly
@@ -1000,3 +1006,348 @@ class SED(object):
         if '_spec' not in d:
             self._initialize_spec()
         self._setup_funcs()
+
+
+class _FluxTable(object):
+    """The flux of an SED through a Bandpass as a function of u = log(1+z).
+
+    The flux is tabulated at u = k * _flux_table_step for integer k, but only around the
+    range of u that has actually been requested, and only where the redshifted SED covers
+    the bandpass.  Where the latter cuts off the table, the exact limiting redshift is used as
+    the last point instead.  Calling the table with an array of u values extends it as needed.
+
+    Each extension is a separate spline segment that shares its end point with the existing
+    table, rather than a new spline through all of the points.  So extending the table never
+    changes the values it returns for u values that it already covered.
+    """
+    def __init__(self, sed, bandpass):
+        self.sed = sed
+        self.bandpass = bandpass
+        # The range of u for which sed.atRedshift(z) covers the bandpass.
+        self.umin = -np.inf
+        self.umax = np.inf
+        if len(bandpass.wave_list) > 0 or len(sed.wave_list) > 0:
+            u_sed = np.log1p(sed.redshift)
+            if sed.red_limit < np.inf:
+                self.umin = u_sed + np.log(bandpass.red_limit / sed.red_limit)
+            if sed.blue_limit > 0.:
+                self.umax = u_sed + np.log(bandpass.blue_limit / sed.blue_limit)
+        self._fluxes = {}
+        # The spline segments, in the order they were made.
+        self._tables = []
+        self.x_min = None
+        self.x_max = None
+
+    def _make_table(self, u):
+        for uu in u:
+            if uu not in self._fluxes:
+                self._fluxes[uu] = self.sed.atRedshift(np.expm1(uu)).calculateFlux(self.bandpass)
+        fluxes = np.array([ self._fluxes[uu] for uu in u ])
+        interpolant = 'spline' if len(u) >= 3 else 'linear'
+        self._tables.append(LookupTable(u, fluxes, interpolant=interpolant))
+
+    def _extend(self, umin, umax):
+        h = _flux_table_step
+        if self._tables:
+            if umin >= self.x_min and umax <= self.x_max: return
+            # Extend by at least a few points, so each new segment is a reasonable spline.
+            if umin < self.x_min: umin = min(umin, self.x_min - 3*h)
+            if umax > self.x_max: umax = max(umax, self.x_max + 3*h)
+        # Include one extra point at each end, so rounding errors can't put umin or umax outside
+        # the table, but don't go past where the SED covers the bandpass.  Points within h/2 of
+        # those limits are replaced by the limits themselves.
+        u = np.arange(int(np.floor(umin / h)) - 1, int(np.ceil(umax / h)) + 2) * h
+        lo = self.umin + 0.5*h
+        hi = self.umax - 0.5*h
+        new_u = [ uu for uu in u if lo <= uu <= hi ]
+        if u[0] < lo: new_u.insert(0, self.umin)
+        if u[-1] > hi: new_u.append(self.umax)
+        if not self._tables:
+            self._make_table(new_u)
+        else:
+            # Each new segment starts at the current end of the table.
+            below = [ uu for uu in new_u if uu < self.x_min ]
+            above = [ uu for uu in new_u if uu > self.x_max ]
+            if below: self._make_table(below + [self.x_min])
+            if above: self._make_table([self.x_max] + above)
+        self.x_min = min(t.x_min for t in self._tables)
+        self.x_max = max(t.x_max for t in self._tables)
+
+    def __call__(self, u):
+        """Return the flux at the given values of u = log(1+z).
+        """
+        umin = np.min(u)
+        umax = np.max(u)
+        # Allow for the slop that calculateFlux allows in the wavelength limits.
+        tol = 1.e-8
+        if umin < self.umin - tol or umax > self.umax + tol:
+            raise GalSimRangeError("Bandpass is not completely within defined wavelength "
+                                   "range for this SED at these redshifts.",
+                                   np.expm1(u), np.expm1(self.umin), np.expm1(self.umax))
+        self._extend(umin, umax)
+        u = np.clip(u, self.x_min, self.x_max)
+        if len(self._tables) == 1:
+            return self._tables[0](u)
+        # Where segments share an end point, use the older one.
+        flux = np.empty_like(u)
+        todo = np.ones(u.shape, dtype=bool)
+        for table in self._tables:
+            use = todo & (u >= table.x_min) & (u <= table.x_max)
+            flux[use] = table(u[use])
+            todo &= ~use
+        return flux
+
+# Tables of the flux of an SED through a Bandpass as a function of redshift, keyed by
+# (sed, bandpass).
+_flux_tables = utilities.LRU_Cache(_FluxTable, maxsize=100)
+_flux_table_step = 1.e-3
+
+def set_flux_table_cache_size(maxsize):
+    """Set the maximum number of (SED, Bandpass) pairs for which to keep flux tables.
+
+    See calculateFluxes for details.
+
+    @param maxsize      The maximum number of tables to keep.
+    """
+    _flux_tables.resize(maxsize)
+
+def clear_flux_table_cache():
+    """Clear the cached flux tables and reset the cache statistics.  See calculateFluxes for
+    details.
+    """
+    _flux_tables.clear()
+
+def get_flux_table_cache_stats():
+    """Get statistics about the use of the cached flux tables.  See calculateFluxes for details.
+
+    @returns a dict with the number of `hits`, `misses` and `evictions`, the `hit_rate`, the
+             current number of cached tables (`size`) and the `maxsize`.  See
+             utilities.LRU_Cache.stats for details.
+    """
+    return _flux_tables.stats()
+
+def _parse_population(seds, redshift, index):
+    """Check the arguments that describe a population of SEDs at various redshifts.
+
+    @returns seds as a list, and redshift and index as broadcast arrays.
+    """
+    if isinstance(seds, SED):
+        if index is not None:
+            raise GalSimIncompatibleValuesError("index is invalid when seds is a single SED",
+                                                seds=seds, index=index)
+        seds = [seds]
+        index = 0
+    elif index is None:
+        if len(seds) != 1:
+            raise GalSimIncompatibleValuesError("index is required for more than one SED",
+                                                seds=seds, index=index)
+        index = 0
+    redshift, index = np.broadcast_arrays(np.asarray(redshift, dtype=float),
+                                          np.asarray(index))
+    if not np.issubdtype(index.dtype, np.integer):
+        raise TypeError("index must be an array of integers")
+    if redshift.size > 0:
+        if np.min(redshift) <= -1:
+            raise GalSimRangeError("Invalid redshift", np.min(redshift), -1.)
+        if np.min(index) < 0 or np.max(index) >= len(seds):
+            raise GalSimRangeError("Invalid index", index, 0, len(seds)-1)
+    return seds, redshift, index
+
+def calculateFluxes(seds, bandpass, redshift, index=None):
+    """Calculate the fluxes (photons/cm^2/s) through a bandpass of many SEDs at different
+    redshifts.
+
+    This is equivalent to
+
+        >>> flux = [ seds[i].atRedshift(z).calculateFlux(bandpass)
+        ...          for i, z in zip(index, redshift) ]
+
+    but it is much faster when there are many redshifts.  For each SED, the flux is tabulated
+    once as a function of log(1+z), in steps of 0.001, and the fluxes at the given redshifts
+    are interpolated from that table with a cubic spline.  The relative accuracy is typically
+    around 1.e-6, and better than 1.e-4 even where sharp features in the SED cross the edges of
+    the bandpass.
+
+    The flux is only tabulated around the range of the given redshifts, and only where the
+    redshifted SED covers the bandpass, so this works for any redshifts at which
+    `sed.atRedshift(z).calculateFlux(bandpass)` would work.  The tables are kept for later
+    calls with the same SED and bandpass.  (They are extended as necessary if a later call
+    needs a different range of redshifts.)  By default, the tables
+    for the 100 most recently used (SED, Bandpass) pairs are kept.  See
+    set_flux_table_cache_size to change this, and get_flux_table_cache_stats to see how well the
+    cache is being used.
+
+    This is typically used to assign fluxes or magnitudes to a population of galaxies, each of
+    which uses one of a few template SEDs:
+
+        >>> templates = [ galsim.SED(name, 'Ang', 'flambda') for name in template_files ]
+        >>> flux = galsim.sed.calculateFluxes(templates, bandpass, redshift, index=template_index)
+        >>> for i in range(ngal):
+        ...     sed = templates[template_index[i]].atRedshift(redshift[i])
+        ...     sed = sed * (target_flux[i] / flux[i])   # Same as sed.withFlux(target_flux[i])
+        ...     ...
+
+    @param seds         Either a single SED, or a list of SEDs.
+    @param bandpass     The Bandpass through which to calculate the fluxes.
+    @param redshift     An array of redshifts.
+    @param index        An array of indices into `seds`, giving which SED to use for each
+                        redshift.  This may be omitted if `seds` is a single SED.
+                        [default: None]
+
+    @returns an array of the fluxes.  Its shape is that of `redshift` and `index` broadcast
+             together.
+    """
+    seds, redshift, index = _parse_population(seds, redshift, index)
+    u = np.log1p(redshift)
+    flux = np.empty(redshift.shape, dtype=float)
+    for i, sed in enumerate(seds):
+        use = index == i
+        if not np.any(use): continue
+        flux[use] = _flux_tables(sed, bandpass)(u[use])
+    return flux
+
+def calculateMagnitudes(seds, bandpass, redshift, index=None):
+    """Calculate the magnitudes through a bandpass of many SEDs at different redshifts.
+
+    This is the magnitude version of calculateFluxes.  See that function for details.  Note
+    that this requires `bandpass` to have been assigned a zeropoint using
+    `Bandpass.withZeropoint()`.
+
+    @param seds         Either a single SED, or a list of SEDs.
+    @param bandpass     The Bandpass through which to calculate the magnitudes.
+    @param redshift     An array of redshifts.
+    @param index        An array of indices into `seds`, giving which SED to use for each
+                        redshift.  This may be omitted if `seds` is a single SED.
+                        [default: None]
+
+    @returns an array of the magnitudes.
+    """
+    if bandpass.zeropoint is None:
+        raise GalSimError("Cannot do this calculation for a bandpass without an assigned "
+                          "zeropoint")
+    flux = calculateFluxes(seds, bandpass, redshift, index)
+    return -2.5 * np.log10(flux) + bandpass.zeropoint
+
+
+def _make_wavelength_table(sed, bandpass, k, npoints):
+    """Make the inverse CDF of the rest-frame wavelengths of photons from sed at redshift
+    z = exp(k * _wavelength_table_step) - 1 as seen through bandpass.
+    """
+    z = np.expm1(k * _wavelength_table_step)
+    return sed.atRedshift(z)._make_deviate(bandpass, npoints)._inverse_cdf
+
+# Inverse CDF tables of the rest-frame wavelengths of photons from an SED at some redshift as
+# seen through a Bandpass.  The keys are (sed, bandpass, k, npoints), where the redshift is
+# z = exp(k * _wavelength_table_step) - 1.  The values are LookupTables from the cumulative
+# probability to the rest-frame wavelength.
+_wavelength_tables = utilities.LRU_Cache(_make_wavelength_table, maxsize=1000)
+_wavelength_table_step = 1.e-3
+
+def set_wavelength_table_cache_size(maxsize):
+    """Set the maximum number of inverse CDF tables to keep for sampleWavelengths.
+
+    See sampleWavelengths for details.
+
+    @param maxsize      The maximum number of tables to keep.
+    """
+    _wavelength_tables.resize(maxsize)
+
+def clear_wavelength_table_cache():
+    """Clear the cached inverse CDF tables and reset the cache statistics.  See
+    sampleWavelengths for details.
+    """
+    _wavelength_tables.clear()
+
+def get_wavelength_table_cache_stats():
+    """Get statistics about the use of the cached inverse CDF tables.  See sampleWavelengths
+    for details.
+
+    @returns a dict with the number of `hits`, `misses` and `evictions`, the `hit_rate`, the
+             current number of cached tables (`size`) and the `maxsize`.  See
+             utilities.LRU_Cache.stats for details.
+    """
+    return _wavelength_tables.stats()
+
+def sampleWavelengths(seds, bandpass, redshift, nphotons, index=None, rng=None, npoints=None):
+    """Sample random wavelengths for the photons of many objects, each of which has one of a
+    few SEDs at its own redshift.
+
+    This is similar to
+
+        >>> waves = np.concatenate([ seds[i].atRedshift(z).sampleWavelength(n, bandpass, rng)
+        ...                          for i, z, n in zip(index, redshift, nphotons) ])
+
+    but it is much faster when there are many objects, since the sampling for all of the
+    photons is done at once.
+
+    The wavelengths are drawn in the rest frame of each SED, using tables of the inverse
+    cumulative distribution of the SED times the (blueshifted) bandpass, and then multiplied by
+    1+z for each object.  The tables are made for redshifts in steps of 0.001 in log(1+z), and
+    each object uses the nearest one.  So the bandpass throughput for each object is evaluated
+    at wavelengths that may be off by up to 0.05%.  This is the only approximation relative to
+    sampleWavelength.  Wavelengths that this shifts outside the bandpass are clipped to its
+    blue and red limits.
+
+    The tables are kept for later calls.  By default, the 1000 most recently used tables are
+    kept.  See set_wavelength_table_cache_size to change this, and
+    get_wavelength_table_cache_stats to see how well the cache is being used.
+
+    The wavelengths may be used to set the wavelengths of the photons of each object.  e.g.
+
+        >>> waves = galsim.sed.sampleWavelengths(templates, bandpass, redshift, nphotons,
+        ...                                      index=template_index, rng=rng)
+        >>> start = np.concatenate([[0], np.cumsum(nphotons)])
+        >>> for i in range(nobj):
+        ...     photons = obj[i].shoot(nphotons[i], rng)
+        ...     photons.wavelength = waves[start[i]:start[i+1]]
+        ...     ...
+
+    @param seds         Either a single SED, or a list of SEDs.
+    @param bandpass     A Bandpass object representing a filter, or None to sample over the full
+                        SED wavelength range.
+    @param redshift     An array of the redshifts of the objects.
+    @param nphotons     An array of the number of photons for each object.
+    @param index        An array of indices into `seds`, giving which SED to use for each
+                        object.  This may be omitted if `seds` is a single SED.
+                        [default: None]
+    @param rng          If provided, a random number generator that is any kind of BaseDeviate
+                        object. If `rng` is None, one will be automatically created from the
+                        system. [default: None]
+    @param npoints      Number of points DistDeviate should use for its internal interpolation
+                        tables. [default: None, which uses the DistDeviate default]
+
+    @returns an array of the wavelengths of all the photons, starting with the photons of the
+             first object, then those of the second, etc.
+    """
+    from .random import UniformDeviate
+    seds, redshift, index = _parse_population(seds, redshift, index)
+    redshift, index, nphotons = np.broadcast_arrays(redshift, index, np.asarray(nphotons))
+    redshift = redshift.ravel()
+    index = index.ravel()
+    nphotons = nphotons.ravel().astype(int)
+    if np.any(nphotons < 0):
+        raise GalSimRangeError("Invalid nphotons", nphotons, 0)
+
+    ret = np.empty(np.sum(nphotons))
+    if len(ret) == 0:
+        return ret
+    ud = UniformDeviate(rng)
+    ud.generate(ret)
+
+    # Group the objects that use the same table, and do each group at once.
+    k = np.round(np.log1p(redshift) / _wavelength_table_step).astype(int)
+    obj = np.repeat(np.arange(len(redshift)), nphotons)
+    groups, group = np.unique(np.column_stack([index, k]), axis=0, return_inverse=True)
+    group = group.ravel()[obj]
+    order = np.argsort(group, kind='mergesort')
+    starts = np.searchsorted(group[order], np.arange(len(groups)+1))
+    for g, (i, kg) in enumerate(groups):
+        use = order[starts[g]:starts[g+1]]
+        if len(use) == 0: continue
+        table = _wavelength_tables(seds[i], bandpass, int(kg), npoints)
+        ret[use] = table(ret[use]) * (1. + redshift[obj[use]])
+    if bandpass is not None:
+        # The table for the nearest redshift covers the bandpass blueshifted by a slightly
+        # different 1+z, so the wavelengths near the edges can fall just outside the bandpass.
+        np.clip(ret, bandpass.blue_limit, bandpass.red_limit, out=ret)
+    return ret
@@ -35,8 +35,42 @@ from .table import LookupTable
 from .position import PositionI, PositionD
 from .table import LookupTable
 from .random import UniformDeviate
+from .bounds import BoundsI
 from . import meta_data
-from .errors import GalSimUndefinedBoundsError, convert_cpp_errors
+from .disk_cache import DiskCache
+from .errors import GalSimUndefinedBoundsError, GalSimValueError, convert_cpp_errors
+
+# If set, the DiskCache to use for saving SiliconSensor tree ring maps.
+_disk_cache = None
+
+def set_disk_cache(directory=None, max_size=2**30):
+    """Set a directory in which to save the tree ring maps of SiliconSensors.
+
+    Calculating the tree ring displacement map for a large sensor can take a while, so if the
+    same map is needed by many different jobs, it can be worth saving it to disk.  When a disk
+    cache is set, a SiliconSensor with `treering_map_bounds` will first look for its map in
+    the cache (keyed by the tree ring function and center, and the bounds and step of the map),
+    and only calculate it if it is not there.  Newly calculated maps are saved to the cache.
+
+    The directory may be shared by multiple processes.  See galsim.disk_cache.DiskCache for
+    details.
+
+    @param directory    The directory to use, or None to turn off the disk cache.
+                        [default: None]
+    @param max_size     The maximum total size of the cache in bytes.  [default: 2**30, i.e. 1 GB]
+    """
+    global _disk_cache
+    if directory is None:
+        _disk_cache = None
+    else:
+        _disk_cache = DiskCache(directory, max_size)
+
+def get_disk_cache():
+    """Get the DiskCache used for SiliconSensor tree ring maps, or None if there is not one.
+    See set_disk_cache for details.
+    """
+    return _disk_cache
+
 
 class Sensor(object):
     """
@@ -122,6 +156,21 @@ class SiliconSensor(Sensor):
     of treering_center, which should still be defined in terms of the coordinate system of the
     images being passed to `accumulate`.
 
+    Evaluating the tree ring function at each vertex of each pixel can be slow for large images.
+    If you give `treering_map_bounds`, then the displacements are instead calculated once on a
+    grid with spacing `treering_map_step` covering those bounds, and bilinearly interpolated
+    from this map for each vertex.  This is used whenever the whole image passed to `accumulate`
+    or `calculate_pixel_areas` is within the map (taking into account orig_center).  Otherwise,
+    the tree ring function is evaluated directly.  The map is stored as float32 values, and it
+    may be saved to disk to be reused by other processes.  See galsim.sensor.set_disk_cache.
+
+    If galsim.utilities.set_num_threads has been used to enable multiple threads, the photons
+    between successive recalculations of the pixel boundaries are placed in parallel, and the
+    pixel boundary updates are also done in parallel.  In this mode, the random numbers are
+    drawn in a different order than in the single-threaded mode, so the result is a different
+    (but statistically equivalent) realization.  However, the result is deterministic for a
+    given rng, independent of the number of threads, so long as it is more than one.
+
 
     @param name             The base name of the files which contains the sensor information,
                             presumably calculated from the Poisson_CCD simulator, which may
@@ -149,10 +198,15 @@ class SiliconSensor(Sensor):
                             required if treering_func is provided]
     @param transpose        Transpose the meaning of (x,y) so the brighter-fatter effect is
                             stronger along the x direction. [default: False]
+    @param treering_map_bounds  A BoundsI giving the pixels (in the same coordinates as
+                            treering_center) over which to precompute a map of the tree ring
+                            displacements.  [default: None, which means don't use a map]
+    @param treering_map_step    The spacing of the points in the tree ring map, in pixels.
+                            [default: 1]
     """
     def __init__(self, name='lsst_itl_8', strength=1.0, rng=None, diffusion_factor=1.0, qdist=3,
                  nrecalc=10000, treering_func=None, treering_center=PositionD(0,0),
-                 transpose=False):
+                 transpose=False, treering_map_bounds=None, treering_map_step=1.):
         self.name = name
         self.strength = float(strength)
         self.rng = UniformDeviate(rng)
@@ -162,6 +216,9 @@ class SiliconSensor(Sensor):
         self.treering_func = treering_func
         self.treering_center = treering_center
         self.transpose = bool(transpose)
+        self.treering_map_bounds = treering_map_bounds
+        self.treering_map_step = float(treering_map_step)
+        self._has_treerings = treering_func is not None
         self._last_image = None
 
         self.config_file = name + '.cfg'
@@ -186,6 +243,13 @@ class SiliconSensor(Sensor):
             raise TypeError("treering_func must be a galsim.LookupTable")
         if not isinstance(treering_center, PositionD):
             raise TypeError("treering_center must be a galsim.PositionD")
+        if treering_map_bounds is not None:
+            if not isinstance(treering_map_bounds, BoundsI):
+                raise TypeError("treering_map_bounds must be a galsim.BoundsI")
+            if not treering_map_bounds.isDefined():
+                raise GalSimUndefinedBoundsError("treering_map_bounds is undefined")
+        if self.treering_map_step <= 0.:
+            raise GalSimValueError("treering_map_step must be > 0", treering_map_step)
 
         # Now we read in the absorption length table:
         abs_file = os.path.join(meta_data.share_dir, 'sensors', 'abs_length.dat')
@@ -215,6 +279,64 @@ class SiliconSensor(Sensor):
                                             vertex_data.ctypes.data,
                                             self.treering_func._tab, self.treering_center._p,
                                             self.abs_length_table._tab, self.transpose)
+        if self._has_treerings and self.treering_map_bounds is not None:
+            dx, dy, x0, y0 = self._get_treering_map()
+            self._silicon.set_tree_ring_map(dx.ctypes.data, dy.ctypes.data,
+                                            dx.shape[1], dx.shape[0], x0, y0,
+                                            self.treering_map_step)
+
+    def _get_treering_map(self):
+        """Get the tree ring map, either from the disk cache or by calculating it.
+
+        @returns dx, dy, x0, y0, where dx, dy are float32 arrays with shape (ny,nx).
+        """
+        b = self.treering_map_bounds
+        step = self.treering_map_step
+        # The vertices of pixel (i,j) go from (i,j) to (i+1,j+1), so the map needs to extend
+        # 1 more than the bounds in each direction.
+        x0 = float(b.xmin)
+        y0 = float(b.ymin)
+        nx = int(np.ceil((b.xmax + 1 - b.xmin) / step)) + 1
+        ny = int(np.ceil((b.ymax + 1 - b.ymin) / step)) + 1
+        if _disk_cache is not None:
+            tr = self.treering_func
+            key = _disk_cache.key('treering_map', tr.x, tr.f, tr.interpolant, tr.x_log, tr.f_log,
+                                  self.treering_center.x, self.treering_center.y,
+                                  x0, y0, nx, ny, step)
+            arrays = _disk_cache.load(key)
+            if arrays is not None:
+                return arrays['dx'], arrays['dy'], x0, y0
+        x = x0 + step * np.arange(nx)
+        y = y0 + step * np.arange(ny)
+        x, y = np.meshgrid(x, y)
+        dx, dy = self.treering_displacement(x, y)
+        dx = np.ascontiguousarray(dx, dtype=np.float32)
+        dy = np.ascontiguousarray(dy, dtype=np.float32)
+        if _disk_cache is not None:
+            _disk_cache.save(key, dx=dx, dy=dy)
+        return dx, dy, x0, y0
+
+    def treering_displacement(self, x, y):
+        """Calculate the tree ring displacement at some position(s).
+
+        The displacement is along the radial direction from treering_center, with a magnitude
+        given by treering_func(r).  This is the shift that is applied to each pixel vertex.
+
+        @param x        The x position(s) in the same coordinates as treering_center.  This
+                        may be a scalar or a NumPy array.
+        @param y        The y position(s).
+
+        @returns dx, dy, the displacements, which have the same shape as x and y.
+        """
+        x = np.asarray(x, dtype=float) - self.treering_center.x
+        y = np.asarray(y, dtype=float) - self.treering_center.y
+        r = np.sqrt(x**2 + y**2)
+        shift = self.treering_func(r)
+        # At the center itself, the direction is undefined, but the displacement should be 0.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dx = np.where(r > 0., shift * x / r, 0.)
+            dy = np.where(r > 0., shift * y / r, 0.)
+        return dx, dy
 
     def __str__(self):
         s = 'galsim.SiliconSensor(%r'%self.name
@@ -226,10 +348,12 @@ class SiliconSensor(Sensor):
 
     def __repr__(self):
         return ('galsim.SiliconSensor(name=%r, strength=%f, rng=%r, diffusion_factor=%f, '
-                'qdist=%d, nrecalc=%f, treering_func=%r, treering_center=%r, transpose=%r)')%(
+                'qdist=%d, nrecalc=%f, treering_func=%r, treering_center=%r, transpose=%r, '
+                'treering_map_bounds=%r, treering_map_step=%r)')%(
                         self.name, self.strength, self.rng,
                         self.diffusion_factor, self.qdist, self.nrecalc,
-                        self.treering_func, self.treering_center, self.transpose)
+                        self.treering_func, self.treering_center, self.transpose,
+                        self.treering_map_bounds, self.treering_map_step)
 
     def __eq__(self, other):
         return (isinstance(other, SiliconSensor) and
@@ -241,7 +365,9 @@ class SiliconSensor(Sensor):
                 self.nrecalc == other.nrecalc and
                 self.treering_func == other.treering_func and
                 self.treering_center == other.treering_center and
-                self.transpose == other.transpose)
+                self.transpose == other.transpose and
+                self.treering_map_bounds == other.treering_map_bounds and
+                self.treering_map_step == other.treering_map_step)
 
     __hash__ = None
 
@@ -302,6 +302,11 @@ class Sum(GSObject):
                 obj._drawReal(im1)
                 image += im1
 
+    @doc_inherit
+    def _realSBP(self):
+        # Multiple components are summed in python, so only a single one can be batched.
+        return self.obj_list[0]._realSBP() if len(self.obj_list) == 1 else None
+
     @doc_inherit
     def _shoot(self, photons, ud):
         from .photon_array import PhotonArray
@@ -325,7 +330,7 @@ class Sum(GSObject):
                 bd = BinomialDeviate(ud, remainingN, thisAbsoluteFlux/remainingAbsoluteFlux)
                 thisN = int(bd())
             if thisN > 0:
-                thisPA = obj.shoot(thisN, ud)
+                thisPA = obj.shoot(thisN, ud, dtype=photons.dtype)
                 # Now rescale the photon fluxes so that they are each nominally fluxPerPhoton
                 # whereas the shoot() routine would have made them each nominally
                 # thisAbsoluteFlux/thisN
@@ -489,6 +489,14 @@ class Transformation(GSObject):
             # TODO: Refactor the C++ draw function to allow this to be implemented in python
             self._sbp.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        if self.offset == PositionD(0.,0.) and np.array_equal(self.jac.ravel(), [1,0,0,1]):
+            # The flux rescaling is applied in python after drawing the original.
+            return self._original._realSBP() if self._flux_ratio == 1. else None
+        else:
+            return self._sbp
+
     @doc_inherit
     def _shoot(self, photons, ud):
         self._original._shoot(photons, ud)
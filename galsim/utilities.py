@@ -914,8 +914,24 @@ class LRU_Cache:
     but added a method for dynamic resizing.  The least recently used cached item is
     overwritten on a cache miss.
 
+    The cache may also be limited by the (approximate) memory used by the cached values, rather
+    than just by their number.  To do this, provide a function `sizeof` that returns the number
+    of bytes used by a value, along with `max_bytes`.  Then when a new value pushes the total
+    above `max_bytes`, the least recently used items are removed until it is below the limit
+    again.  (The new value itself is always kept, even if it is larger than `max_bytes` on its
+    own.)
+
+    The numbers of hits, misses and evictions are counted in the attributes `hits`, `misses`
+    and `evictions`, and are also returned along with some other information by the `stats`
+    method.
+
     @param user_function   A python function to cache.
     @param maxsize         Maximum number of inputs to cache.  [Default: 1024]
+    @param max_bytes       Maximum total size in bytes of the cached values, or None for no
+                           limit.  Requires `sizeof`.  [Default: None]
+    @param sizeof          A function that returns the size in bytes of a value returned by
+                           `user_function`, or None to not track the memory used.
+                           [Default: None]
 
     Usage
     -----
@@ -933,12 +949,28 @@ class LRU_Cache:
     >>> cache.resize(maxsize) # Resize the cache, either upwards or downwards.  Upwards resizing
                               # is non-destructive.  Downwards resizing will remove the least
                               # recently used items first.
+    >>> cache.set_max_bytes(max_bytes)  # Change the memory limit.
+    >>> cache.stats()         # Return a dict of statistics about the use of the cache.
+    >>> cache.clear()         # Remove all items from the cache and reset the statistics.
     """
-    def __init__(self, user_function, maxsize=1024):
+    def __init__(self, user_function, maxsize=1024, max_bytes=None, sizeof=None):
+        if max_bytes is not None and sizeof is None:
+            raise GalSimIncompatibleValuesError("max_bytes requires sizeof",
+                                                max_bytes=max_bytes, sizeof=sizeof)
+        self.user_function = user_function
+        self.sizeof = sizeof
+        self.max_bytes = max_bytes
+        self._build(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _build(self, maxsize):
         # Link layout:     [PREV, NEXT, KEY, RESULT]
         self.root = root = [None, None, None, None]
-        self.user_function = user_function
         self.cache = cache = {}
+        self._sizes = {}
+        self.nbytes = 0
 
         last = root
         for i in range(maxsize):
@@ -946,12 +978,19 @@ class LRU_Cache:
             cache[key] = last[1] = last = [last, root, key, None]
         root[0] = last
 
+    def _forget(self, key):
+        # Keys of real entries are tuples.  Unused slots have a plain object() as their key.
+        if type(key) is tuple:
+            self.evictions += 1
+            self.nbytes -= self._sizes.pop(key, 0)
+
     def __call__(self, *key):
         cache = self.cache
         root = self.root
         link = cache.get(key)
         if link is not None:
             # Cache hit: move link to last position
+            self.hits += 1
             link_prev, link_next, _, result = link
             link_prev[1] = link_next
             link_next[0] = link_prev
@@ -962,8 +1001,12 @@ class LRU_Cache:
             return result
         # Cache miss: evaluate and insert new key/value at root, then increment root
         #             so that just-evaluated value is in last position.
+        self.misses += 1
         result = self.user_function(*key)
         root = self.root  # re-establish root in case user_function modified it due to recursion
+        if key in cache:
+            # The recursion already cached this key, so don't add it again.
+            return result
         root[2] = key
         root[3] = result
         oldroot = root
@@ -972,8 +1015,34 @@ class LRU_Cache:
         root[3], oldvalue = None, root[3]
         del cache[oldkey]
         cache[key] = oldroot
+        self._forget(oldkey)
+        if self.sizeof is not None:
+            self._sizes[key] = size = self.sizeof(result)
+            self.nbytes += size
+            if self.max_bytes is not None:
+                self._trim(oldroot)
         return result
 
+    def _trim(self, keep=None):
+        """Remove the least recently used items until the total size is at most max_bytes.
+
+        @param keep     A link to keep, even if the cache is still too large. [default: None]
+        """
+        cache = self.cache
+        link = self.root[1]
+        while self.nbytes > self.max_bytes and link is not self.root and link is not keep:
+            oldkey = link[2]
+            if type(oldkey) is tuple:
+                # Turn it into an unused slot.  All the links before it are unused, so it
+                # is still in the right place to be reused next.
+                del cache[oldkey]
+                newkey = object()
+                link[2] = newkey
+                link[3] = None
+                cache[newkey] = link
+                self._forget(oldkey)
+            link = link[1]
+
     def resize(self, maxsize):
         """ Resize the cache.  Increasing the size of the cache is non-destructive, i.e.,
         previously cached inputs remain in the cache.  Decreasing the size of the cache will
@@ -997,6 +1066,7 @@ class LRU_Cache:
                     new_next_link = root[1] = root[1][1]
                     new_next_link[0] = root
                     del cache[current_next_link[2]]
+                    self._forget(current_next_link[2])
             else: #  maxsize > oldsize:
                 for i in range(maxsize - oldsize):
                     # Insert between root and root.next
@@ -1005,6 +1075,45 @@ class LRU_Cache:
                     root[1][0] = link
                     root[1] = link
 
+    def set_max_bytes(self, max_bytes):
+        """ Change the maximum total size in bytes of the cached values.  If the cache is
+        currently larger than this, the least recently used items are removed.
+
+        @param max_bytes    The new maximum size in bytes, or None for no limit.
+        """
+        if max_bytes is not None:
+            if self.sizeof is None:
+                raise GalSimIncompatibleValuesError("max_bytes requires sizeof",
+                                                    max_bytes=max_bytes, sizeof=self.sizeof)
+            if max_bytes < 0:
+                raise GalSimValueError("Invalid max_bytes", max_bytes)
+        self.max_bytes = max_bytes
+        if max_bytes is not None:
+            self._trim()
+
+    def stats(self):
+        """ Get statistics about the use of the cache.
+
+        @returns a dict with the number of `hits`, `misses` and `evictions`, the `hit_rate`, the
+                 current number of cached items (`size`), the `maxsize`, and the total size of
+                 the cached values in bytes (`nbytes`, which is 0 if there is no `sizeof`
+                 function), along with `max_bytes`.
+        """
+        ntot = self.hits + self.misses
+        return { 'hits' : self.hits, 'misses' : self.misses, 'evictions' : self.evictions,
+                 'hit_rate' : float(self.hits) / ntot if ntot > 0 else 0.,
+                 'size' : sum(1 for key in self.cache if type(key) is tuple),
+                 'maxsize' : len(self.cache),
+                 'nbytes' : self.nbytes, 'max_bytes' : self.max_bytes }
+
+    def clear(self):
+        """ Remove all items from the cache and reset the statistics.
+        """
+        self._build(len(self.cache))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
 
 # http://stackoverflow.com/questions/2891790/pretty-printing-of-numpy-array
 @contextmanager
@@ -1492,3 +1601,31 @@ def ensure_dir(target):
         raise OSError("tried to make directory '%s' "
                       "but a non-directory file of that "
                       "name already exists" % dir)
+
+def set_num_threads(num_threads):
+    """Set the number of threads to use in the C++ layer for drawing profiles and shooting photons.
+
+    When this is > 1, drawing a profile in real or Fourier space splits the image into bands of
+    rows that are filled in parallel, and photon shooting splits large numbers of photons into
+    batches that are shot in parallel, each with its own random number generator seeded from
+    the given one.  The results are the same for any number of threads > 1, but they differ
+    slightly from the single-threaded results: by floating point rounding for drawing and by
+    the particular random realization for photon shooting.
+
+    Regardless of this setting, the C++ drawing functions release the Python GIL while they are
+    running, so Python threads may also draw different objects concurrently.
+
+    Unless a different number is given to galsim.fft.set_backend, this is also the number of
+    threads used for large FFTs.
+
+    @param num_threads  The number of threads to use.  If this is <= 0, then use the number of
+                        cores on the machine.  [default: 1]
+    """
+    from . import _galsim
+    _galsim.SetNumThreads(int(num_threads))
+
+def get_num_threads():
+    """Get the number of threads being used in the C++ layer.  See set_num_threads for details.
+    """
+    from . import _galsim
+    return _galsim.GetNumThreads()
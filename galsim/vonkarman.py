@@ -236,6 +236,12 @@ class VonKarman(GSObject):
     def _xValue(self, pos):
         return self._sbvk.xValue(pos._p)
 
+    @doc_inherit
+    def _xValueArray(self, x, y):
+        val = np.empty_like(x)
+        self._sbvk.xValueMany(x.ctypes.data, y.ctypes.data, val.ctypes.data, x.size)
+        return val
+
     @doc_inherit
     def _kValue(self, kpos):
         return self._sbp.kValue(kpos._p)
@@ -244,6 +250,10 @@ class VonKarman(GSObject):
     def _drawReal(self, image):
         self._sbvk.draw(image._image, image.scale)
 
+    @doc_inherit
+    def _realSBP(self):
+        return self._sbvk
+
     @doc_inherit
     def _shoot(self, photons, rng):
         self._sbp.shoot(photons._pa, rng._rng)
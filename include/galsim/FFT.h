@@ -97,6 +97,32 @@ namespace galsim {
         FFTInvalid(const std::string& m="invalid plan or data") : FFTError(m) {}
     };
 
+    /**
+     * @brief Set the number of threads to use for large 2D FFTs.
+     *
+     * A value of 0 (the default) means to use GetNumThreads().  When more than one thread is
+     * used, large transforms are split into batches of 1D transforms along the rows and then
+     * along the columns, which are executed in parallel.
+     */
+    void SetFFTNumThreads(int num_threads);
+
+    /// @brief Get the number of threads to use for large 2D FFTs (always >= 1)
+    int GetFFTNumThreads();
+
+    /// @brief Destroy all of the cached FFTW plans.
+    void ClearFFTPlans();
+
+    /// @brief Return the number of cached FFTW plans.
+    int GetNumFFTPlans();
+
+    // Execute a 2D transform of an Ny x Nx (real-space) array, reusing a cached FFTW plan for
+    // this shape and data alignment.  The transforms may be done in place (in == out), in
+    // which case the real array has rows of length 2*(Nx/2+1) as usual for FFTW.
+    // Like FFTW, ExecuteC2R may overwrite its input.
+    void ExecuteR2C(int Ny, int Nx, double* in, fftw_complex* out);
+    void ExecuteC2R(int Ny, int Nx, fftw_complex* in, double* out);
+    void ExecuteC2C(int Ny, int Nx, fftw_complex* in, fftw_complex* out, int sign);
+
     // Quick helper struct to tell if T is real or complex
     template <typename T>
     struct FFTW_Traits
@@ -39,6 +39,10 @@ namespace galsim {
      * inclination "angles" (really slopes), a flux, and a wavelength carried by each photon.
      * It is the intention that fluxes of photons be nearly equal in absolute value so that noise
      * statistics can be estimated by counting number of positive and negative photons.
+     *
+     * The arrays may be either double or float.  All of the arrays in a given PhotonArray
+     * have the same type.  The accessors below always work in double precision, regardless
+     * of the storage type.
      */
     class PhotonArray
     {
@@ -71,7 +75,31 @@ namespace galsim {
         PhotonArray(size_t N, double* x, double* y, double* flux,
                     double* dxdz, double* dydz, double* wave, bool is_corr) :
             _N(N), _x(x), _y(y), _flux(flux), _dxdz(dxdz), _dydz(dydz), _wave(wave),
-            _is_correlated(is_corr) {}
+            _fx(0), _fy(0), _fflux(0), _fdxdz(0), _fdydz(0), _fwave(0),
+            _is_float(false), _is_correlated(is_corr) {}
+
+        /**
+         * @brief Construct a PhotonArray of the given size with the given float arrays.
+         *
+         * This is the same as the above constructor, but using single precision for the
+         * storage of the arrays.
+         */
+        PhotonArray(size_t N, float* x, float* y, float* flux,
+                    float* dxdz, float* dydz, float* wave, bool is_corr) :
+            _N(N), _x(0), _y(0), _flux(0), _dxdz(0), _dydz(0), _wave(0),
+            _fx(x), _fy(y), _fflux(flux), _fdxdz(dxdz), _fdydz(dydz), _fwave(wave),
+            _is_float(true), _is_correlated(is_corr) {}
+
+        /**
+         * @brief Make a PhotonArray that is a view of a portion of this one.
+         *
+         * The returned PhotonArray uses the same memory as this one, so setting photons in it
+         * sets the corresponding photons here.
+         *
+         * @param[in] istart    The index of the first photon to include
+         * @param[in] n         The number of photons to include
+         */
+        PhotonArray subArray(int istart, int n);
 
         /**
          * @brief Accessor for array size
@@ -83,6 +111,8 @@ namespace galsim {
         /**
          * @{
          * @brief Accessors that provide access as numpy arrays in Python layer
+         *
+         * These are only valid if the arrays are double (i.e. !isFloat()).
          */
         double* getXArray() { return _x; }
         double* getYArray() { return _y; }
@@ -90,12 +120,18 @@ namespace galsim {
         double* getDXDZArray() { return _dxdz; }
         double* getDYDZArray() { return _dydz; }
         double* getWavelengthArray() { return _wave; }
-        bool hasAllocatedAngles() const { return _dxdz != 0 && _dydz != 0; }
-        bool hasAllocatedWavelengths() const { return _wave != 0; }
+        bool hasAllocatedAngles() const
+        { return _is_float ? (_fdxdz != 0 && _fdydz != 0) : (_dxdz != 0 && _dydz != 0); }
+        bool hasAllocatedWavelengths() const { return _is_float ? _fwave != 0 : _wave != 0; }
         /**
          * @}
          */
 
+        /**
+         * @brief Return whether the arrays are stored as float rather than double.
+         */
+        bool isFloat() const { return _is_float; }
+
         /**
          * @brief Set characteristics of a photon that are decided during photon shooting
          * (i.e. only x,y,flux)
@@ -107,9 +143,15 @@ namespace galsim {
          */
         void setPhoton(int i, double x, double y, double flux)
         {
-            _x[i]=x;
-            _y[i]=y;
-            _flux[i]=flux;
+            if (_is_float) {
+                _fx[i]=x;
+                _fy[i]=y;
+                _fflux[i]=flux;
+            } else {
+                _x[i]=x;
+                _y[i]=y;
+                _flux[i]=flux;
+            }
         }
 
         /**
@@ -118,7 +160,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns x coordinate of photon
          */
-        double getX(int i) const { return _x[i]; }
+        double getX(int i) const { return _is_float ? _fx[i] : _x[i]; }
 
         /**
          * @brief Access y coordinate of a photon
@@ -126,7 +168,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns y coordinate of photon
          */
-        double getY(int i) const { return _y[i]; }
+        double getY(int i) const { return _is_float ? _fy[i] : _y[i]; }
 
         /**
          * @brief Access flux of a photon
@@ -134,7 +176,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns flux of photon
          */
-        double getFlux(int i) const { return _flux[i]; }
+        double getFlux(int i) const { return _is_float ? _fflux[i] : _flux[i]; }
 
         /**
          * @brief Access dxdz of a photon
@@ -142,7 +184,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns dxdz of photon
          */
-        double getDXDZ(int i) const { return _dxdz[i]; }
+        double getDXDZ(int i) const { return _is_float ? _fdxdz[i] : _dxdz[i]; }
 
         /**
          * @brief Access dydz coordinate of a photon
@@ -150,7 +192,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns dydz coordinate of photon
          */
-        double getDYDZ(int i) const { return _dydz[i]; }
+        double getDYDZ(int i) const { return _is_float ? _fdydz[i] : _dydz[i]; }
 
         /**
          * @brief Access wavelength of a photon
@@ -158,7 +200,7 @@ namespace galsim {
          * @param[in] i Index of desired photon (no bounds checking)
          * @returns wavelength of photon
          */
-        double getWavelength(int i) const { return _wave[i]; }
+        double getWavelength(int i) const { return _is_float ? _fwave[i] : _wave[i]; }
 
         /**
          * @brief Return sum of all photons' fluxes
@@ -275,6 +317,13 @@ namespace galsim {
         double* _dxdz;          // Array holding dxdz of photons
         double* _dydz;          // Array holding dydz of photons
         double* _wave;          // Array holding wavelength of photons
+        float* _fx;             // The same arrays when stored as float.
+        float* _fy;
+        float* _fflux;
+        float* _fdxdz;
+        float* _fdydz;
+        float* _fwave;
+        bool _is_float;         // Are the arrays float (rather than double)?
         bool _is_correlated;    // Are the photons correlated?
 
         // Most of the time the arrays are constructed in Python and passed in, so we don't
@@ -78,6 +78,12 @@ namespace galsim {
         bool hasHardEdges() const { return _anyHardEdges; }
         bool isAnalyticX() const { return _allAnalyticX; }
         bool isAnalyticK() const { return _allAnalyticK; }
+        bool isThreadSafe() const
+        {
+            for (ConstIter pptr = _plist.begin(); pptr!=_plist.end(); ++pptr)
+                if (!pptr->isThreadSafe()) return false;
+            return true;
+        }
 
         Position<double> centroid() const
         { return Position<double>(_sumfx / _sumflux, _sumfy / _sumflux); }
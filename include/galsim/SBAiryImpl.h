@@ -24,6 +24,7 @@
 #include "SBAiry.h"
 #include "LRUCache.h"
 #include "OneDimensionalDeviate.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -39,7 +40,7 @@ namespace galsim {
         /**
          * @brief Constructor
          */
-        AiryInfo() {}
+        AiryInfo() : _sampler_done(false) {}
 
         /// @brief Destructor: deletes photon-shooting classes if necessary
         virtual ~AiryInfo() {}
@@ -84,6 +85,7 @@ namespace galsim {
 
         ///< Class that can sample radial distribution
         mutable shared_ptr<OneDimensionalDeviate> _sampler;
+        mutable std::atomic<bool> _sampler_done; ///< Flag for LazyInit of _sampler
 
     private:
         AiryInfo(const AiryInfo& rhs); ///< Hides the copy constructor.
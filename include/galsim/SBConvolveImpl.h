@@ -22,6 +22,7 @@
 
 #include "SBProfileImpl.h"
 #include "SBConvolve.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -47,6 +48,12 @@ namespace galsim {
         bool hasHardEdges() const { return false; }
         bool isAnalyticX() const { return _real_space; }
         bool isAnalyticK() const { return true; }    // convolvees must all meet this
+        bool isThreadSafe() const
+        {
+            for (ConstIter pptr = _plist.begin(); pptr!=_plist.end(); ++pptr)
+                if (!pptr->isThreadSafe()) return false;
+            return true;
+        }
         double maxK() const;
         double stepK() const;
 
@@ -139,6 +146,8 @@ namespace galsim {
 
         mutable double _maxk; ///< Minimum maxK() of the convolved SBProfiles.
         mutable double _stepk; ///< Minimum stepK() of the convolved SBProfiles.
+        mutable std::atomic<bool> _maxk_done; ///< Flag for LazyInit of _maxk
+        mutable std::atomic<bool> _stepk_done; ///< Flag for LazyInit of _stepk
 
         void doFillKImage(ImageView<std::complex<double> > im,
                           double kx0, double dkx, int izero,
@@ -182,6 +191,7 @@ namespace galsim {
         bool hasHardEdges() const { return false; }
         bool isAnalyticX() const { return _real_space; }
         bool isAnalyticK() const { return true; }
+        bool isThreadSafe() const { return _adaptee.isThreadSafe(); }
         double maxK() const { return _adaptee.maxK(); }
         double stepK() const { return _adaptee.stepK() / sqrt(2.); }
 
@@ -258,6 +268,7 @@ namespace galsim {
         bool hasHardEdges() const { return false; }
         bool isAnalyticX() const { return _real_space; }
         bool isAnalyticK() const { return true; }
+        bool isThreadSafe() const { return _adaptee.isThreadSafe(); }
         double maxK() const { return _adaptee.maxK(); }
         double stepK() const { return _adaptee.stepK() / sqrt(2.); }
 
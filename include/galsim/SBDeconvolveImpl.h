@@ -49,6 +49,7 @@ namespace galsim {
 
         bool isAnalyticX() const { return false; }
         bool isAnalyticK() const { return true; }
+        bool isThreadSafe() const { return _adaptee.isThreadSafe(); }
 
         Position<double> centroid() const;
         double getFlux() const;
@@ -69,6 +69,8 @@ namespace galsim {
         // are found by interpolation of a table:
         bool isAnalyticX() const { return true; }
         bool isAnalyticK() const { return true; }
+        // The XTable and KTable interpolation caches are not thread safe.
+        bool isThreadSafe() const { return false; }
         Position<double> centroid() const;
         double getFlux() const;
         double maxSB() const;
@@ -235,6 +237,8 @@ namespace galsim {
         // a table.  We do not currently implement xValue for real-space interpolation.
         bool isAnalyticX() const { return false; }
         bool isAnalyticK() const { return true; }
+        // The XTable and KTable interpolation caches are not thread safe.
+        bool isThreadSafe() const { return false; }
         void setCentroid() const;
         Position<double> centroid() const;
         double getFlux() const { return _flux; }
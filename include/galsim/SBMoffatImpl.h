@@ -24,6 +24,7 @@
 #include "SBMoffat.h"
 #include "Table.h"
 #include "OneDimensionalDeviate.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -124,11 +125,18 @@ namespace galsim {
         mutable double _stepk;
         mutable double _maxk; ///< Maximum k with kValue > 1.e-3
 
+        // Flags for LazyInit to mark which of the above have been calculated
+        mutable std::atomic<bool> _ft_done;
+        mutable std::atomic<bool> _stepk_done;
+        mutable std::atomic<bool> _maxk_done;
+
         double (*_pow_beta)(double x, double beta);
         double (SBMoffatImpl::*_kV)(double ksq) const;
 
-        /// Setup the FT Table.
+        /// Setup the FT Table if it has not been built yet.
         void setupFT() const;
+        /// Build the FT Table.
+        void buildFT() const;
 
         // These are the (unnormalized) kValue functions for untruncated Moffats
         double kV_15(double ksq) const;
@@ -146,6 +146,20 @@ namespace galsim {
          */
         double xValue(const Position<double>& p) const;
 
+        /**
+         * @brief Return the values of SBProfile at many positions in real space.
+         *
+         * This is equivalent to calling xValue(Position<double>(x[i],y[i])) for each i, but
+         * without any per-point overhead.  If the profile is thread safe, the points are split
+         * among the threads set by SetNumThreads.
+         *
+         * @param[in] x     The x values of the positions.
+         * @param[in] y     The y values of the positions.
+         * @param[out] val  The output values.
+         * @param[in] n     The number of positions.
+         */
+        void xValueMany(const double* x, const double* y, double* val, int n) const;
+
         /**
          * @brief Return value of SBProfile at a chosen 2D position in k space.
          *
@@ -153,6 +167,19 @@ namespace galsim {
          */
         std::complex<double> kValue(const Position<double>& k) const;
 
+        /**
+         * @brief Return the values of SBProfile at many positions in k space.
+         *
+         * This is the k-space equivalent of xValueMany.
+         *
+         * @param[in] kx    The kx values of the positions.
+         * @param[in] ky    The ky values of the positions.
+         * @param[out] val  The output values.
+         * @param[in] n     The number of positions.
+         */
+        void kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                        int n) const;
+
         //@{
         /**
          *  @brief Define the range over which the profile is not trivially zero.
@@ -222,6 +249,15 @@ namespace galsim {
          */
         bool isAnalyticK() const;
 
+        /**
+         * @brief Check whether different parts of an image of the SBProfile may be drawn
+         * concurrently from several threads.
+         *
+         * This is true unless the profile (or one of its components) updates some internal
+         * cache while it is being drawn.
+         */
+        bool isThreadSafe() const;
+
         /// @brief Returns (X, Y) centroid of SBProfile.
         Position<double> centroid() const;
 
@@ -379,6 +415,21 @@ namespace galsim {
         shared_ptr<SBProfileImpl> _pimpl;
     };
 
+    /**
+     * @brief Draw a batch of SBProfiles in real space, each onto its own image.
+     *
+     * This is equivalent to calling profs[i].draw(images[i], dx[i]) for each i in turn, so the
+     * results are identical to drawing them one at a time.  It exists so that the python layer
+     * can draw many profiles with a single call into C++.
+     *
+     * @param[in]        profs, the profiles to draw
+     * @param[in,out]    images, the images to draw onto (same length as profs)
+     * @param[in]        dx, the pixel scale to use for each image (same length as profs)
+     */
+    template <typename T>
+    void drawMany(const std::vector<SBProfile>& profs, std::vector<ImageView<T> >& images,
+                  const std::vector<double>& dx);
+
 }
 
 #endif
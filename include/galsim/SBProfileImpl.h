@@ -122,6 +122,10 @@ namespace galsim {
 
         virtual double getNegativeFlux() const { return getFlux()>0. ? 0. : -getFlux(); }
 
+        // Whether fillXImage and fillKImage may be called concurrently on different parts of
+        // an image.  Profiles that update some internal cache while drawing should return false.
+        virtual bool isThreadSafe() const { return true; }
+
         // Public so it can be directly used from SBProfile.
         GSParams gsparams;
 
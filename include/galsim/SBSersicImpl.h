@@ -26,6 +26,7 @@
 #include "LRUCache.h"
 #include "OneDimensionalDeviate.h"
 #include "Table.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -122,6 +123,13 @@ namespace galsim {
         mutable shared_ptr<FluxDensity> _radial;
         mutable shared_ptr<OneDimensionalDeviate> _sampler;
 
+        // Flags for LazyInit to mark which of the above have been calculated
+        mutable std::atomic<bool> _stepk_done;
+        mutable std::atomic<bool> _ft_done;
+        mutable std::atomic<bool> _re_done;
+        mutable std::atomic<bool> _flux_done;
+        mutable std::atomic<bool> _sampler_done;
+
         // Helper functions used internally:
         void buildFT() const;
         void calculateHLR() const;
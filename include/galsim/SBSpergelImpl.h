@@ -24,6 +24,7 @@
 #include "SBSpergel.h"
 #include "LRUCache.h"
 #include "OneDimensionalDeviate.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -102,6 +103,12 @@ namespace galsim {
         // Classes used for photon shooting
         mutable shared_ptr<FluxDensity> _radial;
         mutable shared_ptr<OneDimensionalDeviate> _sampler;
+
+        // Flags for LazyInit to mark which of the above have been calculated
+        mutable std::atomic<bool> _maxk_done;
+        mutable std::atomic<bool> _stepk_done;
+        mutable std::atomic<bool> _re_done;
+        mutable std::atomic<bool> _sampler_done;
     };
 
     class SBSpergel::SBSpergelImpl : public SBProfileImpl
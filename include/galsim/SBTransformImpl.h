@@ -22,6 +22,7 @@
 
 #include "SBProfileImpl.h"
 #include "SBTransform.h"
+#include "Threads.h"
 
 namespace galsim {
 
@@ -41,6 +42,7 @@ namespace galsim {
         bool hasHardEdges() const { return _adaptee.hasHardEdges(); }
         bool isAnalyticX() const { return _adaptee.isAnalyticX(); }
         bool isAnalyticK() const { return _adaptee.isAnalyticK(); }
+        bool isThreadSafe() const { return _adaptee.isThreadSafe(); }
 
         double maxK() const;
         double stepK() const;
@@ -121,7 +123,13 @@ namespace galsim {
         mutable double _coeff_b, _coeff_c, _coeff_c2; ///< Values used in getYRangeX(x,ymin,ymax);
         mutable std::vector<double> _xsplits, _ysplits; ///< Good split points for the intetegrals
 
+        // Flags for LazyInit to mark which of the above have been calculated
+        mutable std::atomic<bool> _maxk_done;
+        mutable std::atomic<bool> _stepk_done;
+        mutable std::atomic<bool> _ranges_done;
+
         void setupRanges() const;
+        void buildRanges() const;
 
         /**
          * @brief Forward coordinate transform with `M` matrix.
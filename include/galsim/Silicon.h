@@ -43,18 +43,32 @@ namespace galsim
                 const Table& tr_radial_table, Position<double> treeRingCenter,
                 const Table& abs_length_table, bool transpose);
 
+        // If testpoly is given, it is used as scratch space rather than _testpoly, which lets
+        // several threads call this at once.
         template <typename T>
         bool insidePixel(int ix, int iy, double x, double y, double zconv,
-                         ImageView<T> target, bool* off_edge=0) const;
+                         ImageView<T> target, bool* off_edge=0, Polygon* testpoly=0) const;
 
         double calculateConversionDepth(const PhotonArray& photons, int i, UniformDeviate ud) const;
 
+        // The same, but using the given uniform deviate value u if a random number is needed.
+        double calculateConversionDepth(const PhotonArray& photons, int i, double u) const;
+
         template <typename T>
         void updatePixelDistortions(ImageView<T> target);
 
         template <typename T>
         void addTreeRingDistortions(ImageView<T> target, Position<int> orig_center);
 
+        // Set a precomputed map of the tree ring displacements, (dx,dy), on a grid of
+        // nx x ny points with the given spacing, starting at (x0,y0).  The points are stored
+        // with x varying fastest.  Positions are in the same coordinates as treeRingCenter.
+        // When the whole target image is covered by the map, addTreeRingDistortions uses
+        // bilinear interpolation of the map rather than evaluating the radial function for
+        // each vertex.  Use nx = ny = 0 to remove the map.
+        void setTreeRingMap(const float* dx, const float* dy, int nx, int ny,
+                            double x0, double y0, double step);
+
         template <typename T>
         double accumulate(const PhotonArray& photons, UniformDeviate ud, ImageView<T> target,
                           Position<int> orig_center, bool resume);
@@ -63,6 +77,30 @@ namespace galsim
         void fillWithPixelAreas(ImageView<T> target, Position<int> orig_center);
 
     private:
+        // The version of addTreeRingDistortions that uses the tree ring map.
+        template <typename T>
+        void addTreeRingDistortionsFromMap(ImageView<T> target, Position<int> orig_center);
+
+        // The version of accumulate used when GetNumThreads() > 1.
+        template <typename T>
+        double accumulateParallel(const PhotonArray& photons, UniformDeviate ud,
+                                  ImageView<T> target, double& next_recalc);
+
+        // The image is divided into tiles of tile_size x tile_size pixels.  We keep track of
+        // which tiles have had charge added since the last call to updatePixelDistortions, so
+        // only the pixels within _qDist of those tiles need to be updated.
+        static const int tile_size = 32;
+        void initDirtyTiles(const Bounds<int>& b, bool dirty);
+        // Add factor * _delta to target, or zero _delta, just in the dirty tiles.
+        template <typename T>
+        void addDelta(ImageView<T> target, double factor);
+        void clearDelta();
+        void markDirty(int ix, int iy)
+        {
+            _dirtyTiles[((iy - _tileBounds.getYMin()) / tile_size) * _ntx +
+                        (ix - _tileBounds.getXMin()) / tile_size] = true;
+        }
+
         Polygon _emptypoly;
         mutable Polygon _testpoly;
         std::vector<Polygon> _distortions;
@@ -71,10 +109,17 @@ namespace galsim
         double _nrecalc, _diffStep, _pixelSize, _sensorThickness;
         Table _tr_radial_table;
         Position<double> _treeRingCenter;
+        std::vector<float> _trMapX, _trMapY;
+        int _trMapNx, _trMapNy;
+        double _trMapX0, _trMapY0, _trMapStep;
         Table _abs_length_table;
         bool _transpose;
         double _resume_next_recalc;
         ImageAlloc<double> _delta;
+        Bounds<int> _tileBounds;
+        int _ntx, _nty;
+        std::vector<bool> _dirtyTiles;
+        std::vector<bool> _changed;
     };
 }
 
@@ -0,0 +1,115 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2018 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_Threads_H
+#define GalSim_Threads_H
+
+#include <vector>
+#include <thread>
+#include <atomic>
+#include <exception>
+#include <algorithm>
+#include <mutex>
+
+namespace galsim {
+
+    /**
+     * @brief Set the number of threads to use for the parts of the C++ layer that can be run
+     * in parallel.
+     *
+     * The default is 1, which means everything runs serially in the calling thread.
+     * A value <= 0 means to use the number of cores reported by the hardware.
+     */
+    void SetNumThreads(int num_threads);
+
+    /// @brief Get the current number of threads to use (always >= 1)
+    int GetNumThreads();
+
+    /**
+     * @brief Call func(i) for each i in [0, n), using up to GetNumThreads() threads.
+     *
+     * The tasks are handed out to the threads in order as each thread finishes its previous
+     * task, so the tasks should not depend on which thread runs them.  The calling thread
+     * does some of the work too.  If any task throws an exception, the first one is rethrown
+     * once all the threads have finished.
+     *
+     * The first nserial tasks are run in the calling thread before starting any other threads.
+     * This is useful when the first call might initialize some lazily computed values that
+     * the later calls can then share.
+     *
+     * If max_threads > 0, it is used in place of GetNumThreads() as the maximum number of
+     * threads to use.
+     */
+    template <class F>
+    void ParallelFor(int n, const F& func, int nserial=0, int max_threads=0)
+    {
+        nserial = std::min(nserial, n);
+        for (int i=0; i<nserial; ++i) func(i);
+
+        if (max_threads <= 0) max_threads = GetNumThreads();
+        const int nthreads = std::min(max_threads, n - nserial);
+        if (nthreads <= 1) {
+            for (int i=nserial; i<n; ++i) func(i);
+            return;
+        }
+
+        std::atomic<int> next(nserial);
+        std::vector<std::exception_ptr> errors(nthreads);
+        auto work = [&](int t) {
+            try {
+                for (int i=next++; i<n; i=next++) func(i);
+            } catch (...) {
+                errors[t] = std::current_exception();
+            }
+        };
+        std::vector<std::thread> threads;
+        for (int t=1; t<nthreads; ++t) threads.push_back(std::thread(work, t));
+        work(0);
+        for (size_t t=0; t<threads.size(); ++t) threads[t].join();
+        for (int t=0; t<nthreads; ++t)
+            if (errors[t]) std::rethrow_exception(errors[t]);
+    }
+
+    /// @brief The mutex used by LazyInit.  It is recursive, since some builds need others.
+    std::recursive_mutex& LazyInitMutex();
+
+    /**
+     * @brief Run build() exactly once for a lazily computed value, even if several threads
+     * ask for it at the same time.
+     *
+     * Many of the profiles compute things like their Fourier tables or photon samplers the
+     * first time they are needed and store them in mutable members.  Since the same profile
+     * may be used from several threads (both from ParallelFor and from multiple Python threads
+     * once the GIL has been released), such builds need to be guarded by this function.
+     * The done flag should be initialized to false in the constructor.  After the first
+     * call has finished, the cost is a single atomic load.
+     */
+    template <class F>
+    void LazyInit(std::atomic<bool>& done, const F& build)
+    {
+        if (done.load(std::memory_order_acquire)) return;
+        std::lock_guard<std::recursive_mutex> lock(LazyInitMutex());
+        if (done.load(std::memory_order_relaxed)) return;
+        build();
+        done.store(true, std::memory_order_release);
+    }
+
+}
+
+#endif
@@ -19,6 +19,7 @@
 
 #include "PyBind11Helper.h"
 #include "Image.h"
+#include "FFT.h"
 
 // Note that docstrings are now added in galsim/image.py
 namespace galsim {
@@ -71,6 +72,10 @@ namespace galsim {
         WrapImage<std::complex<float> >(_galsim, "CF");
 
         GALSIM_DOT def("goodFFTSize", &goodFFTSize);
+        GALSIM_DOT def("SetFFTNumThreads", &SetFFTNumThreads);
+        GALSIM_DOT def("GetFFTNumThreads", &GetFFTNumThreads);
+        GALSIM_DOT def("ClearFFTPlans", &ClearFFTPlans);
+        GALSIM_DOT def("GetNumFFTPlans", &GetNumFFTPlans);
     }
 
 } // namespace galsim
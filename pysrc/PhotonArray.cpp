@@ -32,8 +32,18 @@ namespace galsim {
     }
 
     static PhotonArray* construct(int N, size_t ix, size_t iy, size_t iflux,
-                                  size_t idxdz, size_t idydz, size_t iwave, bool is_corr)
+                                  size_t idxdz, size_t idydz, size_t iwave, bool is_corr,
+                                  bool is_float)
     {
+        if (is_float) {
+            float *x = reinterpret_cast<float*>(ix);
+            float *y = reinterpret_cast<float*>(iy);
+            float *flux = reinterpret_cast<float*>(iflux);
+            float *dxdz = reinterpret_cast<float*>(idxdz);
+            float *dydz = reinterpret_cast<float*>(idydz);
+            float *wave = reinterpret_cast<float*>(iwave);
+            return new PhotonArray(N, x, y, flux, dxdz, dydz, wave, is_corr);
+        }
         double *x = reinterpret_cast<double*>(ix);
         double *y = reinterpret_cast<double*>(iy);
         double *flux = reinterpret_cast<double*>(iflux);
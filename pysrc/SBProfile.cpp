@@ -20,17 +20,128 @@
 #include "PyBind11Helper.h"
 #include "SBProfile.h"
 #include "SBTransform.h"
+#include "Threads.h"
 
 namespace galsim {
 
+#ifdef USE_BOOST
+    // Release the GIL for the duration of a long-running C++ call.
+    struct ReleaseGIL
+    {
+        ReleaseGIL() : _state(PyEval_SaveThread()) {}
+        ~ReleaseGIL() { PyEval_RestoreThread(_state); }
+        PyThreadState* _state;
+    };
+#else
+    typedef py::gil_scoped_release ReleaseGIL;
+#endif
+
+    // The drawing and shooting functions don't touch any python objects, so they release the
+    // GIL while they are running.  This lets python threads draw different objects concurrently.
+    // Profiles that are not thread safe keep the GIL, so the same object can't be drawn by
+    // several python threads at once.
+    template <typename T>
+    static void Draw(const SBProfile& prof, ImageView<T> image, double dx)
+    {
+        if (prof.isThreadSafe()) {
+            ReleaseGIL release;
+            prof.draw(image, dx);
+        } else {
+            prof.draw(image, dx);
+        }
+    }
+
+    template <typename T>
+    static void DrawK(const SBProfile& prof, ImageView<std::complex<T> > image, double dk)
+    {
+        if (prof.isThreadSafe()) {
+            ReleaseGIL release;
+            prof.drawK(image, dk);
+        } else {
+            prof.drawK(image, dk);
+        }
+    }
+
+    static void Shoot(const SBProfile& prof, PhotonArray& photons, UniformDeviate ud)
+    {
+        if (prof.isThreadSafe()) {
+            ReleaseGIL release;
+            prof.shoot(photons, ud);
+        } else {
+            prof.shoot(photons, ud);
+        }
+    }
+
+    static void XValueMany(const SBProfile& prof, size_t ix, size_t iy, size_t ival, int n)
+    {
+        const double* x = reinterpret_cast<const double*>(ix);
+        const double* y = reinterpret_cast<const double*>(iy);
+        double* val = reinterpret_cast<double*>(ival);
+        if (prof.isThreadSafe()) {
+            ReleaseGIL release;
+            prof.xValueMany(x, y, val, n);
+        } else {
+            prof.xValueMany(x, y, val, n);
+        }
+    }
+
+    static void KValueMany(const SBProfile& prof, size_t ikx, size_t iky, size_t ival, int n)
+    {
+        const double* kx = reinterpret_cast<const double*>(ikx);
+        const double* ky = reinterpret_cast<const double*>(iky);
+        std::complex<double>* val = reinterpret_cast<std::complex<double>*>(ival);
+        if (prof.isThreadSafe()) {
+            ReleaseGIL release;
+            prof.kValueMany(kx, ky, val, n);
+        } else {
+            prof.kValueMany(kx, ky, val, n);
+        }
+    }
+
     template <typename T, typename W>
     static void WrapTemplates(W& wrapper)
     {
-        wrapper.def("draw", (void (SBProfile::*)(ImageView<T>, double) const)&SBProfile::draw);
-        wrapper.def("drawK", (void (SBProfile::*)(ImageView<std::complex<T> >, double) const)
-                    &SBProfile::drawK);
+        wrapper.def("draw", &Draw<T>);
+        wrapper.def("drawK", &DrawK<T>);
     }
 
+    template <typename T>
+    static void DoDrawMany(const std::vector<SBProfile>& profs, std::vector<ImageView<T> >& images,
+                           const std::vector<double>& dx)
+    {
+        for (size_t i=0; i<profs.size(); ++i) {
+            if (!profs[i].isThreadSafe()) {
+                drawMany(profs, images, dx);
+                return;
+            }
+        }
+        ReleaseGIL release;
+        drawMany(profs, images, dx);
+    }
+
+#ifdef USE_BOOST
+    template <typename T>
+    static void DrawMany(const py::object& prof_iter, const py::object& image_iter,
+                         const py::object& dx_iter)
+    {
+        py::stl_input_iterator<SBProfile> piter(prof_iter), pend;
+        std::vector<SBProfile> profs(piter, pend);
+        py::stl_input_iterator<ImageView<T> > iiter(image_iter), iend;
+        std::vector<ImageView<T> > images;
+        for(; iiter != iend; ++iiter) images.push_back(*iiter);
+        py::stl_input_iterator<double> diter(dx_iter), dend;
+        std::vector<double> dx(diter, dend);
+        DoDrawMany(profs, images, dx);
+    }
+#else
+    template <typename T>
+    static void DrawMany(const std::vector<SBProfile>& profs, std::vector<ImageView<T> > images,
+                         const std::vector<double>& dx)
+    {
+        DoDrawMany(profs, images, dx);
+    }
+#endif
+
     void pyExportSBProfile(PY_MODULE& _galsim)
     {
         py::class_<GSParams>(GALSIM_COMMA "GSParams" BP_NOINIT)
@@ -41,7 +152,9 @@ namespace galsim {
         py::class_<SBProfile> pySBProfile(GALSIM_COMMA "SBProfile" BP_NOINIT);
         pySBProfile
             .def("xValue", &SBProfile::xValue)
+            .def("xValueMany", &XValueMany)
             .def("kValue", &SBProfile::kValue)
+            .def("kValueMany", &KValueMany)
             .def("maxK", &SBProfile::maxK)
             .def("stepK", &SBProfile::stepK)
             .def("centroid", &SBProfile::centroid)
@@ -49,9 +162,15 @@ namespace galsim {
             .def("getPositiveFlux", &SBProfile::getPositiveFlux)
             .def("getNegativeFlux", &SBProfile::getNegativeFlux)
             .def("maxSB", &SBProfile::maxSB)
-            .def("shoot", &SBProfile::shoot);
+            .def("shoot", &Shoot);
         WrapTemplates<float>(pySBProfile);
         WrapTemplates<double>(pySBProfile);
+
+        GALSIM_DOT def("drawManyF", &DrawMany<float>);
+        GALSIM_DOT def("drawManyD", &DrawMany<double>);
+
+        GALSIM_DOT def("SetNumThreads", &SetNumThreads);
+        GALSIM_DOT def("GetNumThreads", &GetNumThreads);
     }
 
 } // namespace galsim
@@ -46,10 +46,19 @@ namespace galsim {
                            treeRingTable, treeRingCenter, abs_length_table, transpose);
     }
 
+    static void SetTreeRingMap(Silicon& silicon, size_t idx, size_t idy, int nx, int ny,
+                               double x0, double y0, double step)
+    {
+        const float* dx = reinterpret_cast<const float*>(idx);
+        const float* dy = reinterpret_cast<const float*>(idy);
+        silicon.setTreeRingMap(dx, dy, nx, ny, x0, y0, step);
+    }
+
     void pyExportSilicon(PY_MODULE& _galsim)
     {
         py::class_<Silicon> pySilicon(GALSIM_COMMA "Silicon" BP_NOINIT);
         pySilicon.def(PY_INIT(&MakeSilicon));
+        pySilicon.def("set_tree_ring_map", &SetTreeRingMap);
 
         WrapTemplates<double>(pySilicon);
         WrapTemplates<float>(pySilicon);
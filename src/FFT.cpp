@@ -23,9 +23,13 @@
 
 #include <limits>
 #include <vector>
+#include <map>
+#include <mutex>
+#include <atomic>
 #include <cassert>
 #include "FFT.h"
 #include "Std.h"
+#include "Threads.h"
 
 #ifdef __SSE2__
 #include "xmmintrin.h"
@@ -33,6 +37,205 @@
 
 namespace galsim {
 
+    // The FFTW plans are cached according to the kind of transform, its size and the layout
+    // and alignment of the data, so they can be reused for any later transform that matches.
+    // The FFTW planner is not thread safe (only fftw_execute is), so all access to the cache,
+    // and all creation and destruction of plans, happens with plan_mutex locked.
+    static std::mutex plan_mutex;
+
+    // A cached plan.  Transforms hold a reference to each plan while they execute it, so
+    // ClearFFTPlans can remove plans from the cache while they are in use.  Each plan is only
+    // destroyed when the last reference to it is released.
+    struct FFTWPlan
+    {
+        FFTWPlan(fftw_plan p) : plan(p) {}
+        ~FFTWPlan()
+        {
+            std::lock_guard<std::mutex> lock(plan_mutex);
+            fftw_destroy_plan(plan);
+        }
+        fftw_plan plan;
+    };
+    typedef shared_ptr<FFTWPlan> PlanPtr;
+
+    static std::map<std::vector<int>, PlanPtr> plan_cache;
+    static std::atomic<int> fft_num_threads(0);
+
+    // Transforms with fewer elements than this are always done serially with a single 2D plan.
+    static const int min_parallel_fft_size = 128*128;
+    // The number of rows or columns to do together in each task of a parallel transform.
+    static const int fft_block_size = 16;
+
+    enum PlanKind { R2C_2D, C2R_2D, C2C_2D, R2C_ROWS, C2R_ROWS, C2C_ROWS, C2C_COLS };
+
+    void SetFFTNumThreads(int num_threads)
+    { fft_num_threads = std::max(num_threads, 0); }
+
+    int GetFFTNumThreads()
+    {
+        int n = fft_num_threads;
+        return n > 0 ? n : GetNumThreads();
+    }
+
+    void ClearFFTPlans()
+    {
+        std::map<std::vector<int>, PlanPtr> old_plans;
+        {
+            std::lock_guard<std::mutex> lock(plan_mutex);
+            old_plans.swap(plan_cache);
+        }
+        // The plans that are not currently being executed are destroyed here, when old_plans
+        // goes out of scope (after releasing the lock, since ~FFTWPlan locks it).  The others
+        // are destroyed when the transforms using them finish.
+    }
+
+    int GetNumFFTPlans()
+    {
+        std::lock_guard<std::mutex> lock(plan_mutex);
+        return int(plan_cache.size());
+    }
+
+    // Return the cached plan for the given key, calling make() to create it if necessary.
+    template <class F>
+    static PlanPtr GetPlan(const std::vector<int>& key, const F& make)
+    {
+        std::lock_guard<std::mutex> lock(plan_mutex);
+        std::map<std::vector<int>, PlanPtr>::iterator it = plan_cache.find(key);
+        if (it != plan_cache.end()) return it->second;
+        fftw_plan plan = make();
+        if (plan==NULL) throw FFTInvalid();
+        PlanPtr ptr(new FFTWPlan(plan));
+        plan_cache[key] = ptr;
+        return ptr;
+    }
+
+    // A plan can only be reused on arrays with the same alignment as the ones used to make it.
+    // FFTW (>= 3.3) has fftw_alignment_of for this, but it only needs the alignment modulo the
+    // SIMD vector size, so using a multiple of that is equivalent (if a bit more conservative).
+    static int AlignmentOf(const void* p)
+    { return int((uintptr_t) p % 64); }
+
+    // All the plans for the parallel transforms use FFTW_UNALIGNED, so they can be executed
+    // on any of the rows or columns.
+    static const unsigned parallel_flags = FFTW_ESTIMATE | FFTW_UNALIGNED;
+
+    // Do the complex transforms along the columns of an Ny x ncol complex array whose rows
+    // are separated by stride elements, in place.
+    static void ColumnFFTs(int Ny, int ncol, int stride, fftw_complex* data, int sign,
+                           int nthreads)
+    {
+        const int nblock = (ncol + fft_block_size - 1) / fft_block_size;
+        std::vector<PlanPtr> plans(2);
+        for (int k=0; k<2; ++k) {
+            int howmany = k==0 ? fft_block_size : ncol - (nblock-1) * fft_block_size;
+            std::vector<int> key = { C2C_COLS, Ny, howmany, stride, sign };
+            plans[k] = GetPlan(key, [&]() {
+                return fftw_plan_many_dft(1, &Ny, howmany, data, NULL, stride, 1,
+                                          data, NULL, stride, 1, sign, parallel_flags);
+            });
+        }
+        ParallelFor(nblock, [&](int b) {
+            fftw_complex* ptr = data + b * fft_block_size;
+            fftw_execute_dft(plans[b < nblock-1 ? 0 : 1]->plan, ptr, ptr);
+        }, 0, nthreads);
+    }
+
+    void ExecuteR2C(int Ny, int Nx, double* in, fftw_complex* out)
+    {
+        const bool inplace = (void*)in == (void*)out;
+        const int nthreads = GetFFTNumThreads();
+        if (nthreads > 1 && Nx * Ny >= min_parallel_fft_size) {
+            // Do the real transforms of the rows, then the complex transforms of the columns.
+            const int cstride = Nx/2 + 1;
+            const int rstride = inplace ? 2*cstride : Nx;
+            const int nblock = (Ny + fft_block_size - 1) / fft_block_size;
+            std::vector<PlanPtr> plans(2);
+            for (int k=0; k<2; ++k) {
+                int howmany = k==0 ? fft_block_size : Ny - (nblock-1) * fft_block_size;
+                std::vector<int> key = { R2C_ROWS, Nx, howmany, inplace };
+                plans[k] = GetPlan(key, [&]() {
+                    return fftw_plan_many_dft_r2c(1, &Nx, howmany, in, NULL, 1, rstride,
+                                                  out, NULL, 1, cstride, parallel_flags);
+                });
+            }
+            ParallelFor(nblock, [&](int b) {
+                int j = b * fft_block_size;
+                fftw_execute_dft_r2c(plans[b < nblock-1 ? 0 : 1]->plan, in + j*rstride, out + j*cstride);
+            }, 0, nthreads);
+            ColumnFFTs(Ny, cstride, cstride, out, FFTW_FORWARD, nthreads);
+        } else {
+            std::vector<int> key = { R2C_2D, Nx, Ny, inplace, AlignmentOf(in), AlignmentOf(out) };
+            PlanPtr plan = GetPlan(key, [&]() {
+                return fftw_plan_dft_r2c_2d(Ny, Nx, in, out, FFTW_ESTIMATE);
+            });
+            fftw_execute_dft_r2c(plan->plan, in, out);
+        }
+    }
+
+    void ExecuteC2R(int Ny, int Nx, fftw_complex* in, double* out)
+    {
+        const bool inplace = (void*)in == (void*)out;
+        const int nthreads = GetFFTNumThreads();
+        if (nthreads > 1 && Nx * Ny >= min_parallel_fft_size) {
+            // Do the complex transforms of the columns in place, then the real transforms of
+            // the rows.
+            const int cstride = Nx/2 + 1;
+            const int rstride = inplace ? 2*cstride : Nx;
+            ColumnFFTs(Ny, cstride, cstride, in, FFTW_BACKWARD, nthreads);
+            const int nblock = (Ny + fft_block_size - 1) / fft_block_size;
+            std::vector<PlanPtr> plans(2);
+            for (int k=0; k<2; ++k) {
+                int howmany = k==0 ? fft_block_size : Ny - (nblock-1) * fft_block_size;
+                std::vector<int> key = { C2R_ROWS, Nx, howmany, inplace };
+                plans[k] = GetPlan(key, [&]() {
+                    return fftw_plan_many_dft_c2r(1, &Nx, howmany, in, NULL, 1, cstride,
+                                                  out, NULL, 1, rstride, parallel_flags);
+                });
+            }
+            ParallelFor(nblock, [&](int b) {
+                int j = b * fft_block_size;
+                fftw_execute_dft_c2r(plans[b < nblock-1 ? 0 : 1]->plan, in + j*cstride, out + j*rstride);
+            }, 0, nthreads);
+        } else {
+            std::vector<int> key = { C2R_2D, Nx, Ny, inplace, AlignmentOf(in), AlignmentOf(out) };
+            PlanPtr plan = GetPlan(key, [&]() {
+                return fftw_plan_dft_c2r_2d(Ny, Nx, in, out, FFTW_ESTIMATE);
+            });
+            fftw_execute_dft_c2r(plan->plan, in, out);
+        }
+    }
+
+    void ExecuteC2C(int Ny, int Nx, fftw_complex* in, fftw_complex* out, int sign)
+    {
+        const bool inplace = in == out;
+        const int nthreads = GetFFTNumThreads();
+        if (nthreads > 1 && Nx * Ny >= min_parallel_fft_size) {
+            // Do the transforms of the rows, then the columns in place.
+            const int nblock = (Ny + fft_block_size - 1) / fft_block_size;
+            std::vector<PlanPtr> plans(2);
+            for (int k=0; k<2; ++k) {
+                int howmany = k==0 ? fft_block_size : Ny - (nblock-1) * fft_block_size;
+                std::vector<int> key = { C2C_ROWS, Nx, howmany, inplace, sign };
+                plans[k] = GetPlan(key, [&]() {
+                    return fftw_plan_many_dft(1, &Nx, howmany, in, NULL, 1, Nx,
+                                              out, NULL, 1, Nx, sign, parallel_flags);
+                });
+            }
+            ParallelFor(nblock, [&](int b) {
+                int j = b * fft_block_size;
+                fftw_execute_dft(plans[b < nblock-1 ? 0 : 1]->plan, in + j*Nx, out + j*Nx);
+            }, 0, nthreads);
+            ColumnFFTs(Ny, Nx, Nx, out, sign, nthreads);
+        } else {
+            std::vector<int> key = { C2C_2D, Nx, Ny, inplace, sign,
+                AlignmentOf(in), AlignmentOf(out) };
+            PlanPtr plan = GetPlan(key, [&]() {
+                return fftw_plan_dft_2d(Ny, Nx, in, out, sign, FFTW_ESTIMATE);
+            });
+            fftw_execute_dft(plan->plan, in, out);
+        }
+    }
+
     template <typename T>
     void FFTW_Array<T>::resize(size_t n)
     {
@@ -1018,10 +1221,9 @@ namespace galsim {
 
         XTable xt( _N, 2.*M_PI*_invNd*_invdk );
 
-        // Note: The fftw_execute function is the only thread-safe FFTW routine.
-        // So if we decide to go with some kind of multi-threading (rather than multi-process
-        // parallelism) all of the plan creation and destruction calls in this file
-        // will need to be placed in critical blocks or the equivalent (mutex locks, etc.).
+        // Note: The fftw_execute function is the only thread-safe FFTW routine, so the
+        // plan creation and destruction need plan_mutex locked.
+        std::lock_guard<std::mutex> lock(plan_mutex);
         fftw_plan plan = fftw_plan_dft_c2r_2d(
             _N, _N, t_array.get_fftw(), xt._array.get_fftw(), FFTW_MEASURE);
         if (plan==NULL) throw FFTInvalid();
@@ -1058,16 +1260,9 @@ namespace galsim {
         }
         xdbg<<"After fill t_array, t_array[0] = "<<t_array[0]<<std::endl;
 
-        fftw_plan plan = fftw_plan_dft_c2r_2d(
-            _N, _N, t_array.get_fftw(), xt._array.get_fftw(), FFTW_ESTIMATE);
-        xdbg<<"After make plan"<<std::endl;
-        if (plan==NULL) throw FFTInvalid();
-
         // Run the transform:
-        fftw_execute(plan);
-        xdbg<<"After exec plan"<<std::endl;
-        fftw_destroy_plan(plan);
-        xdbg<<"After destroy plan"<<std::endl;
+        ExecuteC2R(_N, _N, t_array.get_fftw(), xt._array.get_fftw());
+        xdbg<<"After transform"<<std::endl;
 
         xt._dx = 2.*M_PI*_invNd*_invdk;
         dbg<<"dx = "<<xt._dx<<std::endl;
@@ -1091,6 +1286,7 @@ namespace galsim {
 
         KTable kt( _N, 2.*M_PI*_invNd*_invdx );
 
+        std::lock_guard<std::mutex> lock(plan_mutex);
         fftw_plan plan = fftw_plan_dft_r2c_2d(
             _N,_N, t_array.get_fftw(), kt._array.get_fftw(), FFTW_MEASURE);
         if (plan==NULL) throw FFTInvalid();
@@ -1106,11 +1302,7 @@ namespace galsim {
         // Make a new copy of data array since measurement will overwrite:
         FFTW_Array<double> t_array = _array;
 
-        fftw_plan plan = fftw_plan_dft_r2c_2d(
-            _N,_N, t_array.get_fftw(), kt._array.get_fftw(), FFTW_ESTIMATE);
-        if (plan==NULL) throw FFTInvalid();
-        fftw_execute(plan);
-        fftw_destroy_plan(plan);
+        ExecuteR2C(_N, _N, t_array.get_fftw(), kt._array.get_fftw());
 
         // Now scale the k spectrum and flip signs for x=0 in middle.
         double fac = _dx * _dx;
@@ -28,6 +28,7 @@
 
 #include "Image.h"
 #include "ImageArith.h"
+#include "FFT.h"
 
 namespace galsim {
 
@@ -730,10 +731,7 @@ void rfft(const BaseImage<T>& in, ImageView<std::complex<double> > out,
     fftw_complex* kdata = reinterpret_cast<fftw_complex*>(out.getData());
     double* xdata = reinterpret_cast<double*>(out.getData());
 
-    fftw_plan plan = fftw_plan_dft_r2c_2d(Ny, Nx, xdata, kdata, FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteR2C(Ny, Nx, xdata, kdata);
 
     // The resulting image will still have a checkerboard pattern of +-1 on it, which
     // we want to remove.
@@ -838,10 +836,7 @@ void irfft(const BaseImage<T>& in, ImageView<double> out, bool shift_in, bool sh
     double* xdata = out.getData();
     fftw_complex* kdata = reinterpret_cast<fftw_complex*>(xdata);
 
-    fftw_plan plan = fftw_plan_dft_c2r_2d(Ny, Nx, kdata, xdata, FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteC2R(Ny, Nx, kdata, xdata);
 }
 
 template <typename T>
@@ -911,11 +906,7 @@ void cfft(const BaseImage<T>& in, ImageView<std::complex<double> > out,
 
     fftw_complex* kdata = reinterpret_cast<fftw_complex*>(out.getData());
 
-    fftw_plan plan = fftw_plan_dft_2d(Ny, Nx, kdata, kdata, inverse ? FFTW_BACKWARD : FFTW_FORWARD,
-                                      FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteC2C(Ny, Nx, kdata, kdata, inverse ? FFTW_BACKWARD : FFTW_FORWARD);
 
     if (shift_in) {
         kptr = out.getData();
@@ -34,17 +34,37 @@ namespace galsim {
     };
 
     PhotonArray::PhotonArray(int N) : 
-        _N(N), _dxdz(0), _dydz(0), _wave(0), _is_correlated(false), _vx(N), _vy(N), _vflux(N)
+        _N(N), _dxdz(0), _dydz(0), _wave(0),
+        _fx(0), _fy(0), _fflux(0), _fdxdz(0), _fdydz(0), _fwave(0),
+        _is_float(false), _is_correlated(false), _vx(N), _vy(N), _vflux(N)
     {
         _x = &_vx[0];
         _y = &_vy[0];
         _flux = &_vflux[0];
     }
 
-    template <typename T>
+    // Offset a pointer, keeping null pointers null.
+    template <typename P>
+    static P* Offset(P* p, int i) { return p ? p + i : 0; }
+
+    PhotonArray PhotonArray::subArray(int istart, int n)
+    {
+        const bool angles = hasAllocatedAngles();
+        if (_is_float) {
+            return PhotonArray(n, _fx + istart, _fy + istart, _fflux + istart,
+                               angles ? _fdxdz + istart : 0, angles ? _fdydz + istart : 0,
+                               Offset(_fwave, istart), false);
+        } else {
+            return PhotonArray(n, _x + istart, _y + istart, _flux + istart,
+                               angles ? _dxdz + istart : 0, angles ? _dydz + istart : 0,
+                               Offset(_wave, istart), false);
+        }
+    }
+
+    template <typename T, typename P>
     struct AddImagePhotons
     {
-        AddImagePhotons(double* x, double* y, double* f,
+        AddImagePhotons(P* x, P* y, P* f,
                         double maxFlux, UniformDeviate ud) :
             _x(x), _y(y), _f(f), _maxFlux(maxFlux), _ud(ud), _count(0) {}
 
@@ -64,9 +84,9 @@ namespace galsim {
 
         int getCount() const { return _count; }
 
-        double* _x;
-        double* _y;
-        double* _f;
+        P* _x;
+        P* _y;
+        P* _f;
         const double _maxFlux;
         UniformDeviate _ud;
         int _count;
@@ -77,17 +97,26 @@ namespace galsim {
     {
         dbg<<"bounds = "<<image.getBounds()<<std::endl;
         dbg<<"flux, maxflux = "<<_flux<<','<<maxFlux<<std::endl;
-        AddImagePhotons<T> adder(_x, _y, _flux, maxFlux, ud);
-        for_each_pixel_ij_ref(image, adder);
-        dbg<<"Done: size = "<<adder.getCount()<<std::endl;
-        _N = adder.getCount();
+        if (_is_float) {
+            AddImagePhotons<T,float> adder(_fx, _fy, _fflux, maxFlux, ud);
+            for_each_pixel_ij_ref(image, adder);
+            _N = adder.getCount();
+        } else {
+            AddImagePhotons<T,double> adder(_x, _y, _flux, maxFlux, ud);
+            for_each_pixel_ij_ref(image, adder);
+            _N = adder.getCount();
+        }
+        dbg<<"Done: size = "<<_N<<std::endl;
         return _N;
     }
 
     double PhotonArray::getTotalFlux() const
     {
         double total = 0.;
-        return std::accumulate(_flux, _flux+_N, total);
+        if (_is_float)
+            return std::accumulate(_fflux, _fflux+_N, total);
+        else
+            return std::accumulate(_flux, _flux+_N, total);
     }
 
     void PhotonArray::setTotalFlux(double flux)
@@ -97,18 +126,40 @@ namespace galsim {
         scaleFlux(flux / oldFlux);
     }
 
+    template <typename P>
+    static void ScaleArray(P* p, int N, double scale)
+    {
+        std::transform(p, p+N, p, std::bind2nd(std::multiplies<double>(),scale));
+    }
+
     void PhotonArray::scaleFlux(double scale)
     {
-        std::transform(_flux, _flux+_N, _flux,
-                       std::bind2nd(std::multiplies<double>(),scale));
+        if (_is_float) ScaleArray(_fflux, _N, scale);
+        else ScaleArray(_flux, _N, scale);
     }
 
     void PhotonArray::scaleXY(double scale)
     {
-        std::transform(_x, _x+_N, _x,
-                       std::bind2nd(std::multiplies<double>(),scale));
-        std::transform(_y, _y+_N, _y,
-                       std::bind2nd(std::multiplies<double>(),scale));
+        if (_is_float) {
+            ScaleArray(_fx, _N, scale);
+            ScaleArray(_fy, _N, scale);
+        } else {
+            ScaleArray(_x, _N, scale);
+            ScaleArray(_y, _N, scale);
+        }
+    }
+
+    // Copy N values from either a double or float array (whichever is not null) into
+    // either a double or float array (likewise).
+    static void CopyArray(const double* src, const float* fsrc, int N, double* dest, float* fdest)
+    {
+        if (src) {
+            if (dest) std::copy(src, src+N, dest);
+            else std::copy(src, src+N, fdest);
+        } else {
+            if (dest) std::copy(fsrc, fsrc+N, dest);
+            else std::copy(fsrc, fsrc+N, fdest);
+        }
     }
 
     void PhotonArray::assignAt(int istart, const PhotonArray& rhs)
@@ -117,25 +168,30 @@ namespace galsim {
             throw std::runtime_error("Trying to assign past the end of PhotonArray");
 
         const int N2 = rhs.size();
-        std::copy(rhs._x, rhs._x+N2, _x+istart);
-        std::copy(rhs._y, rhs._y+N2, _y+istart);
-        std::copy(rhs._flux, rhs._flux+N2, _flux+istart);
+        CopyArray(rhs._x, rhs._fx, N2, Offset(_x,istart), Offset(_fx,istart));
+        CopyArray(rhs._y, rhs._fy, N2, Offset(_y,istart), Offset(_fy,istart));
+        CopyArray(rhs._flux, rhs._fflux, N2, Offset(_flux,istart), Offset(_fflux,istart));
         if (hasAllocatedAngles() && rhs.hasAllocatedAngles()) {
-            std::copy(rhs._dxdz, rhs._dxdz+N2, _dxdz+istart);
-            std::copy(rhs._dydz, rhs._dydz+N2, _dydz+istart);
+            CopyArray(rhs._dxdz, rhs._fdxdz, N2, Offset(_dxdz,istart), Offset(_fdxdz,istart));
+            CopyArray(rhs._dydz, rhs._fdydz, N2, Offset(_dydz,istart), Offset(_fdydz,istart));
         }
         if (hasAllocatedWavelengths() && rhs.hasAllocatedWavelengths()) {
-            std::copy(rhs._wave, rhs._wave+N2, _wave+istart);
+            CopyArray(rhs._wave, rhs._fwave, N2, Offset(_wave,istart), Offset(_fwave,istart));
         }
     }
 
-    // Helper for multiplying x * y * N
-    struct MultXYScale
+    template <typename P1, typename P2>
+    static void ConvolveArrays(P1* x, P1* y, P1* flux, const P2* x2, const P2* y2,
+                               const P2* flux2, int N)
     {
-        MultXYScale(double scale) : _scale(scale) {}
-        double operator()(double x, double y) { return x * y * _scale; }
-        double _scale;
-    };
+        // Add the coordinates and multiply the fluxes, with a factor of N needed.
+        const double scale = N;
+        for (int i=0; i<N; ++i) {
+            x[i] = double(x[i]) + double(x2[i]);
+            y[i] = double(y[i]) + double(y2[i]);
+            flux[i] = double(flux[i]) * double(flux2[i]) * scale;
+        }
+    }
 
     void PhotonArray::convolve(const PhotonArray& rhs, UniformDeviate ud)
     {
@@ -146,49 +202,84 @@ namespace galsim {
         // If neither or only one is correlated, we are ok to just use them in order.
         if (rhs.size() != size())
             throw std::runtime_error("PhotonArray::convolve with unequal size arrays");
-        // Add x coordinates:
-        std::transform(_x, _x+_N, rhs._x, _x, std::plus<double>());
-        // Add y coordinates:
-        std::transform(_y, _y+_N, rhs._y, _y, std::plus<double>());
-        // Multiply fluxes, with a factor of N needed:
-        std::transform(_flux, _flux+_N, rhs._flux, _flux, MultXYScale(_N));
+        if (_is_float) {
+            if (rhs._is_float) ConvolveArrays(_fx, _fy, _fflux, rhs._fx, rhs._fy, rhs._fflux, _N);
+            else ConvolveArrays(_fx, _fy, _fflux, rhs._x, rhs._y, rhs._flux, _N);
+        } else {
+            if (rhs._is_float) ConvolveArrays(_x, _y, _flux, rhs._fx, rhs._fy, rhs._fflux, _N);
+            else ConvolveArrays(_x, _y, _flux, rhs._x, rhs._y, rhs._flux, _N);
+        }
 
         // If rhs was correlated, then the output will be correlated.
         // This is ok, but we need to mark it as such.
         if (rhs._is_correlated) _is_correlated = true;
     }
 
-    void PhotonArray::convolveShuffle(const PhotonArray& rhs, UniformDeviate ud)
+    template <typename P1, typename P2>
+    static void ConvolveShuffleArrays(P1* x, P1* y, P1* flux, const P2* x2, const P2* y2,
+                                      const P2* flux2, int N, UniformDeviate ud)
     {
-        if (rhs.size() != size())
-            throw std::runtime_error("PhotonArray::convolve with unequal size arrays");
-        double xSave=0.;
-        double ySave=0.;
-        double fluxSave=0.;
+        P1 xSave=0.;
+        P1 ySave=0.;
+        P1 fluxSave=0.;
 
-        for (int iOut = _N-1; iOut>=0; iOut--) {
+        for (int iOut = N-1; iOut>=0; iOut--) {
             // Randomly select an input photon to use at this output
             // NB: don't need floor, since rhs is positive, so floor is superfluous.
             int iIn = int((iOut+1)*ud());
             if (iIn > iOut) iIn=iOut;  // should not happen, but be safe
             if (iIn < iOut) {
                 // Save input information
-                xSave = _x[iOut];
-                ySave = _y[iOut];
-                fluxSave = _flux[iOut];
+                xSave = x[iOut];
+                ySave = y[iOut];
+                fluxSave = flux[iOut];
             }
-            _x[iOut] = _x[iIn] + rhs._x[iOut];
-            _y[iOut] = _y[iIn] + rhs._y[iOut];
-            _flux[iOut] = _flux[iIn] * rhs._flux[iOut] * _N;
+            x[iOut] = double(x[iIn]) + double(x2[iOut]);
+            y[iOut] = double(y[iIn]) + double(y2[iOut]);
+            flux[iOut] = double(flux[iIn]) * double(flux2[iOut]) * N;
             if (iIn < iOut) {
                 // Move saved info to new location in array
-                _x[iIn] = xSave;
-                _y[iIn] = ySave ;
-                _flux[iIn] = fluxSave;
+                x[iIn] = xSave;
+                y[iIn] = ySave ;
+                flux[iIn] = fluxSave;
             }
         }
     }
 
+    void PhotonArray::convolveShuffle(const PhotonArray& rhs, UniformDeviate ud)
+    {
+        if (rhs.size() != size())
+            throw std::runtime_error("PhotonArray::convolve with unequal size arrays");
+        if (_is_float) {
+            if (rhs._is_float)
+                ConvolveShuffleArrays(_fx, _fy, _fflux, rhs._fx, rhs._fy, rhs._fflux, _N, ud);
+            else
+                ConvolveShuffleArrays(_fx, _fy, _fflux, rhs._x, rhs._y, rhs._flux, _N, ud);
+        } else {
+            if (rhs._is_float)
+                ConvolveShuffleArrays(_x, _y, _flux, rhs._fx, rhs._fy, rhs._fflux, _N, ud);
+            else
+                ConvolveShuffleArrays(_x, _y, _flux, rhs._x, rhs._y, rhs._flux, _N, ud);
+        }
+    }
+
+    template <typename T, typename P>
+    static double AddPhotonsTo(const P* x, const P* y, const P* flux, int N,
+                               ImageView<T> target)
+    {
+        Bounds<int> b = target.getBounds();
+        double addedFlux = 0.;
+        for (int i=0; i<N; i++) {
+            int ix = int(floor(x[i] + 0.5));
+            int iy = int(floor(y[i] + 0.5));
+            if (b.includes(ix,iy)) {
+                target(ix,iy) += flux[i];
+                addedFlux += flux[i];
+            }
+        }
+        return addedFlux;
+    }
+
     template <class T>
     double PhotonArray::addTo(ImageView<T> target) const
     {
@@ -199,16 +290,10 @@ namespace galsim {
             throw std::runtime_error("Attempting to PhotonArray::addTo an Image with"
                                      " undefined Bounds");
 
-        double addedFlux = 0.;
-        for (int i=0; i<int(size()); i++) {
-            int ix = int(floor(_x[i] + 0.5));
-            int iy = int(floor(_y[i] + 0.5));
-            if (b.includes(ix,iy)) {
-                target(ix,iy) += _flux[i];
-                addedFlux += _flux[i];
-            }
-        }
-        return addedFlux;
+        if (_is_float)
+            return AddPhotonsTo(_fx, _fy, _fflux, _N, target);
+        else
+            return AddPhotonsTo(_x, _y, _flux, _N, target);
     }
 
     // instantiate template functions for expected image types
@@ -373,7 +373,7 @@ namespace galsim {
     void AiryInfo::shoot(PhotonArray& photons, UniformDeviate ud) const
     {
         // Use the OneDimensionalDeviate to sample from scale-free distribution
-        checkSampler();
+        LazyInit(_sampler_done, [&]() { checkSampler(); });
         assert(_sampler.get());
         _sampler->shoot(photons, ud);
     }
@@ -86,7 +86,7 @@ namespace galsim {
                                                const GSParams& gsparams) :
         SBProfileImpl(gsparams), _real_space(real_space),
         _x0(0.), _y0(0.), _isStillAxisymmetric(true), _fluxProduct(1.),
-        _maxk(0.), _stepk(0.)
+        _maxk(0.), _stepk(0.), _maxk_done(false), _stepk_done(false)
     {
         for(ConstIter it=plist.begin(); it!=plist.end(); ++it) add(*it);
     }
@@ -135,20 +135,20 @@ namespace galsim {
 
     double SBConvolve::SBConvolveImpl::maxK() const
     {
-        if (_maxk == 0.) {
+        LazyInit(_maxk_done, [&]() {
             for(ConstIter it=_plist.begin(); it!=_plist.end(); ++it) {
                 double it_maxk = it->maxK();
                 dbg<<"SBConvolve component has maxK = "<<it_maxk<<std::endl;
                 if (_maxk <= 0. || it_maxk < _maxk) _maxk = it_maxk;
             }
             dbg<<"Net maxK = "<<_maxk<<std::endl;
-        }
+        });
         return _maxk;
     }
 
     double SBConvolve::SBConvolveImpl::stepK() const
     {
-        if (_stepk == 0.) {
+        LazyInit(_stepk_done, [&]() {
             for(ConstIter it=_plist.begin(); it!=_plist.end(); ++it) {
                 double it_stepk = it->stepK();
                 dbg<<"SBConvolve component has stepK = "<<it_stepk<<std::endl;
@@ -156,7 +156,7 @@ namespace galsim {
             }
             _stepk = 1./sqrt(_stepk);  // Convert to (Sum 1/stepk^2)^(-1/2)
             dbg<<"Net stepK = "<<_stepk<<std::endl;
-        }
+        });
         return _stepk;
     }
 
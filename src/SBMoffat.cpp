@@ -180,7 +180,8 @@ namespace galsim {
         _trunc(trunc),
         _ft(Table::spline),
         _stepk(0.), // calculated by stepK() and stored.
-        _maxk(0.) // calculated by maxK() and stored.
+        _maxk(0.), // calculated by maxK() and stored.
+        _ft_done(false), _stepk_done(false), _maxk_done(false)
     {
         xdbg<<"Start SBMoffat constructor: \n";
         xdbg<<"beta = "<<_beta<<"\n";
@@ -482,7 +483,7 @@ namespace galsim {
     // Set maxK to the value where the FT is down to maxk_threshold
     double SBMoffat::SBMoffatImpl::maxK() const
     {
-        if (_maxk == 0.) {
+        LazyInit(_maxk_done, [&]() {
             if (_trunc == 0.) {
                 // f(k) = 4 K(beta-1,k) (k/2)^beta / Gamma(beta-1)
                 //
@@ -514,7 +515,7 @@ namespace galsim {
                 // kValue > 1.e-3.
                 setupFT();
             }
-        }
+        });
         return _maxk*_inv_rD;
     }
 
@@ -525,7 +526,7 @@ namespace galsim {
         dbg<<"Find Moffat stepK\n";
         dbg<<"beta = "<<_beta<<std::endl;
 
-        if (_stepk == 0.) {
+        LazyInit(_stepk_done, [&]() {
             // The fractional flux out to radius R is (if not truncated)
             // 1 - (1+R^2)^(1-beta)
             // So solve (1+R^2)^(1-beta) = folding_threshold
@@ -545,7 +546,7 @@ namespace galsim {
                 R = std::max(R,gsparams.stepk_minimum_hlr*getHalfLightRadius());
                 _stepk = M_PI / R;
             }
-        }
+        });
         return _stepk;
     }
 
@@ -567,8 +568,11 @@ namespace galsim {
     void SBMoffat::SBMoffatImpl::setupFT() const
     {
         assert(_trunc > 0.);
-        if (_ft.finalized()) return;
+        LazyInit(_ft_done, [&]() { buildFT(); });
+    }
 
+    void SBMoffat::SBMoffatImpl::buildFT() const
+    {
         // Do a Hankel transform and store the results in a lookup table.
 
         double prefactor = 2. * (_beta-1.) / (_fluxFactor);
@@ -23,6 +23,7 @@
 #include "SBTransform.h"
 #include "SBProfileImpl.h"
 #include "math/Angle.h"
+#include "Threads.h"
 
 // There are three levels of verbosity which can be helpful when debugging,
 // which are written as dbg, xdbg, xxdbg (all defined in Std.h).
@@ -86,6 +87,46 @@ namespace galsim {
         return _pimpl->kValue(k);
     }
 
+    // The block size to use when evaluating many positions with multiple threads.
+    // The first block is always done serially, so any lazily built tables (e.g. the Sersic
+    // Fourier table) are ready before the other threads start.
+    static const int value_block_size = 4096;
+
+    void SBProfile::xValueMany(const double* x, const double* y, double* val, int n) const
+    {
+        assert(_pimpl.get());
+        if (n <= 0) return;
+        const SBProfileImpl& impl = *_pimpl;
+        const int nblock = (n-1) / value_block_size + 1;
+        if (nblock == 1 || !isThreadSafe()) {
+            for (int i=0; i<n; ++i) val[i] = impl.xValue(Position<double>(x[i],y[i]));
+            return;
+        }
+        ParallelFor(nblock, [&](int k) {
+            const int i1 = k * value_block_size;
+            const int i2 = std::min(i1 + value_block_size, n);
+            for (int i=i1; i<i2; ++i) val[i] = impl.xValue(Position<double>(x[i],y[i]));
+        }, 1);
+    }
+
+    void SBProfile::kValueMany(const double* kx, const double* ky, std::complex<double>* val,
+                               int n) const
+    {
+        assert(_pimpl.get());
+        if (n <= 0) return;
+        const SBProfileImpl& impl = *_pimpl;
+        const int nblock = (n-1) / value_block_size + 1;
+        if (nblock == 1 || !isThreadSafe()) {
+            for (int i=0; i<n; ++i) val[i] = impl.kValue(Position<double>(kx[i],ky[i]));
+            return;
+        }
+        ParallelFor(nblock, [&](int k) {
+            const int i1 = k * value_block_size;
+            const int i2 = std::min(i1 + value_block_size, n);
+            for (int i=i1; i<i2; ++i) val[i] = impl.kValue(Position<double>(kx[i],ky[i]));
+        }, 1);
+    }
+
     void SBProfile::getXRange(double& xmin, double& xmax, std::vector<double>& splits) const
     {
         assert(_pimpl.get());
@@ -141,6 +182,12 @@ namespace galsim {
         return _pimpl->isAnalyticK();
     }
 
+    bool SBProfile::isThreadSafe() const
+    {
+        assert(_pimpl.get());
+        return _pimpl->isThreadSafe();
+    }
+
     Position<double> SBProfile::centroid() const
     {
         assert(_pimpl.get());
@@ -159,10 +206,40 @@ namespace galsim {
         return _pimpl->maxSB();
     }
 
+    // When shooting with multiple threads, the photons are split into batches of this size,
+    // each with its own random number generator seeded from the input one.  As for drawing,
+    // this split does not depend on the number of threads.
+    static const int shoot_batch_size = 100000;
+
     void SBProfile::shoot(PhotonArray& photons, UniformDeviate ud) const
     {
         assert(_pimpl.get());
-        return _pimpl->shoot(photons,ud);
+        const int N = photons.size();
+        if (GetNumThreads() <= 1 || N < 2*shoot_batch_size) {
+            _pimpl->shoot(photons,ud);
+            return;
+        }
+
+        const int nbatch = (N-1) / shoot_batch_size + 1;
+        dbg<<"Shoot "<<N<<" photons in "<<nbatch<<" batches with "<<GetNumThreads()<<" threads\n";
+        std::vector<long> seeds(nbatch);
+        // Seed 0 would mean to seed from the clock, so make sure to avoid that.
+        for (int k=0; k<nbatch; ++k) seeds[k] = long(ud() * 2147483646.) + 1;
+        std::vector<char> correlated(nbatch, 0);
+
+        ParallelFor(nbatch, [&](int k) {
+            const int i1 = k * shoot_batch_size;
+            const int n = std::min(shoot_batch_size, N - i1);
+            PhotonArray batch = photons.subArray(i1, n);
+            UniformDeviate batch_ud(seeds[k]);
+            _pimpl->shoot(batch, batch_ud);
+            // Each batch has the full flux of the profile.  Rescale to the fraction it represents.
+            batch.scaleFlux(double(n) / N);
+            correlated[k] = batch.isCorrelated();
+        }, 1);
+
+        if (std::find(correlated.begin(), correlated.end(), 1) != correlated.end())
+            photons.setCorrelated();
     }
 
     double SBProfile::getPositiveFlux() const
@@ -300,6 +377,32 @@ namespace galsim {
         }
     }
 
+    // When drawing with multiple threads, the image is split into bands of this many rows,
+    // each of which is filled separately.  The split does not depend on the number of threads,
+    // so the results are the same for any number of threads > 1.
+    static const int draw_band_rows = 32;
+
+    // Split the rows of an image into bands for drawing in parallel.  The band containing
+    // the y=0 row (if any) is listed first, so that filling it first can initialize any
+    // lazily built tables in the profile before the other bands are filled concurrently.
+    static std::vector<Bounds<int> > GetDrawBands(const Bounds<int>& b)
+    {
+        std::vector<Bounds<int> > bands;
+        for (int y1=b.getYMin(); y1<=b.getYMax(); y1+=draw_band_rows) {
+            int y2 = std::min(y1 + draw_band_rows - 1, b.getYMax());
+            bands.push_back(Bounds<int>(b.getXMin(), b.getXMax(), y1, y2));
+            if (y1 <= 0 && y2 >= 0) std::swap(bands.front(), bands.back());
+        }
+        return bands;
+    }
+
+    // Whether to split this image into bands to be drawn by multiple threads.
+    static bool UseDrawBands(const Bounds<int>& b, const SBProfile& prof)
+    {
+        return (GetNumThreads() > 1 && b.getYMax() - b.getYMin() + 1 >= 2*draw_band_rows &&
+                prof.isThreadSafe());
+    }
+
     template <typename T>
     void SBProfile::draw(ImageView<T> image, double dx) const
     {
@@ -310,10 +413,22 @@ namespace galsim {
         const int xmin = image.getXMin();
         const int ymin = image.getYMin();
         const int izero = xmin < 0 ? -xmin : 0;
-        const int jzero = ymin < 0 ? -ymin : 0;
 
-        _pimpl->fillXImage(image, xmin*dx, dx, izero, ymin*dx, dx, jzero);
-        if (dx != 1.) image *= dx*dx;
+        if (UseDrawBands(image.getBounds(), *this)) {
+            std::vector<Bounds<int> > bands = GetDrawBands(image.getBounds());
+            dbg<<"Draw in "<<bands.size()<<" bands with "<<GetNumThreads()<<" threads\n";
+            ParallelFor(int(bands.size()), [&](int k) {
+                ImageView<T> band = image.subImage(bands[k]);
+                const int y1 = bands[k].getYMin();
+                const int jzero = (y1 < 0 && bands[k].getYMax() >= 0) ? -y1 : 0;
+                _pimpl->fillXImage(band, xmin*dx, dx, izero, y1*dx, dx, jzero);
+                if (dx != 1.) band *= dx*dx;
+            }, 1);
+        } else {
+            const int jzero = ymin < 0 ? -ymin : 0;
+            _pimpl->fillXImage(image, xmin*dx, dx, izero, ymin*dx, dx, jzero);
+            if (dx != 1.) image *= dx*dx;
+        }
     }
 
     template <typename T>
@@ -326,9 +441,20 @@ namespace galsim {
         const int xmin = image.getXMin();
         const int ymin = image.getYMin();
         const int izero = xmin < 0 ? -xmin : 0;
-        const int jzero = ymin < 0 ? -ymin : 0;
 
-        _pimpl->fillKImage(image.view(), xmin*dk, dk, izero, ymin*dk, dk, jzero);
+        if (UseDrawBands(image.getBounds(), *this)) {
+            std::vector<Bounds<int> > bands = GetDrawBands(image.getBounds());
+            dbg<<"DrawK in "<<bands.size()<<" bands with "<<GetNumThreads()<<" threads\n";
+            ParallelFor(int(bands.size()), [&](int k) {
+                ImageView<std::complex<T> > band = image.subImage(bands[k]);
+                const int y1 = bands[k].getYMin();
+                const int jzero = (y1 < 0 && bands[k].getYMax() >= 0) ? -y1 : 0;
+                _pimpl->fillKImage(band, xmin*dk, dk, izero, y1*dk, dk, jzero);
+            }, 1);
+        } else {
+            const int jzero = ymin < 0 ? -ymin : 0;
+            _pimpl->fillKImage(image.view(), xmin*dk, dk, izero, ymin*dk, dk, jzero);
+        }
     }
 
     // The type of T (real or complex) determines whether the call-back is to
@@ -494,7 +620,21 @@ namespace galsim {
         }
     }
 
+    template <typename T>
+    void drawMany(const std::vector<SBProfile>& profs, std::vector<ImageView<T> >& images,
+                  const std::vector<double>& dx)
+    {
+        dbg<<"Start drawMany: "<<profs.size()<<" profiles"<<std::endl;
+        if (images.size() != profs.size() || dx.size() != profs.size())
+            throw SBError("drawMany requires equal numbers of profiles and images");
+        for (size_t i=0; i<profs.size(); ++i) profs[i].draw(images[i], dx[i]);
+    }
+
     // instantiate template functions for expected image types
+    template void drawMany(const std::vector<SBProfile>& profs,
+                           std::vector<ImageView<float> >& images, const std::vector<double>& dx);
+    template void drawMany(const std::vector<SBProfile>& profs,
+                           std::vector<ImageView<double> >& images, const std::vector<double>& dx);
     template void SBProfile::draw(ImageView<float> image, double dx) const;
     template void SBProfile::draw(ImageView<double> image, double dx) const;
 
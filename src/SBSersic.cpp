@@ -314,7 +314,9 @@ namespace galsim {
         _gamma2n(math::tgamma(2.*_n)),
         _maxk(0.), _stepk(0.), _re(0.), _flux(0.),
         _ft(Table::spline),
-        _kderiv2(0.), _kderiv4(0.)
+        _kderiv2(0.), _kderiv4(0.),
+        _stepk_done(false), _ft_done(false), _re_done(false), _flux_done(false),
+        _sampler_done(false)
     {
         dbg<<"Start SersicInfo constructor for n = "<<_n<<std::endl;
         dbg<<"trunc = "<<_trunc<<std::endl;
@@ -325,7 +327,7 @@ namespace galsim {
 
     double SersicInfo::stepK() const
     {
-        if (_stepk == 0.) {
+        LazyInit(_stepk_done, [&]() {
             // How far should the profile extend, if not truncated?
             // Estimate number of effective radii needed to enclose (1-folding_threshold) of flux
             double R = calculateMissingFluxRadius(_gsparams->folding_threshold);
@@ -335,19 +337,19 @@ namespace galsim {
             dbg<<"R => "<<R<<std::endl;
             _stepk = M_PI / R;
             dbg<<"stepk = "<<_stepk<<std::endl;
-        }
+        });
         return _stepk;
     }
 
     double SersicInfo::maxK() const
     {
-        if (_maxk == 0.) buildFT();
+        LazyInit(_ft_done, [&]() { buildFT(); });
         return _maxk;
     }
 
     double SersicInfo::getHLR() const
     {
-        if (_re == 0.) calculateHLR();
+        LazyInit(_re_done, [&]() { calculateHLR(); });
         return _re;
     }
 
@@ -359,7 +361,7 @@ namespace galsim {
 
     double SersicInfo::getFluxFraction() const
     {
-        if (_flux == 0.) {
+        LazyInit(_flux_done, [&]() {
             // Calculate the flux of a truncated profile (relative to the integral for
             // an untruncated profile).
             if (_truncated) {
@@ -369,7 +371,7 @@ namespace galsim {
             } else {
                 _flux = 1.;
             }
-        }
+        });
         return _flux;
     }
 
@@ -385,7 +387,7 @@ namespace galsim {
     double SersicInfo::kValue(double ksq) const
     {
         assert(ksq >= 0.);
-        if (!_ft.finalized()) buildFT();
+        LazyInit(_ft_done, [&]() { buildFT(); });
 
         if (ksq>=_ksq_max)
             return (_highk_a + _highk_b/sqrt(ksq))/ksq; // high-k asymptote
@@ -830,7 +832,7 @@ namespace galsim {
     {
         dbg<<"Target flux = 1.0\n";
 
-        if (!_sampler) {
+        LazyInit(_sampler_done, [&]() {
             // Set up the classes for photon shooting
             _radial.reset(new SersicRadialFunction(_invn));
             std::vector<double> range(2,0.);
@@ -838,7 +840,7 @@ namespace galsim {
             if (_truncated && _trunc < shoot_maxr) shoot_maxr = _trunc;
             range[1] = shoot_maxr;
             _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, *_gsparams));
-        }
+        });
 
         assert(_sampler.get());
         _sampler->shoot(photons,ud);
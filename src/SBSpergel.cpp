@@ -540,7 +540,8 @@ namespace galsim {
         _gamma_nup1(math::tgamma(_nu+1.0)),
         _gamma_nup2(_gamma_nup1 * (_nu+1)),
         _xnorm0((_nu > 0.) ? _gamma_nup1 / (2. * _nu) * std::pow(2., _nu) : INFINITY),
-        _maxk(0.), _stepk(0.), _re(0.)
+        _maxk(0.), _stepk(0.), _re(0.),
+        _maxk_done(false), _stepk_done(false), _re_done(false), _sampler_done(false)
     {
         dbg<<"Start SpergelInfo constructor for nu = "<<_nu<<std::endl;
 
@@ -625,29 +626,29 @@ namespace galsim {
 
     double SpergelInfo::stepK() const
     {
-        if (_stepk == 0.) {
+        LazyInit(_stepk_done, [&]() {
             double R = calculateFluxRadius(1.0 - _gsparams->folding_threshold);
             // Go to at least 5*re
             R = std::max(R,_gsparams->stepk_minimum_hlr * getHLR());
             dbg<<"R => "<<R<<std::endl;
             _stepk = M_PI / R;
             dbg<<"stepk = "<<_stepk<<std::endl;
-        }
+        });
         return _stepk;
     }
 
     double SpergelInfo::maxK() const
     {
-        if(_maxk == 0.) {
+        LazyInit(_maxk_done, [&]() {
             // Solving (1+k^2)^(-1-nu) = maxk_threshold for k
             _maxk = std::sqrt(std::pow(_gsparams->maxk_threshold, -1./(1+_nu))-1.0);
-        }
+        });
         return _maxk;
     }
 
     double SpergelInfo::getHLR() const
     {
-        if (_re == 0.0) _re = calculateFluxRadius(0.5);
+        LazyInit(_re_done, [&]() { _re = calculateFluxRadius(0.5); });
         return _re;
     }
 
@@ -697,7 +698,7 @@ namespace galsim {
 
     void SpergelInfo::shoot(PhotonArray& photons, UniformDeviate ud) const
     {
-        if (!_sampler) {
+        LazyInit(_sampler_done, [&]() {
             // Set up the classes for photon shooting
             double shoot_rmax = calculateFluxRadius(1. - _gsparams->shoot_accuracy);
             if (_nu > 0.) {
@@ -730,7 +731,7 @@ namespace galsim {
                 _radial.reset(new SpergelNuNegativeRadialFunction(_nu, shoot_rmin, a, b));
                 _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, *_gsparams));
             }
-        }
+        });
 
         assert(_sampler.get());
         _sampler->shoot(photons,ud);
@@ -80,7 +80,8 @@ namespace galsim {
         const GSParams& gsparams) :
         SBProfileImpl(gsparams),
         _adaptee(adaptee), _mA(mA), _mB(mB), _mC(mC), _mD(mD), _cen(cen), _ampScaling(ampScaling),
-        _maxk(0.), _stepk(0.), _xmin(0.), _xmax(0.), _ymin(0.), _ymax(0.)
+        _maxk(0.), _stepk(0.), _xmin(0.), _xmax(0.), _ymin(0.), _ymax(0.),
+        _maxk_done(false), _stepk_done(false), _ranges_done(false)
     {
         dbg<<"Start TransformImpl\n";
         dbg<<"matrix = "<<_mA<<','<<_mB<<','<<_mC<<','<<_mD<<std::endl;
@@ -185,13 +186,13 @@ namespace galsim {
     {
         // The adaptee's maxk can be slow (e.g. high-n Sersic), so delay this calculation
         // until we actually need it.
-        if (_maxk == 0.) _maxk = _adaptee.maxK() / _minor;
+        LazyInit(_maxk_done, [&]() { _maxk = _adaptee.maxK() / _minor; });
         return _maxk;
     }
 
     double SBTransform::SBTransformImpl::stepK() const
     {
-        if (_stepk == 0.) {
+        LazyInit(_stepk_done, [&]() {
             _stepk = _adaptee.stepK() / _major;
             // If we have a shift, we need to further modify stepk
             //     stepk = Pi/R
@@ -203,14 +204,17 @@ namespace galsim {
                 _stepk = M_PI / (M_PI/_stepk + shift);
                 dbg<<"shift = "<<shift<<", stepk -> "<<_stepk<<std::endl;
             }
-        }
+        });
         return _stepk;
     }
 
     void SBTransform::SBTransformImpl::setupRanges() const
     {
-        if (_xmin != 0. || _xmax != 0.) return;
+        LazyInit(_ranges_done, [&]() { buildRanges(); });
+    }
 
+    void SBTransform::SBTransformImpl::buildRanges() const
+    {
         // Calculate the values for getXRange and getYRange:
         if (_adaptee.isAxisymmetric()) {
             // The original is a circle, so first get its radius.
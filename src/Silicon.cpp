@@ -38,6 +38,7 @@
 #include "Silicon.h"
 #include "Image.h"
 #include "PhotonArray.h"
+#include "Threads.h"
 
 
 namespace galsim {
@@ -84,6 +85,7 @@ namespace galsim {
         _nrecalc(nrecalc), _diffStep(diffStep), _pixelSize(pixelSize),
         _sensorThickness(sensorThickness),
         _tr_radial_table(tr_radial_table), _treeRingCenter(treeRingCenter),
+        _trMapNx(0), _trMapNy(0), _trMapX0(0.), _trMapY0(0.), _trMapStep(1.),
         _abs_length_table(abs_length_table), _transpose(transpose), _resume_next_recalc(-999)
     {
         dbg<<"Silicon constructor\n";
@@ -153,6 +155,17 @@ namespace galsim {
 #endif
     }
 
+    const int Silicon::tile_size;
+
+    void Silicon::initDirtyTiles(const Bounds<int>& b, bool dirty)
+    {
+        _tileBounds = b;
+        _ntx = (b.getXMax() - b.getXMin()) / tile_size + 1;
+        _nty = (b.getYMax() - b.getYMin()) / tile_size + 1;
+        _dirtyTiles.assign(_ntx * _nty, dirty);
+        _changed.assign(b.area(), false);
+    }
+
     template <typename T>
     void Silicon::updatePixelDistortions(ImageView<T> target)
     {
@@ -172,41 +185,172 @@ namespace galsim {
         const int j1 = target.getYMin();
         const int j2 = target.getYMax();
         const int ny = j2-j1+1;
-        const int skip = target.getNSkip();
         const int step = target.getStep();
-        const T* ptr = target.getData();
+        const int stride = target.getStride();
+
+        // Only the tiles that have had charge added since the last update can have any
+        // non-zero charge in target.  If we aren't tracking this image, check everything.
+        if (!(_tileBounds == target.getBounds())) initDirtyTiles(target.getBounds(), true);
+
+        // The polygons that can change are the ones within _qDist of a dirty tile.
+        const int nt = (_qDist + tile_size - 1) / tile_size;
+        std::vector<bool> affected(_dirtyTiles.size(), false);
+        bool any_dirty = false;
+        for (int ty=0; ty<_nty; ++ty) {
+            for (int tx=0; tx<_ntx; ++tx) {
+                if (!_dirtyTiles[ty * _ntx + tx]) continue;
+                any_dirty = true;
+                for (int ay=std::max(ty-nt,0); ay<=std::min(ty+nt,_nty-1); ++ay)
+                    for (int ax=std::max(tx-nt,0); ax<=std::min(tx+nt,_ntx-1); ++ax)
+                        affected[ay * _ntx + ax] = true;
+            }
+        }
+        dbg<<"any_dirty = "<<any_dirty<<std::endl;
+        if (!any_dirty) return;
+
+        if (GetNumThreads() > 1) {
+            // Rather than scattering the distortions from each pixel with charge onto its
+            // neighbors, gather them onto each pixel from the pixels within qDist.  Each column
+            // can then be done by a different thread.  The distortions are added to each
+            // polygon in the same order as below, so the results are identical.
+            ParallelFor(i2-i1+1, [&](int di) {
+                const int polyi = i1 + di;
+                const int tx = di / tile_size;
+                const int ci1 = std::max(polyi - _qDist, i1);
+                const int ci2 = std::min(polyi + _qDist, i2);
+                for (int polyj=j1; polyj<=j2; ++polyj) {
+                    if (!affected[((polyj - j1) / tile_size) * _ntx + tx]) continue;
+                    const int cj1 = std::max(polyj - _qDist, j1);
+                    const int cj2 = std::min(polyj + _qDist, j2);
+                    Polygon& imagepoly = _imagepolys[di * ny + (polyj - j1)];
+                    bool changed = false;
+                    for (int j=cj1; j<=cj2; ++j) {
+                        const T* cptr = target.getData() + (j-j1) * stride + (ci1-i1) * step;
+                        for (int i=ci1; i<=ci2; ++i, cptr+=step) {
+                            double charge = *cptr;
+                            if (charge == 0.0) continue;
+                            int dist_index = (nxCenter + polyi - i) * _ny + (nyCenter + polyj - j);
+                            imagepoly.distort(_distortions[dist_index], charge);
+                            changed = true;
+                        }
+                    }
+                    if (changed) imagepoly.updateBounds();
+                }
+            });
+            return;
+        }
 
-        // Now we cycle through the pixels in the target image and update any affected
-        // pixel shapes.
-        std::vector<bool> changed(_imagepolys.size(), false);
-        for (int j=j1; j<=j2; ++j, ptr+=skip) {
-            for (int i=i1; i<=i2; ++i, ptr+=step) {
-                double charge = *ptr;
-                if (charge == 0.0) continue;
-
-                int polyi1 = std::max(i - _qDist, i1);
-                int polyi2 = std::min(i + _qDist, i2);
-                int polyj1 = std::max(j - _qDist, j1);
-                int polyj2 = std::min(j + _qDist, j2);
-                int disti = nxCenter + polyi1 - i;
-
-                for (int polyi=polyi1; polyi<=polyi2; ++polyi, ++disti) {
-                    int distj = nyCenter + polyj1 - j;
-                    int index = (polyi - i1) * ny + (polyj1 - j1);
-                    int dist_index = disti * _ny + distj;
-
-                    for (int polyj=polyj1; polyj<=polyj2; ++polyj, ++distj, ++index, ++dist_index) {
-                        Polygon& distortion = _distortions[dist_index];
-                        Polygon& imagepoly = _imagepolys[index];
-                        imagepoly.distort(distortion, charge);
-                        changed[index] = true;
+        // Now we cycle through the pixels in the dirty tiles of the target image and update
+        // any affected pixel shapes.  Go row by row, so the order matches the above.
+        for (int j=j1; j<=j2; ++j) {
+            const int ty = (j - j1) / tile_size;
+            for (int tx=0; tx<_ntx; ++tx) {
+                if (!_dirtyTiles[ty * _ntx + tx]) continue;
+                const int ti1 = i1 + tx * tile_size;
+                const int ti2 = std::min(ti1 + tile_size - 1, i2);
+                const T* ptr = target.getData() + (j-j1) * stride + (ti1-i1) * step;
+                for (int i=ti1; i<=ti2; ++i, ptr+=step) {
+                    double charge = *ptr;
+                    if (charge == 0.0) continue;
+
+                    int polyi1 = std::max(i - _qDist, i1);
+                    int polyi2 = std::min(i + _qDist, i2);
+                    int polyj1 = std::max(j - _qDist, j1);
+                    int polyj2 = std::min(j + _qDist, j2);
+                    int disti = nxCenter + polyi1 - i;
+
+                    for (int polyi=polyi1; polyi<=polyi2; ++polyi, ++disti) {
+                        int distj = nyCenter + polyj1 - j;
+                        int index = (polyi - i1) * ny + (polyj1 - j1);
+                        int dist_index = disti * _ny + distj;
+
+                        for (int polyj=polyj1; polyj<=polyj2;
+                             ++polyj, ++distj, ++index, ++dist_index) {
+                            Polygon& distortion = _distortions[dist_index];
+                            Polygon& imagepoly = _imagepolys[index];
+                            imagepoly.distort(distortion, charge);
+                            _changed[index] = true;
+                        }
                     }
                 }
             }
         }
-        for (size_t k=0; k<_imagepolys.size(); ++k) {
-            if (changed[k]) _imagepolys[k].updateBounds();
+
+        // Update the bounds of the changed polygons, which are all in the affected tiles.
+        for (int ty=0; ty<_nty; ++ty) {
+            for (int tx=0; tx<_ntx; ++tx) {
+                if (!affected[ty * _ntx + tx]) continue;
+                const int ti1 = tx * tile_size;
+                const int ti2 = std::min(ti1 + tile_size, i2-i1+1);
+                const int tj1 = ty * tile_size;
+                const int tj2 = std::min(tj1 + tile_size, ny);
+                for (int di=ti1; di<ti2; ++di) {
+                    for (int dj=tj1; dj<tj2; ++dj) {
+                        int index = di * ny + dj;
+                        if (_changed[index]) {
+                            _imagepolys[index].updateBounds();
+                            _changed[index] = false;
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    template <typename T>
+    void Silicon::addDelta(ImageView<T> target, double factor)
+    {
+        // _delta is zero outside of the dirty tiles, so we only need to add those.
+        const int i1 = _tileBounds.getXMin();
+        const int i2 = _tileBounds.getXMax();
+        const int j1 = _tileBounds.getYMin();
+        const int j2 = _tileBounds.getYMax();
+        const int step = target.getStep();
+        const int stride = target.getStride();
+        for (int j=j1; j<=j2; ++j) {
+            const int ty = (j - j1) / tile_size;
+            for (int tx=0; tx<_ntx; ++tx) {
+                if (!_dirtyTiles[ty * _ntx + tx]) continue;
+                const int ti1 = i1 + tx * tile_size;
+                const int ti2 = std::min(ti1 + tile_size - 1, i2);
+                T* ptr = target.getData() + (j-j1) * stride + (ti1-i1) * step;
+                // Do the sum in double precision, and only round the result to T, so float
+                // images get the same values as they would from a full-image update.
+                for (int i=ti1; i<=ti2; ++i, ptr+=step) *ptr = T(*ptr + factor * _delta(i,j));
+            }
+        }
+    }
+
+    void Silicon::clearDelta()
+    {
+        const int i1 = _tileBounds.getXMin();
+        const int i2 = _tileBounds.getXMax();
+        const int j1 = _tileBounds.getYMin();
+        const int j2 = _tileBounds.getYMax();
+        for (int j=j1; j<=j2; ++j) {
+            const int ty = (j - j1) / tile_size;
+            for (int tx=0; tx<_ntx; ++tx) {
+                if (!_dirtyTiles[ty * _ntx + tx]) continue;
+                const int ti1 = i1 + tx * tile_size;
+                const int ti2 = std::min(ti1 + tile_size - 1, i2);
+                for (int i=ti1; i<=ti2; ++i) _delta(i,j) = 0.;
+            }
         }
+        std::fill(_dirtyTiles.begin(), _dirtyTiles.end(), false);
+    }
+
+    void Silicon::setTreeRingMap(const float* dx, const float* dy, int nx, int ny,
+                                 double x0, double y0, double step)
+    {
+        if (nx > 0 && (nx < 2 || ny < 2 || step <= 0.))
+            throw std::runtime_error("Invalid tree ring map");
+        _trMapNx = nx;
+        _trMapNy = ny;
+        _trMapX0 = x0;
+        _trMapY0 = y0;
+        _trMapStep = step;
+        _trMapX.assign(dx, dx + nx*ny);
+        _trMapY.assign(dy, dy + nx*ny);
     }
 
     template <typename T>
@@ -229,6 +373,18 @@ namespace galsim {
         const int j1 = b.getYMin();
         const int j2 = b.getYMax();
         const int ny = j2-j1+1;
+
+        // The vertices of pixel (i,j) are at positions between (i,j) and (i+1,j+1) in the
+        // tree ring coordinates.  If these are all covered by the map, use that.
+        if (_trMapNx > 0 &&
+            i1 + orig_center.x >= _trMapX0 &&
+            i2 + orig_center.x + 1 <= _trMapX0 + (_trMapNx-1) * _trMapStep &&
+            j1 + orig_center.y >= _trMapY0 &&
+            j2 + orig_center.y + 1 <= _trMapY0 + (_trMapNy-1) * _trMapStep) {
+            addTreeRingDistortionsFromMap(target, orig_center);
+            return;
+        }
+
         double shift = 0.0;
         // Now we cycle through the pixels in the target image and add
         // the (small) distortions due to tree rings
@@ -263,9 +419,51 @@ namespace galsim {
         }
     }
 
+    template <typename T>
+    void Silicon::addTreeRingDistortionsFromMap(ImageView<T> target, Position<int> orig_center)
+    {
+        dbg<<"addTreeRingsFromMap\n";
+        Bounds<int> b = target.getBounds();
+        const int i1 = b.getXMin();
+        const int i2 = b.getXMax();
+        const int j1 = b.getYMin();
+        const int j2 = b.getYMax();
+        const int ny = j2-j1+1;
+        const double inv_step = 1. / _trMapStep;
+        const int nx = _trMapNx;
+
+        // Each column of pixels is independent, so these can be done in parallel.
+        ParallelFor(i2-i1+1, [&](int di) {
+            const int i = i1 + di;
+            for (int j=j1; j<=j2; ++j) {
+                Polygon& poly = _imagepolys[di * ny + (j - j1)];
+                for (int n=0; n<_nv; n++) {
+                    double u = ((double)i + poly[n].x + (double)orig_center.x - _trMapX0) *
+                        inv_step;
+                    double v = ((double)j + poly[n].y + (double)orig_center.y - _trMapY0) *
+                        inv_step;
+                    int k = std::min(std::max(int(u), 0), _trMapNx-2);
+                    int l = std::min(std::max(int(v), 0), _trMapNy-2);
+                    double s = u - k;
+                    double t = v - l;
+                    int index = l * nx + k;
+                    double w00 = (1.-s) * (1.-t);
+                    double w10 = s * (1.-t);
+                    double w01 = (1.-s) * t;
+                    double w11 = s * t;
+                    poly[n].x += w00 * _trMapX[index] + w10 * _trMapX[index+1] +
+                        w01 * _trMapX[index+nx] + w11 * _trMapX[index+nx+1];
+                    poly[n].y += w00 * _trMapY[index] + w10 * _trMapY[index+1] +
+                        w01 * _trMapY[index+nx] + w11 * _trMapY[index+nx+1];
+                }
+                poly.updateBounds();
+            }
+        });
+    }
+
     template <typename T>
     bool Silicon::insidePixel(int ix, int iy, double x, double y, double zconv,
-                              ImageView<T> target, bool* off_edge) const
+                              ImageView<T> target, bool* off_edge, Polygon* testpoly) const
     {
         // This scales the pixel distortion based on the zconv, which is the depth
         // at which the electron is created, and then tests to see if the delivered
@@ -313,10 +511,11 @@ namespace galsim {
             const double zfactor = std::tanh(zconv / zfit);
 
             // Scale the testpoly vertices by zfactor
-            _testpoly.scale(poly, _emptypoly, zfactor);
+            if (!testpoly) testpoly = &_testpoly;
+            testpoly->scale(poly, _emptypoly, zfactor);
 
             // Now test to see if the point is inside
-            inside = _testpoly.contains(p);
+            inside = testpoly->contains(p);
         }
 
         // If the nominal pixel is on the edge of the image and the photon misses in the
@@ -328,7 +527,6 @@ namespace galsim {
             xdbg<<"iy,j1,j2 = "<<iy<<','<<j1<<','<<j2<<std::endl;
             *off_edge = false;
             xdbg<<"ix == i1 ? "<<(ix == i1)<<std::endl;
-            xdbg<<"x < inner.xmin? "<<(x < _testpoly.getInnerBounds().getXMin())<<std::endl;
             if ((ix == i1) && (x < poly.getInnerBounds().getXMin())) *off_edge = true;
             if ((ix == i2) && (x > poly.getInnerBounds().getXMax())) *off_edge = true;
             if ((iy == j1) && (y < poly.getInnerBounds().getYMin())) *off_edge = true;
@@ -343,6 +541,13 @@ namespace galsim {
 
     double Silicon::calculateConversionDepth(const PhotonArray& photons, int i,
                                              UniformDeviate ud) const
+    {
+        // Only use a random number if we need one.
+        double u = photons.hasAllocatedWavelengths() ? ud() : 0.;
+        return calculateConversionDepth(photons, i, u);
+    }
+
+    double Silicon::calculateConversionDepth(const PhotonArray& photons, int i, double u) const
     {
         // Determine the distance the photon travels into the silicon
         double si_length;
@@ -350,7 +555,7 @@ namespace galsim {
             double lambda = photons.getWavelength(i); // in nm
             // Lookup the absorption length in the imported table
             double abs_length = _abs_length_table.lookup(lambda); // in microns
-            si_length = -abs_length * log(1.0 - ud()); // in microns
+            si_length = -abs_length * log(1.0 - u); // in microns
 #ifdef DEBUGLOGGING
             if (i % 1000 == 0) {
                 xdbg<<"lambda = "<<lambda<<std::endl;
@@ -387,7 +592,7 @@ namespace galsim {
     // to further optimize this part of the code.
     template <typename T>
     bool searchNeighbors(const Silicon& silicon, int& ix, int& iy, double x, double y, double zconv,
-                         ImageView<T> target, int& step)
+                         ImageView<T> target, int& step, Polygon* testpoly=0)
     {
         xdbg<<"searchNeighbors for "<<ix<<','<<iy<<','<<x<<','<<y<<std::endl;
         // The following code finds which pixel we are in given
@@ -406,7 +611,7 @@ namespace galsim {
             double x_off = x - xoff[n];
             double y_off = y - yoff[n];
             xdbg<<n<<"  "<<ix_off<<"  "<<iy_off<<"  "<<x_off<<"  "<<y_off<<std::endl;
-            if (silicon.insidePixel(ix_off, iy_off, x_off, y_off, zconv, target)) {
+            if (silicon.insidePixel(ix_off, iy_off, x_off, y_off, zconv, target, 0, testpoly)) {
                 xdbg<<"Found in pixel "<<n<<", ix = "<<ix<<", iy = "<<iy
                     <<", x="<<x<<", y = "<<y<<", target(ix,iy)="<<target(ix,iy)<<std::endl;
                 ix = ix_off;
@@ -442,6 +647,7 @@ namespace galsim {
 
         // Set up the pixel information according to the current flux in the image.
         addTreeRingDistortions(target, orig_center);
+        initDirtyTiles(b, true);
         updatePixelDistortions(target);
 
         // Fill target with the area in each pixel.
@@ -509,7 +715,8 @@ namespace galsim {
             // the last update.  The easiest way to do that is to just subtract off what has
             // been added so far now and just keep adding to the existing _delta image.
             // It will all be added back at the end of this call to accumulate.
-            target -= _delta;
+            if (!(_tileBounds == _delta.getBounds())) initDirtyTiles(_delta.getBounds(), true);
+            addDelta(target, -1.);
             dbg<<"resume=True.  Use saved next_recalc = "<<next_recalc<<std::endl;
         } else {
             _imagepolys.resize(nxny);
@@ -521,6 +728,7 @@ namespace galsim {
 
             // Start with the correct distortions for the initial image as it is already
             dbg<<"Initial updatePixelDistortions\n";
+            initDirtyTiles(b, true);
             updatePixelDistortions(target);
             next_recalc = _nrecalc;
 
@@ -528,7 +736,17 @@ namespace galsim {
             // of the distortion updates.
             _delta.resize(b);
             _delta.setZero();
+            initDirtyTiles(b, false);
         }
+
+        if (GetNumThreads() > 1) {
+            double addedFlux = accumulateParallel(photons, ud, target, next_recalc);
+            addDelta(target, 1.);
+            _resume_next_recalc = next_recalc - addedFlux;
+            dbg<<"All done.  Added flux "<<addedFlux<<".  Save next_recalc = "<<_resume_next_recalc<<std::endl;
+            return addedFlux;
+        }
+
         const double invPixelSize = 1./_pixelSize; // pixels/micron
         const double diffStep_pixel_z = _diffStep / (_sensorThickness * _pixelSize);
 
@@ -542,8 +760,8 @@ namespace galsim {
             if (addedFlux > next_recalc) {
                 dbg<<"updatePixelDistortions because "<<addedFlux<<" > "<<next_recalc<<std::endl;
                 updatePixelDistortions(_delta.view());
-                target += _delta;
-                _delta.setZero();
+                addDelta(target, 1.);
+                clearDelta();
                 next_recalc = addedFlux + _nrecalc;
             }
 
@@ -660,11 +878,12 @@ namespace galsim {
                 Irr0 += flux * rsq;
 #endif
                 _delta(ix,iy) += flux;
+                markDirty(ix,iy);
                 addedFlux += flux;
             }
         }
         // No need to update the distortions again, but we do need to add the delta image.
-        target += _delta;
+        addDelta(target, 1.);
         _resume_next_recalc = next_recalc - addedFlux;
         dbg<<"All done.  Added flux "<<addedFlux<<".  Save next_recalc = "<<_resume_next_recalc<<std::endl;
 
@@ -679,14 +898,147 @@ namespace galsim {
         return addedFlux;
     }
 
+    template <typename T>
+    double Silicon::accumulateParallel(const PhotonArray& photons, UniformDeviate ud,
+                                       ImageView<T> target, double& next_recalc)
+    {
+        // This gives the same distribution of results as the serial version in accumulate,
+        // but it uses the random numbers differently, so the individual results are different.
+        // They are deterministic for a given ud though, regardless of the number of threads.
+        Bounds<int> b = target.getBounds();
+        const int nphotons = photons.size();
+        const double invPixelSize = 1./_pixelSize; // pixels/micron
+        const double diffStep_pixel_z = _diffStep / (_sensorThickness * _pixelSize);
+        dbg<<"accumulateParallel with "<<GetNumThreads()<<" threads\n";
+
+        // Draw all the random numbers up front in a fixed order, so they don't depend on
+        // which thread processes which photon.
+        std::vector<double> depth_u(photons.hasAllocatedWavelengths() ? nphotons : 0);
+        std::vector<double> diff_g(_diffStep != 0. ? 2*nphotons : 0);
+        std::vector<double> miss_u(nphotons);
+        GaussianDeviate gd(ud,0,1); // Random variable from Standard Normal dist.
+        for (int i=0; i<nphotons; i++) {
+            if (depth_u.size() > 0) depth_u[i] = ud();
+            if (diff_g.size() > 0) {
+                diff_g[2*i] = gd();
+                diff_g[2*i+1] = gd();
+            }
+            miss_u[i] = ud();
+        }
+
+        // Photons are processed by the threads in chunks of this size.
+        const int chunk_size = 1000;
+
+        // The conversion point of each photon doesn't depend on the pixel boundaries, so find
+        // them all at once.
+        std::vector<double> xconv(nphotons), yconv(nphotons), zconv(nphotons);
+        ParallelFor((nphotons-1) / chunk_size + 1, [&](int k) {
+            const int end = std::min(nphotons, (k+1) * chunk_size);
+            for (int i=k*chunk_size; i<end; i++) {
+                double x0 = photons.getX(i); // in pixels
+                double y0 = photons.getY(i); // in pixels
+                double dz = calculateConversionDepth(photons, i,
+                                                     depth_u.size() > 0 ? depth_u[i] : 0.);
+                if (photons.hasAllocatedAngles()) {
+                    double dz_pixel = dz * invPixelSize;
+                    x0 += photons.getDXDZ(i) * dz_pixel; // dx in pixels
+                    y0 += photons.getDYDZ(i) * dz_pixel; // dy in pixels
+                }
+                zconv[i] = _sensorThickness - dz;
+                if (_diffStep != 0.) {
+                    double diffStep = std::max(0.0, diffStep_pixel_z * (zconv[i] - 10.0));
+                    x0 += diffStep * diff_g[2*i];
+                    y0 += diffStep * diff_g[2*i+1];
+                }
+                xconv[i] = x0;
+                yconv[i] = y0;
+            }
+        });
+
+        // Use the mean flux per photon to estimate how many photons will be added before the
+        // next time we need to update the pixel boundaries.
+        double mean_flux = 0.;
+        for (int i=0; i<nphotons; i++) mean_flux += std::abs(photons.getFlux(i));
+        mean_flux = std::max(mean_flux / std::max(nphotons,1), 1.e-300);
+
+        // The pixel boundaries only change when we recalculate the distortions, so between
+        // recalculations, the photons can be placed into pixels in parallel.  We place a block
+        // of photons that should be enough to get to the next recalculation, and then add them
+        // in order until the recalculation is due.  Any photons in the block after that point
+        // are placed again with the updated pixel boundaries.
+        std::vector<int> pix_x(nphotons), pix_y(nphotons);
+        std::vector<char> found(nphotons);
+        double addedFlux = 0.;
+        int i = 0;
+        while (i < nphotons) {
+            double nest = std::max(next_recalc - addedFlux, 0.) / mean_flux;
+            int nblock = int(std::min(1.1 * nest + 16., double(nphotons - i)));
+            const int end = i + nblock;
+            xdbg<<"Place photons "<<i<<" .. "<<end<<std::endl;
+            const int start = i;
+            ParallelFor((nblock-1) / chunk_size + 1, [&](int k) {
+                Polygon testpoly = _emptypoly;
+                const int kend = std::min(end, start + (k+1) * chunk_size);
+                for (int ip=start + k*chunk_size; ip<kend; ip++) {
+                    found[ip] = 0;
+                    if (zconv[ip] < 0.0) continue; // Throw photon away if it hits the bottom
+                    int ix = int(floor(xconv[ip] + 0.5));
+                    int iy = int(floor(yconv[ip] + 0.5));
+                    double x = xconv[ip] - ix + 0.5;
+                    double y = yconv[ip] - iy + 0.5;
+                    bool off_edge;
+                    bool foundPixel = insidePixel(ix, iy, x, y, zconv[ip], target, &off_edge,
+                                                  &testpoly);
+                    if (!foundPixel && off_edge) continue;
+                    int step;
+                    if (!foundPixel) {
+                        foundPixel = searchNeighbors(*this, ix, iy, x, y, zconv[ip], target, step,
+                                                     &testpoly);
+                    }
+                    if (!foundPixel) {
+                        int n = (miss_u[ip] > 0.5) ? 0 : step;
+                        ix = ix + xoff[n];
+                        iy = iy + yoff[n];
+                    }
+                    pix_x[ip] = ix;
+                    pix_y[ip] = iy;
+                    found[ip] = 1;
+                }
+            });
+
+            for (; i<end; i++) {
+                if (addedFlux > next_recalc) break;
+                if (found[i] && b.includes(pix_x[i], pix_y[i])) {
+                    double flux = photons.getFlux(i);
+                    _delta(pix_x[i], pix_y[i]) += flux;
+                    markDirty(pix_x[i], pix_y[i]);
+                    addedFlux += flux;
+                }
+            }
+
+            // Update shapes every _nrecalc electrons
+            if (i < nphotons && addedFlux > next_recalc) {
+                dbg<<"updatePixelDistortions because "<<addedFlux<<" > "<<next_recalc<<std::endl;
+                updatePixelDistortions(_delta.view());
+                addDelta(target, 1.);
+                clearDelta();
+                next_recalc = addedFlux + _nrecalc;
+            }
+        }
+        return addedFlux;
+    }
+
     template bool Silicon::insidePixel(int ix, int iy, double x, double y, double zconv,
-                                       ImageView<double> target, bool*) const;
+                                       ImageView<double> target, bool*, Polygon*) const;
     template bool Silicon::insidePixel(int ix, int iy, double x, double y, double zconv,
-                                       ImageView<float> target, bool*) const;
+                                       ImageView<float> target, bool*, Polygon*) const;
 
     template void Silicon::updatePixelDistortions(ImageView<double> target);
     template void Silicon::updatePixelDistortions(ImageView<float> target);
 
+    template void Silicon::addDelta(ImageView<double> target, double factor);
+    template void Silicon::addDelta(ImageView<float> target, double factor);
+
     template void Silicon::addTreeRingDistortions(ImageView<double> target,
                                                   Position<int> orig_center);
     template void Silicon::addTreeRingDistortions(ImageView<float> target,
@@ -143,6 +143,13 @@ def check_basic_x(prof, name, approx_maxsb=False, scale=None):
         assert prof._xValue.__doc__ == galsim.GSObject._xValue.__doc__
         assert prof.__class__._xValue.__doc__ == galsim.GSObject._xValue.__doc__
 
+    # The array version of xValue should match the values at each position.
+    x = np.array([2, -4, 0, -3]) * dx
+    y = np.array([3, 1, -5, -3]) * dx
+    np.testing.assert_allclose(
+            prof.xValue(x,y), [prof.xValue(xx,yy) for xx,yy in zip(x,y)], rtol=1.e-5,
+            err_msg="%s profile xValue with arrays does not match xValue"%name)
+
     # Direct call to drawReal should also work and be equivalent to the above with scale = 1.
     prof.drawImage(image, method='sb', scale=1., use_true_center=False)
     image2 = image.copy()
@@ -196,6 +203,13 @@ def check_basic_k(prof, name):
         assert prof._kValue.__doc__ == galsim.GSObject._kValue.__doc__
         assert prof.__class__._kValue.__doc__ == galsim.GSObject._kValue.__doc__
 
+    # The array version of kValue should match the values at each position.
+    kx = np.array([2, -4, 0, -3]) * dk
+    ky = np.array([3, 1, -5, -3]) * dk
+    np.testing.assert_allclose(
+            prof.kValue(kx,ky), [prof.kValue(kxx,kyy) for kxx,kyy in zip(kx,ky)], rtol=1.e-5,
+            err_msg="%s profile kValue with arrays does not match kValue"%name)
+
     # If supposed to be axisymmetric, make sure it is in the kValues.
     if prof.is_axisymmetric:
         for r in [0.2, 1.3, 33.4]:
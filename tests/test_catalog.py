@@ -234,6 +234,140 @@ def test_single_row():
         err_msg="galsim.Catalog.__init__ failed to read 1-row file")
 
 
+@timer
+def test_columnar_catalog():
+    """Test Catalogs with typed columns."""
+    cat = galsim.Catalog(dir='config_input', file_name='catalog.txt')
+    cat_c = galsim.Catalog(dir='config_input', file_name='catalog.txt', columnar=True)
+    assert cat_c != cat
+    assert not cat_c.hasNames()
+    assert cat_c.ncols == cat.ncols
+    assert len(cat_c) == cat_c.nobjects == cat.nobjects
+    assert cat_c.getColumn(0).dtype == np.float64
+    assert cat_c.getColumn(2).dtype == np.int64
+    assert cat_c.getColumn(5).dtype.kind == 'U'
+    assert cat.getColumn(2).dtype.kind == 'U'
+    np.testing.assert_array_equal(cat_c.getColumn(2), [9, 0, -4])
+    np.testing.assert_array_equal(cat_c.getColumn(5), cat.getColumn(5))
+    assert cat_c.get(1,11) == 15
+    assert cat_c.get(1,5) == 'No'
+    for i in range(cat.nobjects):
+        for col in [0, 1, 2, 3, 4, 10, 11]:
+            assert cat_c.getFloat(i,col) == cat.getFloat(i,col)
+        assert cat_c.getInt(i,3) == cat.getInt(i,3)
+    do_pickle(cat_c)
+    assert_raises(IndexError, cat_c.get, 3, 11)
+    assert_raises(IndexError, cat_c.get, 1, 50)
+    assert_raises(IndexError, cat_c.getColumn, 'val')
+
+    # Check that the chunked parsing gets the types right when they change partway through.
+    filename = os.path.join('output', 'test_columnar.txt')
+    with open(filename, 'w') as f:
+        f.write("# comment\n1 2 3\n\n4 5.5 x\n# another comment\n7 8 9\n")
+    for chunk_size in [1, 2, 100]:
+        columns = galsim.catalog._read_ascii_columns(filename, '#', chunk_size=chunk_size)
+        assert len(columns) == 3
+        np.testing.assert_array_equal(columns[0], [1, 4, 7])
+        assert columns[0].dtype == np.int64
+        np.testing.assert_array_equal(columns[1], [2., 5.5, 8.])
+        assert columns[1].dtype == np.float64
+        np.testing.assert_array_equal(columns[2], ['3', 'x', '9'])
+    with open(filename, 'w') as f:
+        f.write("1 2 3\n4 5\n")
+    assert_raises(ValueError, galsim.catalog._read_ascii_columns, filename, '#', 0, None, 1)
+
+    # FITS catalogs are memory mapped.
+    cat = galsim.Catalog(dir='config_input', file_name='catalog.fits')
+    cat_c = galsim.Catalog(dir='config_input', file_name='catalog.fits', columnar=True)
+    assert cat_c.hasNames()
+    assert cat_c.names == cat.names
+    for name in cat.names:
+        np.testing.assert_array_equal(cat_c.getColumn(name), cat.getColumn(name))
+    assert cat_c.get(1,'angle2') == 15
+    assert_raises(KeyError, cat_c.getColumn, 'invalid')
+    do_pickle(cat_c)
+
+    # NPY files are structured arrays.
+    filename = os.path.join('output', 'catalog.npy')
+    np.save(filename, np.array(cat.data))
+    cat_n = galsim.Catalog(filename)
+    assert cat_n.file_type == 'NPY'
+    assert cat_n.hasNames()
+    assert cat_n.names == cat.names
+    assert len(cat_n) == cat_n.nobjects == cat.nobjects
+    assert cat_n.ncols == cat.ncols
+    for name in cat.names:
+        np.testing.assert_array_equal(cat_n.getColumn(name), cat.getColumn(name))
+    assert cat_n.get(1,'angle2') == 15
+    assert cat_n.getFloat(2,'float2') == 8000
+    assert galsim.Catalog(filename, _nobjects_only=True).nobjects == cat.nobjects
+    do_pickle(cat_n)
+    # Bytes columns are returned as str.
+    data = np.array([(1, b'gal1'), (2, b'gal2')], dtype=[('id', int), ('name', 'S4')])
+    np.save(filename, data)
+    cat_s = galsim.Catalog(filename)
+    assert cat_s.get(1,'name') == 'gal2'
+    np.testing.assert_array_equal(cat_s.getColumn('name'), ['gal1', 'gal2'])
+    assert cat_s.getInt(0,'id') == 1
+    np.save(filename, np.arange(10))
+    assert_raises(ValueError, galsim.Catalog, filename)
+
+    # Parquet requires pyarrow.
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+    except ImportError:
+        print('Skipping Parquet tests, since pyarrow is not installed.')
+    else:
+        filename = os.path.join('output', 'catalog.parquet')
+        table = pyarrow.table(dict((name, np.array(cat.data[name])) for name in cat.names))
+        pq.write_table(table, filename)
+        cat_p = galsim.Catalog(filename)
+        assert cat_p.file_type == 'PARQUET'
+        assert cat_p.names == cat.names
+        for name in cat.names:
+            np.testing.assert_array_equal(cat_p.getColumn(name), cat.getColumn(name))
+        assert galsim.Catalog(filename, _nobjects_only=True).nobjects == cat.nobjects
+
+
+@timer
+def test_catalog_rows():
+    """Test Catalogs that only use some of the rows in the file."""
+    for file_name, col, columnar in [ ('catalog.txt', 11, False), ('catalog.txt', 11, True),
+                                      ('catalog.fits', 'angle2', False),
+                                      ('catalog.fits', 'angle2', True) ]:
+        cat = galsim.Catalog(file_name, 'config_input', columnar=columnar)
+        cat1 = galsim.Catalog(file_name, 'config_input', columnar=columnar, first_row=1)
+        assert cat1 != cat
+        assert len(cat1) == 2
+        assert cat1.get(0,col) == cat.get(1,col)
+        assert cat1.get(1,col) == cat.get(2,col)
+        assert_raises(IndexError, cat1.get, 2, col)
+        np.testing.assert_array_equal(cat1.getColumn(col), cat.getColumn(col)[1:])
+        do_pickle(cat1)
+
+        cat2 = galsim.Catalog(file_name, 'config_input', columnar=columnar, first_row=1, nrows=1)
+        assert len(cat2) == 1
+        assert cat2.get(0,col) == cat.get(1,col)
+        assert_raises(IndexError, cat2.get, 1, col)
+        do_pickle(cat2)
+
+        cat3 = galsim.Catalog(file_name, 'config_input', first_row=1, _nobjects_only=True)
+        assert cat3.nobjects == 2
+        cat3 = galsim.Catalog(file_name, 'config_input', nrows=2, _nobjects_only=True)
+        assert cat3.nobjects == 2
+        cat3 = galsim.Catalog(file_name, 'config_input', first_row=5, _nobjects_only=True)
+        assert cat3.nobjects == 0
+
+    # The rows after comment lines are counted correctly.
+    cat = galsim.Catalog('catalog2.txt', 'config_input', comments='%', first_row=2)
+    assert len(cat) == 1
+    assert cat.get(0,11) == '82'
+
+    assert_raises(ValueError, galsim.Catalog, 'catalog.txt', 'config_input', first_row=-1)
+    assert_raises(ValueError, galsim.Catalog, 'catalog.txt', 'config_input', nrows=-1)
+
+
 @timer
 def test_output_catalog():
     """Test basic operations on Catalog."""
@@ -361,4 +495,6 @@ if __name__ == "__main__":
     test_fits_catalog()
     test_basic_dict()
     test_single_row()
+    test_columnar_catalog()
+    test_catalog_rows()
     test_output_catalog()
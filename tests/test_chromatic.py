@@ -1260,6 +1260,254 @@ def test_analytic_integrator():
                          integrator=galsim.integ.SampleIntegrator(rule=galsim.integ.trapzRule))
 
 
+@timer
+def test_batch_integrator():
+    """Test that drawing all the wavelengths at once gives the same result as drawing each
+    wavelength separately.
+    """
+    psf = galsim.ChromaticAtmosphere(galsim.Kolmogorov(fwhm=0.7), 500., zenith_angle=zenith_angle)
+    gal = galsim.Exponential(half_light_radius=0.5) * disk_SED
+    gal += galsim.DeVaucouleurs(half_light_radius=0.3).shift(0.1,0.2) * bulge_SED
+    star = galsim.DeltaFunction() * disk_SED
+    bp = bandpass.thin(rel_err=1.e-2)
+
+    for rule in [galsim.integ.trapzRule, galsim.integ.midptRule]:
+        for integ1, integ2 in [
+                (galsim.integ.SampleIntegrator(rule),
+                 galsim.integ.SampleIntegrator(rule, batch=True)),
+                (galsim.integ.ContinuousIntegrator(rule, N=40),
+                 galsim.integ.ContinuousIntegrator(rule, N=40, batch=True)) ]:
+            assert not integ1.batch
+            assert integ2.batch
+            n = len(integ1.calculateWaves(bp))
+            weights = integ1.calculateWeights(integ1.calculateWaves(bp))
+            assert len(weights) == n
+            if rule is galsim.integ.trapzRule:
+                np.testing.assert_almost_equal(np.sum(weights), bp.red_limit - bp.blue_limit)
+
+            for obj in [psf * disk_SED, galsim.Convolve(gal, psf), galsim.Convolve(star, psf)]:
+                im1 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ1)
+                im2 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ2)
+                print('max diff = ',np.max(np.abs(im2.array-im1.array)), im1.array.max())
+                np.testing.assert_allclose(im2.array, im1.array, rtol=0,
+                                           atol=1.e-4 * im1.array.max())
+                np.testing.assert_allclose(im2.array.sum(), im1.array.sum(), rtol=1.e-5)
+
+                im1 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ1,
+                                    method='no_pixel')
+                im2 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ2,
+                                    method='no_pixel')
+                np.testing.assert_allclose(im2.array, im1.array, rtol=0,
+                                           atol=1.e-4 * im1.array.max())
+
+            obj = psf * disk_SED
+            obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ2)
+            # A SampleIntegrator uses the bandpass wave_list merged with that of the SED.
+            wave_list, _, _ = galsim.utilities.combine_wave_list(obj, bp)
+            if isinstance(integ2, galsim.integ.SampleIntegrator):
+                assert obj._last_n_eval == len(wave_list)
+            else:
+                assert obj._last_n_eval == n
+            k1 = obj.drawKImage(bp, nx=32, ny=32, scale=0.2, integrator=integ1)
+            k2 = obj.drawKImage(bp, nx=32, ny=32, scale=0.2, integrator=integ2)
+            np.testing.assert_allclose(k2.array, k1.array, rtol=0,
+                                       atol=1.e-5 * np.abs(k1.array).max())
+
+    # Photon shooting still draws each wavelength separately, so it is identical.
+    integ1 = galsim.integ.ContinuousIntegrator(galsim.integ.trapzRule, N=10)
+    integ2 = galsim.integ.ContinuousIntegrator(galsim.integ.trapzRule, N=10, batch=True)
+    obj = psf * disk_SED
+    im1 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ1, method='phot',
+                        n_photons=1000, rng=galsim.BaseDeviate(1234))
+    im2 = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ2, method='phot',
+                        n_photons=1000, rng=galsim.BaseDeviate(1234))
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Still requires at least 2 points.
+    integ = galsim.integ.ContinuousIntegrator(galsim.integ.midptRule, N=1, use_endpoints=False,
+                                              batch=True)
+    with assert_raises(ValueError):
+        (psf * disk_SED).drawImage(bp, integrator=integ)
+
+
+@timer
+def test_adaptive_integrator():
+    """Test the AdaptiveIntegrator.
+    """
+    psf = galsim.ChromaticAtmosphere(galsim.Kolmogorov(fwhm=0.7), 500., zenith_angle=zenith_angle)
+    obj = galsim.Convolve(galsim.Exponential(half_light_radius=0.5) * disk_SED, psf)
+    bp = bandpass.thin(rel_err=1.e-3)
+
+    ref_integ = galsim.integ.SampleIntegrator(galsim.integ.trapzRule)
+    im_ref = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=ref_integ)
+    kim_ref = (psf*disk_SED).drawKImage(bp, nx=32, ny=32, scale=0.2, integrator=ref_integ)
+    print('SampleIntegrator used %d wavelengths'%len(bp.wave_list))
+
+    last_n = 0
+    for rel_err in [1.e-2, 1.e-3, 1.e-4]:
+        integ = galsim.integ.AdaptiveIntegrator(rel_err=rel_err)
+        im = obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ)
+        print('rel_err = %s: n_eval = %d, max diff = %s'%(
+              rel_err, integ.last_n_eval, np.max(np.abs(im.array-im_ref.array))))
+        # A smaller rel_err never needs fewer evaluations, but it may not need more if the
+        # initial intervals are already accurate enough.
+        assert integ.last_n_eval >= last_n
+        assert integ.last_n_eval <= integ.max_n
+        last_n = integ.last_n_eval
+        # Each tolerance still gives an image of the corresponding accuracy.
+        np.testing.assert_allclose(im.array, im_ref.array, rtol=0,
+                                   atol=10 * rel_err * im_ref.array.max())
+    assert last_n < len(bp.wave_list)
+
+    # drawKImage too.
+    kim = (psf*disk_SED).drawKImage(bp, nx=32, ny=32, scale=0.2, integrator=integ)
+    np.testing.assert_allclose(kim.array, kim_ref.array, rtol=0,
+                               atol=1.e-3 * np.abs(kim_ref.array).max())
+
+    # An object that doesn't change with wavelength only needs the initial evaluations.
+    flat_SED = galsim.SED('1', wave_type='nm', flux_type='fphotons')
+    const_psf = galsim.ChromaticObject(galsim.Kolmogorov(fwhm=0.7)).shift(lambda w: (0,0))
+    integ = galsim.integ.AdaptiveIntegrator(N=4)
+    im = (const_psf * flat_SED).drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ)
+    assert integ.last_n_eval == 9
+    im2 = (galsim.Kolmogorov(fwhm=0.7) * flat_SED).drawImage(bp, nx=32, ny=32, scale=0.2)
+    np.testing.assert_allclose(im.array, im2.array, rtol=0, atol=1.e-4 * im2.array.max())
+
+    # max_n limits the number of evaluations.
+    integ = galsim.integ.AdaptiveIntegrator(rel_err=1.e-8, max_n=30)
+    obj.drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ)
+    assert integ.last_n_eval == 30
+
+    # The weights integrate the throughput exactly for a linear function.
+    integ = galsim.integ.AdaptiveIntegrator()
+    waves = integ.calculateWaves(bp)
+    assert len(waves) == integ.N + 1
+    weights = integ.calculateBandpassWeights(waves, bp)
+    w = np.linspace(bp.blue_limit, bp.red_limit, 100001)
+    dw = w[1] - w[0]
+    np.testing.assert_allclose(np.sum(weights), np.sum(bp(w)) * dw, rtol=1.e-4)
+    np.testing.assert_allclose(np.dot(weights, waves), np.sum(w * bp(w)) * dw, rtol=1.e-4)
+
+    assert_raises(ValueError, galsim.integ.AdaptiveIntegrator, rel_err=0.)
+    assert_raises(ValueError, galsim.integ.AdaptiveIntegrator, N=0)
+    assert_raises(ValueError, galsim.integ.AdaptiveIntegrator, N=10, max_n=10)
+
+
+@timer
+def test_effective_prof_cache():
+    """Test the statistics, memory limit and disk cache of the ChromaticConvolution effective
+    profile cache.
+    """
+    import shutil
+    # Use a LookupTable SED, so the galaxies' SEDs (which are remade from this one each time
+    # they are accessed) compare equal and the cache can find the same key.
+    waves = np.linspace(400, 900, 101)
+    sed = galsim.SED(galsim.LookupTable(waves, waves**1.1), wave_type='nm', flux_type='fphotons')
+    bp = galsim.Bandpass('1', 'nm', blue_limit=500, red_limit=750)
+    psf = galsim.ChromaticAtmosphere(galsim.Kolmogorov(fwhm=0.7), 500.,
+                                     zenith_angle=30*galsim.degrees)
+    gal1 = galsim.Exponential(half_light_radius=0.3) * sed
+    gal2 = galsim.Exponential(half_light_radius=0.5) * sed
+    CC = galsim.ChromaticConvolution
+
+    # Other tests may have changed the size of the cache.
+    CC.resize_effective_prof_cache(10)
+    CC.clear_effective_prof_cache()
+    assert gal1.SED == gal2.SED
+    im1 = galsim.Convolve(gal1, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+    stats = CC.get_effective_prof_cache_stats()
+    print('stats = ',stats)
+    assert stats['misses'] == 1
+    assert stats['hits'] == 0
+    assert stats['size'] == 1
+    assert stats['nbytes'] > 0
+    assert stats['maxsize'] == 10
+    assert stats['max_bytes'] is None
+    assert stats['disk_hits'] == stats['disk_misses'] == 0
+
+    # The same PSF and SED with a different separable galaxy uses the same effective profile.
+    galsim.Convolve(gal2, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+    stats = CC.get_effective_prof_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+    # A different bandpass needs a different one.
+    bp2 = galsim.Bandpass('1', 'nm', blue_limit=600, red_limit=850)
+    galsim.Convolve(gal1, psf).drawImage(bp2, nx=32, ny=32, scale=0.2)
+    stats = CC.get_effective_prof_cache_stats()
+    assert stats['misses'] == 2
+    assert stats['size'] == 2
+    assert stats['evictions'] == 0
+
+    # Limiting the memory evicts the least recently used profile.
+    CC.resize_effective_prof_cache(10, max_bytes=stats['nbytes']-1)
+    stats = CC.get_effective_prof_cache_stats()
+    assert stats['size'] == 1
+    assert stats['evictions'] == 1
+    assert stats['nbytes'] <= stats['max_bytes']
+    CC.resize_effective_prof_cache(20)
+    stats = CC.get_effective_prof_cache_stats()
+    assert stats['maxsize'] == 20
+    assert stats['max_bytes'] is None
+    assert stats['size'] == 1
+
+    # The integrators need a repr for the disk cache key.
+    assert (repr(galsim.integ.SampleIntegrator(galsim.integ.midptRule)) ==
+            'galsim.integ.SampleIntegrator(galsim.integ.midptRule, batch=False)')
+    integ = galsim.integ.ContinuousIntegrator(galsim.integ.trapzRule, N=50)
+    assert (repr(integ) ==
+            'galsim.integ.ContinuousIntegrator(galsim.integ.trapzRule, N=50, use_endpoints=True, '
+            'batch=False)')
+    assert (repr(galsim.integ.AdaptiveIntegrator(rel_err=1.e-3)) ==
+            'galsim.integ.AdaptiveIntegrator(rel_err=0.001, N=8, max_n=250)')
+
+    # The effective profiles can also be saved in a disk cache, where other processes can
+    # find them.
+    cache_dir = os.path.join('output', 'effective_prof_cache')
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    galsim.chromatic.set_disk_cache(cache_dir)
+    try:
+        assert galsim.chromatic.get_disk_cache().directory == os.path.abspath(cache_dir)
+        CC.clear_effective_prof_cache()
+        im2 = galsim.Convolve(gal1, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+        np.testing.assert_array_equal(im2.array, im1.array)
+        stats = CC.get_effective_prof_cache_stats()
+        assert stats['disk_misses'] == 1
+        assert stats['disk_hits'] == 0
+        assert len(galsim.chromatic.get_disk_cache()) == 1
+
+        # Simulate a different process by clearing the in-memory cache.
+        CC.clear_effective_prof_cache()
+        im3 = galsim.Convolve(gal2, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+        stats = CC.get_effective_prof_cache_stats()
+        assert stats['disk_hits'] == 1
+        assert stats['disk_misses'] == 0
+        CC.clear_effective_prof_cache()
+        im4 = galsim.Convolve(gal2, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+        np.testing.assert_array_equal(im4.array, im3.array)
+        im5 = galsim.Convolve(gal1, psf).drawImage(bp, nx=32, ny=32, scale=0.2)
+        np.testing.assert_array_almost_equal(im5.array, im1.array, decimal=10)
+
+        # A different integrator is a different entry.
+        galsim.Convolve(gal1, psf).drawImage(bp, nx=32, ny=32, scale=0.2, integrator=integ)
+        assert len(galsim.chromatic.get_disk_cache()) == 2
+
+        # Objects whose repr doesn't fully specify them aren't saved.
+        psf2 = galsim.ChromaticObject(galsim.Kolmogorov(fwhm=0.7)).dilate(lambda w:(w/500)**-0.2)
+        galsim.Convolve(gal1, psf2).drawImage(bp, nx=32, ny=32, scale=0.2)
+        assert len(galsim.chromatic.get_disk_cache()) == 2
+        sed2 = galsim.SED(lambda w: w**1.1, wave_type='nm', flux_type='fphotons')
+        galsim.Convolve(galsim.Exponential(half_light_radius=0.3) * sed2, psf).drawImage(
+                bp, nx=32, ny=32, scale=0.2)
+        assert len(galsim.chromatic.get_disk_cache()) == 2
+    finally:
+        galsim.chromatic.set_disk_cache(None)
+    assert galsim.chromatic.get_disk_cache() is None
+    CC.resize_effective_prof_cache(10)
+
+
 @timer
 def test_gsparams():
     """Check that gsparams actually gets processed by ChromaticObjects.
@@ -2503,6 +2751,9 @@ if __name__ == "__main__":
     test_ChromaticObject_shift()
     test_ChromaticObject_compound_affine_transformation()
     test_analytic_integrator()
+    test_batch_integrator()
+    test_adaptive_integrator()
+    test_effective_prof_cache()
     test_gsparams()
     test_separable_ChromaticSum()
     test_centroid()
@@ -22,6 +22,8 @@ import os
 import sys
 import logging
 import math
+import multiprocessing
+import copy
 import re
 import warnings
 
@@ -261,6 +263,17 @@ def test_phot():
         im3d = galsim.config.BuildImage(config, logger=cl.logger)
     assert "ignoring 'max_extra_noise'" in cl.output
 
+    # Shoot the photons in batches of at most maxN at a time.
+    del config['_copied_image_keys_to_stamp']
+    config['image']['maxN'] = 70
+    ud.seed(1234 + 1)
+    im3e = gal.drawImage(scale=1, method='phot', n_photons=300, rng=ud, poisson_flux=True,
+                         maxN=70)
+    im3f = galsim.config.BuildImage(config)
+    np.testing.assert_array_equal(im3f.array, im3e.array)
+    del config['image']['maxN']
+    del config['stamp']['maxN']
+
     # Without n_photons, it should work.  But then, we also need a noise field
     # So without the noise field, it will raise an exception.
     del config['image']['n_photons']
@@ -2129,6 +2142,364 @@ def test_blend():
         galsim.config.BuildStamp(config, obj_num=8)
 
 
+@timer
+def test_worker_pool():
+    """Test that the worker processes persist across calls to BuildImages/BuildStamps.
+    """
+    config = {
+        'gal' : {
+            'type' : 'Exponential',
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+            'flux' : { 'type' : 'Catalog', 'col' : 1 },
+        },
+        'image' : {
+            'type' : 'Scattered',
+            'size' : 64,
+            'nobjects' : 6,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+        },
+        'input' : {
+            'catalog' : { 'dir' : 'config_input', 'file_name' : 'catalog.txt' },
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    images1 = galsim.config.BuildImages(3, config1)
+
+    config['image']['nproc'] = 2
+    images2 = galsim.config.BuildImages(3, config)
+    pool = config['_worker_pool']
+    pids = [ p.pid for p in pool.processes ]
+    assert len(pids) == 2
+    for im1, im2 in zip(images1, images2):
+        np.testing.assert_array_equal(im1.array, im2.array)
+
+    # Calling again reuses the same processes, which still give the same answers.
+    images3 = galsim.config.BuildImages(3, config)
+    assert config['_worker_pool'] is pool
+    assert [ p.pid for p in pool.processes ] == pids
+    for im1, im3 in zip(images1, images3):
+        np.testing.assert_array_equal(im1.array, im3.array)
+
+    # The input catalog is only sent to the workers once, as is an unchanged config dict.
+    cache = galsim.config.process._ConfigCache()
+    new_objs, live, s = cache.makeUpdate(config1)
+    assert len(new_objs) == 1
+    assert s is not None
+    new_objs, live, s = cache.makeUpdate(config1)
+    assert len(new_objs) == 0
+    assert len(live) == 1
+    assert s is None
+
+    # If an input loader changes the object, it is sent again, but under a new token.
+    cat = config1['_input_objs']['catalog'][0]
+    galsim.config.SetInputChanged(config1, cat)
+    assert config1['_input_objs']['catalog_version'][0] == 1
+    new_objs2, live2, s = cache.makeUpdate(config1)
+    assert len(new_objs2) == 1
+    assert live2 != live
+    new_objs, live, s = cache.makeUpdate(config1)
+    assert len(new_objs) == 0
+    assert live == live2
+    assert s is None
+
+    # Setting up an image only marks the object as changed if its loader has its own setupImage.
+    galsim.config.SetupInputsForImage(config1)
+    assert config1['_input_objs']['catalog_version'][0] == 1
+    class CatalogSetupLoader(galsim.config.InputLoader):
+        def setupImage(self, input_obj, config, base, logger):
+            pass
+    orig_loader = galsim.config.valid_input_types['catalog']
+    galsim.config.valid_input_types['catalog'] = CatalogSetupLoader(galsim.Catalog)
+    try:
+        galsim.config.SetupInputsForImage(config1)
+    finally:
+        galsim.config.valid_input_types['catalog'] = orig_loader
+    assert config1['_input_objs']['catalog_version'][0] == 2
+
+    # A new object is always sent.
+    config1['_input_objs']['catalog'][0] = copy.copy(cat)
+    new_objs, live, s = cache.makeUpdate(config1)
+    assert len(new_objs) == 1
+    assert live != live2
+    config1['_input_objs']['catalog'][0] = cat
+
+    # And the workers reconstruct the same catalog from the update.
+    worker_cache = galsim.config.process._ConfigCache()
+    worker_config = worker_cache.applyUpdate(galsim.config.process._ConfigCache().makeUpdate(config1))
+    cat1 = worker_config['_input_objs']['catalog'][0]
+    assert cat1 == config1['_input_objs']['catalog'][0]
+    assert worker_config['input']['catalog']['current'][0] is cat1
+
+    galsim.config.CloseWorkerPool(config)
+    assert '_worker_pool' not in config
+    assert pool.processes == []
+
+    # With a logger, the workers log through a proxy, whose manager needs to stay alive until
+    # the pool is closed.
+    with CaptureLog() as cl:
+        images4 = galsim.config.BuildImages(3, config, logger=cl.logger)
+        images5 = galsim.config.BuildImages(3, config, logger=cl.logger)
+        pool = config['_worker_pool']
+        assert pool.logger_manager is not None
+        galsim.config.CloseWorkerPool(config)
+    assert pool.logger_manager is None
+    assert 'Process-1: Received STOP' in cl.output
+    assert 'Process-2: Received STOP' in cl.output
+    for im1, im4, im5 in zip(images1, images4, images5):
+        np.testing.assert_array_equal(im1.array, im4.array)
+        np.testing.assert_array_equal(im1.array, im5.array)
+
+    # The values cached in the config dict, like the compiled function of an Eval, are not
+    # sent to the workers, since they aren't generally picklable.
+    config = {
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type' : 'Random', 'min' : 1, 'max' : 2 },
+            'flux' : '$100 * (obj_num + 1)',
+        },
+        'image' : {
+            'type' : 'Tiled',
+            'nx_tiles' : 4,
+            'ny_tiles' : 4,
+            'stamp_size' : 16,
+            'pixel_scale' : 0.3,
+            'random_seed' : { 'type' : 'Eval', 'str' : '1234 + file_num' },
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    image1 = galsim.config.BuildImage(config1)
+    config['image']['nproc'] = 2
+    image2 = galsim.config.BuildImage(config)
+    np.testing.assert_array_equal(image1.array, image2.array)
+    assert '_fn' in config['image']['random_seed']
+    worker_config = galsim.config.process._WorkerConfig(config)
+    assert '_fn' not in worker_config['image']['random_seed']
+    assert '_worker_pool' not in worker_config
+    assert worker_config['current_image'].bounds == config['current_image'].bounds
+    assert worker_config['current_image'].array.size == 0
+    image3 = galsim.config.BuildImage(config)
+    np.testing.assert_array_equal(image1.array, image3.array)
+
+    # If a worker dies, getResult raises an exception rather than waiting forever.
+    galsim.config.BuildImages(3, config)
+    pool = config['_worker_pool']
+    pool.poll_time = 0.1
+    pool.processes[0].terminate()
+    pool.processes[0].join()
+    with assert_raises(galsim.GalSimError):
+        pool.getResult()
+    galsim.config.CloseWorkerPool(config, terminate=True)
+
+
+def _square_job(config, logger, x):
+    # A job function for test_schedule, which fails for x == 3.
+    if x == 3:
+        raise ValueError("x == 3")
+    return x*x
+
+@timer
+def test_schedule():
+    """Test the load balancing of stamps among multiple processes.
+    """
+    # The most expensive tasks go first, and cheap ones are grouped into larger chunks.
+    tasks = [ [ ({}, k) ] for k in range(20) ]
+    costs = [ 1 ] * 18 + [ 50, 30 ]
+    chunks = galsim.config.process._MakeChunks(tasks, costs, 2)
+    assert [ k for kwargs, k in chunks[0][0] ] == [18]
+    assert [ k for kwargs, k in chunks[1][0] ] == [19]
+    assert len(chunks[2][0]) > 1
+    assert sum(cost for chunk, cost in chunks) == sum(costs)
+    assert sorted(k for chunk, cost in chunks for kwargs, k in chunk) == list(range(20))
+
+    # Without costs, each task counts the same.  Tasks with multiple jobs are kept together.
+    tasks = [ [ ({}, 2*k), ({}, 2*k+1) ] for k in range(10) ]
+    chunks = galsim.config.process._MakeChunks(tasks, None, 3)
+    for chunk, cost in chunks:
+        assert len(chunk) % 2 == 0
+        assert chunk[0][1] % 2 == 0
+    assert sorted(k for chunk, cost in chunks for kwargs, k in chunk) == list(range(20))
+
+    config = {
+        'gal' : {
+            'type' : 'Exponential',
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 3.5 },
+            'flux' : 100,
+        },
+        'stamp' : {
+            'cost' : '$@gal.half_light_radius**2',
+        },
+        'image' : {
+            'type' : 'Scattered',
+            'size' : 128,
+            'nobjects' : 20,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    im1 = galsim.config.BuildImage(config1)
+
+    costs = galsim.config.stamp.GetStampCosts(config, [ { 'obj_num' : k, 'xsize' : 0, 'ysize' : 0 }
+                                                        for k in range(20) ], None)
+    assert len(costs) == 20
+    assert 0.25 <= min(costs) <= max(costs) <= 3.5**2
+
+    config['image']['nproc'] = 2
+    with CaptureLog() as cl:
+        im2 = galsim.config.BuildImage(config, logger=cl.logger)
+    np.testing.assert_array_equal(im1.array, im2.array)
+    assert re.search("Process-.: [0-9]+ stamps, busy for", cl.output)
+    galsim.config.CloseWorkerPool(config)
+
+    # If the costs cannot be calculated, they are all treated equally.
+    config['stamp']['cost'] = '$undefined_variable'
+    galsim.config.RemoveCurrent(config)
+    with CaptureLog() as cl:
+        im3 = galsim.config.BuildImage(config, logger=cl.logger)
+    np.testing.assert_array_equal(im1.array, im3.array)
+    assert "Unable to estimate the stamp costs." in cl.output
+    galsim.config.CloseWorkerPool(config)
+
+    # Without stamp.cost, the cost is the stamp area times n_photons, which may be given in
+    # either the stamp or image field.
+    del config['stamp']['cost']
+    config['stamp']['size'] = 16
+    config['image']['n_photons'] = 1000
+    galsim.config.RemoveCurrent(config)
+    jobs = [ { 'obj_num' : k, 'xsize' : 0, 'ysize' : 0 } for k in range(3) ]
+    assert galsim.config.stamp.GetStampCosts(config, jobs) == [ 16 * 16 * 1000. ] * 3
+
+    # A job that fails only loses its own result, not those of the rest of its chunk.
+    tasks = [ [ ({ 'x' : k }, k) ] for k in range(20) ]
+    config = {}
+    logger = galsim.config.LoggerWrapper(None)
+    results = galsim.config.MultiProcess(2, config, _square_job, tasks, 'test', logger=logger,
+                                         except_abort=False)
+    assert results == [ k*k for k in range(20) if k != 3 ]
+    # Likewise with the chunks made using costs.
+    tasks = [ [ ({ 'x' : k }, k) ] for k in range(20) ]
+    costs = [ 100 ] + [ 1 ] * 19
+    results = galsim.config.MultiProcess(2, config, _square_job, tasks, 'test', logger=logger,
+                                         except_abort=False, costs=costs)
+    assert results == [ k*k for k in range(20) if k != 3 ]
+    galsim.config.CloseWorkerPool(config)
+
+    # Idle workers keep trying to steal work until there is some.
+    task_queues = [ multiprocessing.Queue() for j in range(3) ]
+    task_queues[2].put('STOP')
+    task_queues[1].put('chunk')
+    assert galsim.config.process._GetChunk(0, task_queues) == ('chunk', True)
+    assert galsim.config.process._GetChunk(2, task_queues) == ('STOP', False)
+
+
+@timer
+def test_shared_stamps():
+    """Test returning the stamps from the worker processes via shared memory.
+    """
+    config = {
+        'gal' : {
+            'type' : 'Sersic',
+            'n' : { 'type' : 'Random', 'min' : 1, 'max' : 4 },
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+            'flux' : 1000,
+        },
+        'psf' : { 'type' : 'Moffat', 'beta' : 2.5, 'fwhm' : 0.7 },
+        'image' : {
+            'type' : 'Scattered',
+            'size' : 128,
+            'nobjects' : 30,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'noise' : { 'type' : 'Gaussian', 'sigma' : 2 },
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    im1 = galsim.config.BuildImage(config1)
+
+    # The accumulation into the full image happens in the same order, so the result is
+    # identical to the nproc = 1 result.
+    config['image']['nproc'] = 2
+    config['image']['shared_stamps'] = True
+    im2 = galsim.config.BuildImage(config)
+    np.testing.assert_array_equal(im1.array, im2.array)
+
+    # The stamps returned by BuildStamps view the shared memory.
+    stamps1 = galsim.config.BuildStamps(6, config1, do_noise=False)[0]
+    stamps2 = galsim.config.BuildStamps(6, config, do_noise=False)[0]
+    for s1, s2 in zip(stamps1, stamps2):
+        assert isinstance(s2.array.base, np.memmap)
+        assert s1.bounds == s2.bounds
+        assert s1.wcs == s2.wcs
+        np.testing.assert_array_equal(s1.array, s2.array)
+
+    # Closing the pool removes the shared files.
+    arena_dir = config['_worker_pool'].arena_dir
+    assert os.path.isdir(arena_dir)
+    galsim.config.CloseWorkerPool(config)
+    assert not os.path.exists(arena_dir)
+
+
+@timer
+def test_scattered_regions():
+    """Test building a Scattered image in parallel by regions of the image.
+    """
+    config = {
+        'gal' : {
+            'type' : 'Exponential',
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 2.5 },
+            'flux' : { 'type' : 'Random', 'min' : 100, 'max' : 1000 },
+        },
+        'psf' : { 'type' : 'Gaussian', 'sigma' : 0.5 },
+        'image' : {
+            'type' : 'Scattered',
+            'xsize' : 200,
+            'ysize' : 150,
+            'nobjects' : 40,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'noise' : { 'type' : 'Gaussian', 'sigma' : 1 },
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    im1 = galsim.config.BuildImage(config1)
+
+    # With nproc = 1, region_size doesn't do anything.
+    config2 = galsim.config.CopyConfig(config)
+    config2['image']['region_size'] = 64
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im1.array, im2.array)
+
+    # With nproc > 1, each region is built separately.  The sums are done in a different order,
+    # so the result is only equal up to rounding errors.
+    config2['image']['nproc'] = 3
+    with CaptureLog() as cl:
+        im2 = galsim.config.BuildImage(config2, logger=cl.logger)
+    np.testing.assert_allclose(im2.array, im1.array, rtol=1.e-5, atol=1.e-3)
+    assert "Region 0:" in cl.output
+    galsim.config.CloseWorkerPool(config2)
+
+    # Also works with the regions returned via shared memory.
+    config3 = galsim.config.CopyConfig(config2)
+    config3['image']['shared_stamps'] = True
+    im3 = galsim.config.BuildImage(config3)
+    np.testing.assert_array_equal(im3.array, im2.array)
+    galsim.config.CloseWorkerPool(config3)
+
+    # Each region covers all the stamps of its objects, which may extend past the region.
+    galsim.config.RemoveCurrent(config1)
+    config1['current_image'] = im1
+    region, info = galsim.config.image_scattered.BuildScatteredRegion(config1, [3,5,8])
+    assert [ n for n, b, var in info ] == [3,5,8]
+    for n, b, var in info:
+        assert region.bounds.includes(b & im1.bounds)
+        assert var == 0.
+
+    config2['image']['region_size'] = 0
+    with assert_raises(galsim.GalSimConfigError):
+        galsim.config.BuildImage(config2)
+
+
 if __name__ == "__main__":
     test_single()
     test_positions()
@@ -2146,3 +2517,7 @@ if __name__ == "__main__":
     test_template()
     test_variable_cat_size()
     test_blend()
+    test_worker_pool()
+    test_schedule()
+    test_shared_stamps()
+    test_scattered_regions()
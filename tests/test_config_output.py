@@ -226,6 +226,98 @@ def test_multifits():
         np.testing.assert_array_equal(im4_list[k].array, im1_list[k].array)
 
 
+@timer
+def test_catalog_stream():
+    """Test a catalog input with stream=True, which only reads the rows needed for each file
+    """
+    nfiles = 3
+    nimages = 4
+    sigma = np.linspace(1., 2., nfiles * nimages)
+    flux = np.linspace(50., 150., nfiles * nimages)
+    cat_file = os.path.join('output', 'test_stream_cat.txt')
+    np.savetxt(cat_file, np.array([sigma, flux]).T, header='sigma flux')
+
+    config = {
+        'input' : {
+            'catalog' : { 'file_name' : cat_file, 'stream' : True },
+        },
+        'image' : {
+            'type' : 'Single',
+            'size' : 32,
+        },
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type' : 'Catalog', 'col' : 0 },
+            'flux' : { 'type' : 'Catalog', 'col' : 1 },
+        },
+        'output' : {
+            'type' : 'MultiFits',
+            'nfiles' : nfiles,
+            'nimages' : nimages,
+            'file_name' : "$'output/test_stream_%d.fits'%file_num",
+        },
+    }
+    config1 = galsim.config.CopyConfig(config)
+
+    # Object k uses row k of the catalog.
+    im1_list = []
+    for k in range(nfiles * nimages):
+        gal = galsim.Gaussian(sigma=sigma[k], flux=flux[k])
+        im1_list.append(gal.drawImage(nx=32, ny=32, scale=1))
+
+    def check_files():
+        for i in range(nfiles):
+            im2_list = galsim.fits.readMulti('output/test_stream_%d.fits'%i)
+            assert len(im2_list) == nimages
+            for j in range(nimages):
+                np.testing.assert_array_equal(im2_list[j].array, im1_list[i*nimages+j].array)
+
+    galsim.config.Process(config)
+    check_files()
+
+    # The input catalog is just the rows for the current file.
+    config = galsim.config.CopyConfig(config1)
+    galsim.config.BuildFile(config, file_num=1, image_num=nimages, obj_num=nimages)
+    cat = config['_input_objs']['catalog'][0]
+    assert isinstance(cat, galsim.Catalog)
+    assert cat.nobjects == nimages
+    assert cat.first_row == nimages
+    np.testing.assert_almost_equal(cat.getFloat(0,0), sigma[nimages])
+
+    # Same thing with multiple processes.  The rows are copied to each process, rather than
+    # being accessed through a proxy.
+    config = galsim.config.CopyConfig(config1)
+    config['output']['nproc'] = nfiles
+    for i in range(nfiles):
+        os.remove('output/test_stream_%d.fits'%i)
+    galsim.config.Process(config)
+    check_files()
+
+    config = galsim.config.CopyConfig(config1)
+    config['image']['nproc'] = 2
+    galsim.config.Process(config)
+    check_files()
+
+    # Without stream=True, every file uses the first rows.
+    config = galsim.config.CopyConfig(config1)
+    del config['input']['catalog']['stream']
+    galsim.config.Process(config)
+    for i in range(nfiles):
+        im2_list = galsim.fits.readMulti('output/test_stream_%d.fits'%i)
+        for j in range(nimages):
+            np.testing.assert_array_equal(im2_list[j].array, im1_list[j].array)
+
+    # If nimages isn't given, then the first file uses all the rows.
+    config = galsim.config.CopyConfig(config1)
+    del config['output']['nimages']
+    config['output']['nfiles'] = 1
+    galsim.config.Process(config)
+    im2_list = galsim.fits.readMulti('output/test_stream_0.fits')
+    assert len(im2_list) == nfiles * nimages
+    for k in range(nfiles * nimages):
+        np.testing.assert_array_equal(im2_list[k].array, im1_list[k].array)
+
+
 @timer
 def test_datacube():
     """Test the output type = DataCube
@@ -1422,6 +1514,7 @@ def test_eval_full_word():
 if __name__ == "__main__":
     test_fits()
     test_multifits()
+    test_catalog_stream()
     test_datacube()
     test_skip()
     test_extra_wt()
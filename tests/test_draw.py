@@ -1059,6 +1059,20 @@ def test_shoot():
     # It's not exactly the same, since the rngs are realized in a different order.
     np.testing.assert_allclose(image3.array, image1.array, rtol=0.25)
 
+    # With a sensor, the batches are accumulated with resume=True.  For integer images, this
+    # uses a single temporary image for all the batches, so the result is the same as for a
+    # float image, rounded to the nearest integer.
+    obj2 = galsim.Gaussian(sigma=0.3, flux=30000)
+    image5 = galsim.ImageI(32,32, scale=0.2)
+    obj2.drawImage(image5, method='phot', poisson_flux=False, rng=galsim.BaseDeviate(1234),
+                   sensor=galsim.SiliconSensor(rng=galsim.BaseDeviate(5678)), maxN=7000)
+    image6 = galsim.ImageD(32,32, scale=0.2)
+    obj2.drawImage(image6, method='phot', poisson_flux=False, rng=galsim.BaseDeviate(1234),
+                   sensor=galsim.SiliconSensor(rng=galsim.BaseDeviate(5678)), maxN=7000)
+    np.testing.assert_array_equal(image5.array, np.around(image6.array))
+    np.testing.assert_allclose(image5.array, image6.array, rtol=0, atol=0.5)
+    assert image5.array.sum() > 29000
+
     # Test that shooting with 0.0 flux makes a zero-photons image.
     image4 = (obj*0).drawImage(method='phot')
     np.testing.assert_equal(image4.array, 0)
@@ -1555,6 +1569,329 @@ def test_direct_scale():
     assert_raises(ValueError, obj.drawPhot, im2, n_photons=-20)
     assert_raises(TypeError, obj.drawPhot, im2, sensor=5)
 
+@timer
+def test_drawImages():
+    """Test that drawImages matches drawing each profile separately with drawImage.
+    """
+    gal_list = [
+        galsim.Gaussian(sigma=1.7, flux=100.),
+        galsim.Exponential(half_light_radius=1.3, flux=20.).shear(g1=0.1, g2=-0.3),
+        galsim.Sersic(n=2.5, half_light_radius=1.1).shift(0.3,-0.2),
+        galsim.Moffat(beta=3.5, fwhm=2.2, flux=7.).dilate(1.2),
+        galsim.Gaussian(sigma=1.2) + galsim.Exponential(scale_radius=0.8),  # Not batched
+        galsim.Airy(lam_over_diam=0.6) * 3.,
+    ]
+    psf = galsim.Moffat(beta=2.5, fwhm=0.9)
+    conv_list = [galsim.Convolve(gal, psf) for gal in gal_list]  # Drawn with FFT
+
+    for method in ['no_pixel', 'real_space', 'auto', 'sb']:
+        for dtype in [np.float32, np.float64, np.int32]:
+            objs = gal_list if method in ['no_pixel', 'real_space'] else gal_list + conv_list
+            images1 = [obj.drawImage(nx=32, ny=28, scale=0.3, method=method, dtype=dtype,
+                                     offset=(0.1,0.3))
+                       for obj in objs]
+            images2 = galsim.drawImages(objs, nx=32, ny=28, scale=0.3, method=method,
+                                        dtype=dtype, offset=(0.1,0.3))
+            assert len(images2) == len(objs)
+            for im1, im2 in zip(images1, images2):
+                np.testing.assert_array_equal(im2.array, im1.array,
+                                              "drawImages differs for method %s"%method)
+                assert im2.bounds == im1.bounds
+                assert im2.wcs == im1.wcs
+                assert im2.dtype == dtype
+                np.testing.assert_equal(im2.added_flux, im1.added_flux)
+
+    # Existing images, including an automatically sized one and non-contiguous views.
+    images1 = [galsim.ImageF(40,40, scale=0.2),
+               galsim.ImageD(bounds=galsim.BoundsI(-3,20,5,30)),
+               galsim.ImageF(),
+               galsim.ImageD(50,50, scale=0.25)[galsim.BoundsI(5,30,10,40)],
+               galsim.ImageF(20,20),
+               galsim.ImageF(25,25, wcs=galsim.JacobianWCS(0.2,0.03,-0.02,0.21))]
+    images2 = [im.copy() for im in images1]
+    for im1, im2 in zip(images1, images2):
+        if im1.bounds.isDefined():
+            im1.fill(3.)
+            im2.fill(3.)
+    for add_to_image in [False, True]:
+        for obj, im1 in zip(gal_list, images1):
+            obj.drawImage(im1, method='no_pixel', gain=2.3, area=12., exptime=5.,
+                          use_true_center=False, add_to_image=add_to_image)
+        images3 = galsim.drawImages(gal_list, images2, method='no_pixel', gain=2.3, area=12.,
+                                    exptime=5., use_true_center=False, add_to_image=add_to_image)
+        for im1, im2, im3 in zip(images1, images2, images3):
+            assert im3 is im2
+            np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Check some invalid inputs
+    assert_raises(galsim.GalSimIncompatibleValuesError, galsim.drawImages, gal_list, images2[:2])
+    assert_raises(TypeError, galsim.drawImages, gal_list[:1], [images2[0].array])
+    assert_raises(galsim.GalSimValueError, galsim.drawImages, gal_list, method='phot')
+    assert_raises(galsim.GalSimRangeError, galsim.drawImages, gal_list, gain=0.)
+    assert_raises(galsim.GalSimRangeError, galsim.drawImages, gal_list, area=0.)
+    assert_raises(galsim.GalSimRangeError, galsim.drawImages, gal_list, exptime=0.)
+    assert galsim.drawImages([]) == []
+
+
+@timer
+def test_threads():
+    """Test drawing and photon shooting with multiple threads in the C++ layer.
+    """
+    from multiprocessing.pool import ThreadPool
+
+    assert galsim.utilities.get_num_threads() == 1
+
+    obj_list = [
+        galsim.Gaussian(sigma=2.3, flux=100.),
+        galsim.Sersic(n=3.1, half_light_radius=1.7).shear(g1=0.2, g2=0.1).shift(0.3,0.1),
+        galsim.Convolve(galsim.Exponential(scale_radius=1.3), galsim.Moffat(beta=3, fwhm=0.8)),
+        galsim.Kolmogorov(fwhm=0.9) + galsim.Airy(lam_over_diam=0.5, flux=0.3),
+        galsim.InterpolatedImage(galsim.Gaussian(sigma=3.).drawImage(nx=64, ny=64, scale=0.4)),
+    ]
+
+    def draw_all():
+        images = []
+        for obj in obj_list:
+            images.append(obj.drawImage(nx=150, ny=137, scale=0.2))
+            images.append(obj.drawImage(nx=150, ny=137, scale=0.2, method='no_pixel',
+                                        offset=(17.3, -3.2)))
+            images.append(obj.drawKImage(nx=130, ny=130, scale=0.1))
+            images.append(obj.drawImage(nx=150, ny=137, scale=0.2, method='phot',
+                                        n_photons=350000, rng=galsim.BaseDeviate(1234),
+                                        poisson_flux=False))
+        return images
+
+    images1 = draw_all()
+    try:
+        galsim.utilities.set_num_threads(2)
+        assert galsim.utilities.get_num_threads() == 2
+        images2 = draw_all()
+        galsim.utilities.set_num_threads(5)
+        assert galsim.utilities.get_num_threads() == 5
+        images5 = draw_all()
+
+        # Use Python threads to draw different objects at the same time.
+        pool = ThreadPool(3)
+        images_pool = pool.map(lambda obj: obj.drawImage(nx=150, ny=137, scale=0.2), obj_list)
+        pool.close()
+        pool.join()
+
+        galsim.utilities.set_num_threads(0)
+        assert galsim.utilities.get_num_threads() >= 1
+    finally:
+        galsim.utilities.set_num_threads(1)
+    assert galsim.utilities.get_num_threads() == 1
+
+    for k, (im1, im2, im5) in enumerate(zip(images1, images2, images5)):
+        # The results don't depend on the number of threads if it is > 1.
+        np.testing.assert_array_equal(im2.array, im5.array)
+        if k % 4 < 3:
+            # Drawing differs from the serial version only by rounding errors.  Both versions
+            # compute in double precision, so for the float32 images this is at most the final
+            # rounding to float32.
+            rtol = 1.e-10 if im1.dtype in (np.float64, np.complex128) else 1.e-6
+            np.testing.assert_allclose(im2.array, im1.array, rtol=rtol,
+                                       atol=rtol * np.max(np.abs(im1.array)))
+        else:
+            # Photon shooting is a different realization, but with the same total flux.
+            np.testing.assert_allclose(im2.array.sum(), im1.array.sum(), rtol=2.e-3)
+            assert not np.array_equal(im2.array, im1.array)
+    # InterpolatedImage is not thread safe, so it is always drawn serially.
+    for im1, im2 in zip(images1[-4:-1], images2[-4:-1]):
+        np.testing.assert_array_equal(im2.array, im1.array)
+    for im1, im2 in zip(images1[::4], images_pool):
+        np.testing.assert_allclose(im2.array, im1.array, rtol=1.e-6,
+                                   atol=1.e-6 * np.max(np.abs(im1.array)))
+
+
+@timer
+def test_threads_shared_profile():
+    """Test drawing and shooting the same profile from several Python threads at once.
+
+    The first draw builds lazily computed tables (e.g. the Sersic and Moffat Fourier tables and
+    the photon shooting samplers), which needs to work correctly when the GIL is released.
+    """
+    from multiprocessing.pool import ThreadPool
+
+    def make_objs():
+        # Use unusual parameters so these tables won't have been built by other tests.
+        return [
+            galsim.Sersic(n=2.317, half_light_radius=1.3, trunc=7.1),
+            galsim.Moffat(beta=2.713, fwhm=0.9, trunc=4.3),
+            galsim.Convolve(galsim.Sersic(n=1.931, half_light_radius=0.7),
+                            galsim.Moffat(beta=3.417, fwhm=0.8)),
+            galsim.Spergel(nu=-0.417, half_light_radius=1.1),
+            galsim.Airy(lam_over_diam=0.3, obscuration=0.217),
+        ]
+
+    def draw(obj, seed):
+        return [obj.drawImage(nx=64, ny=64, scale=0.2, method='no_pixel'),
+                obj.drawKImage(nx=64, ny=64, scale=0.1),
+                obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', n_photons=20000,
+                              rng=galsim.BaseDeviate(seed), poisson_flux=False)]
+
+    nthreads = 8
+    pool = ThreadPool(nthreads)
+    for obj in make_objs():
+        print(obj)
+        results = pool.map(lambda k: draw(obj, 1234), range(nthreads))
+        # Once the tables are built, drawing serially must give the same answer.
+        ref = draw(obj, 1234)
+        for images in results:
+            for im, ref_im in zip(images, ref):
+                np.testing.assert_array_equal(im.array, ref_im.array)
+    pool.close()
+    pool.join()
+
+
+@timer
+def test_fft_backend():
+    """Test the different FFT backends.
+    """
+    backends = ['fftw', 'numpy']
+    try:
+        import scipy.fft
+        backends.append('scipy')
+    except ImportError:
+        print('scipy.fft not available.  Skipping that backend.')
+
+    rng = galsim.UniformDeviate(1234)
+    xar = np.empty((256,192))
+    rng.generate(xar)
+    obj = galsim.Convolve(galsim.Exponential(half_light_radius=1.3),
+                          galsim.Box(width=0.1, height=0.2))
+    im0 = obj.drawImage(nx=64, ny=64, scale=0.2, method='no_pixel')
+    kim0 = im0.calculate_fft()
+    im20 = kim0.calculate_inverse_fft()
+
+    assert galsim.fft.get_backend() == 'fftw'
+    try:
+        for backend in backends:
+            for nthreads in [1, 3]:
+                print('backend = ',backend,'nthreads = ',nthreads)
+                galsim.fft.set_backend(backend, nthreads=nthreads)
+                assert galsim.fft.get_backend() == backend
+                if backend == 'numpy':
+                    assert galsim.fft.get_num_threads() == 1
+                else:
+                    assert galsim.fft.get_num_threads() == nthreads
+
+                for shift_in in [False, True]:
+                    for shift_out in [False, True]:
+                        kar1 = galsim.fft.fft2(xar, shift_in, shift_out)
+                        kar2 = np.fft.fft2(np.fft.fftshift(xar) if shift_in else xar)
+                        if shift_out: kar2 = np.fft.fftshift(kar2)
+                        np.testing.assert_allclose(kar1, kar2, atol=1.e-10)
+                        xar1 = galsim.fft.ifft2(kar1, shift_out, shift_in)
+                        np.testing.assert_allclose(xar1, xar, atol=1.e-12)
+                        cxar = galsim.fft.fft2(kar1, shift_out, shift_in)
+                        kar3 = np.fft.fft2(np.fft.fftshift(kar1) if shift_out else kar1)
+                        if shift_in: kar3 = np.fft.fftshift(kar3)
+                        np.testing.assert_allclose(cxar, kar3, atol=1.e-8)
+                        rkar = galsim.fft.rfft2(xar, shift_in, shift_out)
+                        np.testing.assert_allclose(rkar, kar1[:,:97] if not shift_out else
+                                                   np.fft.fftshift(kar2, axes=(1,))[:,:97],
+                                                   atol=1.e-10)
+                        xar2 = galsim.fft.irfft2(rkar, shift_out, shift_in)
+                        np.testing.assert_allclose(xar2, xar, atol=1.e-12)
+
+                # drawFFT and calculate_fft, inverse_fft use the backend too.  All backends
+                # compute in double precision, but im1 is float32, so it may differ from im0
+                # in the last bit.
+                im1 = obj.drawImage(nx=64, ny=64, scale=0.2, method='no_pixel')
+                atol = 1.e-6 * np.max(im0.array)
+                np.testing.assert_allclose(im1.array, im0.array, atol=atol)
+                kim1 = im1.calculate_fft()
+                np.testing.assert_allclose(kim1.array, kim0.array, atol=atol)
+                im2 = kim1.calculate_inverse_fft()
+                np.testing.assert_allclose(im2.array, im20.array, atol=atol)
+                # The double precision transforms are the same to rounding errors.
+                kim3 = galsim.ImageD(im0).calculate_fft()
+                np.testing.assert_allclose(kim3.array, kim0.array, atol=1.e-12)
+    finally:
+        galsim.fft.set_backend()
+
+    assert galsim.fft.get_backend() == 'fftw'
+    assert galsim.fft.get_num_threads() == galsim.utilities.get_num_threads()
+    galsim.fft.clear_plan_cache()
+    np.testing.assert_allclose(galsim.fft.fft2(xar), np.fft.fft2(xar), atol=1.e-10)
+    assert_raises(ValueError, galsim.fft.set_backend, 'invalid')
+
+
+@timer
+def test_value_arrays():
+    """Test xValue and kValue with arrays of positions.
+    """
+    gal = galsim.Gaussian(sigma=1.3, flux=17).shear(g1=0.2, g2=-0.1).shift(0.3, -0.2)
+    gal += galsim.Exponential(half_light_radius=0.8, flux=3)
+    psf = galsim.Moffat(beta=3, fwhm=0.9)
+    objs = [ gal,
+             galsim.Convolve(gal, galsim.Pixel(0.3), real_space=True),
+             galsim.Convolve(gal, psf),
+             galsim.DeltaFunction(flux=2),
+             galsim.InterpolatedImage(gal.drawImage(nx=32, ny=32, scale=0.3)),
+           ]
+
+    rng = np.random.RandomState(1234)
+    n = 10000
+    x = rng.uniform(-3, 3, n)
+    y = rng.uniform(-3, 3, n)
+    x[0] = y[0] = 0.   # Make sure the DeltaFunction has a non-zero value.
+    kx = rng.uniform(-5, 5, n)
+    ky = rng.uniform(-5, 5, n)
+    for nthreads in [1, 4]:
+        galsim.utilities.set_num_threads(nthreads)
+        try:
+            for obj in objs:
+                print(obj)
+                kval = obj.kValue(kx, ky)
+                assert kval.shape == (n,)
+                assert kval.dtype == np.complex128
+                for i in range(0, n, n//10):
+                    np.testing.assert_allclose(kval[i], obj.kValue(kx[i], ky[i]), rtol=1.e-5,
+                                               atol=1.e-12*obj.flux)
+                np.testing.assert_array_equal(obj.kValue(kx=kx, ky=ky), kval)
+
+                if not obj.is_analytic_x: continue
+                # Real-space convolution is slow, so only do a few points.
+                m = 20 if obj.__class__ is galsim.Convolution else n
+                xval = obj.xValue(x[:m], y[:m])
+                assert xval.shape == (m,)
+                for i in range(0, m, m//10):
+                    np.testing.assert_allclose(xval[i], obj.xValue(x[i], y[i]), rtol=1.e-5,
+                                               atol=1.e-12*obj.flux)
+                np.testing.assert_array_equal(obj.xValue(x=x[:m], y=y[:m]), xval)
+        finally:
+            galsim.utilities.set_num_threads(1)
+
+    # A fresh Sersic builds its Fourier table on the first kValue call.  Make sure that works
+    # when the first call is an array large enough to use multiple threads.
+    for n_sersic in [2.573, 3.129]:
+        sersic = galsim.Sersic(n=n_sersic, half_light_radius=0.9)
+        galsim.utilities.set_num_threads(4)
+        try:
+            kval = sersic.kValue(kx, ky)
+            xval = sersic.xValue(x, y)
+        finally:
+            galsim.utilities.set_num_threads(1)
+        for i in range(0, n, n//10):
+            np.testing.assert_allclose(kval[i], sersic.kValue(kx[i], ky[i]), rtol=1.e-10)
+            np.testing.assert_allclose(xval[i], sersic.xValue(x[i], y[i]), rtol=1.e-10)
+        np.testing.assert_array_equal(sersic.kValue(kx, ky), kval)
+
+    # Arrays are broadcast against each other, and the shape is preserved.
+    xx, yy = np.meshgrid(np.linspace(-1,1,7), np.linspace(-2,2,5))
+    np.testing.assert_array_equal(gal.xValue(xx, yy).ravel(), gal.xValue(xx.ravel(), yy.ravel()))
+    np.testing.assert_array_equal(gal.xValue(xx[0], 0.3), gal.xValue(xx[0], [0.3]*7))
+    assert gal.xValue(xx, yy).shape == (5,7)
+    assert gal.kValue(xx, 1.2).shape == (5,7)
+
+    # Objects that can't calculate xValue still raise an exception for arrays.
+    conv3 = galsim.Convolve(gal, psf, galsim.Pixel(0.3))
+    assert_raises(galsim.GalSimError, conv3.xValue, x[:3], y[:3])
+    assert_raises(galsim.GalSimError, galsim.Deconvolve(psf).xValue, x[:3], y[:3])
+
+
 if __name__ == "__main__":
     test_drawImage()
     test_draw_methods()
@@ -1568,3 +1905,8 @@ if __name__ == "__main__":
     test_shoot()
     test_types()
     test_direct_scale()
+    test_drawImages()
+    test_threads()
+    test_threads_shared_profile()
+    test_fft_backend()
+    test_value_arrays()
@@ -1516,6 +1516,114 @@ def test_constant():
     np.testing.assert_allclose(k_a, k_b, rtol=1.e-10)
 
 
+@timer
+def test_getshear_array():
+    """Test that getShear, etc. on large arrays of positions match the single-position values"""
+    ps = galsim.PowerSpectrum(e_power_function=pk2, b_power_function=pk1)
+    ngrid = 40
+    grid_spacing = 3.
+    ps.buildGrid(grid_spacing=grid_spacing, ngrid=ngrid, rng=galsim.BaseDeviate(1234),
+                 center=galsim.PositionD(10,-20))
+    b = ps.bounds
+    rng = np.random.RandomState(1234)
+    n = 100000
+    # Include some points outside the grid.
+    x = rng.uniform(b.xmin-20, b.xmax+20, n)
+    y = rng.uniform(b.ymin-20, b.ymax+20, n)
+    outside = (x < b.xmin) | (x > b.xmax) | (y < b.ymin) | (y > b.ymax)
+    assert np.any(outside)
+
+    # Compare to an explicit InterpolatedImage calculation at a few points.
+    g1, g2, mu = galsim.lensing_ps.theoryToObserved(ps.im_g1.array, ps.im_g2.array,
+                                                    ps.im_kappa.array)
+    # This is how getShear used to do the interpolation for each position.
+    ii_g1 = galsim._InterpolatedImage(galsim.ImageD(g1, scale=grid_spacing), galsim.Lanczos(5),
+                                      galsim.Quintic()) * grid_spacing**2
+    ii_kappa = galsim._InterpolatedImage(ps.im_kappa, galsim.Lanczos(5),
+                                         galsim.Quintic()) * grid_spacing**2
+
+    with assert_warns(galsim.GalSimWarning):
+        g1_arr, g2_arr = ps.getShear((x,y))
+    with assert_warns(galsim.GalSimWarning):
+        kappa_arr = ps.getConvergence((x,y))
+    with assert_warns(galsim.GalSimWarning):
+        mu_arr = ps.getMagnification((x,y))
+    with assert_warns(galsim.GalSimWarning):
+        g1_l, g2_l, mu_l = ps.getLensing((x,y))
+    assert g1_arr.shape == (n,)
+    np.testing.assert_array_equal(g1_arr[outside], 0.)
+    np.testing.assert_array_equal(g2_arr[outside], 0.)
+    np.testing.assert_array_equal(kappa_arr[outside], 0.)
+    np.testing.assert_array_equal(mu_arr[outside], 1.)
+    np.testing.assert_array_equal(g1_l, g1_arr)
+    np.testing.assert_array_equal(g2_l, g2_arr)
+    np.testing.assert_array_equal(mu_l, mu_arr)
+
+    for i in range(0, n, n//20):
+        if outside[i]: continue
+        pos = galsim.PositionD(x[i],y[i])
+        np.testing.assert_almost_equal(g1_arr[i], ii_g1.xValue(pos-ps.center), decimal=12)
+        np.testing.assert_almost_equal(kappa_arr[i], ii_kappa.xValue(pos-ps.center), decimal=12)
+        np.testing.assert_almost_equal(ps.getShear(pos), (g1_arr[i], g2_arr[i]), decimal=12)
+        np.testing.assert_almost_equal(ps.getConvergence((x[i],y[i])), kappa_arr[i], decimal=12)
+        np.testing.assert_almost_equal(ps.getMagnification(pos), mu_arr[i], decimal=12)
+        np.testing.assert_almost_equal(ps.getLensing(pos), (g1_l[i], g2_l[i], mu_l[i]),
+                                       decimal=12)
+
+    # The shape of the input arrays is preserved.
+    g1_2d, g2_2d = ps.getShear((x[:1000].reshape(20,50), y[:1000].reshape(20,50)),
+                               reduced=False)
+    assert g1_2d.shape == (20,50)
+    np.testing.assert_array_equal(g1_2d.ravel(), ps.getShear((x[:1000],y[:1000]), reduced=False)[0])
+
+    # Periodic wrapping of the whole array matches wrapping each point by hand.
+    g1_p, g2_p = ps.getShear((x,y), periodic=True)
+    dx = b.xmax - b.xmin
+    dy = b.ymax - b.ymin
+    xw = np.where(outside, (x-b.xmin) % dx + b.xmin, x)
+    yw = np.where(outside, (y-b.ymin) % dy + b.ymin, y)
+    g1_w, g2_w = ps.getShear((xw,yw), periodic=True)
+    np.testing.assert_array_equal(g1_p, g1_w)
+    np.testing.assert_array_equal(g2_p, g2_w)
+    # Away from the edges, the periodic and non-periodic interpolations use the same grid
+    # values.  Within the Lanczos(5) support (5 grid spacings) of an edge, the periodic version
+    # includes wrapped values from the other side of the grid, so it differs there.
+    support = 5 * grid_spacing
+    interior = ((x > b.xmin + support) & (x < b.xmax - support) &
+                (y > b.ymin + support) & (y < b.ymax - support))
+    assert np.any(interior)
+    np.testing.assert_allclose(g1_p[interior], g1_arr[interior], rtol=1.e-10, atol=1.e-12)
+    np.testing.assert_allclose(g2_p[interior], g2_arr[interior], rtol=1.e-10, atol=1.e-12)
+
+    # The interpolators are cached, but remade after a new buildGrid or after pickling.
+    assert len(ps._interp_cache) > 0
+    # The cached interpolators keep their interpolants alive, so they still work after
+    # any temporary objects have been garbage collected.
+    import gc
+    gc.collect()
+    np.testing.assert_array_equal(ps.getShear((x,y), periodic=True), (g1_p, g2_p))
+    np.testing.assert_array_equal(ps.getConvergence((x[~outside],y[~outside])),
+                                  kappa_arr[~outside])
+    ps2 = galsim.PowerSpectrum(e_power_function=pk2, b_power_function=pk1)
+    ps2.buildGrid(grid_spacing=grid_spacing, ngrid=ngrid, rng=galsim.BaseDeviate(1234),
+                  center=galsim.PositionD(10,-20))
+    try:
+        import cPickle as pickle
+    except ImportError:
+        import pickle
+    ps3 = pickle.loads(pickle.dumps(ps))
+    assert len(ps3._interp_cache) == 0
+    np.testing.assert_array_equal(ps3.getShear((x[~outside],y[~outside])),
+                                  ps2.getShear((x[~outside],y[~outside])))
+    np.testing.assert_array_equal(ps3.getShear((x[~outside],y[~outside])),
+                                  (g1_arr[~outside], g2_arr[~outside]))
+    ps.buildGrid(grid_spacing=grid_spacing, ngrid=ngrid, rng=galsim.BaseDeviate(5678),
+                 center=galsim.PositionD(10,-20))
+    assert len(ps._interp_cache) == 0
+    assert not np.array_equal(ps.getConvergence((x[~outside],y[~outside])),
+                              kappa_arr[~outside])
+
+
 if __name__ == "__main__":
     test_nfwhalo()
     test_halo_pos()
@@ -1535,3 +1643,4 @@ if __name__ == "__main__":
     test_psr()
     test_normalization()
     test_constant()
+    test_getshear_array()
@@ -421,6 +421,137 @@ def test_phase_psf_batch():
             "Individually generated AtmosphericPSF differs from AtmosphericPSF generated in batch")
 
 
+@timer
+def test_phase_psf_batch_thetas():
+    """Test the batched wavefront evaluation over many thetas."""
+    rng = galsim.BaseDeviate(5432)
+    atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0, 10.0], r0_500=0.2,
+                            speed=[3.0, 5.0, 8.0], direction=[0*galsim.degrees, 40*galsim.degrees,
+                                                              100*galsim.degrees],
+                            rng=rng)
+    atm.append(galsim.OpticalScreen(diam=1.0, defocus=0.3, coma1=0.2))
+    aper = galsim.Aperture(diam=1.0, lam=700.0, screen_list=atm)
+    thetas = [(x*galsim.arcmin, y*galsim.arcmin) for x in [-3, 0, 2] for y in [-1, 0, 4]]
+
+    # The batched wavefront is identical to doing each theta separately.
+    u = aper.u[aper.illuminated]
+    v = aper.v[aper.illuminated]
+    atm.instantiate()
+    for t in [0.0, 0.3]:
+        atm._seek(t)
+        wf = atm._wavefront_batch(u, v, None, thetas)
+        assert wf.shape == (len(thetas), len(u))
+        for theta, wf1 in zip(thetas, wf):
+            np.testing.assert_array_equal(wf1, atm._wavefront(u, v, None, theta))
+    atm._reset()
+
+    # PSFs built together, including some with different wavelengths or apertures, which
+    # are batched separately, match the ones built one at a time.
+    exptime = 0.05
+    aper2 = galsim.Aperture(diam=1.0, lam=700.0, screen_list=atm, obscuration=0.3)
+    kwargs = [dict(lam=700.0, aper=aper), dict(lam=500.0, diam=1.0),
+              dict(lam=700.0, aper=aper2), dict(lam=700.0, diam=1.0)]
+    psfs = [atm.makePSF(theta=th, exptime=exptime, **kwargs[i%4])
+            for i, th in enumerate(thetas)]
+    imgs = [psf.drawImage(nx=32, ny=32, scale=0.05) for psf in psfs]
+    for i, th in enumerate(thetas):
+        psf = atm.makePSF(theta=th, exptime=exptime, **kwargs[i%4])
+        img = psf.drawImage(nx=32, ny=32, scale=0.05)
+        np.testing.assert_array_equal(img.array, imgs[i].array)
+
+
+@timer
+def test_disk_cache():
+    """Test saving and loading PhaseScreenPSFs from a disk cache."""
+    cache_dir = os.path.join('output', 'psf_cache')
+    cache = galsim.disk_cache.DiskCache(cache_dir)
+    cache.clear()
+    assert len(cache) == 0
+    assert_raises(ValueError, galsim.disk_cache.DiskCache, cache_dir, max_size=0)
+
+    # Basic functionality of DiskCache
+    key = cache.key('test', 1.2, np.arange(5))
+    assert key == cache.key('test', 1.2, np.arange(5))
+    assert key != cache.key('test', 1.2, np.arange(6))
+    assert key != cache.key('tes', 't', 1.2, np.arange(5))
+    assert cache.load(key) is None
+    cache.save(key, a=np.arange(5), b=np.array(3.))
+    arrays = cache.load(key)
+    np.testing.assert_array_equal(arrays['a'], np.arange(5))
+    assert arrays['b'] == 3.
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    do_pickle(cache)
+
+    def make_atm():
+        atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], r0_500=0.2,
+                                speed=[3.0, 5.0], rng=galsim.BaseDeviate(1234))
+        atm.append(galsim.OpticalScreen(diam=1.0, defocus=0.3))
+        return atm
+    kwargs = dict(lam=700.0, diam=1.0, exptime=0.05)
+    theta = (0.3*galsim.arcmin, -0.2*galsim.arcmin)
+
+    # Without a cache, the reference PSFs.
+    assert galsim.phase_psf.get_disk_cache() is None
+    psf0 = make_atm().makePSF(theta=theta, **kwargs)
+    im0 = psf0.drawImage(nx=32, ny=32, scale=0.05)
+
+    galsim.phase_psf.set_disk_cache(cache_dir)
+    try:
+        assert galsim.phase_psf.get_disk_cache() == cache
+        # The first time, the PSF is calculated and saved.
+        psf1 = make_atm().makePSF(theta=theta, **kwargs)
+        im1 = psf1.drawImage(nx=32, ny=32, scale=0.05)
+        np.testing.assert_array_equal(im1.array, im0.array)
+        assert not hasattr(psf1, '_cached_stepk')
+        assert len(cache) == 1
+
+        # The second time, it is loaded from the cache, with the same stepk and maxk.
+        atm = make_atm()
+        psf2 = atm.makePSF(theta=theta, **kwargs)
+        im2 = psf2.drawImage(nx=32, ny=32, scale=0.05)
+        assert hasattr(psf2, '_cached_stepk')
+        np.testing.assert_array_equal(im2.array, im0.array)
+        assert psf2.stepk == psf0.stepk
+        assert psf2.maxk == psf0.maxk
+        assert len(cache) == 1
+
+        # Anything that changes the PSF gives a different entry.
+        psf3 = make_atm().makePSF(theta=(theta[0], 0.*galsim.arcmin), **kwargs)
+        psf4 = make_atm().makePSF(theta=theta, time_step=0.01, **kwargs)
+        psf5 = make_atm().makePSF(theta=theta, lam=500.0, diam=1.0, exptime=0.05)
+        psf6 = psf1.withGSParams(galsim.GSParams(folding_threshold=1.e-3))
+        for psf in [psf3, psf4, psf5]:
+            psf.drawImage(nx=32, ny=32, scale=0.05)
+            assert not hasattr(psf, '_cached_stepk')
+        assert psf6._disk_cache_key() != psf1._disk_cache_key()
+        assert len(cache) == 4
+
+        # OpticalPSF uses the cache too.
+        opt1 = galsim.OpticalPSF(lam=700.0, diam=1.0, defocus=0.2, coma1=0.3, nstruts=4)
+        im_opt1 = opt1.drawImage(nx=32, ny=32, scale=0.05)
+        opt2 = galsim.OpticalPSF(lam=700.0, diam=1.0, defocus=0.2, coma1=0.3, nstruts=4)
+        im_opt2 = opt2.drawImage(nx=32, ny=32, scale=0.05)
+        assert hasattr(opt2._psf, '_cached_stepk')
+        np.testing.assert_array_equal(im_opt2.array, im_opt1.array)
+        assert len(cache) == 5
+
+        # When the cache is full, the least recently used entries are removed.
+        max_size = int(1.5 * max(entry[1] for entry in cache._entries()))
+        galsim.phase_psf.set_disk_cache(cache_dir, max_size=max_size)
+        psf7 = make_atm().makePSF(theta=(theta[1], theta[0]), **kwargs)
+        psf7.drawImage(nx=32, ny=32, scale=0.05)
+        small_cache = galsim.phase_psf.get_disk_cache()
+        assert len(small_cache) < 6
+        assert small_cache.size <= max_size
+        assert small_cache.load(psf7._disk_cache_key()) is not None
+        assert small_cache.load(psf1._disk_cache_key()) is None
+    finally:
+        galsim.phase_psf.set_disk_cache(None)
+        cache.clear()
+
+
 @timer
 def test_opt_indiv_aberrations():
     """Test that aberrations specified by name match those specified in `aberrations` list."""
@@ -993,6 +1124,8 @@ if __name__ == "__main__":
     test_frozen_flow()
     test_phase_psf_reset()
     test_phase_psf_batch()
+    test_phase_psf_batch_thetas()
+    test_disk_cache()
     test_opt_indiv_aberrations()
     test_scale_unit()
     test_stepk_maxk()
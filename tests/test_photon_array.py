@@ -405,6 +405,101 @@ def test_photon_io():
     np.testing.assert_array_equal(photons2.dydz, photons.dydz)
     np.testing.assert_array_equal(photons2.wavelength, photons.wavelength)
 
+    # float32 photons are written as single precision, and read back that way.
+    photons32 = galsim.PhotonArray(nphotons, x=photons.x, y=photons.y, flux=photons.flux,
+                                   dxdz=photons.dxdz, dydz=photons.dydz,
+                                   wavelength=photons.wavelength, dtype=np.float32)
+    file_name = 'output/photons3.dat'
+    photons32.write(file_name)
+    photons3 = galsim.PhotonArray.read(file_name)
+    assert photons3.dtype == np.float32
+    assert photons3 == photons32
+
+@timer
+def test_photon_float32():
+    """Test PhotonArrays that use float32 arrays.
+    """
+    nphotons = 1000
+
+    pa = galsim.PhotonArray(nphotons, dtype=np.float32)
+    assert pa.dtype == np.float32
+    assert pa.x.dtype == pa.y.dtype == pa.flux.dtype == np.float32
+    assert pa.dxdz.dtype == pa.dydz.dtype == pa.wavelength.dtype == np.float32
+    assert galsim.PhotonArray(nphotons).dtype == np.float64
+    assert_raises(ValueError, galsim.PhotonArray, nphotons, dtype=np.int32)
+    assert_raises(TypeError, galsim.PhotonArray, nphotons, dtype='invalid')
+
+    # Shooting gives the same photons as for float64, up to float32 precision.
+    # Check a C++ profile, and ones that are shot in Python (which use temporary arrays).
+    gsobj = galsim.Exponential(flux=1.7, scale_radius=2.3)
+    for obj in [ gsobj,
+                 galsim.Convolve(gsobj, galsim.Gaussian(sigma=0.7)),
+                 gsobj + galsim.Gaussian(sigma=0.7, flux=2.3),
+                 gsobj.shear(g1=0.2, g2=0.1).shift(0.3,0.1) ]:
+        pa64 = obj.shoot(nphotons, galsim.BaseDeviate(1234))
+        pa32 = obj.shoot(nphotons, galsim.BaseDeviate(1234), dtype=np.float32)
+        assert pa64.dtype == np.float64
+        assert pa32.dtype == np.float32
+        assert pa32.isCorrelated() == pa64.isCorrelated()
+        np.testing.assert_allclose(pa32.x, pa64.x, rtol=1.e-5, atol=1.e-5)
+        np.testing.assert_allclose(pa32.y, pa64.y, rtol=1.e-5, atol=1.e-5)
+        np.testing.assert_allclose(pa32.flux, pa64.flux, rtol=1.e-5)
+        do_pickle(pa32)
+
+        # With the same (float32-representable) values, addTo gives the same image.
+        pa64 = galsim.PhotonArray(nphotons, x=pa32.x, y=pa32.y, flux=pa32.flux)
+        im32 = galsim.ImageD(32,32, xmin=-16, ymin=-16)
+        im64 = galsim.ImageD(32,32, xmin=-16, ymin=-16)
+        np.testing.assert_almost_equal(pa32.addTo(im32), pa64.addTo(im64), decimal=12)
+        np.testing.assert_array_equal(im32.array, im64.array)
+
+    # Operations that mix float32 and float64 arrays.
+    pa1 = gsobj.shoot(nphotons, galsim.BaseDeviate(1234), dtype=np.float32)
+    pa2 = gsobj.shoot(nphotons, galsim.BaseDeviate(5678))
+    pa3 = galsim.PhotonArray(nphotons, x=pa1.x, y=pa1.y, flux=pa1.flux)
+    pa1.convolve(pa2)
+    pa3.convolve(pa2)
+    assert pa1.dtype == np.float32
+    np.testing.assert_allclose(pa1.x, pa3.x, rtol=1.e-6, atol=1.e-6)
+    np.testing.assert_allclose(pa1.y, pa3.y, rtol=1.e-6, atol=1.e-6)
+    np.testing.assert_allclose(pa1.flux, pa3.flux, rtol=1.e-6)
+
+    pa2.wavelength = 500.
+    pa4 = galsim.PhotonArray(2*nphotons, dtype=np.float32)
+    pa4.assignAt(0, pa2)
+    pa4.assignAt(nphotons, pa1)
+    np.testing.assert_allclose(pa4.x[:nphotons], pa2.x, rtol=1.e-6)
+    np.testing.assert_array_equal(pa4.x[nphotons:], pa1.x)
+    np.testing.assert_array_equal(pa4.wavelength[:nphotons], 500.)
+
+    tens = galsim.Image(4,4,init_value=8)
+    photons = galsim.PhotonArray.makeFromImage(tens, max_flux=5., dtype=np.float32)
+    assert photons.dtype == np.float32
+    assert len(photons) == 32
+    np.testing.assert_almost_equal(photons.flux, 4.)
+
+    # drawImage can use float32 photons throughout, including surface ops and sensor.
+    sed = galsim.SED(os.path.join(sedpath, 'CWW_E_ext.sed'), 'nm', 'flambda').thin()
+    bandpass = galsim.Bandpass(os.path.join(bppath, 'LSST_r.dat'), 'nm').thin()
+    obj = galsim.Gaussian(flux=20000, sigma=0.3)
+    images = []
+    for dtype in [np.float64, np.float32]:
+        rng = galsim.BaseDeviate(1234)
+        ops = [ galsim.WavelengthSampler(sed, bandpass, rng),
+                galsim.FRatioAngles(1.3, 0.3, rng) ]
+        sensor = galsim.SiliconSensor(rng=galsim.BaseDeviate(5678))
+        im = obj.drawImage(nx=24, ny=24, scale=0.3, method='phot', rng=rng, sensor=sensor,
+                           surface_ops=ops, save_photons=True, photon_dtype=dtype)
+        assert im.photons.dtype == dtype
+        assert im.photons.wavelength.dtype == dtype
+        assert im.photons.dxdz.dtype == dtype
+        images.append(im)
+    mom64 = galsim.utilities.unweighted_moments(images[0])
+    mom32 = galsim.utilities.unweighted_moments(images[1])
+    np.testing.assert_almost_equal(images[1].array.sum(), images[0].array.sum(), decimal=0)
+    np.testing.assert_almost_equal(mom32['Mx'], mom64['Mx'], decimal=3)
+    np.testing.assert_almost_equal(mom32['Mxx'], mom64['Mxx'], decimal=3)
+
 @timer
 def test_dcr():
     """Test the dcr surface op
@@ -804,6 +899,7 @@ if __name__ == '__main__':
     test_wavelength_sampler()
     test_photon_angles()
     test_photon_io()
+    test_photon_float32()
     test_dcr()
     if not no_astroplan:
         test_dcr_angles()
@@ -878,6 +878,143 @@ def test_crg_noise_pad():
     np.testing.assert_allclose(obj.noise.getVariance(), edgevar, atol=0, rtol=0.3)
 
 
+@timer
+def test_stamp_store():
+    """Test RealGalaxyCatalog with a memory-mapped stamp store"""
+    import shutil
+    stamp_dir = os.path.join('output', 'rgc_stamps')
+    if os.path.isdir(stamp_dir):
+        shutil.rmtree(stamp_dir)
+
+    for file_name in [catalog_file, 'AEGIS_F606w_catalog.fits']:
+        rgc = galsim.RealGalaxyCatalog(file_name, dir=image_dir)
+        rgc_mm = galsim.RealGalaxyCatalog(file_name, dir=image_dir, stamp_dir=stamp_dir)
+        assert rgc_mm == rgc
+        for i in range(len(rgc)):
+            gal = rgc.getGalImage(i)
+            gal_mm = rgc_mm.getGalImage(i)
+            np.testing.assert_array_equal(gal_mm.array, gal.array)
+            assert gal_mm.array.dtype == np.float64
+            assert gal_mm.scale == gal.scale
+            np.testing.assert_array_equal(rgc_mm.getPSFImage(i).array, rgc.getPSFImage(i).array)
+        assert len(rgc_mm.loaded_files) == 0
+        with assert_raises(IndexError):
+            rgc_mm.getGalImage(len(rgc))
+        with assert_raises(IndexError):
+            rgc_mm.getPSFImage(len(rgc))
+
+        # A second catalog uses the existing store rather than making it again.
+        files = sorted(os.listdir(stamp_dir))
+        mtimes = [os.path.getmtime(os.path.join(stamp_dir, f)) for f in files]
+        rgc_mm2 = galsim.RealGalaxyCatalog(file_name, dir=image_dir, stamp_dir=stamp_dir,
+                                           preload=True)
+        assert sorted(os.listdir(stamp_dir)) == files
+        assert [os.path.getmtime(os.path.join(stamp_dir, f)) for f in files] == mtimes
+        assert len(rgc_mm2._stamp_arrays) == len(rgc_mm2._stamp_files)
+        np.testing.assert_array_equal(rgc_mm2.getGalImage(0).array, rgc.getGalImage(0).array)
+
+        # The memory maps aren't pickled, but are reopened as needed.
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        rgc_mm4 = pickle.loads(pickle.dumps(rgc_mm2))
+        assert len(rgc_mm4._stamp_arrays) == 0
+        np.testing.assert_array_equal(rgc_mm4.getPSFImage(1).array, rgc.getPSFImage(1).array)
+
+        # RealGalaxy objects made from either catalog are identical.
+        rg = galsim.RealGalaxy(rgc, index=1)
+        galsim.real.clear_deconvolved_cache()  # Make sure rg_mm builds its own profiles.
+        rg_mm = galsim.RealGalaxy(rgc_mm4, index=1)
+        np.testing.assert_array_equal(rg_mm.drawImage(nx=32, ny=32, scale=0.1).array,
+                                      rg.drawImage(nx=32, ny=32, scale=0.1).array)
+
+
+@timer
+def test_deconvolved_cache():
+    """Test the cache of deconvolved profiles shared by RealGalaxy objects"""
+    rgc = galsim.RealGalaxyCatalog(catalog_file, dir=image_dir)
+    psf = galsim.Gaussian(fwhm=0.3)
+    im_ref = []
+    for index in [0, 1]:
+        galsim.real.clear_deconvolved_cache()
+        rg = galsim.RealGalaxy(rgc, index=index, flux=10)
+        # Making the RealGalaxy doesn't make the deconvolution until it is needed.
+        assert '_psf_inv' not in rg.__dict__
+        final = galsim.Convolve(rg.shear(g1=0.1, g2=0.2), psf)
+        im_ref.append(final.drawImage(nx=40, ny=40, scale=0.05))
+        # Convolve draws a copy of rg with its own gsparams, so check that one.
+        assert '_psf_inv' in final.obj_list[0].original.__dict__
+    galsim.real.clear_deconvolved_cache()
+    stats = galsim.real.get_deconvolved_cache_stats()
+    assert stats['hits'] == stats['misses'] == stats['size'] == 0
+
+    rg_list = []
+    for k in range(3):
+        for index in [0, 1]:
+            rg = galsim.RealGalaxy(rgc, index=index, flux=10)
+            final = galsim.Convolve(rg.shear(g1=0.1, g2=0.2), psf)
+            im = final.drawImage(nx=40, ny=40, scale=0.05)
+            np.testing.assert_array_equal(im.array, im_ref[index].array)
+            rg_list.append(rg)
+    stats = galsim.real.get_deconvolved_cache_stats()
+    print('stats = ',stats)
+    assert stats['hits'] == 4
+    assert stats['misses'] == 2
+    assert stats['size'] == 2
+    assert stats['maxsize'] == 10
+    np.testing.assert_almost_equal(stats['hit_rate'], 4./6.)
+
+    # Later objects share the profiles of the first ones.
+    assert rg_list[2].original_gal is rg_list[0].original_gal
+    assert rg_list[2]._psf_inv.orig_obj is rg_list[0]._psf_inv.orig_obj
+    assert rg_list[3].original_psf is rg_list[1].original_psf
+    assert rg_list[2] == rg_list[0]
+    # But the noise is not shared.
+    assert rg_list[2].noise.rng is not rg_list[0].noise.rng
+
+    # Different parameters are different entries.
+    rg = galsim.RealGalaxy(rgc, index=0, x_interpolant='linear')
+    assert rg.original_gal is not rg_list[0].original_gal
+    rg = galsim.RealGalaxy(rgc, index=0, gsparams=galsim.GSParams(folding_threshold=1.e-3))
+    assert rg.original_gal is not rg_list[0].original_gal
+    assert galsim.real.get_deconvolved_cache_stats()['size'] == 4
+
+    # Noise padded galaxies are never cached.
+    rg = galsim.RealGalaxy(rgc, index=0, noise_pad_size=4, rng=galsim.BaseDeviate(1234))
+    assert rg.original_gal is not rg_list[0].original_gal
+    assert galsim.real.get_deconvolved_cache_stats()['size'] == 4
+
+    # Shrinking the cache removes the least recently used entries.
+    galsim.real.set_deconvolved_cache_size(1)
+    stats = galsim.real.get_deconvolved_cache_stats()
+    assert stats['size'] == 1
+    assert stats['evictions'] == 3
+    assert_raises(ValueError, galsim.real.set_deconvolved_cache_size, -1)
+    assert_raises(ValueError, galsim.real.set_deconvolved_cache_size, 0)
+
+    galsim.real.clear_deconvolved_cache()
+    stats = galsim.real.get_deconvolved_cache_stats()
+    assert stats['hits'] == stats['misses'] == stats['size'] == stats['evictions'] == 0
+    assert stats['hit_rate'] == 0.
+    galsim.real.set_deconvolved_cache_size(10)
+
+    # The cache doesn't keep the catalogs alive.
+    import gc
+    import weakref
+    rgc2 = galsim.RealGalaxyCatalog(catalog_file, dir=image_dir)
+    rgc2_ref = weakref.ref(rgc2)
+    rg = galsim.RealGalaxy(rgc2, index=0)
+    assert galsim.real.get_deconvolved_cache_stats()['size'] == 1
+    del rg, rgc2
+    gc.collect()
+    assert rgc2_ref() is None
+    # And a new catalog doesn't use the entry of the old one.
+    rg = galsim.RealGalaxy(galsim.RealGalaxyCatalog(catalog_file, dir=image_dir), index=0)
+    assert galsim.real.get_deconvolved_cache_stats()['misses'] == 2
+    galsim.real.clear_deconvolved_cache()
+
+
 if __name__ == "__main__":
     test_real_galaxy_catalog()
     test_real_galaxy_ideal()
@@ -892,3 +1029,5 @@ if __name__ == "__main__":
     test_crg_noise_draw_transform_commutativity()
     test_crg_noise()
     test_crg_noise_pad()
+    test_stamp_store()
+    test_deconvolved_cache()
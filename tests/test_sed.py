@@ -662,6 +662,111 @@ def test_redshift_calculateFlux():
         np.testing.assert_almost_equal(f, 7./3. * 500 / (1.+z)**2)
 
 
+@timer
+def test_calculateFluxes():
+    """Check the vectorized flux and magnitude calculations for many redshifts.
+    """
+    # All analytic has easy to check answers
+    sed = galsim.SED('(wave/500)**2', wave_type='nm', flux_type='fphotons')
+    bp = galsim.Bandpass('1', blue_limit=500, red_limit=1000, wave_type='nm')
+    galsim.sed.clear_flux_table_cache()
+    assert galsim.sed.get_flux_table_cache_stats()['size'] == 0
+    z = np.linspace(0, 3, 101)
+    flux = galsim.sed.calculateFluxes(sed, bp, z)
+    assert flux.shape == z.shape
+    np.testing.assert_allclose(flux, 7./3. * 500 / (1.+z)**2, rtol=1.e-7)
+    # Negative redshifts are allowed too.
+    np.testing.assert_allclose(galsim.sed.calculateFluxes(sed, bp, -0.1), 7./3. * 500 / 0.9**2,
+                               rtol=1.e-7)
+    stats = galsim.sed.get_flux_table_cache_stats()
+    assert stats['size'] == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+    # A population of galaxies using a few templates.
+    templates = [ galsim.SED(os.path.join(sedpath, name), wave_type='ang', flux_type='flambda')
+                  for name in ['CWW_E_ext.sed', 'CWW_Sbc_ext.sed', 'CWW_Im_ext.sed'] ]
+    templates = [ t.withFluxDensity(1.0, 500).thin() for t in templates ]
+    rband = galsim.Bandpass(os.path.join(bppath, 'LSST_r.dat'), 'nm').thin().withZeropoint('AB')
+    rng = np.random.RandomState(1234)
+    ngal = 1000
+    redshift = rng.uniform(0., 2., ngal)
+    index = rng.randint(0, len(templates), ngal)
+    flux = galsim.sed.calculateFluxes(templates, rband, redshift, index=index)
+    mag = galsim.sed.calculateMagnitudes(templates, rband, redshift, index=index)
+    assert flux.shape == mag.shape == (ngal,)
+    assert galsim.sed.get_flux_table_cache_stats()['size'] == 4
+    for i in range(20):
+        sed = templates[index[i]].atRedshift(redshift[i])
+        np.testing.assert_allclose(flux[i], sed.calculateFlux(rband), rtol=1.e-4)
+        np.testing.assert_allclose(mag[i], sed.calculateMagnitude(rband), atol=1.e-4)
+        # This is how to use it to normalize the SEDs.
+        norm_sed = sed * 10**(-0.4*(24. - mag[i]))
+        np.testing.assert_allclose(norm_sed.calculateMagnitude(rband), 24., atol=1.e-4)
+
+    # Larger redshifts extend the existing tables.
+    flux3 = galsim.sed.calculateFluxes(templates[0], rband, 2.5)
+    np.testing.assert_allclose(flux3, templates[0].atRedshift(2.5).calculateFlux(rband),
+                               rtol=1.e-4)
+    assert galsim.sed.get_flux_table_cache_stats()['size'] == 4
+    table = galsim.sed._flux_tables(templates[0], rband)
+    assert table.x_min < np.log1p(np.min(redshift[index==0]))
+    assert table.x_max > np.log(3.5)
+    assert len(table._tables) == 2
+    # The extension doesn't change the fluxes at the redshifts that were already covered.
+    np.testing.assert_array_equal(
+            galsim.sed.calculateFluxes(templates, rband, redshift, index=index), flux)
+
+    # An SED that only covers the bandpass for some range of redshifts.  Here 1.25 <= z <= 6.
+    uv_sed = galsim.SED(galsim.LookupTable([100, 150, 200, 300, 400], [1, 3, 2, 2.5, 1],
+                                           interpolant='linear'),
+                        wave_type='nm', flux_type='fphotons')
+    nir = galsim.Bandpass('1', blue_limit=700, red_limit=900, wave_type='nm')
+    uv_z = np.concatenate([rng.uniform(1.5, 2.5, 100), [1.25, 6.]])
+    uv_flux = galsim.sed.calculateFluxes(uv_sed, nir, uv_z)
+    for i in range(0, len(uv_z), 10):
+        np.testing.assert_allclose(uv_flux[i], uv_sed.atRedshift(uv_z[i]).calculateFlux(nir),
+                                   rtol=1.e-4)
+    np.testing.assert_allclose(uv_flux[-2:], [uv_sed.atRedshift(z).calculateFlux(nir)
+                                              for z in uv_z[-2:]], rtol=1.e-6)
+    table = galsim.sed._flux_tables(uv_sed, nir)
+    np.testing.assert_allclose(table.x_min, np.log(2.25))
+    np.testing.assert_allclose(table.x_max, np.log(7.))
+    assert_raises(galsim.GalSimRangeError, uv_sed.atRedshift(1.).calculateFlux, nir)
+    assert_raises(galsim.GalSimRangeError, galsim.sed.calculateFluxes, uv_sed, nir, [1., 2.])
+    assert_raises(galsim.GalSimRangeError, galsim.sed.calculateFluxes, uv_sed, nir, [2., 6.1])
+
+    # Check the cache size functions.
+    galsim.sed.set_flux_table_cache_size(2)
+    stats = galsim.sed.get_flux_table_cache_stats()
+    assert stats['size'] == 2
+    assert stats['maxsize'] == 2
+    assert stats['evictions'] == 3
+    assert (templates[2], rband) in galsim.sed._flux_tables.cache
+    galsim.sed.clear_flux_table_cache()
+    stats = galsim.sed.get_flux_table_cache_stats()
+    assert stats['size'] == stats['hits'] == stats['misses'] == stats['evictions'] == 0
+    np.testing.assert_array_equal(
+            galsim.sed.calculateFluxes(templates, rband, redshift, index=index), flux)
+    assert galsim.sed.get_flux_table_cache_stats()['evictions'] == 1
+    galsim.sed.set_flux_table_cache_size(100)
+
+    assert_raises(galsim.GalSimIncompatibleValuesError, galsim.sed.calculateFluxes,
+                  templates[0], rband, redshift, index=index)
+    assert_raises(galsim.GalSimIncompatibleValuesError, galsim.sed.calculateFluxes,
+                  templates, rband, redshift)
+    assert_raises(galsim.GalSimRangeError, galsim.sed.calculateFluxes,
+                  templates, rband, redshift, index=index+1)
+    assert_raises(galsim.GalSimRangeError, galsim.sed.calculateFluxes,
+                  templates, rband, redshift-1, index=index)
+    assert_raises(TypeError, galsim.sed.calculateFluxes,
+                  templates, rband, redshift, index=index*1.)
+    assert_raises(galsim.GalSimError, galsim.sed.calculateMagnitudes,
+                  templates, bp, redshift, index=index)
+    assert_raises(ValueError, galsim.sed.set_flux_table_cache_size, -1)
+    assert_raises(ValueError, galsim.sed.set_flux_table_cache_size, 0)
+
+
 @timer
 def test_SED_calculateDCRMomentShifts():
     # compute some moment shifts
@@ -855,6 +960,81 @@ def test_SED_sampleWavelength():
                                    "Sampled CDF does not match input redshifted SED.")
 
 
+@timer
+def test_sampleWavelengths():
+    """Check the batched wavelength sampling for many objects.
+    """
+    templates = [ galsim.SED(os.path.join(sedpath, name), wave_type='ang', flux_type='flambda')
+                  for name in ['CWW_E_ext.sed', 'CWW_Im_ext.sed'] ]
+    templates = [ t.thin() for t in templates ]
+    rband = galsim.Bandpass(os.path.join(bppath, 'LSST_r.dat'), 'nm').thin()
+    galsim.sed.clear_wavelength_table_cache()
+
+    # At the redshifts of the tables, the results are the same as sampleWavelength.
+    z = np.expm1(np.array([300, 500, 300]) * galsim.sed._wavelength_table_step)
+    nphotons = [1000, 2000, 500]
+    index = [0, 1, 1]
+    waves = galsim.sed.sampleWavelengths(templates, rband, z, nphotons, index=index,
+                                         rng=galsim.BaseDeviate(1234))
+    assert waves.shape == (3500,)
+    stats = galsim.sed.get_wavelength_table_cache_stats()
+    assert stats['size'] == stats['misses'] == 3
+    assert stats['hits'] == 0
+    rng = galsim.BaseDeviate(1234)
+    ref = np.concatenate([ templates[i].atRedshift(zi).sampleWavelength(n, rband, rng=rng)
+                           for i, zi, n in zip(index, z, nphotons) ])
+    np.testing.assert_allclose(waves, ref, rtol=1.e-10)
+    assert np.min(waves) >= rband.blue_limit
+    assert np.max(waves) <= rband.red_limit
+
+    # Between them, the distribution is very close.
+    rng = galsim.BaseDeviate(5678)
+    z = [0.3217, 1.1234]
+    n = 100000
+    for i in range(2):
+        waves = galsim.sed.sampleWavelengths(templates, rband, z, n, index=i, rng=rng)
+        assert waves.shape == (2*n,)
+        assert np.min(waves) >= rband.blue_limit
+        assert np.max(waves) <= rband.red_limit
+        for j in range(2):
+            ref = templates[i].atRedshift(z[j]).sampleWavelength(n, rband, rng=rng)
+            print(i, j, np.mean(waves[j*n:(j+1)*n]), np.mean(ref))
+            np.testing.assert_allclose(np.mean(waves[j*n:(j+1)*n]), np.mean(ref), rtol=1.e-3)
+            np.testing.assert_allclose(np.std(waves[j*n:(j+1)*n]), np.std(ref), rtol=2.e-2)
+
+    # A single SED doesn't need index, and objects may have no photons.
+    waves = galsim.sed.sampleWavelengths(templates[0], None, [0.5, 1.5], [0, 10], rng=rng)
+    assert waves.shape == (10,)
+    assert np.min(waves) >= templates[0].blue_limit * 2.5
+    waves = galsim.sed.sampleWavelengths(templates[0], rband, [0.5, 1.5], 0, rng=rng)
+    assert waves.shape == (0,)
+
+    # Check the cache size functions.
+    galsim.sed.set_wavelength_table_cache_size(2)
+    stats = galsim.sed.get_wavelength_table_cache_stats()
+    assert stats['size'] == stats['maxsize'] == 2
+    galsim.sed.clear_wavelength_table_cache()
+    stats = galsim.sed.get_wavelength_table_cache_stats()
+    assert stats['size'] == stats['hits'] == stats['misses'] == stats['evictions'] == 0
+    galsim.sed.sampleWavelengths(templates, rband, [0.5, 1.5], 10, index=[0,1], rng=rng)
+    galsim.sed.sampleWavelengths(templates, rband, [0.5, 1.5], 10, index=[0,1], rng=rng)
+    stats = galsim.sed.get_wavelength_table_cache_stats()
+    assert stats['misses'] == stats['hits'] == 2
+    assert stats['hit_rate'] == 0.5
+    galsim.sed.sampleWavelengths(templates, rband, [0.5, 2.5], 10, index=[0,1], rng=rng)
+    assert galsim.sed.get_wavelength_table_cache_stats()['evictions'] == 1
+    galsim.sed.set_wavelength_table_cache_size(1000)
+
+    assert_raises(galsim.GalSimRangeError, galsim.sed.sampleWavelengths,
+                  templates, rband, [0.5, 1.5], [10, -1], index=[0,1])
+    assert_raises(galsim.GalSimRangeError, galsim.sed.sampleWavelengths,
+                  templates, rband, [0.5, 1.5], 10, index=[0,2])
+    assert_raises(galsim.GalSimIncompatibleValuesError, galsim.sed.sampleWavelengths,
+                  templates, rband, [0.5, 1.5], 10)
+    assert_raises(ValueError, galsim.sed.set_wavelength_table_cache_size, -1)
+    assert_raises(ValueError, galsim.sed.set_wavelength_table_cache_size, 0)
+
+
 @timer
 def test_fnu_vs_flambda():
     c = 2.99792458e17  # speed of light in nm/s
@@ -988,9 +1168,11 @@ if __name__ == "__main__":
     test_SED_withFluxDensity()
     test_SED_calculateMagnitude()
     test_redshift_calculateFlux()
+    test_calculateFluxes()
     test_SED_calculateDCRMomentShifts()
     test_SED_calculateSeeingMomentRatio()
     test_SED_sampleWavelength()
+    test_sampleWavelengths()
     test_fnu_vs_flambda()
     test_ne()
     test_thin()
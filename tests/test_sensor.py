@@ -753,6 +753,101 @@ def test_treerings():
     assert_raises(TypeError, galsim.SiliconSensor, treering_func=tr7, treering_center=(3,4))
 
 
+@timer
+def test_treering_map():
+    """Test the precomputed map of tree ring displacements.
+    """
+    import shutil
+    tr = galsim.SiliconSensor.simple_treerings(0.05, 47., r_max=3000.)
+    center = galsim.PositionD(-300.5, 1200.25)
+    map_bounds = galsim.BoundsI(0,200,0,200)
+    sensor1 = galsim.SiliconSensor(treering_func=tr, treering_center=center)
+    sensor2 = galsim.SiliconSensor(treering_func=tr, treering_center=center,
+                                   treering_map_bounds=map_bounds)
+    assert sensor2 != sensor1
+    do_pickle(sensor2)
+
+    # The vectorized displacement function matches the tree ring function.
+    x = np.array([0., 10.3, 150., -300.5])
+    y = np.array([0., 17.8, 3., 1200.25])
+    dx, dy = sensor1.treering_displacement(x, y)
+    r = np.hypot(x - center.x, y - center.y)
+    for k in range(3):
+        np.testing.assert_almost_equal(dx[k], tr(r[k]) * (x[k] - center.x) / r[k])
+        np.testing.assert_almost_equal(dy[k], tr(r[k]) * (y[k] - center.y) / r[k])
+    assert dx[3] == dy[3] == 0.
+    dx2, dy2 = sensor1.treering_displacement(x.reshape(2,2), y.reshape(2,2))
+    np.testing.assert_array_equal(dx2.ravel(), dx)
+
+    # The pixel areas using the map are very close to using the function directly.
+    im = galsim.ImageD(100, 100)
+    area1 = sensor1.calculate_pixel_areas(im, orig_center=galsim.PositionI(10,20))
+    area2 = sensor2.calculate_pixel_areas(im, orig_center=galsim.PositionI(10,20))
+    print('max area variation = ',np.max(np.abs(area1.array-1)))
+    print('max diff with map = ',np.max(np.abs(area2.array-area1.array)))
+    assert np.max(np.abs(area1.array-1)) > 1.e-3
+    np.testing.assert_allclose(area2.array, area1.array, atol=2.e-5)
+
+    # If the image isn't entirely within the map, it uses the function.
+    area1 = sensor1.calculate_pixel_areas(im, orig_center=galsim.PositionI(150,20))
+    area2 = sensor2.calculate_pixel_areas(im, orig_center=galsim.PositionI(150,20))
+    np.testing.assert_array_equal(area2.array, area1.array)
+
+    # Likewise for accumulate.
+    obj = galsim.Gaussian(flux=20000, sigma=0.3)
+    im1 = obj.drawImage(nx=30, ny=30, scale=0.3, method='phot', rng=galsim.BaseDeviate(1234),
+                        sensor=galsim.SiliconSensor(rng=galsim.BaseDeviate(5678),
+                                                    treering_func=tr, treering_center=center))
+    im2 = obj.drawImage(nx=30, ny=30, scale=0.3, method='phot', rng=galsim.BaseDeviate(1234),
+                        sensor=galsim.SiliconSensor(rng=galsim.BaseDeviate(5678),
+                                                    treering_func=tr, treering_center=center,
+                                                    treering_map_bounds=map_bounds))
+    mom1 = galsim.utilities.unweighted_moments(im1)
+    mom2 = galsim.utilities.unweighted_moments(im2)
+    np.testing.assert_almost_equal(mom2['Mx'], mom1['Mx'], decimal=3)
+    np.testing.assert_almost_equal(mom2['My'], mom1['My'], decimal=3)
+
+    # The map can be saved in a disk cache.
+    cache_dir = os.path.join('output', 'treering_cache')
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    galsim.sensor.set_disk_cache(cache_dir)
+    try:
+        assert galsim.sensor.get_disk_cache().directory == os.path.abspath(cache_dir)
+        sensor3 = galsim.SiliconSensor(treering_func=tr, treering_center=center,
+                                       treering_map_bounds=map_bounds)
+        assert len(galsim.sensor.get_disk_cache()) == 1
+        dx3, dy3, x0, y0 = sensor3._get_treering_map()
+        assert dx3.dtype == np.float32
+        assert dx3.shape == (202, 202)
+        assert x0 == y0 == 0.
+        sensor4 = galsim.SiliconSensor(treering_func=tr, treering_center=center,
+                                       treering_map_bounds=map_bounds, treering_map_step=2.)
+        assert len(galsim.sensor.get_disk_cache()) == 2
+        assert sensor4._get_treering_map()[0].shape == (102, 102)
+        area3 = sensor3.calculate_pixel_areas(im, orig_center=galsim.PositionI(10,20))
+        np.testing.assert_array_equal(area3.array,
+                                      sensor2.calculate_pixel_areas(
+                                          im, orig_center=galsim.PositionI(10,20)).array)
+        # A different center is a different entry.
+        sensor5 = galsim.SiliconSensor(treering_func=tr, treering_center=galsim.PositionD(0,0),
+                                       treering_map_bounds=map_bounds)
+        assert len(galsim.sensor.get_disk_cache()) == 3
+        # Without tree rings, there is no map.
+        sensor6 = galsim.SiliconSensor(treering_map_bounds=map_bounds)
+        assert len(galsim.sensor.get_disk_cache()) == 3
+    finally:
+        galsim.sensor.set_disk_cache(None)
+    assert galsim.sensor.get_disk_cache() is None
+
+    assert_raises(TypeError, galsim.SiliconSensor, treering_func=tr,
+                  treering_map_bounds=galsim.BoundsD(0,200,0,200))
+    assert_raises(galsim.GalSimUndefinedBoundsError, galsim.SiliconSensor, treering_func=tr,
+                  treering_map_bounds=galsim.BoundsI())
+    assert_raises(ValueError, galsim.SiliconSensor, treering_func=tr,
+                  treering_map_bounds=map_bounds, treering_map_step=0.)
+
+
 @timer
 def test_resume():
     """Test that the resume option for accumulate works properly.
@@ -989,6 +1084,164 @@ def test_flat():
     np.testing.assert_allclose(cov20 / counts_total, 0., atol=2*toler)
     np.testing.assert_allclose(cov02 / counts_total, 0., atol=2*toler)
 
+@timer
+def test_silicon_threads():
+    """Test SiliconSensor accumulation with multiple threads.
+    """
+    obj = galsim.Gaussian(flux=3.e5, sigma=0.3)
+    treering_func = galsim.SiliconSensor.simple_treerings(0.3, 80.)
+    treering_center = galsim.PositionD(-100,30)
+
+    def draw(seed, nthreads, nrecalc=3000):
+        sensor = galsim.SiliconSensor(rng=galsim.BaseDeviate(seed), nrecalc=nrecalc,
+                                      treering_func=treering_func,
+                                      treering_center=treering_center)
+        im = galsim.ImageD(48, 48, scale=0.3)
+        try:
+            galsim.utilities.set_num_threads(nthreads)
+            obj.drawImage(im, method='phot', poisson_flux=False, sensor=sensor,
+                          rng=galsim.BaseDeviate(seed))
+            area = sensor.calculate_pixel_areas(im)
+        finally:
+            galsim.utilities.set_num_threads(1)
+        return im, area
+
+    im1, area1 = draw(1234, 1)
+    im2, area2 = draw(1234, 2)
+    im4, area4 = draw(1234, 4)
+
+    # The threaded version is deterministic, regardless of the number of threads.
+    np.testing.assert_array_equal(im2.array, im4.array)
+    np.testing.assert_array_equal(area2.array, area4.array)
+    assert im2.added_flux == im4.added_flux
+
+    # It uses the random numbers differently than the serial version, so it is a different
+    # realization, but with the same properties.
+    assert not np.array_equal(im1.array, im2.array)
+    np.testing.assert_allclose(im2.array.sum(), im1.array.sum(), rtol=1.e-3)
+    r1 = im1.calculateMomentRadius(flux=obj.flux)
+    r2 = im2.calculateMomentRadius(flux=obj.flux)
+    sigma_r = 1. / np.sqrt(obj.flux) * im1.scale
+    np.testing.assert_allclose(r2, r1, atol=4.*sigma_r)
+
+    # The pixel areas for a given image don't depend on the number of threads at all.
+    sensor = galsim.SiliconSensor(treering_func=treering_func, treering_center=treering_center)
+    area1 = sensor.calculate_pixel_areas(im1)
+    try:
+        galsim.utilities.set_num_threads(3)
+        area3 = sensor.calculate_pixel_areas(im1)
+    finally:
+        galsim.utilities.set_num_threads(1)
+    np.testing.assert_array_equal(area3.array, area1.array)
+
+    # Resuming gives the same result as doing all the photons at once.
+    photons = galsim.PhotonArray(40000)
+    rng = galsim.UniformDeviate(8675309)
+    rng.generate(photons.x)
+    rng.generate(photons.y)
+    # Keep the photons a few pixels away from the edges, so none of the charge diffuses off
+    # the image.
+    photons.x = photons.x * 14 + 3.5
+    photons.y = photons.y * 14 + 3.5
+    photons.flux = 1.
+    sensor1 = galsim.SiliconSensor(rng=rng.duplicate(), nrecalc=5000)
+    sensor2 = galsim.SiliconSensor(rng=rng.duplicate(), nrecalc=5000)
+    im1 = galsim.ImageF(20,20)
+    im2 = galsim.ImageF(20,20)
+    try:
+        galsim.utilities.set_num_threads(2)
+        added_flux = sensor1.accumulate(photons, im1)
+        for k in range(4):
+            part = galsim.PhotonArray(10000, x=photons.x[k*10000:(k+1)*10000],
+                                      y=photons.y[k*10000:(k+1)*10000],
+                                      flux=photons.flux[k*10000:(k+1)*10000])
+            sensor2.accumulate(part, im2, resume=(k>0))
+    finally:
+        galsim.utilities.set_num_threads(1)
+    np.testing.assert_array_equal(im2.array, im1.array)
+    np.testing.assert_allclose(added_flux, 40000, rtol=1.e-6)
+    np.testing.assert_allclose(im1.array.sum(), 40000, rtol=1.e-6)
+
+@timer
+def test_silicon_large_image():
+    """Test that photons falling on a small part of a large image give the same result as
+    on a small image covering just that part.
+    """
+    # The pixel boundaries are only updated near pixels that have received charge, so this
+    # checks that nothing is missed by doing that.
+    photons = galsim.PhotonArray(20000)
+    gd = galsim.GaussianDeviate(galsim.BaseDeviate(1234), sigma=1.5)
+    gd.generate(photons.x)
+    gd.generate(photons.y)
+    photons.flux = 1.
+
+    small_bounds = galsim.BoundsI(45,84,45,84)
+    for dx, dy in [ (64.5, 64.5), (70.3, 57.9) ]:
+        # Center the spot near the corners of the tiles in the C++ layer, so the charge
+        # spreads across several of them.
+        spot = galsim.PhotonArray(photons.size(), x=photons.x + dx, y=photons.y + dy,
+                                  flux=photons.flux)
+        im_big = galsim.ImageD(galsim.BoundsI(1,300,1,300))
+        im_small = galsim.ImageD(small_bounds)
+        sensor1 = galsim.SiliconSensor(rng=galsim.BaseDeviate(5678), nrecalc=1000)
+        sensor2 = galsim.SiliconSensor(rng=galsim.BaseDeviate(5678), nrecalc=1000)
+        sensor1.accumulate(spot, im_big)
+        sensor2.accumulate(spot, im_small)
+        print('flux = ',im_big.array.sum(), im_small.array.sum())
+        np.testing.assert_array_equal(im_big[small_bounds].array, im_small.array)
+        np.testing.assert_equal(im_big.array.sum(), im_small.array.sum())
+
+        # Also with resume.
+        im_big2 = galsim.ImageD(galsim.BoundsI(1,300,1,300))
+        sensor3 = galsim.SiliconSensor(rng=galsim.BaseDeviate(5678), nrecalc=1000)
+        for k in range(4):
+            part = galsim.PhotonArray(5000, x=spot.x[k*5000:(k+1)*5000],
+                                      y=spot.y[k*5000:(k+1)*5000],
+                                      flux=spot.flux[k*5000:(k+1)*5000])
+            sensor3.accumulate(part, im_big2, resume=(k>0))
+        np.testing.assert_array_equal(im_big2.array, im_big.array)
+
+        # The pixel areas only change near the spot.
+        area = sensor1.calculate_pixel_areas(im_big)
+        area0 = sensor1.calculate_pixel_areas(galsim.ImageD(im_big.bounds))
+        diff = np.where(area.array != area0.array)
+        assert np.all(diff[0] >= small_bounds.ymin - 1 - 3)
+        assert np.all(diff[0] <= small_bounds.ymax - 1 + 3)
+        assert np.all(diff[1] >= small_bounds.xmin - 1 - 3)
+        assert np.all(diff[1] <= small_bounds.xmax - 1 + 3)
+
+@timer
+def test_silicon_float_image():
+    """Test that accumulating onto an ImageF matches doing the same on an ImageD.
+    """
+    # The pixel boundary updates are done tile by tile, so make sure that doing them on a
+    # float image doesn't accumulate any more rounding error than a full-image update would.
+    photons = galsim.PhotonArray(20000)
+    gd = galsim.GaussianDeviate(galsim.BaseDeviate(1234), sigma=1.5)
+    gd.generate(photons.x)
+    gd.generate(photons.y)
+    photons.x += 64.5
+    photons.y += 64.5
+    photons.flux = 1.7
+
+    small_bounds = galsim.BoundsI(45,84,45,84)
+    im_bigf = galsim.ImageF(galsim.BoundsI(1,300,1,300))
+    im_smallf = galsim.ImageF(small_bounds)
+    im_bigd = galsim.ImageD(galsim.BoundsI(1,300,1,300))
+    for im in [im_bigf, im_smallf, im_bigd]:
+        sensor = galsim.SiliconSensor(rng=galsim.BaseDeviate(5678), nrecalc=1000)
+        sensor.accumulate(photons, im)
+    print('flux = ',im_bigf.array.sum(), im_smallf.array.sum(), im_bigd.array.sum())
+    np.testing.assert_array_equal(im_bigf[small_bounds].array, im_smallf.array)
+    np.testing.assert_allclose(im_bigf.array.sum(), im_bigd.array.sum(), rtol=1.e-6)
+    # The pixel boundaries are calculated from slightly different image values, so an
+    # occasional photon may land in a neighboring pixel.  But the rest should agree to
+    # float precision.
+    diff = np.abs(im_bigf.array - im_bigd.array)
+    print('max diff = ',diff.max(), np.sum(diff > 1.e-3))
+    assert np.sum(diff > 1.e-3) <= 0.01 * np.sum(im_bigd.array > 0)
+
+
 if __name__ == "__main__":
     test_simple()
     test_silicon()
@@ -997,5 +1250,9 @@ if __name__ == "__main__":
     test_sensor_wavelengths_and_angles()
     test_bf_slopes()
     test_treerings()
+    test_treering_map()
     test_resume()
     test_flat()
+    test_silicon_threads()
+    test_silicon_large_image()
+    test_silicon_float_image()
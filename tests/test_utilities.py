@@ -845,6 +845,78 @@ def test_python_LRU_Cache():
     assert_raises(ValueError, cache.resize, -20)
 
 
+@timer
+def test_LRU_Cache_stats():
+    """Test the statistics and memory limit of LRU_Cache."""
+    f = lambda n: np.zeros(n)
+    cache = galsim.utilities.LRU_Cache(f, maxsize=10, sizeof=lambda a: a.nbytes)
+    for n in [1, 2, 3, 2, 1]:
+        cache(n)
+    stats = cache.stats()
+    print('stats = ',stats)
+    assert stats['hits'] == 2
+    assert stats['misses'] == 3
+    assert stats['evictions'] == 0
+    assert stats['hit_rate'] == 0.4
+    assert stats['size'] == 3
+    assert stats['maxsize'] == 10
+    assert stats['nbytes'] == 6 * 8
+    assert stats['max_bytes'] is None
+
+    # Setting max_bytes removes the least recently used items until they fit: (3,).
+    cache.set_max_bytes(4 * 8)
+    assert (3,) not in cache.cache
+    assert cache.nbytes == 3 * 8
+    assert cache.evictions == 1
+
+    # Adding (4,) bumps (2,) then (1,).
+    cache(4)
+    assert (2,) not in cache.cache
+    assert (1,) not in cache.cache
+    assert cache.nbytes == 4 * 8
+    assert cache.evictions == 3
+    assert cache.stats()['size'] == 1
+
+    # An item that is larger than max_bytes by itself is still kept.
+    cache(7)
+    assert (7,) in cache.cache
+    assert (4,) not in cache.cache
+    assert cache.evictions == 4
+    assert cache.nbytes == 7 * 8
+    np.testing.assert_array_equal(cache(7), np.zeros(7))
+    assert cache.hits == 3
+
+    # Items pushed out by the number limit count as evictions too.
+    cache.set_max_bytes(None)
+    cache.resize(2)
+    for n in range(10, 15):
+        cache(n)
+    assert cache.stats()['size'] == 2
+    assert cache.evictions == 8
+    assert cache.nbytes == (13 + 14) * 8
+    cache.resize(1)
+    assert cache.evictions == 9
+    assert cache.nbytes == 14 * 8
+
+    cache.clear()
+    stats = cache.stats()
+    assert stats['hits'] == stats['misses'] == stats['evictions'] == 0
+    assert stats['size'] == 0
+    assert stats['nbytes'] == 0
+    assert stats['maxsize'] == 1
+    np.testing.assert_array_equal(cache(3), np.zeros(3))
+
+    # Without sizeof, the memory is not tracked, so max_bytes is not allowed.
+    cache = galsim.utilities.LRU_Cache(f, maxsize=10)
+    cache(3)
+    assert cache.stats()['nbytes'] == 0
+    assert_raises(galsim.GalSimIncompatibleValuesError, cache.set_max_bytes, 100)
+    assert_raises(galsim.GalSimIncompatibleValuesError, galsim.utilities.LRU_Cache, f,
+                  max_bytes=100)
+    cache = galsim.utilities.LRU_Cache(f, maxsize=10, sizeof=lambda a: a.nbytes)
+    assert_raises(ValueError, cache.set_max_bytes, -1)
+
+
 @timer
 def test_rand_with_replacement():
     """Test routine to select random indices with replacement."""
@@ -1066,6 +1138,7 @@ if __name__ == "__main__":
     test_deInterleaveImage()
     test_interleaveImages()
     test_python_LRU_Cache()
+    test_LRU_Cache_stats()
     test_rand_with_replacement()
     test_position_type_promotion()
     test_unweighted_moments()